@@ -0,0 +1,167 @@
+"""
+Caché en memoria para resultados de consultas costosas (agregados, reportes)
+Cada worker tiene su propia caché. Las escrituras invalidan la caché del worker que
+las atiende e incrementan la generación compartida (tabla generacion_cache); antes de
+devolver una entrada, cada worker lee la generación y descarta las calculadas antes
+de una escritura en otro worker.
+"""
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from app.config import database
+from app.config.metricas import registrar_consulta_cache
+from app.config.salud import registrar_verificacion
+from app.models.generacion_cache_model import generacion_cache
+
+logger = logging.getLogger("app.cache")
+
+# Segundos que se reutilizan las estadísticas agregadas (/api/estadisticas)
+ESTADISTICAS_CACHE_SEGUNDOS = float(os.getenv("ESTADISTICAS_CACHE_SEGUNDOS", "60"))
+
+# Segundos que se reutilizan los reportes de cohortes (/api/cohortes), por par de gestiones
+COHORTES_CACHE_SEGUNDOS = float(os.getenv("COHORTES_CACHE_SEGUNDOS", "600"))
+
+def leer_generacion() -> Optional[int]:
+    """
+    Generación compartida de las cachés (0 si nadie invalidó todavía).
+    Si la tabla no se puede leer (ej: falta crear-tablas) devuelve None y las
+    entradas solo vencen por tiempo, como antes de compartir la invalidación.
+    """
+    try:
+        with database.engine.connect() as conexion:
+            return conexion.execute(
+                select(generacion_cache.c.generacion).where(generacion_cache.c.id == 1)
+            ).scalar() or 0
+    except SQLAlchemyError as e:
+        logger.warning("No se pudo leer la generación de las cachés: %s", e)
+        return None
+
+def incrementar_generacion() -> None:
+    """Avisar a los demás workers que sus entradas en caché quedaron viejas"""
+    try:
+        with database.engine.begin() as conexion:
+            resultado = conexion.execute(
+                update(generacion_cache)
+                .where(generacion_cache.c.id == 1)
+                .values(generacion=generacion_cache.c.generacion + 1)
+            )
+            if resultado.rowcount == 0:
+                conexion.execute(insert(generacion_cache).values(id=1, generacion=1))
+    except IntegrityError:
+        # Otro worker creó la fila al mismo tiempo: basta con incrementarla
+        incrementar_generacion()
+    except SQLAlchemyError as e:
+        logger.warning("No se pudo incrementar la generación de las cachés: %s", e)
+
+class CacheResultados:
+    """
+    Caché con vencimiento y tamaño máximo (se descartan las entradas menos usadas)
+
+    Si varios hilos piden la misma clave vencida, solo uno la calcula y los demás
+    esperan su resultado. Un resultado que se calculó mientras se invalidaba la
+    caché no se guarda, porque podría no incluir la escritura que invalidó.
+    Cada entrada guarda la generación compartida leída antes de calcularla y solo
+    se devuelve mientras esa generación no cambie.
+    """
+    def __init__(self, nombre: str, segundos: float, maximo: int = 128):
+        self.nombre = nombre
+        self.segundos = segundos
+        self.maximo = maximo
+        self._entradas: "OrderedDict[Hashable, Tuple[float, Optional[int], Any]]" = OrderedDict()
+        self._calculando: Dict[Hashable, threading.Lock] = {}
+        self._generacion = 0
+        self._lock = threading.Lock()
+
+    def _vigente(self, clave: Hashable, compartida: Optional[int]) -> Tuple[bool, Any]:
+        """Buscar una entrada vigente (llamar con el lock tomado)"""
+        entrada = self._entradas.get(clave)
+        if entrada is None or entrada[0] <= time.monotonic() or entrada[1] != compartida:
+            return False, None
+        self._entradas.move_to_end(clave)
+        return True, entrada[2]
+
+    def obtener(self, clave: Hashable, calcular: Callable[[], Any]) -> Any:
+        """
+        Resultado de la clave, calculándolo con `calcular()` si no está, venció
+        o hubo una escritura (en cualquier worker) desde que se calculó
+        """
+        compartida = leer_generacion() if self.segundos > 0 else None
+        with self._lock:
+            encontrado, valor = self._vigente(clave, compartida)
+            lock_clave = self._calculando.setdefault(clave, threading.Lock())
+        if encontrado:
+            registrar_consulta_cache(self.nombre, True)
+            return valor
+
+        with lock_clave:
+            # Otro hilo pudo calcularlo mientras se esperaba el turno
+            with self._lock:
+                encontrado, valor = self._vigente(clave, compartida)
+                generacion = self._generacion
+            if encontrado:
+                registrar_consulta_cache(self.nombre, True)
+                return valor
+
+            registrar_consulta_cache(self.nombre, False)
+            valor = calcular()
+            with self._lock:
+                if generacion == self._generacion and self.segundos > 0:
+                    self._entradas[clave] = (time.monotonic() + self.segundos, compartida, valor)
+                    self._entradas.move_to_end(clave)
+                    while len(self._entradas) > self.maximo:
+                        descartada, _ = self._entradas.popitem(last=False)
+                        self._calculando.pop(descartada, None)
+            return valor
+
+    def invalidar(self) -> None:
+        """Descartar todas las entradas"""
+        with self._lock:
+            self._entradas.clear()
+            self._generacion += 1
+
+    def entradas(self, timeout: float) -> Optional[int]:
+        """Cantidad de entradas guardadas, o None si la caché no responde antes del timeout"""
+        if not self._lock.acquire(timeout=timeout):
+            return None
+        try:
+            return len(self._entradas)
+        finally:
+            self._lock.release()
+
+# Cachés de datos derivados de estudiantes, cursos e inscripciones
+_caches: Dict[str, CacheResultados] = {}
+
+def crear_cache(nombre: str, segundos: float, maximo: int = 128) -> CacheResultados:
+    """Crear una caché que se invalida con invalidar_caches()"""
+    cache = CacheResultados(nombre, segundos, maximo)
+    _caches[nombre] = cache
+    return cache
+
+def invalidar_caches() -> None:
+    """
+    Invalidar las cachés de este worker e incrementar la generación compartida,
+    que invalida las de los demás. Llamar después de confirmar una escritura
+    sobre estudiantes, cursos o inscripciones.
+    """
+    for cache in _caches.values():
+        cache.invalidar()
+    incrementar_generacion()
+
+def verificar_caches() -> Tuple[str, dict]:
+    """
+    Verificación de preparación de las cachés. Son memoria del worker (no hay un
+    servidor que pueda caerse): se comprueba que cada una responda, es decir, que
+    ningún hilo haya dejado su lock tomado y bloquee a las peticiones que la leen.
+    """
+    entradas = {nombre: cache.entradas(timeout=0.2) for nombre, cache in list(_caches.items())}
+    bloqueadas = sorted(nombre for nombre, cantidad in entradas.items() if cantidad is None)
+    if bloqueadas:
+        return "error", {"bloqueadas": bloqueadas}
+    return "ok", {"entradas": entradas}
+
+registrar_verificacion("caches", verificar_caches)
@@ -0,0 +1,192 @@
+"""
+Conteo de consultas SQL y detección de N+1
+Cuenta las sentencias ejecutadas dentro de un bloque, una petición o un método
+de controlador, y detecta la misma sentencia repetida con parámetros distintos
+(el patrón N+1: una consulta por fila dentro de un bucle).
+
+Un bloque con presupuesto falla al excederlo (PresupuestoConsultasExcedido); así
+lo exigen las pruebas:
+    metodo = InscripcionMasivaController.inscribir_estudiantes_masivamente
+    with presupuesto_consultas(metodo.presupuesto_consultas):
+        metodo(db, id_curso, ids)
+
+Un método decorado declara su presupuesto y solo lo vigila según CONSULTAS_MODO;
+nunca falla por él, porque cuando se controla el método ya confirmó su transacción:
+    off        sin conteo (producción)
+    advertir   registra un warning con el sitio de la llamada (desarrollo)
+
+    @staticmethod
+    @presupuesto_consultas(5)
+    def metodo(db, ...):
+"""
+import os
+import logging
+import functools
+import traceback
+import contextvars
+from typing import Callable, Dict, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+CONSULTAS_MODO = os.getenv("CONSULTAS_MODO", "off")
+
+# Ejecuciones de una misma sentencia con parámetros distintos a partir de las que se considera N+1
+CONSULTAS_REPETICIONES_N_MAS_1 = int(os.getenv("CONSULTAS_REPETICIONES_N_MAS_1", "5"))
+
+logger = logging.getLogger("app.consultas")
+
+# Directorio del paquete app, para ubicar la línea de código que originó una consulta
+_RAIZ_APP = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_RAIZ_CONFIG = os.path.dirname(os.path.abspath(__file__))
+
+class PresupuestoConsultasExcedido(AssertionError):
+    """Un bloque ejecutó más consultas que su presupuesto o repitió una consulta por fila"""
+
+class ContadorConsultas:
+    """
+    Consultas ejecutadas dentro de un bloque, agrupadas por sentencia
+    """
+    def __init__(self, nombre: Optional[str] = None):
+        self.nombre = nombre
+        self.total = 0
+        self.por_sentencia: Dict[str, int] = {}
+        self._primeros_parametros: Dict[str, str] = {}
+        self._parametros_varian: Dict[str, bool] = {}
+        self._sitios: Dict[str, str] = {}
+
+    def registrar(self, sentencia: str, parametros) -> None:
+        self.total += 1
+        veces = self.por_sentencia.get(sentencia, 0) + 1
+        self.por_sentencia[sentencia] = veces
+
+        # Solo importa saber si los parámetros cambian: se guarda el primero y se compara
+        if veces == 1:
+            self._primeros_parametros[sentencia] = repr(parametros)
+        elif not self._parametros_varian.get(sentencia) and repr(parametros) != self._primeros_parametros[sentencia]:
+            self._parametros_varian[sentencia] = True
+            self._sitios[sentencia] = sitio_de_llamada()
+
+    def repetidas(self, minimo: int = CONSULTAS_REPETICIONES_N_MAS_1) -> List[Tuple[str, int, str]]:
+        """
+        Sentencias ejecutadas al menos `minimo` veces con parámetros distintos
+
+        Returns:
+            Lista de (sentencia, veces, sitio de la llamada), de la más repetida a la menos
+        """
+        repetidas = [
+            (sentencia, veces, self._sitios.get(sentencia, "desconocido"))
+            for sentencia, veces in self.por_sentencia.items()
+            if veces >= minimo and self._parametros_varian.get(sentencia)
+        ]
+        return sorted(repetidas, key=lambda r: r[1], reverse=True)
+
+_contadores: contextvars.ContextVar[Tuple[ContadorConsultas, ...]] = contextvars.ContextVar(
+    "contadores_consultas", default=()
+)
+
+def sitio_de_llamada() -> str:
+    """Primera línea de la aplicación (fuera de app/config) en la pila actual"""
+    for cuadro in reversed(traceback.extract_stack()):
+        if cuadro.filename.startswith(_RAIZ_APP) and not cuadro.filename.startswith(_RAIZ_CONFIG):
+            return f"{os.path.relpath(cuadro.filename, os.path.dirname(_RAIZ_APP))}:{cuadro.lineno} en {cuadro.name}"
+    return "desconocido"
+
+def instrumentar_engine(engine: Engine) -> None:
+    """Registrar en el engine el evento que alimenta los contadores activos"""
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _contar(conn, cursor, statement, parameters, context, executemany):
+        contadores = _contadores.get()
+        for contador in contadores:
+            contador.registrar(statement, parameters)
+
+class contar_consultas:
+    """
+    Contar las consultas de un bloque (sin límites)
+
+    Uso:
+        with contar_consultas() as contador:
+            ...
+        contador.total
+    """
+    def __init__(self, nombre: Optional[str] = None):
+        self.contador = ContadorConsultas(nombre)
+        self._token = None
+
+    def __enter__(self) -> ContadorConsultas:
+        self._token = _contadores.set(_contadores.get() + (self.contador,))
+        return self.contador
+
+    def __exit__(self, tipo, valor, traza) -> None:
+        _contadores.reset(self._token)
+
+def violaciones(contador: ContadorConsultas, maximo: Optional[int], repeticiones: int) -> List[str]:
+    """Descripción de cada incumplimiento del presupuesto de un contador"""
+    mensajes = []
+    if maximo is not None and contador.total > maximo:
+        mensajes.append(f"{contador.total} consultas (presupuesto: {maximo})")
+    for sentencia, veces, sitio in contador.repetidas(repeticiones):
+        resumen = " ".join(sentencia.split())[:160]
+        mensajes.append(f"posible N+1: {veces} ejecuciones de '{resumen}' desde {sitio}")
+    return mensajes
+
+class presupuesto_consultas:
+    """
+    Presupuesto de consultas para un bloque o un método
+
+    Como context manager siempre cuenta y, por defecto, falla al excederse. Como
+    decorador solo cuenta si CONSULTAS_MODO no es 'off' (sin costo en producción)
+    y solo advierte: el presupuesto que exigen las pruebas queda en el atributo
+    presupuesto_consultas del método.
+
+    Args:
+        maximo: Consultas permitidas (None: sin límite, solo detección de N+1)
+        repeticiones: Repeticiones con parámetros distintos que se reportan como N+1
+        modo: 'estricto' (por defecto en un bloque) o 'advertir'
+        nombre: Nombre para los mensajes (por defecto, el del método decorado)
+    """
+    def __init__(
+        self,
+        maximo: Optional[int],
+        repeticiones: int = CONSULTAS_REPETICIONES_N_MAS_1,
+        modo: Optional[str] = None,
+        nombre: Optional[str] = None
+    ):
+        self.maximo = maximo
+        self.repeticiones = repeticiones
+        self.modo = modo
+        self.nombre = nombre
+        self._conteo: Optional[contar_consultas] = None
+
+    def __enter__(self) -> ContadorConsultas:
+        self._conteo = contar_consultas(self.nombre)
+        return self._conteo.__enter__()
+
+    def __exit__(self, tipo, valor, traza) -> None:
+        self._conteo.__exit__(tipo, valor, traza)
+        if tipo is not None:
+            return
+
+        mensajes = violaciones(self._conteo.contador, self.maximo, self.repeticiones)
+        if not mensajes:
+            return
+
+        modo = self.modo or "estricto"
+        detalle = f"{self.nombre or 'bloque'}: " + "; ".join(mensajes)
+        if modo == "estricto":
+            raise PresupuestoConsultasExcedido(detalle)
+        logger.warning(detalle)
+
+    def __call__(self, funcion: Callable) -> Callable:
+        nombre = self.nombre or funcion.__qualname__
+
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if CONSULTAS_MODO == "off":
+                return funcion(*args, **kwargs)
+            with presupuesto_consultas(self.maximo, self.repeticiones, "advertir", nombre):
+                return funcion(*args, **kwargs)
+
+        # Permite a los tests consultar el presupuesto declarado
+        envoltura.presupuesto_consultas = self.maximo
+        return envoltura
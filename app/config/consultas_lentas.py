@@ -0,0 +1,203 @@
+"""
+Registro de consultas lentas
+Toda sentencia que supera CONSULTAS_LENTAS_UMBRAL_MS se registra con sus parámetros
+enmascarados (sin datos personales), la línea del controlador que la originó y,
+para los SELECT, su plan de ejecución (EXPLAIN) obtenido en una conexión aparte.
+
+Cada registro es una línea JSON en CONSULTAS_LENTAS_ARCHIVO (además del log), de
+modo que `python manage.py consultas-lentas` agrupa los de todos los workers.
+"""
+import os
+import re
+import json
+import time
+import logging
+import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import NullPool
+from app.config.consultas import sitio_de_llamada
+
+# Milisegundos a partir de los que una consulta es lenta (0 desactiva el registro)
+CONSULTAS_LENTAS_UMBRAL_MS = float(os.getenv("CONSULTAS_LENTAS_UMBRAL_MS", "500"))
+
+# Archivo JSONL con los registros (vacío: solo log)
+CONSULTAS_LENTAS_ARCHIVO = os.getenv("CONSULTAS_LENTAS_ARCHIVO", "logs/consultas_lentas.jsonl")
+
+# Segundos mínimos entre dos EXPLAIN de la misma sentencia normalizada
+CONSULTAS_LENTAS_INTERVALO_EXPLAIN = float(os.getenv("CONSULTAS_LENTAS_INTERVALO_EXPLAIN", "300"))
+
+logger = logging.getLogger("app.consultas_lentas")
+
+# Un solo hilo para EXPLAIN y escritura: no agrega latencia a la petición
+_trabajador = ThreadPoolExecutor(max_workers=1, thread_name_prefix="consultas-lentas")
+_archivo_lock = threading.Lock()
+_ultimo_explain: Dict[str, float] = {}
+_engine_explain: Optional[Engine] = None
+
+_RE_CADENA = re.compile(r"'(?:[^']|'')*'")
+_RE_NUMERO = re.compile(r"\b\d+(?:\.\d+)?\b")
+_RE_MARCADOR = re.compile(r"%\(\w+\)s|%s|(?<!:):\w+|\?")
+_RE_LISTA = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_RE_VALORES = re.compile(r"(VALUES\s*\(\?\.\.\.\))(?:\s*,\s*\(\?\.\.\.\))+", re.IGNORECASE)
+
+def normalizar_sentencia(sentencia: str) -> str:
+    """
+    Forma canónica de una sentencia para agrupar: sin literales, con un solo
+    marcador por lista IN/VALUES y espacios colapsados
+    """
+    texto = " ".join(sentencia.split())
+    texto = _RE_CADENA.sub("?", texto)
+    texto = _RE_NUMERO.sub("?", texto)
+    texto = _RE_MARCADOR.sub("?", texto)
+    texto = _RE_LISTA.sub("(?...)", texto)
+    texto = _RE_VALORES.sub(r"\1", texto)
+    return texto
+
+def _enmascarar_valor(valor: Any) -> Any:
+    """Conservar números (ids, límites) y ocultar textos y fechas, que pueden ser datos personales"""
+    if valor is None or isinstance(valor, (bool, int, float)):
+        return valor
+    if isinstance(valor, str):
+        return f"<texto:{len(valor)}>"
+    if isinstance(valor, (datetime.date, datetime.datetime)):
+        return "<fecha>"
+    return f"<{type(valor).__name__}>"
+
+def enmascarar_parametros(parametros: Any, executemany: bool = False) -> Any:
+    """Parámetros de una sentencia con los valores personales enmascarados"""
+    if executemany:
+        filas = list(parametros)
+        return {"filas": len(filas), "primera": enmascarar_parametros(filas[0]) if filas else None}
+    if isinstance(parametros, dict):
+        return {clave: _enmascarar_valor(valor) for clave, valor in parametros.items()}
+    if isinstance(parametros, (list, tuple)):
+        return [_enmascarar_valor(valor) for valor in parametros]
+    return _enmascarar_valor(parametros)
+
+def _obtener_engine_explain(url) -> Engine:
+    """Engine sin pool para EXPLAIN: no ocupa conexiones del pool de las peticiones"""
+    global _engine_explain
+    if _engine_explain is None:
+        _engine_explain = create_engine(url, poolclass=NullPool)
+    return _engine_explain
+
+def _explicar(url, dialecto: str, sentencia: str, parametros: Any) -> List[str]:
+    prefijo = "EXPLAIN QUERY PLAN " if dialecto == "sqlite" else "EXPLAIN "
+    with _obtener_engine_explain(url).connect() as conexion:
+        filas = conexion.exec_driver_sql(prefijo + sentencia, parametros).fetchall()
+    return [" | ".join("" if valor is None else str(valor) for valor in fila) for fila in filas]
+
+def _procesar(registro: dict, url, dialecto: str, sentencia: str, parametros: Any, explicar: bool) -> None:
+    """Obtener el plan (si corresponde) y escribir el registro; corre en el hilo de fondo"""
+    if explicar:
+        try:
+            registro["plan"] = _explicar(url, dialecto, sentencia, parametros)
+        except Exception as e:
+            registro["plan_error"] = str(e)[:300]
+
+    linea = json.dumps(registro, ensure_ascii=False, default=str)
+    logger.warning(linea)
+    if CONSULTAS_LENTAS_ARCHIVO:
+        try:
+            with _archivo_lock:
+                os.makedirs(os.path.dirname(CONSULTAS_LENTAS_ARCHIVO) or ".", exist_ok=True)
+                with open(CONSULTAS_LENTAS_ARCHIVO, "a", encoding="utf-8") as archivo:
+                    archivo.write(linea + "\n")
+        except OSError as e:
+            logger.error(f"No se pudo escribir {CONSULTAS_LENTAS_ARCHIVO}: {e}")
+
+def _debe_explicar(normalizada: str, executemany: bool) -> bool:
+    if executemany or not normalizada.lstrip("( ").upper().startswith(("SELECT", "WITH")):
+        return False
+    ahora = time.monotonic()
+    ultimo = _ultimo_explain.get(normalizada)
+    if ultimo is not None and ahora - ultimo < CONSULTAS_LENTAS_INTERVALO_EXPLAIN:
+        return False
+    _ultimo_explain[normalizada] = ahora
+    return True
+
+def registrar_consultas_lentas(engine: Engine) -> None:
+    """Registrar en el engine los eventos que detectan las consultas lentas"""
+    if CONSULTAS_LENTAS_UMBRAL_MS <= 0:
+        return
+    umbral = CONSULTAS_LENTAS_UMBRAL_MS / 1000
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _antes(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("inicio_consulta_lenta", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _despues(conn, cursor, statement, parameters, context, executemany):
+        duracion = time.perf_counter() - conn.info["inicio_consulta_lenta"].pop()
+        if duracion < umbral:
+            return
+
+        normalizada = normalizar_sentencia(statement)
+        registro = {
+            "evento": "consulta_lenta",
+            "fecha": datetime.datetime.now().isoformat(timespec="seconds"),
+            "duracion_ms": round(duracion * 1000, 1),
+            "sentencia": " ".join(statement.split())[:2000],
+            "normalizada": normalizada,
+            "parametros": enmascarar_parametros(parameters, executemany),
+            "origen": sitio_de_llamada(),
+            "pid": os.getpid(),
+        }
+        _trabajador.submit(
+            _procesar, registro, conn.engine.url, conn.dialect.name,
+            statement, parameters, _debe_explicar(normalizada, executemany)
+        )
+
+def leer_registros(ruta: str) -> Iterable[dict]:
+    """Registros de un archivo JSONL (se ignoran las líneas dañadas)"""
+    with open(ruta, encoding="utf-8") as archivo:
+        for linea in archivo:
+            try:
+                yield json.loads(linea)
+            except ValueError:
+                continue
+
+def agrupar_peores(registros: Iterable[dict], limite: int = 10, orden: str = "total") -> List[dict]:
+    """
+    Agrupar los registros por sentencia normalizada
+
+    Args:
+        registros: Registros de consultas lentas
+        limite: Cantidad de grupos a devolver
+        orden: 'total' (tiempo acumulado), 'maximo' o 'veces'
+
+    Returns:
+        Grupos con veces, total_ms, promedio_ms, maximo_ms, orígenes y el último plan
+    """
+    grupos: Dict[str, dict] = {}
+    for registro in registros:
+        grupo = grupos.setdefault(registro["normalizada"], {
+            "normalizada": registro["normalizada"],
+            "veces": 0,
+            "total_ms": 0.0,
+            "maximo_ms": 0.0,
+            "origenes": {},
+            "plan": None,
+        })
+        grupo["veces"] += 1
+        grupo["total_ms"] += registro["duracion_ms"]
+        grupo["maximo_ms"] = max(grupo["maximo_ms"], registro["duracion_ms"])
+        origen = registro.get("origen", "desconocido")
+        grupo["origenes"][origen] = grupo["origenes"].get(origen, 0) + 1
+        if registro.get("plan"):
+            grupo["plan"] = registro["plan"]
+
+    for grupo in grupos.values():
+        grupo["promedio_ms"] = round(grupo["total_ms"] / grupo["veces"], 1)
+        grupo["total_ms"] = round(grupo["total_ms"], 1)
+
+    clave = {"total": "total_ms", "maximo": "maximo_ms", "veces": "veces"}[orden]
+    return sorted(grupos.values(), key=lambda g: g[clave], reverse=True)[:limite]
+
+def esperar_pendientes(timeout: float = 10.0) -> None:
+    """Esperar los EXPLAIN y escrituras pendientes (al apagar la aplicación)"""
+    _trabajador.submit(lambda: None).result(timeout=timeout)
@@ -3,7 +3,10 @@ Configuración de la conexión a la base de datos MySQL
 usando SQLAlchemy y variables de entorno
 """
 import os
+import threading
+import time
 from sqlalchemy import create_engine
+from sqlalchemy.pool import QueuePool
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
@@ -19,13 +22,57 @@ DB_NAME = os.getenv("DB_NAME", "bienestar_estudiantil")
 DB_PORT = os.getenv("DB_PORT", "3306")
 
 # Construir URL de conexión para MySQL con pymysql
-DATABASE_URL = f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+# DATABASE_URL la reemplaza completa (ej: sqlite:///benchmarks/datos/escuela.db para benchmarks)
+DATABASE_URL = os.getenv("DATABASE_URL") or f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+
+# Tamaño del pool de conexiones
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+
+# Mostrar cada query SQL en consola (solo para depurar; los tiempos por petición
+# se registran con app.middlewares.tiempos_middleware)
+DB_ECHO = os.getenv("DB_ECHO", "0") == "1"
+
+# Espera promedio (EWMA) para obtener una conexión del pool, en segundos
+_espera_checkout = {"promedio": 0.0, "ultima": 0.0, "actualizado": 0.0}
+_espera_checkout_lock = threading.Lock()
+
+class PoolCronometrado(QueuePool):
+    """
+    Pool de conexiones que mide cuánto espera cada petición para obtener una conexión
+    """
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            espera = time.perf_counter() - inicio
+            with _espera_checkout_lock:
+                _espera_checkout["promedio"] = 0.8 * _espera_checkout["promedio"] + 0.2 * espera
+                _espera_checkout["ultima"] = espera
+                _espera_checkout["actualizado"] = time.monotonic()
+
+def espera_checkout_reciente(ventana: float = 10.0) -> float:
+    """
+    Espera promedio reciente para obtener una conexión del pool (0 si no hubo checkouts en la ventana)
+    """
+    with _espera_checkout_lock:
+        if time.monotonic() - _espera_checkout["actualizado"] > ventana:
+            return 0.0
+        return _espera_checkout["promedio"]
 
 # Crear motor de base de datos
 engine = create_engine(
     DATABASE_URL,
-    echo=True,  # Mostrar queries SQL en consola (útil para desarrollo)
-    pool_pre_ping=True  # Verificar conexión antes de usar
+    echo=DB_ECHO,
+    pool_pre_ping=True,  # Verificar conexión antes de usar
+    poolclass=PoolCronometrado,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    # SQLite: la conexión se usa desde los hilos del threadpool
+    connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
 )
 
 # Crear sesión local
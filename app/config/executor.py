@@ -0,0 +1,150 @@
+"""
+Configuración del pool de procesos para trabajo pesado de CPU
+(generación y lectura de libros Excel) fuera del threadpool de las peticiones
+"""
+import os
+import threading
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional, Tuple
+from fastapi import HTTPException, status
+from app.config.perfilado import perfil_actual
+
+# Procesos del pool. 0 ejecuta las tareas en el mismo hilo de la petición (útil en desarrollo)
+EXCEL_WORKERS = int(os.getenv("EXCEL_WORKERS", str(max(1, min(4, (os.cpu_count() or 2) // 2)))))
+
+# Tareas que pueden esperar turno además de las que ya se están ejecutando
+EXCEL_COLA_MAXIMA = int(os.getenv("EXCEL_COLA_MAXIMA", "8"))
+
+# Tareas que ejecuta cada proceso antes de ser reemplazado (limita el crecimiento de memoria)
+EXCEL_TAREAS_POR_PROCESO = int(os.getenv("EXCEL_TAREAS_POR_PROCESO", "50"))
+
+# Segundos máximos de espera por el resultado de una tarea
+EXCEL_TIMEOUT = float(os.getenv("EXCEL_TIMEOUT", "120"))
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+_cupos = threading.BoundedSemaphore(max(1, EXCEL_WORKERS) + EXCEL_COLA_MAXIMA)
+_en_curso = 0
+_en_curso_lock = threading.Lock()
+
+def _obtener_pool() -> ProcessPoolExecutor:
+    """Crear el pool de forma perezosa la primera vez que se usa"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=EXCEL_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                max_tasks_per_child=EXCEL_TAREAS_POR_PROCESO or None
+            )
+        return _pool
+
+def _descartar_pool(pool: ProcessPoolExecutor) -> None:
+    """
+    Descartar un pool roto (un proceso hijo murió, ej: por falta de memoria) para
+    que la próxima tarea cree uno nuevo en lugar de fallar hasta reiniciar el worker
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def _enviar(funcion: Callable, args: tuple) -> Tuple[ProcessPoolExecutor, Future]:
+    """Enviar la tarea al pool; si una tarea anterior lo dejó roto, se reemplaza una vez"""
+    pool = _obtener_pool()
+    try:
+        return pool, pool.submit(funcion, *args)
+    except BrokenProcessPool:
+        _descartar_pool(pool)
+        pool = _obtener_pool()
+        return pool, pool.submit(funcion, *args)
+
+def _liberar_cupo(_futuro: Optional[Future] = None) -> None:
+    """Devolver el cupo de una tarea terminada"""
+    global _en_curso
+    with _en_curso_lock:
+        _en_curso -= 1
+    _cupos.release()
+
+def ejecutar_en_pool(funcion: Callable, *args: Any) -> Any:
+    """
+    Ejecutar una función pura en el pool de procesos y esperar su resultado.
+    La función y sus argumentos deben poder serializarse (pickle).
+
+    Args:
+        funcion: Función de nivel de módulo a ejecutar
+        *args: Argumentos de la función
+
+    Returns:
+        Resultado de la función
+
+    Raises:
+        HTTPException: 503 si la cola del pool está llena o un proceso del pool murió,
+            504 si la tarea no termina en EXCEL_TIMEOUT segundos
+    """
+    global _en_curso
+
+    if not _cupos.acquire(blocking=False):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="El servidor está procesando demasiados archivos Excel. Intente nuevamente en unos segundos.",
+            headers={"Retry-After": "5"}
+        )
+
+    with _en_curso_lock:
+        _en_curso += 1
+
+    # Una petición perfilada ejecuta la tarea en su hilo para que el perfil la incluya
+    if EXCEL_WORKERS == 0 or perfil_actual() is not None:
+        try:
+            return funcion(*args)
+        finally:
+            _liberar_cupo()
+
+    try:
+        pool, futuro = _enviar(funcion, args)
+    except BrokenProcessPool:
+        _liberar_cupo()
+        raise _proceso_caido()
+    except BaseException:
+        _liberar_cupo()
+        raise
+
+    # El cupo se libera cuando la tarea termina, no cuando la petición deja de esperarla:
+    # una tarea vencida sigue ocupando un proceso del pool
+    futuro.add_done_callback(_liberar_cupo)
+    try:
+        return futuro.result(timeout=EXCEL_TIMEOUT)
+    except FuturesTimeoutError:
+        futuro.cancel()
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail=f"El procesamiento del archivo Excel superó los {EXCEL_TIMEOUT:g} segundos"
+        )
+    except BrokenProcessPool:
+        # No se reintenta: la tarea que mató al proceso (ej: un libro enorme) podría volver a hacerlo
+        _descartar_pool(pool)
+        raise _proceso_caido()
+
+def _proceso_caido() -> HTTPException:
+    """Error para una tarea cuyo proceso del pool murió"""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Un proceso de Excel terminó inesperadamente (por ejemplo, por falta de memoria). Intente nuevamente.",
+        headers={"Retry-After": "5"}
+    )
+
+def tareas_en_curso() -> int:
+    """Cantidad de tareas ejecutándose o esperando en el pool"""
+    return _en_curso
+
+def cerrar_pool() -> None:
+    """Cerrar el pool de procesos al apagar la aplicación"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
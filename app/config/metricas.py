@@ -0,0 +1,175 @@
+"""
+Métricas en formato Prometheus para el endpoint /metrics
+Latencia y códigos de estado por ruta, pool de conexiones, consultas por petición,
+aciertos de cachés, filas y duración de Excel y memoria del proceso.
+
+Con varios workers (gunicorn) definir PROMETHEUS_MULTIPROC_DIR con un directorio
+vacío: cada worker escribe sus valores ahí y /metrics devuelve el agregado.
+"""
+import os
+import sys
+import time
+import threading
+from contextlib import contextmanager
+from typing import Optional
+from app.config import database
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+)
+
+MULTIPROCESO = bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+
+# Segundos mínimos entre dos lecturas de la memoria del proceso
+_INTERVALO_MEMORIA = 5.0
+
+# Con un solo proceso se usa un registro propio (sin las métricas por defecto de la librería)
+registro = CollectorRegistry(auto_describe=True)
+_registro_metricas = None if MULTIPROCESO else registro
+
+PETICIONES = Counter(
+    "http_peticiones_total", "Peticiones HTTP atendidas",
+    ["metodo", "ruta", "status"], registry=_registro_metricas
+)
+DURACION_PETICION = Histogram(
+    "http_peticion_duracion_segundos", "Latencia de las peticiones hasta el inicio de la respuesta",
+    ["metodo", "ruta"], registry=_registro_metricas,
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+CONSULTAS_PETICION = Histogram(
+    "db_consultas_por_peticion", "Consultas SQL ejecutadas por petición",
+    ["ruta"], registry=_registro_metricas,
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250, 1000)
+)
+POOL_TAMANO = Gauge(
+    "db_pool_tamano", "Conexiones permanentes del pool",
+    registry=_registro_metricas, multiprocess_mode="livesum"
+)
+POOL_EN_USO = Gauge(
+    "db_pool_conexiones_en_uso", "Conexiones prestadas a peticiones",
+    registry=_registro_metricas, multiprocess_mode="livesum"
+)
+POOL_OVERFLOW = Gauge(
+    "db_pool_overflow", "Conexiones abiertas por encima del tamaño del pool",
+    registry=_registro_metricas, multiprocess_mode="livesum"
+)
+POOL_ESPERA = Gauge(
+    "db_pool_espera_checkout_segundos", "Espera promedio reciente para obtener una conexión",
+    registry=_registro_metricas, multiprocess_mode="livemax"
+)
+CACHE_CONSULTAS = Counter(
+    "cache_consultas_total", "Consultas a cachés de la aplicación por resultado (acierto/fallo)",
+    ["cache", "resultado"], registry=_registro_metricas
+)
+EXCEL_FILAS = Counter(
+    "excel_filas_total", "Filas de Excel exportadas o importadas",
+    ["operacion"], registry=_registro_metricas
+)
+EXCEL_DURACION = Histogram(
+    "excel_duracion_segundos", "Duración de las operaciones Excel",
+    ["operacion"], registry=_registro_metricas,
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+)
+MEMORIA_RSS = Gauge(
+    "proceso_memoria_rss_bytes", "Memoria residente del proceso",
+    registry=_registro_metricas, multiprocess_mode="liveall"
+)
+
+_ultima_memoria = 0.0
+_memoria_lock = threading.Lock()
+
+def memoria_rss_bytes() -> Optional[int]:
+    """Memoria residente actual del proceso (None si no se puede leer en esta plataforma)"""
+    try:
+        with open("/proc/self/statm") as archivo:
+            return int(archivo.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Sin /proc solo está disponible el máximo (KB en Linux, bytes en macOS)
+    maximo = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maximo if sys.platform == "darwin" else maximo * 1024
+
+def actualizar_pool() -> None:
+    """Leer el estado actual del pool de conexiones"""
+    pool = database.engine.pool
+    if hasattr(pool, "checkedout"):
+        POOL_TAMANO.set(pool.size())
+        POOL_EN_USO.set(pool.checkedout())
+        POOL_OVERFLOW.set(max(pool.overflow(), 0))
+    POOL_ESPERA.set(database.espera_checkout_reciente())
+
+def _actualizar_memoria(forzar: bool = False) -> None:
+    global _ultima_memoria
+    ahora = time.monotonic()
+    with _memoria_lock:
+        if not forzar and ahora - _ultima_memoria < _INTERVALO_MEMORIA:
+            return
+        _ultima_memoria = ahora
+    rss = memoria_rss_bytes()
+    if rss is not None:
+        MEMORIA_RSS.set(rss)
+
+def registrar_peticion(metodo: str, ruta: str, status: int, duracion: float, consultas: int) -> None:
+    """
+    Registrar una petición atendida
+
+    Args:
+        metodo: Método HTTP
+        ruta: Plantilla de la ruta (ej: /api/estudiantes/{id_estudiante}), no la URL concreta
+        status: Código de estado de la respuesta
+        duracion: Segundos hasta el inicio de la respuesta
+        consultas: Consultas SQL ejecutadas
+    """
+    PETICIONES.labels(metodo, ruta, str(status)).inc()
+    DURACION_PETICION.labels(metodo, ruta).observe(duracion)
+    CONSULTAS_PETICION.labels(ruta).observe(consultas)
+    if MULTIPROCESO:
+        # Cada worker publica su estado; en un solo proceso se lee al exportar
+        actualizar_pool()
+        _actualizar_memoria()
+
+def registrar_consulta_cache(cache: str, acierto: bool) -> None:
+    """Registrar un acierto o fallo de una caché de la aplicación"""
+    CACHE_CONSULTAS.labels(cache, "acierto" if acierto else "fallo").inc()
+
+@contextmanager
+def medir_excel(operacion: str):
+    """
+    Medir la duración y las filas de una operación Excel
+
+    Uso:
+        with medir_excel("exportar") as medicion:
+            ...
+            medicion["filas"] = len(filas)
+    """
+    medicion = {"filas": 0}
+    inicio = time.perf_counter()
+    try:
+        yield medicion
+    finally:
+        EXCEL_DURACION.labels(operacion).observe(time.perf_counter() - inicio)
+        EXCEL_FILAS.labels(operacion).inc(medicion["filas"])
+
+def exportar_metricas() -> bytes:
+    """Texto de todas las métricas en formato de exposición de Prometheus"""
+    actualizar_pool()
+    _actualizar_memoria(forzar=True)
+    if MULTIPROCESO:
+        from prometheus_client import multiprocess
+
+        registro_agregado = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registro_agregado)
+        return generate_latest(registro_agregado)
+    return generate_latest(registro)
+
+TIPO_CONTENIDO = CONTENT_TYPE_LATEST
+
+def marcar_worker_terminado(pid: int) -> None:
+    """Descartar los valores 'live' de un worker que terminó (hook child_exit de gunicorn)"""
+    if MULTIPROCESO:
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(pid)
@@ -0,0 +1,167 @@
+"""
+Perfilado bajo demanda de peticiones individuales
+Un muestreador de pilas registra, cada PERFILADO_INTERVALO_MS, la pila de los hilos
+que ejecutan el controlador de la petición; tracemalloc mide el pico de memoria y
+las líneas que más asignan. El resultado se guarda en PERFILADO_DIRECTORIO como:
+
+    <nombre>.folded  pilas colapsadas (flamegraph.pl, speedscope, inferno)
+    <nombre>.json    duración, muestras, memoria pico y principales asignaciones
+"""
+import os
+import sys
+import json
+import time
+import datetime
+import threading
+import tracemalloc
+import contextvars
+from collections import Counter
+from typing import Optional, Set
+
+# Permitir perfilar peticiones (desactivado por defecto)
+PERFILADO_HABILITADO = os.getenv("PERFILADO_HABILITADO", "0") == "1"
+
+# Token que debe enviarse en el header X-Perfilar o en el parámetro ?perfilar=
+PERFILADO_TOKEN = os.getenv("PERFILADO_TOKEN", "")
+
+PERFILADO_DIRECTORIO = os.getenv("PERFILADO_DIRECTORIO", "logs/perfiles")
+
+# Milisegundos entre muestras de la pila
+PERFILADO_INTERVALO_MS = float(os.getenv("PERFILADO_INTERVALO_MS", "5"))
+
+# Cuadros de pila que guarda tracemalloc por asignación (más cuadros, más costo)
+PERFILADO_CUADROS_MEMORIA = int(os.getenv("PERFILADO_CUADROS_MEMORIA", "1"))
+
+_RAIZ_PROYECTO = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_perfil_actual: contextvars.ContextVar[Optional["Perfil"]] = contextvars.ContextVar("perfil_actual", default=None)
+
+# tracemalloc y el muestreador son globales al proceso: un perfil a la vez
+_perfil_lock = threading.Lock()
+
+def perfil_actual() -> Optional["Perfil"]:
+    """Perfil de la petición en curso (None si no se está perfilando)"""
+    return _perfil_actual.get()
+
+def _nombre_cuadro(cuadro) -> str:
+    codigo = cuadro.f_code
+    archivo = codigo.co_filename
+    if archivo.startswith(_RAIZ_PROYECTO):
+        archivo = os.path.relpath(archivo, _RAIZ_PROYECTO)
+    else:
+        archivo = os.path.basename(archivo)
+    return f"{codigo.co_name} ({archivo}:{codigo.co_firstlineno})"
+
+class Perfil:
+    """
+    Perfil de una petición: muestreo de pilas y memoria
+
+    Los hilos a muestrear se agregan a `hilos` desde el hilo que ejecuta el
+    endpoint (ver RutaCronometrada en tiempos_middleware).
+    """
+    def __init__(self, nombre: str):
+        self.nombre = nombre
+        self.hilos: Set[int] = set()
+        self.muestras: Counter = Counter()
+        self.total_muestras = 0
+        self._detener = threading.Event()
+        self._muestreador = threading.Thread(target=self._muestrear, name="perfilado", daemon=True)
+        self._inicio = 0.0
+        self._duracion = 0.0
+        self._iniciado_tracemalloc = False
+        self._memoria = {}
+        self._token = None
+
+    @staticmethod
+    def intentar_iniciar(nombre: str) -> Optional["Perfil"]:
+        """Iniciar un perfil, o None si ya hay otro en curso en este proceso"""
+        if not _perfil_lock.acquire(blocking=False):
+            return None
+        perfil = Perfil(nombre)
+        perfil._iniciar()
+        return perfil
+
+    def _iniciar(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(PERFILADO_CUADROS_MEMORIA)
+            self._iniciado_tracemalloc = True
+        tracemalloc.reset_peak()
+        self._memoria_inicial = tracemalloc.get_traced_memory()[0]
+        self._token = _perfil_actual.set(self)
+        self._inicio = time.perf_counter()
+        self._muestreador.start()
+
+    def _muestrear(self) -> None:
+        intervalo = PERFILADO_INTERVALO_MS / 1000
+        while not self._detener.wait(intervalo):
+            cuadros = sys._current_frames()
+            for hilo in tuple(self.hilos):
+                cuadro = cuadros.get(hilo)
+                pila = []
+                while cuadro is not None:
+                    pila.append(_nombre_cuadro(cuadro))
+                    cuadro = cuadro.f_back
+                if pila:
+                    self.muestras[";".join(reversed(pila))] += 1
+                    self.total_muestras += 1
+
+    def detener(self) -> None:
+        """Detener el muestreo y la medición de memoria"""
+        try:
+            self._duracion = time.perf_counter() - self._inicio
+            self._detener.set()
+            self._muestreador.join()
+            _perfil_actual.reset(self._token)
+
+            actual, pico = tracemalloc.get_traced_memory()
+            instantanea = tracemalloc.take_snapshot().filter_traces((
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+            ))
+            self._memoria = {
+                "inicial_mb": round(self._memoria_inicial / 1024 / 1024, 2),
+                "final_mb": round(actual / 1024 / 1024, 2),
+                "pico_mb": round(pico / 1024 / 1024, 2),
+                "pico_sobre_inicial_mb": round((pico - self._memoria_inicial) / 1024 / 1024, 2),
+                "principales_asignaciones": [
+                    {
+                        "linea": str(estadistica.traceback[0]),
+                        "mb": round(estadistica.size / 1024 / 1024, 3),
+                        "bloques": estadistica.count,
+                    }
+                    for estadistica in instantanea.statistics("lineno")[:20]
+                ],
+            }
+        finally:
+            if self._iniciado_tracemalloc:
+                tracemalloc.stop()
+            _perfil_lock.release()
+
+    def guardar(self, extra: Optional[dict] = None) -> str:
+        """
+        Escribir el perfil en PERFILADO_DIRECTORIO
+
+        Returns:
+            Ruta base de los archivos (sin extensión)
+        """
+        os.makedirs(PERFILADO_DIRECTORIO, exist_ok=True)
+        base = os.path.join(PERFILADO_DIRECTORIO, self.nombre)
+
+        with open(base + ".folded", "w", encoding="utf-8") as archivo:
+            for pila, veces in self.muestras.most_common():
+                archivo.write(f"{pila} {veces}\n")
+
+        resumen = {
+            "nombre": self.nombre,
+            "fecha": datetime.datetime.now().isoformat(timespec="seconds"),
+            "duracion_ms": round(self._duracion * 1000, 1),
+            "intervalo_ms": PERFILADO_INTERVALO_MS,
+            "muestras": self.total_muestras,
+            "memoria": self._memoria,
+            **(extra or {}),
+        }
+        with open(base + ".json", "w", encoding="utf-8") as archivo:
+            json.dump(resumen, archivo, ensure_ascii=False, indent=2)
+        return base
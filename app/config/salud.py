@@ -0,0 +1,133 @@
+"""
+Verificaciones de salud para el balanceador de carga
+Las verificaciones corren en paralelo con timeout y el resultado se guarda durante
+SALUD_CACHE_SEGUNDOS, así los sondeos frecuentes no agregan carga a la base de datos.
+
+Estados: 'ok', 'degradado' (responde, pero lento) y 'error' (no debe recibir tráfico)
+"""
+import os
+import time
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from typing import Callable, Dict, Tuple
+from sqlalchemy import text
+from app.config import database
+from app.config.executor import EXCEL_WORKERS, EXCEL_COLA_MAXIMA, tareas_en_curso
+
+# Segundos que se reutiliza el resultado de las verificaciones
+SALUD_CACHE_SEGUNDOS = float(os.getenv("SALUD_CACHE_SEGUNDOS", "2"))
+
+# Timeout de cada verificación (segundos)
+SALUD_TIMEOUT = float(os.getenv("SALUD_TIMEOUT", "1"))
+
+# Latencia de SELECT 1 a partir de la cual la base de datos se reporta degradada
+SALUD_LATENCIA_DB_MAX_MS = float(os.getenv("SALUD_LATENCIA_DB_MAX_MS", "200"))
+
+# Fracción de conexiones en uso (pool + overflow) a partir de la que el worker no está listo
+SALUD_USO_POOL_MAX = float(os.getenv("SALUD_USO_POOL_MAX", "0.9"))
+
+# Espera promedio reciente del pool (segundos) a partir de la que el worker no está listo
+SALUD_ESPERA_POOL_MAX = float(os.getenv("SALUD_ESPERA_POOL_MAX", "0.5"))
+
+Resultado = Tuple[str, dict]
+
+_hilos = ThreadPoolExecutor(max_workers=4, thread_name_prefix="salud")
+_lock = threading.Lock()
+_cache: Dict[str, object] = {"resultado": None, "hasta": 0.0}
+_en_curso: Dict[str, Future] = {}
+
+def verificar_db() -> Resultado:
+    """Ida y vuelta a la base de datos con SELECT 1"""
+    inicio = time.perf_counter()
+    with database.engine.connect() as conexion:
+        conexion.execute(text("SELECT 1"))
+    latencia = (time.perf_counter() - inicio) * 1000
+    estado = "ok" if latencia <= SALUD_LATENCIA_DB_MAX_MS else "degradado"
+    return estado, {"latencia_ms": round(latencia, 1)}
+
+def verificar_pool() -> Resultado:
+    """Conexiones en uso y espera reciente para obtener una conexión"""
+    pool = database.engine.pool
+    espera = database.espera_checkout_reciente()
+    detalle = {"espera_checkout_ms": round(espera * 1000, 1)}
+    if hasattr(pool, "checkedout"):
+        limite = pool.size() + max(database.DB_MAX_OVERFLOW, 0)
+        detalle.update({"en_uso": pool.checkedout(), "limite": limite})
+        if pool.checkedout() >= limite * SALUD_USO_POOL_MAX:
+            return "error", detalle
+    if espera > SALUD_ESPERA_POOL_MAX:
+        return "error", detalle
+    return "ok", detalle
+
+def verificar_excel() -> Resultado:
+    """Tareas en el pool de procesos de Excel frente a su capacidad"""
+    capacidad = max(1, EXCEL_WORKERS) + EXCEL_COLA_MAXIMA
+    en_curso = tareas_en_curso()
+    estado = "ok" if en_curso < capacidad else "degradado"
+    return estado, {"en_curso": en_curso, "capacidad": capacidad}
+
+# Verificaciones de preparación; otros módulos (ej: cachés) agregan las suyas
+VERIFICACIONES: Dict[str, Callable[[], Resultado]] = {
+    "base_de_datos": verificar_db,
+    "pool_conexiones": verificar_pool,
+    "excel": verificar_excel,
+}
+
+def registrar_verificacion(nombre: str, funcion: Callable[[], Resultado]) -> None:
+    """Agregar una verificación de preparación (debe devolver (estado, detalle))"""
+    VERIFICACIONES[nombre] = funcion
+
+def _lanzar(nombre: str, funcion: Callable[[], Resultado]) -> Future:
+    """
+    Lanzar una verificación en segundo plano. Si la anterior sigue colgada (ej: una
+    conexión sin respuesta), se reutiliza en lugar de acumular hilos bloqueados.
+    """
+    futuro = _en_curso.get(nombre)
+    if futuro is None or futuro.done():
+        futuro = _hilos.submit(funcion)
+        _en_curso[nombre] = futuro
+    return futuro
+
+def _esperar(futuro: Future, limite: float) -> dict:
+    """Resultado de una verificación, o error si no termina antes del límite"""
+    try:
+        estado, detalle = futuro.result(timeout=max(limite - time.monotonic(), 0))
+    except FuturesTimeoutError:
+        estado, detalle = "error", {"detalle": f"Sin respuesta en {SALUD_TIMEOUT:g} s"}
+    except Exception as e:
+        estado, detalle = "error", {"detalle": str(e)[:200]}
+    return {"estado": estado, **detalle}
+
+def estado_preparacion(forzar: bool = False) -> dict:
+    """
+    Resultado de todas las verificaciones de preparación (cacheado)
+
+    Returns:
+        Diccionario con 'listo', 'estado' general y el detalle de cada verificación
+    """
+    ahora = time.monotonic()
+    with _lock:
+        if not forzar and _cache["resultado"] is not None and ahora < _cache["hasta"]:
+            return _cache["resultado"]
+
+        # Todas las verificaciones corren en paralelo con el mismo límite
+        limite = time.monotonic() + SALUD_TIMEOUT
+        futuros = {nombre: _lanzar(nombre, funcion) for nombre, funcion in VERIFICACIONES.items()}
+        verificaciones = {nombre: _esperar(futuro, limite) for nombre, futuro in futuros.items()}
+        estados = {v["estado"] for v in verificaciones.values()}
+        general = "error" if "error" in estados else "degradado" if "degradado" in estados else "ok"
+        resultado = {
+            "listo": general != "error",
+            "estado": general,
+            "pid": os.getpid(),
+            "verificaciones": verificaciones,
+        }
+        _cache["resultado"] = resultado
+        _cache["hasta"] = time.monotonic() + SALUD_CACHE_SEGUNDOS
+        return resultado
+
+_inicio_proceso = time.monotonic()
+
+def estado_vida() -> dict:
+    """Estado de vida del proceso: no toca dependencias"""
+    return {"status": "ok", "pid": os.getpid(), "activo_segundos": round(time.monotonic() - _inicio_proceso)}
@@ -0,0 +1,131 @@
+"""
+Configuración del servidor para producción
+Varios workers, uvloop/httptools, precarga de la app, reciclaje de workers y apagado ordenado
+"""
+import os
+import sys
+
+SERVIDOR_HOST = os.getenv("SERVIDOR_HOST", "0.0.0.0")
+SERVIDOR_PUERTO = int(os.getenv("SERVIDOR_PUERTO", "8000"))
+
+# Workers (procesos). Por defecto: un worker por núcleo
+SERVIDOR_WORKERS = int(os.getenv("SERVIDOR_WORKERS", str(os.cpu_count() or 1)))
+
+# Reciclar cada worker tras N peticiones (con variación aleatoria) para acotar la memoria de pandas/openpyxl
+SERVIDOR_MAX_PETICIONES = int(os.getenv("SERVIDOR_MAX_PETICIONES", "1000"))
+SERVIDOR_MAX_PETICIONES_VARIACION = int(os.getenv("SERVIDOR_MAX_PETICIONES_VARIACION", "100"))
+
+# Segundos que se mantiene abierta una conexión keep-alive inactiva
+SERVIDOR_KEEPALIVE = int(os.getenv("SERVIDOR_KEEPALIVE", "5"))
+
+# Segundos para terminar las peticiones en curso (ej: exportaciones) al apagar o reciclar
+SERVIDOR_TIMEOUT_APAGADO = int(os.getenv("SERVIDOR_TIMEOUT_APAGADO", "60"))
+
+# Segundos sin respuesta tras los que gunicorn reinicia un worker
+SERVIDOR_TIMEOUT_WORKER = int(os.getenv("SERVIDOR_TIMEOUT_WORKER", "180"))
+
+APP = "app.main:app"
+
+def _loop_y_parser() -> tuple:
+    """uvloop y httptools si están instalados (no existen en Windows)"""
+    try:
+        import uvloop  # noqa: F401
+        loop = "uvloop"
+    except ImportError:
+        loop = "asyncio"
+    try:
+        import httptools  # noqa: F401
+        http = "httptools"
+    except ImportError:
+        http = "h11"
+    return loop, http
+
+def iniciar_desarrollo() -> None:
+    """Servidor de desarrollo: un proceso con recarga automática"""
+    import uvicorn
+
+    uvicorn.run(APP, host=SERVIDOR_HOST, port=SERVIDOR_PUERTO, reload=True, log_level="info")
+
+def iniciar_produccion() -> None:
+    """
+    Servidor de producción. Usa gunicorn con workers uvicorn cuando está disponible
+    (Linux/macOS), lo que permite precargar la app antes del fork. En Windows usa
+    el gestor de procesos de uvicorn.
+    """
+    try:
+        if sys.platform == "win32":
+            raise ImportError
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        _iniciar_uvicorn_workers()
+        return
+
+    class _Aplicacion(BaseApplication):
+        def load_config(self):
+            opciones = {
+                "bind": f"{SERVIDOR_HOST}:{SERVIDOR_PUERTO}",
+                "workers": SERVIDOR_WORKERS,
+                "worker_class": "app.config.servidor.WorkerProduccion",
+                "preload_app": True,
+                "max_requests": SERVIDOR_MAX_PETICIONES,
+                "max_requests_jitter": SERVIDOR_MAX_PETICIONES_VARIACION,
+                "keepalive": SERVIDOR_KEEPALIVE,
+                "graceful_timeout": SERVIDOR_TIMEOUT_APAGADO,
+                "timeout": SERVIDOR_TIMEOUT_WORKER,
+                "post_fork": _despues_del_fork,
+                "child_exit": _al_terminar_worker,
+                "accesslog": "-",
+            }
+            for clave, valor in opciones.items():
+                self.cfg.set(clave, valor)
+
+        def load(self):
+            from app.main import app
+            return app
+
+    _Aplicacion().run()
+
+def _iniciar_uvicorn_workers() -> None:
+    """Varios workers con el gestor de procesos de uvicorn (sin precarga)"""
+    import uvicorn
+
+    loop, http = _loop_y_parser()
+    uvicorn.run(
+        APP,
+        host=SERVIDOR_HOST,
+        port=SERVIDOR_PUERTO,
+        workers=SERVIDOR_WORKERS,
+        loop=loop,
+        http=http,
+        limit_max_requests=SERVIDOR_MAX_PETICIONES,
+        timeout_keep_alive=SERVIDOR_KEEPALIVE,
+        timeout_graceful_shutdown=SERVIDOR_TIMEOUT_APAGADO,
+        log_level="info"
+    )
+
+def _despues_del_fork(server, worker) -> None:
+    """Descartar las conexiones heredadas del proceso maestro (la app se precarga antes del fork)"""
+    from app.config.database import engine
+
+    engine.dispose(close=False)
+
+def _al_terminar_worker(server, worker) -> None:
+    """Descartar las métricas en vivo del worker que terminó (PROMETHEUS_MULTIPROC_DIR)"""
+    from app.config.metricas import marcar_worker_terminado
+
+    marcar_worker_terminado(worker.pid)
+
+try:
+    from uvicorn_worker import UvicornWorker
+
+    class WorkerProduccion(UvicornWorker):
+        """Worker de gunicorn con uvloop, httptools y keep-alive configurado"""
+        CONFIG_KWARGS = {
+            "loop": _loop_y_parser()[0],
+            "http": _loop_y_parser()[1],
+            "timeout_keep_alive": SERVIDOR_KEEPALIVE,
+            "timeout_graceful_shutdown": SERVIDOR_TIMEOUT_APAGADO,
+        }
+except ImportError:
+    # uvicorn-worker requiere gunicorn, que no está disponible en Windows
+    pass
@@ -0,0 +1,278 @@
+"""
+Controlador para archivar las gestiones cerradas
+Los cursos y las inscripciones de una gestión archivada pasan a cursos_archivo y
+estudiantes_cursos_archivo, así las tablas de uso diario solo tienen las gestiones
+vigentes. Las lecturas históricas eligen la tabla según la gestión (fuentes()).
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import select, insert, delete, union_all, func
+from sqlalchemy.sql import FromClause
+from fastapi import HTTPException, status
+from typing import Iterable, Optional, Set, Tuple
+from app.models.estudiante_model import estudiantes_cursos
+from app.models.curso_model import Curso
+from app.models.gestion_model import Gestion
+from app.models.lista_espera_model import lista_espera
+from app.models.archivo_model import CursoArchivado, estudiantes_cursos_archivo
+from app.controllers.contador_curso_controller import ContadorCursoController
+from app.config.cache import invalidar_caches
+
+cursos = Curso.__table__
+cursos_archivo = CursoArchivado.__table__
+
+# Columnas que se copian entre cursos y cursos_archivo
+COLUMNAS_CURSO = [
+    'id_curso', 'nombre_curso', 'nivel', 'gestion', 'capacidad',
+    'cantidad_estudiantes', 'cantidad_activos', 'cantidad_abandonos', 'cantidad_retirados', 'version'
+]
+
+def _verificar_ids_libres(db: Session, gestion: str, origen_cursos, destino_cursos) -> None:
+    """
+    Rechazar el movimiento si algún curso de la gestión ya tiene su ID ocupado en la
+    tabla destino. Pasa si la base reutilizó el ID de un curso archivado para un curso
+    nuevo: SQLite sin AUTOINCREMENT toma max(id) + 1 y MySQL anterior a 8.0 recalcula
+    el contador al reiniciar. (Al restaurar, InnoDB sube el contador por encima de los
+    IDs insertados, así que los cursos nuevos no chocan con los restaurados.)
+
+    Raises:
+        HTTPException: 409 con los IDs en conflicto
+    """
+    ocupados = db.execute(
+        select(destino_cursos.c.id_curso)
+        .where(destino_cursos.c.id_curso.in_(
+            select(origen_cursos.c.id_curso).where(origen_cursos.c.gestion == gestion)
+        ))
+        .order_by(destino_cursos.c.id_curso)
+    ).scalars().all()
+    if ocupados:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=(
+                f"No se puede mover la gestión {gestion}: los cursos con ID "
+                f"{', '.join(str(id_curso) for id_curso in ocupados)} ya existen en {destino_cursos.name}. "
+                "Cambie o elimine esos cursos e intente nuevamente."
+            )
+        )
+
+def _mover(db: Session, gestion: str, origen_cursos, origen_inscripciones, destino_cursos, destino_inscripciones) -> Tuple[int, int]:
+    """Copiar los cursos de la gestión y sus inscripciones a las tablas destino y borrarlos del origen"""
+    ids = select(origen_cursos.c.id_curso).where(origen_cursos.c.gestion == gestion)
+
+    movidos = db.execute(
+        insert(destino_cursos).from_select(
+            COLUMNAS_CURSO,
+            select(*[origen_cursos.c[columna] for columna in COLUMNAS_CURSO]).where(origen_cursos.c.gestion == gestion)
+        )
+    ).rowcount
+    inscripciones = db.execute(
+        insert(destino_inscripciones).from_select(
+            ['id_estudiante', 'id_curso'],
+            select(origen_inscripciones.c.id_estudiante, origen_inscripciones.c.id_curso)
+            .where(origen_inscripciones.c.id_curso.in_(ids))
+        )
+    ).rowcount
+
+    db.execute(delete(origen_inscripciones).where(origen_inscripciones.c.id_curso.in_(ids)))
+    db.execute(delete(origen_cursos).where(origen_cursos.c.gestion == gestion))
+    return max(movidos, 0), max(inscripciones, 0)
+
+class ArchivoController:
+    """
+    Controlador para mover gestiones entre las tablas vigentes y las de archivo
+    y para elegir de qué tablas leer una gestión
+    """
+
+    @staticmethod
+    def archivadas(db: Session, gestiones: Iterable[str]) -> Set[str]:
+        """
+        Gestiones archivadas entre las dadas (lectura por clave primaria del catálogo)
+
+        Args:
+            db: Sesión de base de datos
+            gestiones: Gestiones a consultar
+
+        Returns:
+            Conjunto con las que están archivadas
+        """
+        gestiones = set(gestiones)
+        if not gestiones:
+            return set()
+        return set(db.execute(
+            select(Gestion.gestion).where(Gestion.gestion.in_(gestiones), Gestion.archivada.is_(True))
+        ).scalars())
+
+    @staticmethod
+    def esta_archivada(db: Session, gestion: str) -> bool:
+        """Si la gestión está en las tablas de archivo"""
+        return bool(ArchivoController.archivadas(db, [gestion]))
+
+    @staticmethod
+    def fuentes(db: Session, gestiones: Optional[Iterable[str]] = None) -> Tuple[FromClause, FromClause]:
+        """
+        Tablas de cursos e inscripciones de las que se leen las gestiones dadas.
+        Si todas son vigentes (lo habitual) son cursos y estudiantes_cursos; si todas
+        están archivadas, las de archivo; si se mezclan (o sin gestiones: todo el
+        historial), la unión de ambas. Las columnas se llaman igual en los tres casos.
+
+        Args:
+            db: Sesión de base de datos
+            gestiones: Gestiones que se van a leer (None: todas)
+
+        Returns:
+            Tupla (cursos, inscripciones)
+        """
+        if gestiones is not None:
+            gestiones = set(gestiones)
+            archivadas = ArchivoController.archivadas(db, gestiones)
+            if not archivadas:
+                return cursos, estudiantes_cursos
+            if archivadas == gestiones:
+                return cursos_archivo, estudiantes_cursos_archivo
+        elif not db.execute(select(Gestion.gestion).where(Gestion.archivada.is_(True)).limit(1)).first():
+            return cursos, estudiantes_cursos
+
+        todos_cursos = union_all(
+            select(*[cursos.c[columna] for columna in COLUMNAS_CURSO]),
+            select(*[cursos_archivo.c[columna] for columna in COLUMNAS_CURSO])
+        ).subquery("cursos_historial")
+        todas_inscripciones = union_all(
+            select(estudiantes_cursos.c.id_estudiante, estudiantes_cursos.c.id_curso),
+            select(estudiantes_cursos_archivo.c.id_estudiante, estudiantes_cursos_archivo.c.id_curso)
+        ).subquery("inscripciones_historial")
+        return todos_cursos, todas_inscripciones
+
+    @staticmethod
+    def archivar(db: Session, gestion: str) -> dict:
+        """
+        Mover los cursos de una gestión cerrada y sus inscripciones a las tablas de archivo.
+        Las listas de espera de esos cursos se descartan; el índice estudiantes_gestiones
+        se conserva, así la matriz de cohortes sigue incluyendo la gestión.
+
+        Args:
+            db: Sesión de base de datos
+            gestion: Gestión a archivar
+
+        Returns:
+            Diccionario con la cantidad de cursos e inscripciones archivados
+
+        Raises:
+            HTTPException: Si la gestión no existe (404), no está cerrada, es la actual o ya está archivada (400)
+                o si el ID de alguno de sus cursos ya está en cursos_archivo (409)
+        """
+        registro = ArchivoController._obtener_gestion(db, gestion)
+        if registro.archivada:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"La gestión {gestion} ya está archivada"
+            )
+        if registro.actual or not registro.cerrada:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Solo se archivan gestiones cerradas que no sean la actual; cierre la gestión {gestion} primero"
+            )
+
+        _verificar_ids_libres(db, gestion, cursos, cursos_archivo)
+
+        try:
+            db.execute(
+                delete(lista_espera).where(
+                    lista_espera.c.id_curso.in_(select(cursos.c.id_curso).where(cursos.c.gestion == gestion))
+                )
+            )
+            movidos, inscripciones = _mover(
+                db, gestion, cursos, estudiantes_cursos, cursos_archivo, estudiantes_cursos_archivo
+            )
+            registro.archivada = True
+            db.commit()
+            invalidar_caches()
+        except Exception as e:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error al archivar la gestión: {str(e)}"
+            )
+
+        return {
+            "mensaje": f"Gestión {gestion} archivada",
+            "gestion": gestion,
+            "cursos": movidos,
+            "inscripciones": inscripciones
+        }
+
+    @staticmethod
+    def restaurar(db: Session, gestion: str) -> dict:
+        """
+        Devolver una gestión archivada a las tablas vigentes (por ejemplo, para corregirla).
+        Los contadores de sus cursos se recalculan, porque los estudiantes pudieron
+        cambiar de estado mientras estaba archivada.
+
+        Args:
+            db: Sesión de base de datos
+            gestion: Gestión a restaurar
+
+        Returns:
+            Diccionario con la cantidad de cursos e inscripciones restaurados
+
+        Raises:
+            HTTPException: Si la gestión no existe (404), no está archivada (400) o si el ID
+                de alguno de sus cursos lo tiene ahora un curso vigente (409)
+        """
+        registro = ArchivoController._obtener_gestion(db, gestion)
+        if not registro.archivada:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"La gestión {gestion} no está archivada"
+            )
+
+        _verificar_ids_libres(db, gestion, cursos_archivo, cursos)
+
+        try:
+            movidos, inscripciones = _mover(
+                db, gestion, cursos_archivo, estudiantes_cursos_archivo, cursos, estudiantes_cursos
+            )
+            ContadorCursoController.recalcular(db, gestion=gestion)
+            registro.archivada = False
+            db.commit()
+            invalidar_caches()
+        except Exception as e:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error al restaurar la gestión: {str(e)}"
+            )
+
+        return {
+            "mensaje": f"Gestión {gestion} restaurada",
+            "gestion": gestion,
+            "cursos": movidos,
+            "inscripciones": inscripciones
+        }
+
+    @staticmethod
+    def contar(db: Session) -> dict:
+        """
+        Filas en las tablas vigentes y en las de archivo
+
+        Returns:
+            Diccionario con la cantidad de cursos e inscripciones de cada lado
+        """
+        def filas(tabla) -> int:
+            return db.execute(select(func.count()).select_from(tabla)).scalar()
+
+        return {
+            "cursos": filas(cursos),
+            "inscripciones": filas(estudiantes_cursos),
+            "cursos_archivados": filas(cursos_archivo),
+            "inscripciones_archivadas": filas(estudiantes_cursos_archivo),
+        }
+
+    @staticmethod
+    def _obtener_gestion(db: Session, gestion: str) -> Gestion:
+        """Leer la gestión del catálogo por clave primaria"""
+        registro = db.get(Gestion, gestion)
+        if not registro:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Gestión {gestion} no encontrada"
+            )
+        return registro
@@ -0,0 +1,219 @@
+"""
+Controlador para los reportes de retención por cohortes
+El historial de inscripciones se trae en una sola consulta como columnas y los
+conteos se calculan con operaciones vectorizadas de pandas (sin recorrer estudiantes).
+Los reportes se guardan en caché por par de gestiones; cualquier escritura, en
+cualquier worker, los invalida (generación compartida de app/config/cache.py).
+"""
+from datetime import datetime
+from sqlalchemy.orm import Session
+from sqlalchemy import select
+from fastapi import HTTPException, status
+from typing import Optional
+from app.config.cache import crear_cache, COHORTES_CACHE_SEGUNDOS
+from app.models.estudiante_model import Estudiante
+from app.models.estudiante_gestion_model import estudiantes_gestiones
+from app.controllers.promocion_controller import ORDEN_NIVELES
+from app.controllers.archivo_controller import ArchivoController
+
+cache_cohortes = crear_cache("cohortes", COHORTES_CACHE_SEGUNDOS)
+
+# Categorías de cada estudiante de la cohorte (columnas de TasasCohorte)
+CATEGORIAS = ["retenidos", "inscritos_no_activos", "abandonos", "retiros", "sin_reinscripcion"]
+
+def _tasas(conteos: dict) -> dict:
+    """Completar un conteo por categoría con el total de la cohorte y las tasas"""
+    cohorte = sum(conteos.get(c, 0) for c in CATEGORIAS)
+    resultado = {c: int(conteos.get(c, 0)) for c in CATEGORIAS}
+
+    def tasa(valor):
+        return round(valor / cohorte, 4) if cohorte else 0.0
+
+    return {
+        "cohorte": int(cohorte),
+        **resultado,
+        "tasa_retencion": tasa(resultado["retenidos"]),
+        "tasa_abandono": tasa(resultado["abandonos"]),
+        "tasa_retiro": tasa(resultado["retiros"]),
+    }
+
+def gestion_siguiente(gestion: str) -> str:
+    """Gestión inmediatamente posterior (las gestiones son años)"""
+    if not gestion.isdigit():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"La gestión '{gestion}' no es un año; indique gestion_destino"
+        )
+    return str(int(gestion) + 1)
+
+class CohorteController:
+    """
+    Controlador para la retención de estudiantes entre gestiones
+    """
+
+    @staticmethod
+    def obtener_reporte(db: Session, gestion_origen: str, gestion_destino: Optional[str] = None) -> dict:
+        """
+        Reporte de retención de la cohorte de una gestión en la siguiente (desde la caché si está vigente)
+
+        Args:
+            db: Sesión de base de datos
+            gestion_origen: Gestión de la cohorte
+            gestion_destino: Gestión en la que se mide la retención (por defecto: la siguiente)
+
+        Returns:
+            Diccionario con el resumen, el detalle por nivel y por curso y las transiciones entre niveles
+
+        Raises:
+            HTTPException: Si la gestión origen no tiene estudiantes inscritos
+        """
+        gestion_destino = gestion_destino or gestion_siguiente(gestion_origen)
+        return cache_cohortes.obtener(
+            ("reporte", gestion_origen, gestion_destino),
+            lambda: CohorteController.calcular_reporte(db, gestion_origen, gestion_destino)
+        )
+
+    @staticmethod
+    def calcular_reporte(db: Session, gestion_origen: str, gestion_destino: str) -> dict:
+        """
+        Calcular el reporte de retención entre dos gestiones, sin pasar por la caché
+
+        Cada estudiante de la cohorte cae en una categoría: retenido (inscrito en la
+        destino y Activo), inscrito no activo, abandono, retiro o sin reinscripción
+        (Activo pero todavía sin curso en la destino). Si el estudiante tiene varios
+        cursos en una gestión, se toma el de menor ID. Las gestiones archivadas se
+        leen de las tablas de archivo.
+        """
+        import numpy as np
+        import pandas as pd
+
+        cursos, inscripciones = ArchivoController.fuentes(db, [gestion_origen, gestion_destino])
+        consulta = (
+            select(
+                inscripciones.c.id_estudiante,
+                cursos.c.id_curso,
+                cursos.c.nombre_curso,
+                cursos.c.nivel,
+                cursos.c.gestion,
+                Estudiante.estado_estudiante,
+            )
+            .select_from(inscripciones)
+            .join(cursos, cursos.c.id_curso == inscripciones.c.id_curso)
+            .join(Estudiante, Estudiante.id_estudiante == inscripciones.c.id_estudiante)
+            .where(cursos.c.gestion.in_([gestion_origen, gestion_destino]))
+        )
+        resultado = db.execute(consulta)
+        historial = pd.DataFrame(resultado.fetchall(), columns=list(resultado.keys()))
+
+        historial = historial.sort_values(["id_estudiante", "id_curso"])
+        origen = historial[historial["gestion"] == gestion_origen].drop_duplicates("id_estudiante")
+        if origen.empty:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"No hay estudiantes inscritos en la gestión {gestion_origen}"
+            )
+        destino = (
+            historial.loc[historial["gestion"] == gestion_destino, ["id_estudiante", "nivel"]]
+            .drop_duplicates("id_estudiante")
+            .rename(columns={"nivel": "nivel_destino"})
+        )
+
+        cohorte = origen.merge(destino, on="id_estudiante", how="left")
+        reinscrito = cohorte["nivel_destino"].notna()
+        estado = cohorte["estado_estudiante"]
+        cohorte["categoria"] = np.select(
+            [reinscrito & (estado == "Activo"), reinscrito, estado == "Abandono", estado == "Retirado"],
+            ["retenidos", "inscritos_no_activos", "abandonos", "retiros"],
+            default="sin_reinscripcion"
+        )
+
+        # Conteos por categoría: una tabla cruzada por cada agrupación
+        por_nivel = pd.crosstab(cohorte["nivel"], cohorte["categoria"])
+        por_curso = pd.crosstab(
+            [cohorte["id_curso"], cohorte["nombre_curso"], cohorte["nivel"]],
+            cohorte["categoria"]
+        )
+        transiciones = pd.crosstab(cohorte["nivel"], cohorte["nivel_destino"].fillna(""))
+
+        return {
+            "gestion_origen": gestion_origen,
+            "gestion_destino": gestion_destino,
+            "generado": datetime.now(),
+            "resumen": _tasas(cohorte["categoria"].value_counts().to_dict()),
+            "por_nivel": sorted(
+                [{"nivel": nivel, **_tasas(fila.to_dict())} for nivel, fila in por_nivel.iterrows()],
+                key=lambda n: ORDEN_NIVELES.get(n["nivel"], 99)
+            ),
+            "por_curso": sorted(
+                [
+                    {"id_curso": int(id_curso), "nombre_curso": nombre, "nivel": nivel, **_tasas(fila.to_dict())}
+                    for (id_curso, nombre, nivel), fila in por_curso.iterrows()
+                ],
+                key=lambda c: (ORDEN_NIVELES.get(c["nivel"], 99), c["nombre_curso"], c["id_curso"])
+            ),
+            "transiciones": [
+                {"nivel_origen": nivel_origen, "nivel_destino": nivel_destino or None, "estudiantes": int(cantidad)}
+                for (nivel_origen, nivel_destino), cantidad in transiciones.stack().items()
+                if cantidad
+            ],
+        }
+
+    @staticmethod
+    def obtener_matriz(db: Session, maximo_desplazamiento: int = 6) -> dict:
+        """
+        Matriz de retención de todas las gestiones (desde la caché si está vigente)
+
+        Args:
+            db: Sesión de base de datos
+            maximo_desplazamiento: Cantidad de gestiones posteriores a medir por cohorte
+
+        Returns:
+            Diccionario con una fila por gestión: estudiantes de la cohorte e inscritos k gestiones después
+        """
+        return cache_cohortes.obtener(
+            ("matriz", maximo_desplazamiento),
+            lambda: CohorteController.calcular_matriz(db, maximo_desplazamiento)
+        )
+
+    @staticmethod
+    def calcular_matriz(db: Session, maximo_desplazamiento: int = 6) -> dict:
+        """
+        Calcular la matriz de retención desde el índice estudiantes_gestiones, sin pasar por la caché.
+        Para cada desplazamiento k, se busca el par (estudiante, gestión + k) en el índice
+        de pares (estudiante, gestión) con una sola operación vectorizada.
+        """
+        import pandas as pd
+
+        resultado = db.execute(select(estudiantes_gestiones.c.id_estudiante, estudiantes_gestiones.c.gestion))
+        pares = pd.DataFrame(resultado.fetchall(), columns=["id_estudiante", "gestion"])
+        # Las gestiones que no son años no tienen una "siguiente"
+        pares["anio"] = pd.to_numeric(pares["gestion"], errors="coerce")
+        pares = pares.dropna(subset=["anio"]).astype({"anio": "int64"})
+
+        desplazamientos = list(range(maximo_desplazamiento + 1))
+        if pares.empty:
+            return {"generado": datetime.now(), "desplazamientos": desplazamientos, "filas": []}
+
+        indice = pd.MultiIndex.from_arrays([pares["id_estudiante"], pares["anio"]])
+        ultimo_anio = int(pares["anio"].max())
+        cohortes = pares.groupby("anio")["id_estudiante"].count()
+
+        inscritos = {}
+        for k in desplazamientos:
+            presentes = pd.MultiIndex.from_arrays([pares["id_estudiante"], pares["anio"] + k]).isin(indice)
+            inscritos[k] = pd.Series(presentes, index=pares.index).groupby(pares["anio"]).sum()
+
+        filas = []
+        for anio, cantidad in sorted(cohortes.items(), reverse=True):
+            fila_inscritos = [
+                int(inscritos[k].get(anio, 0)) if anio + k <= ultimo_anio else None
+                for k in desplazamientos
+            ]
+            filas.append({
+                "gestion": str(anio),
+                "estudiantes": int(cantidad),
+                "inscritos": fila_inscritos,
+                "tasas": [round(valor / cantidad, 4) if valor is not None else None for valor in fila_inscritos],
+            })
+
+        return {"generado": datetime.now(), "desplazamientos": desplazamientos, "filas": filas}
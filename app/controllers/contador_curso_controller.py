@@ -0,0 +1,238 @@
+"""
+Controlador para mantener los contadores de estudiantes de cada curso
+(cantidad_estudiantes y cantidad por estado en la tabla cursos)
+Cada escritura sobre estudiantes_cursos o sobre el estado de un estudiante debe
+ajustarlos dentro de su misma transacción
+"""
+from collections import defaultdict
+from sqlalchemy.orm import Session
+from sqlalchemy import update, select, func, case, bindparam, or_
+from typing import Dict, Iterable, List, Optional, Tuple
+from app.models.estudiante_model import Estudiante, estudiantes_cursos
+from app.models.curso_model import Curso
+
+# Columna del contador de cada estado del estudiante
+COLUMNAS_ESTADO = {
+    'Activo': 'cantidad_activos',
+    'Abandono': 'cantidad_abandonos',
+    'Retirado': 'cantidad_retirados'
+}
+
+COLUMNAS_CONTADOR = ['cantidad_estudiantes', *COLUMNAS_ESTADO.values()]
+
+cursos = Curso.__table__
+
+def _conteo(estado: Optional[str] = None):
+    """Subconsulta correlacionada con la cantidad real de estudiantes del curso (opcionalmente de un estado)"""
+    consulta = (
+        select(func.count())
+        .select_from(estudiantes_cursos)
+        .where(estudiantes_cursos.c.id_curso == cursos.c.id_curso)
+    )
+    if estado is not None:
+        consulta = consulta.join(
+            Estudiante, Estudiante.id_estudiante == estudiantes_cursos.c.id_estudiante
+        ).where(Estudiante.estado_estudiante == estado)
+    return consulta.scalar_subquery()
+
+def _cursos_de_estudiantes(ids_estudiantes: List[int]):
+    """Subconsulta con los cursos en los que están inscritos los estudiantes"""
+    return select(estudiantes_cursos.c.id_curso).where(estudiantes_cursos.c.id_estudiante.in_(ids_estudiantes))
+
+class ContadorCursoController:
+    """
+    Controlador para los contadores de estudiantes por curso.
+    Los ajustes son UPDATE relativos (columna = columna + delta), así dos transacciones
+    que inscriben en el mismo curso no pisan el valor de la otra.
+    Ningún método confirma la transacción: lo hace quien realiza la escritura.
+    """
+
+    @staticmethod
+    def ajustar(db: Session, cambios: Iterable[Tuple[int, str, int]]) -> None:
+        """
+        Sumar o restar estudiantes a los contadores de varios cursos con un solo UPDATE
+
+        Args:
+            db: Sesión de base de datos
+            cambios: Tuplas (id_curso, estado del estudiante, delta); delta es +1 al inscribir y -1 al desinscribir
+        """
+        deltas: Dict[int, Dict[str, int]] = defaultdict(lambda: dict.fromkeys(COLUMNAS_CONTADOR, 0))
+        for id_curso, estado, delta in cambios:
+            deltas[id_curso]['cantidad_estudiantes'] += delta
+            deltas[id_curso][COLUMNAS_ESTADO[estado]] += delta
+
+        # Orden fijo por id_curso para que dos lotes concurrentes bloqueen las filas en el mismo orden
+        parametros = [
+            {"b_id_curso": id_curso, **{f"b_{columna}": valor for columna, valor in valores.items()}}
+            for id_curso, valores in sorted(deltas.items())
+            if any(valores.values())
+        ]
+        if not parametros:
+            return
+
+        db.execute(
+            update(cursos)
+            .where(cursos.c.id_curso == bindparam("b_id_curso"))
+            .values({columna: cursos.c[columna] + bindparam(f"b_{columna}") for columna in COLUMNAS_CONTADOR}),
+            parametros
+        )
+
+    @staticmethod
+    def reservar(db: Session, id_curso: int, estado: str, cantidad: int) -> int:
+        """
+        Ocupar hasta `cantidad` lugares de un curso respetando su capacidad.
+        Es un UPDATE condicional (... WHERE cantidad_estudiantes + n <= capacidad): no cuenta
+        estudiantes_cursos ni bloquea el curso antes de decidir. Si no entran todos, se lee
+        cuántos lugares quedan y se reintenta con ese número, porque otra transacción pudo
+        ocupar o liberar lugares entre medio.
+
+        Args:
+            db: Sesión de base de datos
+            id_curso: ID del curso
+            estado: Estado de los estudiantes que ocupan los lugares
+            cantidad: Lugares pedidos
+
+        Returns:
+            Lugares ocupados (entre 0 y cantidad); quien llama inscribe solo a esa cantidad
+        """
+        columna = COLUMNAS_ESTADO[estado]
+        pedidos = cantidad
+        while pedidos > 0:
+            resultado = db.execute(
+                update(cursos)
+                .where(
+                    cursos.c.id_curso == id_curso,
+                    or_(cursos.c.capacidad.is_(None), cursos.c.cantidad_estudiantes + pedidos <= cursos.c.capacidad)
+                )
+                .values({
+                    "cantidad_estudiantes": cursos.c.cantidad_estudiantes + pedidos,
+                    columna: cursos.c[columna] + pedidos
+                })
+            )
+            if resultado.rowcount:
+                return pedidos
+
+            libres = db.execute(
+                select(cursos.c.capacidad - cursos.c.cantidad_estudiantes).where(cursos.c.id_curso == id_curso)
+            ).scalar()
+            if not libres or libres <= 0:
+                return 0
+            pedidos = min(pedidos, libres)
+        return 0
+
+    @staticmethod
+    def cambiar_estado(db: Session, id_estudiante: int, estado_anterior: str, estado_nuevo: str) -> None:
+        """
+        Mover un estudiante del contador de su estado anterior al del nuevo en todos sus cursos
+
+        Args:
+            db: Sesión de base de datos
+            id_estudiante: ID del estudiante
+            estado_anterior: Estado antes del cambio
+            estado_nuevo: Estado después del cambio
+        """
+        anterior = COLUMNAS_ESTADO[estado_anterior]
+        nuevo = COLUMNAS_ESTADO[estado_nuevo]
+        db.execute(
+            update(cursos)
+            .where(cursos.c.id_curso.in_(_cursos_de_estudiantes([id_estudiante])))
+            .values({anterior: cursos.c[anterior] - 1, nuevo: cursos.c[nuevo] + 1})
+        )
+
+    @staticmethod
+    def quitar_estudiante(db: Session, id_estudiante: int, estado: str) -> None:
+        """
+        Descontar un estudiante de todos sus cursos (antes de eliminarlo)
+
+        Args:
+            db: Sesión de base de datos
+            id_estudiante: ID del estudiante
+            estado: Estado actual del estudiante
+        """
+        columna = COLUMNAS_ESTADO[estado]
+        db.execute(
+            update(cursos)
+            .where(cursos.c.id_curso.in_(_cursos_de_estudiantes([id_estudiante])))
+            .values({
+                "cantidad_estudiantes": cursos.c.cantidad_estudiantes - 1,
+                columna: cursos.c[columna] - 1
+            })
+        )
+
+    @staticmethod
+    def recalcular(
+        db: Session,
+        ids_cursos: Optional[Iterable[int]] = None,
+        gestion: Optional[str] = None,
+        ids_estudiantes: Optional[Iterable[int]] = None
+    ) -> None:
+        """
+        Recalcular los contadores desde estudiantes_cursos (sin filtros: todos los cursos)
+
+        Args:
+            db: Sesión de base de datos
+            ids_cursos: Limitar a estos cursos (opcional)
+            gestion: Limitar a los cursos de una gestión (opcional)
+            ids_estudiantes: Limitar a los cursos de estos estudiantes (opcional)
+        """
+        sentencia = update(cursos).values(
+            cantidad_estudiantes=_conteo(),
+            **{columna: _conteo(estado) for estado, columna in COLUMNAS_ESTADO.items()}
+        )
+        if ids_cursos is not None:
+            ids = list(set(ids_cursos))
+            if not ids:
+                return
+            sentencia = sentencia.where(cursos.c.id_curso.in_(ids))
+        if gestion is not None:
+            sentencia = sentencia.where(cursos.c.gestion == gestion)
+        if ids_estudiantes is not None:
+            ids = list(set(ids_estudiantes))
+            if not ids:
+                return
+            sentencia = sentencia.where(cursos.c.id_curso.in_(_cursos_de_estudiantes(ids)))
+
+        db.execute(sentencia)
+
+    @staticmethod
+    def detectar_desvios(db: Session) -> List[dict]:
+        """
+        Comparar los contadores guardados con los conteos reales de estudiantes_cursos
+
+        Args:
+            db: Sesión de base de datos
+
+        Returns:
+            Lista con los cursos cuyos contadores no coinciden: guardados y reales por columna
+        """
+        reales = (
+            select(
+                estudiantes_cursos.c.id_curso,
+                func.count().label("cantidad_estudiantes"),
+                *[
+                    func.sum(case((Estudiante.estado_estudiante == estado, 1), else_=0)).label(columna)
+                    for estado, columna in COLUMNAS_ESTADO.items()
+                ]
+            )
+            .join(Estudiante, Estudiante.id_estudiante == estudiantes_cursos.c.id_estudiante)
+            .group_by(estudiantes_cursos.c.id_curso)
+            .subquery()
+        )
+        consulta = (
+            select(
+                cursos.c.id_curso,
+                *[cursos.c[columna] for columna in COLUMNAS_CONTADOR],
+                *[func.coalesce(reales.c[columna], 0) for columna in COLUMNAS_CONTADOR]
+            )
+            .outerjoin(reales, reales.c.id_curso == cursos.c.id_curso)
+            .order_by(cursos.c.id_curso)
+        )
+
+        desvios = []
+        cantidad = len(COLUMNAS_CONTADOR)
+        for fila in db.execute(consulta):
+            guardados = dict(zip(COLUMNAS_CONTADOR, fila[1:1 + cantidad]))
+            calculados = dict(zip(COLUMNAS_CONTADOR, (int(valor) for valor in fila[1 + cantidad:])))
+            if guardados != calculados:
+                desvios.append({"id_curso": fila[0], "guardados": guardados, "reales": calculados})
+        return desvios
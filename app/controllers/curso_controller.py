@@ -2,12 +2,19 @@
 Controlador con la lógica de negocio para gestionar cursos
 Maneja las operaciones CRUD en la base de datos
 """
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, lazyload, noload
+from sqlalchemy.orm.exc import StaleDataError
 from fastapi import HTTPException, status
 from app.models.curso_model import Curso
-from app.schemas.curso_schema import CursoCreate, CursoUpdate
+from app.schemas.curso_schema import CursoCreate, CursoUpdate, CursoResponse
+from app.controllers.indice_gestion_controller import IndiceGestionController
+from app.controllers.gestion_controller import GestionController
+from app.controllers.archivo_controller import ArchivoController
+from app.models.archivo_model import CursoArchivado
+from app.models.lista_espera_model import lista_espera
+from app.config.cache import invalidar_caches
 from typing import List, Optional
-from sqlalchemy import text
+from sqlalchemy import text, delete, select, update
 
 class CursoController:
     """
@@ -20,7 +27,8 @@ class CursoController:
         skip: int = 0, 
         limit: int = 100,
         nivel: Optional[str] = None,
-        gestion: Optional[str] = None
+        gestion: Optional[str] = None,
+        incluir_estudiantes: bool = True
     ) -> List[Curso]:
         """
         Obtener lista de todos los cursos con paginación y filtros opcionales
@@ -30,37 +38,57 @@ class CursoController:
             skip: Número de registros a saltar
             limit: Número máximo de registros a retornar
             nivel: Filtrar por nivel (opcional)
-            gestion: Filtrar por gestión (opcional)
+            gestion: Filtrar por gestión (opcional); una gestión archivada se lee de cursos_archivo
+            incluir_estudiantes: Cargar la lista de estudiantes de cada curso; con False
+                solo se leen los contadores de la tabla cursos
             
         Returns:
-            Lista de cursos
+            Lista de cursos (sin gestión: primero los vigentes y después los archivados)
         """
-        query = db.query(Curso)
+        def consulta(modelo):
+            query = db.query(modelo)
+            if not incluir_estudiantes:
+                query = query.options(noload(modelo.estudiantes))
+            
+            # Aplicar filtros si se proporcionan
+            if nivel:
+                query = query.filter(modelo.nivel == nivel)
+            if gestion:
+                query = query.filter(modelo.gestion == gestion)
+            return query
+        
+        if gestion and ArchivoController.esta_archivada(db, gestion):
+            return consulta(CursoArchivado).offset(skip).limit(limit).all()
+        
+        cursos = consulta(Curso).offset(skip).limit(limit).all()
         
-        # Aplicar filtros si se proporcionan
-        if nivel:
-            query = query.filter(Curso.nivel == nivel)
-        if gestion:
-            query = query.filter(Curso.gestion == gestion)
+        # Sin filtro de gestión la página sigue con los cursos archivados
+        if not gestion and len(cursos) < limit:
+            vigentes = skip + len(cursos) if cursos else consulta(Curso).count()
+            cursos += consulta(CursoArchivado).offset(max(skip - vigentes, 0)).limit(limit - len(cursos)).all()
         
-        return query.offset(skip).limit(limit).all()
+        return cursos
     
     @staticmethod
-    def obtener_por_id(db: Session, id_curso: int) -> Curso:
+    def obtener_por_id(db: Session, id_curso: int, incluir_archivados: bool = False) -> Curso:
         """
         Obtener un curso por su ID
         
         Args:
             db: Sesión de base de datos
             id_curso: ID del curso a buscar
+            incluir_archivados: Si no está entre los vigentes, buscarlo en cursos_archivo
+                (solo para lecturas: un curso archivado no se modifica)
             
         Returns:
-            Objeto Curso
+            Objeto Curso (o CursoArchivado)
             
         Raises:
             HTTPException: Si el curso no existe
         """
         curso = db.query(Curso).filter(Curso.id_curso == id_curso).first()
+        if not curso and incluir_archivados:
+            curso = db.query(CursoArchivado).filter(CursoArchivado.id_curso == id_curso).first()
         
         if not curso:
             raise HTTPException(
@@ -88,9 +116,14 @@ class CursoController:
         try:
             # Agregar a la sesión y confirmar
             db.add(nuevo_curso)
+            GestionController.registrar(db, [nuevo_curso.gestion])
             db.commit()
+            invalidar_caches()
             db.refresh(nuevo_curso)
             return nuevo_curso
+        except HTTPException:
+            db.rollback()
+            raise
         except Exception as e:
             db.rollback()
             raise HTTPException(
@@ -102,35 +135,84 @@ class CursoController:
     def actualizar(
         db: Session, 
         id_curso: int, 
-        curso_data: CursoUpdate
-    ) -> Curso:
+        curso_data: CursoUpdate,
+        version_esperada: Optional[int] = None
+    ) -> CursoResponse:
         """
-        Actualizar un curso existente
+        Actualizar un curso existente con control de concurrencia optimista
         
         Args:
             db: Sesión de base de datos
             id_curso: ID del curso a actualizar
             curso_data: Nuevos datos del curso
+            version_esperada: Versión enviada en If-Match (opcional)
             
         Returns:
             Curso actualizado
             
         Raises:
-            HTTPException: Si el curso no existe
+            HTTPException: Si el curso no existe (404), la capacidad es menor a los inscritos (400)
+                o fue modificado por otro usuario (409)
         """
-        # Buscar curso
-        curso = CursoController.obtener_por_id(db, id_curso)
+        # Buscar curso sin cargar sus estudiantes
+        curso = db.query(Curso).options(lazyload(Curso.estudiantes)).filter(Curso.id_curso == id_curso).first()
+        
+        if not curso:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Curso con ID {id_curso} no encontrado"
+            )
         
-        # Actualizar solo los campos proporcionados
+        if version_esperada is not None and curso.version != version_esperada:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"El curso fue modificado por otro usuario (versión actual {curso.version}). Recargue los datos e intente nuevamente."
+            )
+        
+        # Actualizar solo los campos proporcionados que realmente cambian
         update_data = curso_data.model_dump(exclude_unset=True)
+        cambios = {
+            campo: valor for campo, valor in update_data.items()
+            if getattr(curso, campo) != valor
+        }
         
-        for campo, valor in update_data.items():
-            setattr(curso, campo, valor)
+        # Sin cambios: no se escribe nada en la base de datos
+        if not cambios:
+            return CursoResponse.model_validate(curso)
+        
+        gestion_anterior = curso.gestion
         
         try:
+            # Bajar la capacidad se valida en el mismo UPDATE que la escribe: la cantidad
+            # leída arriba puede haber subido desde entonces por una inscripción concurrente
+            if cambios.get('capacidad') is not None:
+                CursoController._fijar_capacidad(db, id_curso, cambios['capacidad'])
+            
+            for campo, valor in cambios.items():
+                setattr(curso, campo, valor)
+            
+            db.flush()
+            
+            # Si cambia la gestión, las inscripciones del curso cambian de gestión
+            if curso.gestion != gestion_anterior:
+                GestionController.registrar(db, [curso.gestion])
+                IndiceGestionController.sincronizar_gestion(db, gestion_anterior)
+                IndiceGestionController.sincronizar_gestion(db, curso.gestion)
+            
+            # La respuesta se arma tras el flush, sin recargar la fila ni sus relaciones
+            respuesta = CursoResponse.model_validate(curso)
             db.commit()
-            db.refresh(curso)
-            return curso
+            invalidar_caches()
+            return respuesta
+        except StaleDataError:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="El curso fue modificado por otro usuario. Recargue los datos e intente nuevamente."
+            )
+        except HTTPException:
+            db.rollback()
+            raise
         except Exception as e:
             db.rollback()
             raise HTTPException(
@@ -138,6 +220,33 @@ class CursoController:
                 detail=f"Error al actualizar curso: {str(e)}"
             )
     
+    @staticmethod
+    def _fijar_capacidad(db: Session, id_curso: int, capacidad: int) -> None:
+        """
+        Escribir la nueva capacidad solo si no queda por debajo de los inscritos.
+        La fila queda bloqueada hasta el commit, así que ninguna inscripción
+        (ContadorCursoController.reservar) puede superarla entre la validación y el commit.
+        
+        Raises:
+            HTTPException: 400 si la capacidad es menor a los estudiantes inscritos
+        """
+        resultado = db.execute(
+            update(Curso.__table__)
+            .where(
+                Curso.__table__.c.id_curso == id_curso,
+                Curso.__table__.c.cantidad_estudiantes <= capacidad
+            )
+            .values(capacidad=capacidad)
+        )
+        if resultado.rowcount == 0:
+            inscritos = db.execute(
+                select(Curso.__table__.c.cantidad_estudiantes).where(Curso.__table__.c.id_curso == id_curso)
+            ).scalar()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"La capacidad no puede ser menor a los {inscritos} estudiantes inscritos"
+            )
+    
     @staticmethod
     def eliminar(db: Session, id_curso: int) -> dict:
         """
@@ -157,8 +266,12 @@ class CursoController:
         curso = CursoController.obtener_por_id(db, id_curso)
         
         try:
+            db.execute(delete(lista_espera).where(lista_espera.c.id_curso == id_curso))
             db.delete(curso)
+            db.flush()
+            IndiceGestionController.sincronizar_gestion(db, curso.gestion)
             db.commit()
+            invalidar_caches()
             return {"mensaje": f"Curso con ID {id_curso} eliminado exitosamente"}
         except Exception as e:
             db.rollback()
@@ -188,10 +301,12 @@ class CursoController:
             HTTPException: Si hay errores en la operación
         """
         try:
-            # Verificar que existan cursos en la gestión origen
-            cursos_origen = db.query(Curso).filter(
-                Curso.gestion == gestion_origen
-            ).all()
+            # Verificar que existan cursos en la gestión origen (vigente o archivada)
+            origen_archivado = ArchivoController.esta_archivada(db, gestion_origen)
+            modelo_origen = CursoArchivado if origen_archivado else Curso
+            cursos_origen = db.query(modelo_origen.id_curso).filter(
+                modelo_origen.gestion == gestion_origen
+            ).count()
             
             if not cursos_origen:
                 raise HTTPException(
@@ -211,10 +326,10 @@ class CursoController:
                 )
             
             # Copiar cursos usando SQL directo para mejor rendimiento
-            sql = text("""
-                INSERT INTO cursos (nombre_curso, nivel, gestion)
-                SELECT nombre_curso, nivel, :gestion_destino
-                FROM cursos 
+            sql = text(f"""
+                INSERT INTO cursos (nombre_curso, nivel, gestion, capacidad)
+                SELECT nombre_curso, nivel, :gestion_destino, capacidad
+                FROM {modelo_origen.__tablename__} 
                 WHERE gestion = :gestion_origen
             """)
             
@@ -225,8 +340,10 @@ class CursoController:
                     "gestion_destino": gestion_destino
                 }
             )
+            GestionController.registrar(db, [gestion_destino])
             
             db.commit()
+            invalidar_caches()
             
             cursos_copiados = result.rowcount
             
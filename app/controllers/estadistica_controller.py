@@ -0,0 +1,161 @@
+"""
+Controlador para las estadísticas agregadas del tablero
+Los conteos se calculan con GROUP BY en la base de datos y se guardan en caché;
+las escrituras sobre estudiantes, cursos e inscripciones la invalidan.
+"""
+from datetime import datetime
+from collections import defaultdict
+from sqlalchemy.orm import Session
+from sqlalchemy import select, func, distinct
+from typing import Optional
+from app.config.cache import crear_cache, ESTADISTICAS_CACHE_SEGUNDOS
+from app.models.estudiante_model import Estudiante
+from app.models.estudiante_gestion_model import estudiantes_gestiones
+from app.controllers.promocion_controller import ORDEN_NIVELES
+from app.controllers.archivo_controller import ArchivoController
+
+cache_estadisticas = crear_cache("estadisticas", ESTADISTICAS_CACHE_SEGUNDOS)
+
+def _por_estado() -> dict:
+    return {'Activo': 0, 'Abandono': 0, 'Retirado': 0}
+
+class EstadisticaController:
+    """
+    Controlador para los conteos por gestión, nivel, curso y estado
+    """
+
+    @staticmethod
+    def obtener_estadisticas(db: Session, gestion: Optional[str] = None) -> dict:
+        """
+        Obtener las estadísticas agregadas (desde la caché si están vigentes)
+
+        Args:
+            db: Sesión de base de datos
+            gestion: Limitar a una gestión e incluir el detalle por curso (opcional)
+
+        Returns:
+            Diccionario con totales de estudiantes y conteos por gestión, nivel y curso
+        """
+        return cache_estadisticas.obtener(gestion, lambda: EstadisticaController.calcular(db, gestion))
+
+    @staticmethod
+    def calcular(db: Session, gestion: Optional[str] = None) -> dict:
+        """
+        Calcular las estadísticas con consultas GROUP BY, sin pasar por la caché
+
+        Args:
+            db: Sesión de base de datos
+            gestion: Limitar a una gestión e incluir el detalle por curso (opcional)
+
+        Returns:
+            Diccionario con totales de estudiantes y conteos por gestión, nivel y curso
+        """
+        # Estudiantes por estado (toda la tabla)
+        estudiantes = {"total": 0, "por_estado": _por_estado()}
+        for estado, cantidad in db.execute(
+            select(Estudiante.estado_estudiante, func.count()).group_by(Estudiante.estado_estudiante)
+        ):
+            estudiantes["por_estado"][estado] = cantidad
+            estudiantes["total"] += cantidad
+
+        # Cursos e inscripciones vigentes o archivados, según la gestión pedida
+        tabla_cursos, tabla_inscripciones = ArchivoController.fuentes(db, None if gestion is None else [gestion])
+
+        # Cursos por gestión y nivel
+        consulta_cursos = (
+            select(tabla_cursos.c.gestion, tabla_cursos.c.nivel, func.count())
+            .group_by(tabla_cursos.c.gestion, tabla_cursos.c.nivel)
+        )
+        # Inscripciones y estudiantes distintos por gestión, nivel y estado
+        consulta_inscripciones = (
+            select(
+                tabla_cursos.c.gestion,
+                tabla_cursos.c.nivel,
+                Estudiante.estado_estudiante,
+                func.count(),
+                func.count(distinct(tabla_inscripciones.c.id_estudiante))
+            )
+            .select_from(tabla_inscripciones)
+            .join(tabla_cursos, tabla_cursos.c.id_curso == tabla_inscripciones.c.id_curso)
+            .join(Estudiante, Estudiante.id_estudiante == tabla_inscripciones.c.id_estudiante)
+            .group_by(tabla_cursos.c.gestion, tabla_cursos.c.nivel, Estudiante.estado_estudiante)
+        )
+        # Estudiantes distintos por gestión y estado, desde el índice por gestión
+        consulta_gestiones = (
+            select(estudiantes_gestiones.c.gestion, Estudiante.estado_estudiante, func.count())
+            .select_from(estudiantes_gestiones)
+            .join(Estudiante, Estudiante.id_estudiante == estudiantes_gestiones.c.id_estudiante)
+            .group_by(estudiantes_gestiones.c.gestion, Estudiante.estado_estudiante)
+        )
+        if gestion is not None:
+            consulta_cursos = consulta_cursos.where(tabla_cursos.c.gestion == gestion)
+            consulta_inscripciones = consulta_inscripciones.where(tabla_cursos.c.gestion == gestion)
+            consulta_gestiones = consulta_gestiones.where(estudiantes_gestiones.c.gestion == gestion)
+
+        gestiones = defaultdict(lambda: {"cursos": 0, "inscripciones": 0, "estudiantes": 0, "por_estado": _por_estado()})
+        niveles = defaultdict(lambda: {"cursos": 0, "inscripciones": 0, "estudiantes": 0, "por_estado": _por_estado()})
+
+        for gestion_fila, nivel, cantidad in db.execute(consulta_cursos):
+            gestiones[gestion_fila]["cursos"] += cantidad
+            niveles[(gestion_fila, nivel)]["cursos"] = cantidad
+
+        for gestion_fila, nivel, estado, inscripciones, distintos in db.execute(consulta_inscripciones):
+            gestiones[gestion_fila]["inscripciones"] += inscripciones
+            nivel_fila = niveles[(gestion_fila, nivel)]
+            nivel_fila["inscripciones"] += inscripciones
+            # El estado es del estudiante: los distintos por estado suman los distintos del nivel
+            nivel_fila["estudiantes"] += distintos
+            nivel_fila["por_estado"][estado] = distintos
+
+        for gestion_fila, estado, cantidad in db.execute(consulta_gestiones):
+            gestiones[gestion_fila]["estudiantes"] += cantidad
+            gestiones[gestion_fila]["por_estado"][estado] = cantidad
+
+        resultado = {
+            "gestion": gestion,
+            "generado": datetime.now(),
+            "estudiantes": estudiantes,
+            "por_gestion": [
+                {"gestion": g, **datos}
+                for g, datos in sorted(gestiones.items(), key=lambda item: item[0], reverse=True)
+            ],
+            "por_nivel": [
+                {"gestion": g, "nivel": n, **datos}
+                for (g, n), datos in sorted(
+                    niveles.items(),
+                    key=lambda item: (item[0][0], -ORDEN_NIVELES.get(item[0][1], 99)),
+                    reverse=True
+                )
+            ],
+            "por_curso": None,
+        }
+
+        if gestion is not None:
+            cursos = {}
+            for id_curso, nombre_curso, nivel, estado, cantidad in db.execute(
+                select(tabla_cursos.c.id_curso, tabla_cursos.c.nombre_curso, tabla_cursos.c.nivel,
+                       Estudiante.estado_estudiante, func.count(tabla_inscripciones.c.id_estudiante))
+                .select_from(tabla_cursos)
+                .outerjoin(tabla_inscripciones, tabla_inscripciones.c.id_curso == tabla_cursos.c.id_curso)
+                .outerjoin(Estudiante, Estudiante.id_estudiante == tabla_inscripciones.c.id_estudiante)
+                .where(tabla_cursos.c.gestion == gestion)
+                .group_by(tabla_cursos.c.id_curso, tabla_cursos.c.nombre_curso, tabla_cursos.c.nivel, Estudiante.estado_estudiante)
+            ):
+                curso = cursos.setdefault(id_curso, {
+                    "id_curso": id_curso,
+                    "nombre_curso": nombre_curso,
+                    "nivel": nivel,
+                    "gestion": gestion,
+                    "estudiantes": 0,
+                    "por_estado": _por_estado(),
+                })
+                # Un curso sin estudiantes devuelve una fila con estado NULL y cantidad 0
+                if estado is not None:
+                    curso["estudiantes"] += cantidad
+                    curso["por_estado"][estado] = cantidad
+            resultado["por_curso"] = sorted(
+                cursos.values(),
+                key=lambda c: (ORDEN_NIVELES.get(c["nivel"], 99), c["nombre_curso"], c["id_curso"])
+            )
+
+        return resultado
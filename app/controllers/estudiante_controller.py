@@ -1,7 +1,15 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, lazyload
+from sqlalchemy.orm.exc import StaleDataError
+from sqlalchemy import delete
 from fastapi import HTTPException, status
 from app.models.estudiante_model import Estudiante
-from app.schemas.estudiante_schema import EstudianteCreate, EstudianteUpdate
+from app.schemas.estudiante_schema import EstudianteCreate, EstudianteUpdate, EstudianteResponse
+from app.controllers.indice_gestion_controller import IndiceGestionController
+from app.controllers.contador_curso_controller import ContadorCursoController
+from app.models.lista_espera_model import lista_espera
+from app.models.archivo_model import CursoArchivado, estudiantes_cursos_archivo
+from app.controllers.archivo_controller import ArchivoController
+from app.config.cache import invalidar_caches
 from typing import List, Optional
 
 class EstudianteController:
@@ -32,6 +40,7 @@ class EstudianteController:
             # Agregar a la sesión y confirmar
             db.add(nuevo_estudiante)
             db.commit()
+            invalidar_caches()
             db.refresh(nuevo_estudiante)
             return nuevo_estudiante
         except Exception as e:
@@ -41,25 +50,83 @@ class EstudianteController:
                 detail=f"Error al crear estudiante: {str(e)}"
             )
     
+    @staticmethod
+    def obtener_para_actualizar(
+        db: Session,
+        id_estudiante: int,
+        version_esperada: Optional[int] = None
+    ) -> Estudiante:
+        """
+        Obtener un estudiante sin cargar sus cursos y verificar su versión
+        
+        Args:
+            db: Sesión de base de datos
+            id_estudiante: ID del estudiante
+            version_esperada: Versión enviada en If-Match (opcional)
+            
+        Returns:
+            Objeto Estudiante
+            
+        Raises:
+            HTTPException: 404 si no existe, 409 si la versión no coincide
+        """
+        estudiante = db.query(Estudiante).options(
+            lazyload(Estudiante.cursos)
+        ).filter(
+            Estudiante.id_estudiante == id_estudiante
+        ).first()
+        
+        if not estudiante:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Estudiante con ID {id_estudiante} no encontrado"
+            )
+        
+        if version_esperada is not None and estudiante.version != version_esperada:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"El estudiante fue modificado por otro usuario (versión actual {estudiante.version}). Recargue los datos e intente nuevamente."
+            )
+        
+        return estudiante
+    
     @staticmethod
     def actualizar(
         db: Session, 
         id_estudiante: int, 
-        estudiante_data: EstudianteUpdate
-    ) -> Estudiante:
-        # Buscar estudiante
-        estudiante = EstudianteController.obtener_por_id(db, id_estudiante)
+        estudiante_data: EstudianteUpdate,
+        version_esperada: Optional[int] = None
+    ) -> EstudianteResponse:
+        # Buscar estudiante (sin cursos) y verificar la versión enviada en If-Match
+        estudiante = EstudianteController.obtener_para_actualizar(db, id_estudiante, version_esperada)
         
-        # Actualizar solo los campos proporcionados
+        # Actualizar solo los campos proporcionados que realmente cambian
         update_data = estudiante_data.model_dump(exclude_unset=True)
+        cambios = {
+            campo: valor for campo, valor in update_data.items()
+            if getattr(estudiante, campo) != valor
+        }
+        
+        # Sin cambios: no se escribe nada en la base de datos
+        if not cambios:
+            return EstudianteResponse.model_validate(estudiante)
         
-        for campo, valor in update_data.items():
+        for campo, valor in cambios.items():
             setattr(estudiante, campo, valor)
         
         try:
+            # La respuesta se arma tras el flush, sin recargar la fila ni sus relaciones
+            db.flush()
+            respuesta = EstudianteResponse.model_validate(estudiante)
             db.commit()
-            db.refresh(estudiante)
-            return estudiante
+            invalidar_caches()
+            return respuesta
+        except StaleDataError:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="El estudiante fue modificado por otro usuario. Recargue los datos e intente nuevamente."
+            )
         except Exception as e:
             db.rollback()
             raise HTTPException(
@@ -73,8 +140,15 @@ class EstudianteController:
         estudiante = EstudianteController.obtener_por_id(db, id_estudiante)
         
         try:
+            # Descontar al estudiante de sus cursos antes de que se borren sus inscripciones
+            ContadorCursoController.quitar_estudiante(db, id_estudiante, estudiante.estado_estudiante)
+            db.execute(delete(lista_espera).where(lista_espera.c.id_estudiante == id_estudiante))
+            db.execute(delete(estudiantes_cursos_archivo).where(estudiantes_cursos_archivo.c.id_estudiante == id_estudiante))
             db.delete(estudiante)
+            db.flush()
+            IndiceGestionController.sincronizar_estudiantes(db, [id_estudiante])
             db.commit()
+            invalidar_caches()
             return {"mensaje": f"Estudiante con ID {id_estudiante} eliminado exitosamente"}
         except Exception as e:
             db.rollback()
@@ -84,7 +158,12 @@ class EstudianteController:
             )
 
     @staticmethod
-    def cambiar_estado(db: Session, id_estudiante: int, nuevo_estado: str) -> dict:
+    def cambiar_estado(
+        db: Session,
+        id_estudiante: int,
+        nuevo_estado: str,
+        version_esperada: Optional[int] = None
+    ) -> dict:
         """
         Cambiar el estado de un estudiante
         
@@ -92,15 +171,16 @@ class EstudianteController:
             db: Sesión de base de datos
             id_estudiante: ID del estudiante
             nuevo_estado: Nuevo estado (Activo, Abandono, Retirado)
+            version_esperada: Versión enviada en If-Match (opcional)
             
         Returns:
             Diccionario con información del cambio
             
         Raises:
-            HTTPException: Si el estudiante no existe
+            HTTPException: Si el estudiante no existe o fue modificado por otro usuario
         """
-        # Buscar estudiante
-        estudiante = EstudianteController.obtener_por_id(db, id_estudiante)
+        # Buscar estudiante (sin cursos) y verificar la versión enviada en If-Match
+        estudiante = EstudianteController.obtener_para_actualizar(db, id_estudiante, version_esperada)
         
         # Guardar estado anterior
         estado_anterior = estudiante.estado_estudiante
@@ -115,15 +195,25 @@ class EstudianteController:
         try:
             # Cambiar estado
             estudiante.estado_estudiante = nuevo_estado
+            db.flush()
+            ContadorCursoController.cambiar_estado(db, id_estudiante, estado_anterior, nuevo_estado)
+            version = estudiante.version
             db.commit()
-            db.refresh(estudiante)
+            invalidar_caches()
             
             return {
                 "mensaje": f"Estado del estudiante cambiado de '{estado_anterior}' a '{nuevo_estado}'",
                 "id_estudiante": id_estudiante,
                 "estado_anterior": estado_anterior,
-                "estado_nuevo": nuevo_estado
+                "estado_nuevo": nuevo_estado,
+                "version": version
             }
+        except StaleDataError:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="El estudiante fue modificado por otro usuario. Recargue los datos e intente nuevamente."
+            )
         except Exception as e:
             db.rollback()
             raise HTTPException(
@@ -145,7 +235,7 @@ class EstudianteController:
         
         Args:
             db: Sesión de base de datos
-            gestion: Gestión a filtrar (año académico)
+            gestion: Gestión a filtrar (año académico); si está archivada se lee de las tablas de archivo
             nivel: Filtrar por nivel (inicial, primaria, secundaria) - opcional
             id_curso: Filtrar por ID de curso específico - opcional
             skip: Número de registros a saltar
@@ -157,19 +247,23 @@ class EstudianteController:
         from app.models.curso_model import Curso
         from sqlalchemy.orm import joinedload
         
+        # Una gestión archivada se lee de cursos_archivo (relación Estudiante.cursos_archivados)
+        archivada = ArchivoController.esta_archivada(db, gestion)
+        modelo = CursoArchivado if archivada else Curso
+        
         # Query base de estudiantes con sus cursos
-        query = db.query(Estudiante).join(Estudiante.cursos)
+        query = db.query(Estudiante).join(Estudiante.cursos_archivados if archivada else Estudiante.cursos)
         
         # Filtrar por gestión
-        query = query.filter(Curso.gestion == gestion)
+        query = query.filter(modelo.gestion == gestion)
         
         # Filtrar por nivel si se especifica
         if nivel:
-            query = query.filter(Curso.nivel == nivel)
+            query = query.filter(modelo.nivel == nivel)
         
         # Filtrar por curso específico si se especifica
         if id_curso:
-            query = query.filter(Curso.id_curso == id_curso)
+            query = query.filter(modelo.id_curso == id_curso)
         
         # Eliminar duplicados y aplicar paginación
         estudiantes = query.distinct().offset(skip).limit(limit).all()
@@ -199,7 +293,7 @@ class EstudianteController:
             }
             
             # Filtrar cursos por gestión (y opcionalmente por nivel e id_curso)
-            for curso in estudiante.cursos:
+            for curso in (estudiante.cursos_archivados if archivada else estudiante.cursos):
                 if curso.gestion == gestion:
                     if nivel and curso.nivel != nivel:
                         continue
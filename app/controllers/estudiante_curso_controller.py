@@ -2,11 +2,37 @@
 Controlador para gestionar la relación estudiantes-cursos
 Maneja asignaciones, desasignaciones y consultas
 """
+import base64
+import json
 from sqlalchemy.orm import Session
+from sqlalchemy import insert, delete, select, tuple_
+from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
-from app.models.estudiante_model import Estudiante
+from app.models.estudiante_model import Estudiante, estudiantes_cursos
 from app.models.curso_model import Curso
-from typing import List
+from app.models.archivo_model import CursoArchivado, estudiantes_cursos_archivo
+from app.controllers.indice_gestion_controller import IndiceGestionController
+from app.controllers.contador_curso_controller import ContadorCursoController
+from app.controllers.lista_espera_controller import ListaEsperaController
+from typing import List, Optional
+from app.schemas.estudiante_curso_schema import AsignacionLoteRequest
+from app.config.cache import invalidar_caches
+
+# Columnas que se pueden pedir en la lista de estudiantes de un curso
+CAMPOS_ROSTER = {
+    "id_estudiante": Estudiante.id_estudiante,
+    "ci": Estudiante.ci,
+    "nombres": Estudiante.nombres,
+    "apellido_paterno": Estudiante.apellido_paterno,
+    "apellido_materno": Estudiante.apellido_materno,
+    "estado_estudiante": Estudiante.estado_estudiante
+}
+
+# Claves de ordenamiento; siempre terminan en id_estudiante para que el cursor sea único
+ORDENES_ROSTER = {
+    "apellidos": ["apellido_paterno", "apellido_materno", "nombres", "id_estudiante"],
+    "id": ["id_estudiante"]
+}
 
 class EstudianteCursoController:
     """
@@ -16,7 +42,11 @@ class EstudianteCursoController:
     @staticmethod
     def asignar_estudiante_a_curso(db: Session, id_estudiante: int, id_curso: int) -> dict:
         """
-        Asignar un estudiante a un curso
+        Asignar un estudiante a un curso.
+        Solo lee las columnas necesarias por clave primaria e inserta directamente
+        en la tabla de asociación; la clave primaria compuesta detecta duplicados.
+        El lugar se ocupa con un UPDATE condicional sobre el contador del curso;
+        si el curso está lleno, el estudiante pasa a la lista de espera.
         
         Args:
             db: Sesión de base de datos
@@ -24,48 +54,40 @@ class EstudianteCursoController:
             id_curso: ID del curso
             
         Returns:
-            Mensaje de confirmación
+            Mensaje de confirmación (con en_lista_espera=True si el curso estaba lleno)
             
         Raises:
             HTTPException: Si el estudiante o curso no existe, o si ya está asignado
         """
-        # Verificar que el estudiante existe
-        estudiante = db.query(Estudiante).filter(
-            Estudiante.id_estudiante == id_estudiante
-        ).first()
-        
-        if not estudiante:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Estudiante con ID {id_estudiante} no encontrado"
-            )
-        
-        # Verificar que el curso existe
-        curso = db.query(Curso).filter(Curso.id_curso == id_curso).first()
-        
-        if not curso:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Curso con ID {id_curso} no encontrado"
-            )
-        
-        # Verificar si ya está asignado
-        if curso in estudiante.cursos:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"El estudiante ya está asignado a este curso"
-            )
+        estudiante, curso = EstudianteCursoController._verificar_existencia(db, id_estudiante, id_curso)
         
         try:
+            if ContadorCursoController.reservar(db, id_curso, estudiante.estado_estudiante, 1) == 0:
+                return EstudianteCursoController._poner_en_espera(db, estudiante, curso, id_estudiante, id_curso)
+            
             # Asignar estudiante al curso
-            estudiante.cursos.append(curso)
+            db.execute(
+                insert(estudiantes_cursos).values(id_estudiante=id_estudiante, id_curso=id_curso)
+            )
+            if curso.capacidad is not None:
+                ListaEsperaController.quitar_inscritos(db, id_curso, [id_estudiante])
+            IndiceGestionController.sincronizar_estudiantes(db, [id_estudiante], [curso.gestion])
             db.commit()
+            invalidar_caches()
             
             return {
                 "mensaje": f"Estudiante {estudiante.nombres} {estudiante.apellido_paterno} asignado al curso {curso.nombre_curso}",
                 "id_estudiante": id_estudiante,
                 "id_curso": id_curso
             }
+        except HTTPException:
+            raise
+        except IntegrityError:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"El estudiante ya está asignado a este curso"
+            )
         except Exception as e:
             db.rollback()
             raise HTTPException(
@@ -73,10 +95,39 @@ class EstudianteCursoController:
                 detail=f"Error al asignar estudiante al curso: {str(e)}"
             )
     
+    @staticmethod
+    def _poner_en_espera(db: Session, estudiante, curso, id_estudiante: int, id_curso: int) -> dict:
+        """Agregar a la lista de espera a un estudiante que no entró en un curso lleno"""
+        ya_asignado = db.execute(
+            select(estudiantes_cursos.c.id_curso).where(
+                estudiantes_cursos.c.id_estudiante == id_estudiante,
+                estudiantes_cursos.c.id_curso == id_curso
+            )
+        ).first()
+        if ya_asignado:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"El estudiante ya está asignado a este curso"
+            )
+        
+        ListaEsperaController.agregar(db, id_curso, [id_estudiante])
+        db.commit()
+        posicion = ListaEsperaController.posicion(db, id_curso, id_estudiante)
+        
+        return {
+            "mensaje": f"El curso {curso.nombre_curso} está lleno: {estudiante.nombres} {estudiante.apellido_paterno} quedó en la lista de espera (posición {posicion})",
+            "id_estudiante": id_estudiante,
+            "id_curso": id_curso,
+            "en_lista_espera": True,
+            "posicion_lista_espera": posicion
+        }
+    
     @staticmethod
     def desasignar_estudiante_de_curso(db: Session, id_estudiante: int, id_curso: int) -> dict:
         """
-        Desasignar un estudiante de un curso
+        Desasignar un estudiante de un curso.
+        Elimina directamente la fila de la tabla de asociación por su clave primaria.
         
         Args:
             db: Sesión de base de datos
@@ -89,66 +140,328 @@ class EstudianteCursoController:
         Raises:
             HTTPException: Si el estudiante o curso no existe, o si no está asignado
         """
-        # Verificar que el estudiante existe
-        estudiante = db.query(Estudiante).filter(
-            Estudiante.id_estudiante == id_estudiante
-        ).first()
+        estudiante, curso = EstudianteCursoController._verificar_existencia(db, id_estudiante, id_curso)
         
-        if not estudiante:
+        try:
+            # Desasignar estudiante del curso
+            result = db.execute(
+                delete(estudiantes_cursos).where(
+                    estudiantes_cursos.c.id_estudiante == id_estudiante,
+                    estudiantes_cursos.c.id_curso == id_curso
+                )
+            )
+            
+            if result.rowcount == 0:
+                db.rollback()
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"El estudiante no está asignado a este curso"
+                )
+            
+            IndiceGestionController.sincronizar_estudiantes(db, [id_estudiante], [curso.gestion])
+            ContadorCursoController.ajustar(db, [(id_curso, estudiante.estado_estudiante, -1)])
+            db.commit()
+            invalidar_caches()
+            
+            return {
+                "mensaje": f"Estudiante {estudiante.nombres} {estudiante.apellido_paterno} desasignado del curso {curso.nombre_curso}",
+                "id_estudiante": id_estudiante,
+                "id_curso": id_curso
+            }
+        except HTTPException:
+            raise
+        except Exception as e:
+            db.rollback()
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Estudiante con ID {id_estudiante} no encontrado"
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error al desasignar estudiante del curso: {str(e)}"
             )
+    
+    @staticmethod
+    def procesar_lote(db: Session, lote: AsignacionLoteRequest) -> dict:
+        """
+        Aplicar un lote de asignaciones, desasignaciones y cambios de curso
+        en una sola transacción. Los IDs se validan con una consulta por tabla y
+        los cambios se escriben con un INSERT y un DELETE para todo el lote.
+        Se procesa primero 'desasignar', luego 'mover' y al final 'asignar'.
+        Los lugares de cada curso destino se ocupan con ContadorCursoController.reservar,
+        en el orden de las operaciones: una asignación que no entra queda en la lista
+        de espera y un cambio de curso que no entra no se aplica.
         
-        # Verificar que el curso existe
-        curso = db.query(Curso).filter(Curso.id_curso == id_curso).first()
+        Args:
+            db: Sesión de base de datos
+            lote: Operaciones a aplicar
+            
+        Returns:
+            Diccionario con el resultado de cada operación
+            
+        Raises:
+            HTTPException: Si el lote está vacío (400) o si otra petición asignó
+                alguno de sus pares al mismo tiempo (409)
+        """
+        ids_estudiantes = {op.id_estudiante for op in lote.asignar + lote.desasignar + lote.mover}
+        ids_cursos = {op.id_curso for op in lote.asignar + lote.desasignar}
+        ids_cursos.update(op.id_curso_origen for op in lote.mover)
+        ids_cursos.update(op.id_curso_destino for op in lote.mover)
         
-        if not curso:
+        if not ids_estudiantes:
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Curso con ID {id_curso} no encontrado"
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="El lote no contiene operaciones"
             )
         
-        # Verificar si está asignado
-        if curso not in estudiante.cursos:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"El estudiante no está asignado a este curso"
+        # Validar todos los IDs referenciados en bloque
+        estudiantes_existentes = {
+            fila.id_estudiante: fila.estado_estudiante
+            for fila in db.query(Estudiante.id_estudiante, Estudiante.estado_estudiante).filter(
+                Estudiante.id_estudiante.in_(ids_estudiantes)
+            )
+        }
+        cursos_existentes = {
+            fila.id_curso: fila
+            for fila in db.query(Curso.id_curso, Curso.gestion, Curso.capacidad).filter(Curso.id_curso.in_(ids_cursos))
+        }
+        
+        # Estado actual de las asignaciones involucradas
+        iniciales = {
+            (fila.id_estudiante, fila.id_curso)
+            for fila in db.execute(
+                select(estudiantes_cursos.c.id_estudiante, estudiantes_cursos.c.id_curso).where(
+                    estudiantes_cursos.c.id_estudiante.in_(ids_estudiantes),
+                    estudiantes_cursos.c.id_curso.in_(ids_cursos)
+                )
             )
+        }
+        finales = set(iniciales)
+        resultados = []
+        # Operación (índice en resultados) que agregó cada par y origen de cada cambio de curso
+        agregado_por = {}
+        origen_de = {}
+        
+        def validar(id_estudiante: int, *cursos: int) -> Optional[str]:
+            if id_estudiante not in estudiantes_existentes:
+                return "estudiante_no_encontrado"
+            if any(id_curso not in cursos_existentes for id_curso in cursos):
+                return "curso_no_encontrado"
+            return None
+        
+        for op in lote.desasignar:
+            par = (op.id_estudiante, op.id_curso)
+            resultado = validar(op.id_estudiante, op.id_curso)
+            if resultado is None:
+                resultado = "aplicado" if par in finales else "no_asignado"
+                finales.discard(par)
+            resultados.append({"operacion": "desasignar", "id_estudiante": op.id_estudiante,
+                               "id_curso": op.id_curso, "resultado": resultado})
+        
+        for op in lote.mover:
+            origen = (op.id_estudiante, op.id_curso_origen)
+            destino = (op.id_estudiante, op.id_curso_destino)
+            resultado = validar(op.id_estudiante, op.id_curso_origen, op.id_curso_destino)
+            if resultado is None:
+                if origen not in finales:
+                    resultado = "no_asignado"
+                else:
+                    resultado = "aplicado"
+                    finales.discard(origen)
+                    if destino not in finales:
+                        finales.add(destino)
+                        agregado_por[destino] = len(resultados)
+                        origen_de[destino] = origen
+            resultados.append({"operacion": "mover", "id_estudiante": op.id_estudiante,
+                               "id_curso": op.id_curso_origen, "id_curso_destino": op.id_curso_destino,
+                               "resultado": resultado})
+        
+        for op in lote.asignar:
+            par = (op.id_estudiante, op.id_curso)
+            resultado = validar(op.id_estudiante, op.id_curso)
+            if resultado is None:
+                if par in finales:
+                    resultado = "ya_asignado"
+                else:
+                    resultado = "aplicado"
+                    finales.add(par)
+                    agregado_por[par] = len(resultados)
+            resultados.append({"operacion": "asignar", "id_estudiante": op.id_estudiante,
+                               "id_curso": op.id_curso, "resultado": resultado})
         
         try:
-            # Desasignar estudiante del curso
-            estudiante.cursos.remove(curso)
-            db.commit()
+            # Primero se liberan los lugares de las desasignaciones, para que el lote pueda usarlos
+            liberadas = iniciales - finales - set(origen_de.values())
+            EstudianteCursoController._quitar_pares(db, liberadas, estudiantes_existentes)
             
-            return {
-                "mensaje": f"Estudiante {estudiante.nombres} {estudiante.apellido_paterno} desasignado del curso {curso.nombre_curso}",
-                "id_estudiante": id_estudiante,
-                "id_curso": id_curso
-            }
+            # Lugares por curso destino, en orden de id_curso (mismo orden de bloqueo en lotes concurrentes)
+            # y, dentro de cada curso, en el orden de las operaciones
+            pendientes = {}
+            for par in sorted(finales - iniciales, key=lambda par: agregado_por[par]):
+                pendientes.setdefault(par[1], []).append(par)
+            nuevas = set()
+            en_espera = {}
+            for id_curso in sorted(pendientes):
+                for estado in dict.fromkeys(estudiantes_existentes[e] for e, _ in pendientes[id_curso]):
+                    pares = [par for par in pendientes[id_curso] if estudiantes_existentes[par[0]] == estado]
+                    lugares = ContadorCursoController.reservar(db, id_curso, estado, len(pares))
+                    nuevas.update(pares[:lugares])
+                    for par in pares[lugares:]:
+                        finales.discard(par)
+                        indice = agregado_por[par]
+                        if par in origen_de:
+                            # El cambio de curso no entra: el estudiante sigue en el curso de origen
+                            finales.add(origen_de[par])
+                            resultados[indice]["resultado"] = "sin_cupo"
+                        else:
+                            resultados[indice]["resultado"] = "lista_espera"
+                            en_espera.setdefault(id_curso, []).append(par[0])
+            
+            if nuevas:
+                db.execute(
+                    insert(estudiantes_cursos),
+                    [{"id_estudiante": e, "id_curso": c} for e, c in sorted(nuevas)]
+                )
+                for id_curso in {c for _, c in nuevas if cursos_existentes[c].capacidad is not None}:
+                    ListaEsperaController.quitar_inscritos(db, id_curso, [e for e, c in nuevas if c == id_curso])
+            for id_curso, ids in en_espera.items():
+                ListaEsperaController.agregar(db, id_curso, ids)
+            
+            # Orígenes de los cambios de curso que sí se aplicaron
+            movidas = (iniciales - finales) - liberadas
+            EstudianteCursoController._quitar_pares(db, movidas, estudiantes_existentes)
+            
+            cambios = nuevas | liberadas | movidas
+            if cambios:
+                IndiceGestionController.sincronizar_estudiantes(
+                    db,
+                    {e for e, _ in cambios},
+                    {cursos_existentes[c].gestion for _, c in cambios}
+                )
+            
+            db.commit()
+            invalidar_caches()
+        except IntegrityError:
+            # Otra petición asignó alguno de los pares entre la lectura y el INSERT
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Otra operación modificó las asignaciones del lote al mismo tiempo. Intente nuevamente."
+            )
         except Exception as e:
             db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Error al desasignar estudiante del curso: {str(e)}"
+                detail=f"Error al aplicar el lote de asignaciones: {str(e)}"
+            )
+        
+        aplicadas = sum(1 for r in resultados if r["resultado"] == "aplicado")
+        
+        return {
+            "mensaje": f"Lote procesado: {aplicadas} operaciones aplicadas",
+            "aplicadas": aplicadas,
+            "omitidas": len(resultados) - aplicadas,
+            "resultados": resultados
+        }
+    
+    @staticmethod
+    def _quitar_pares(db: Session, pares: set, estados: dict) -> None:
+        """Borrar asignaciones (estudiante, curso) con un DELETE y descontarlas de los contadores"""
+        if not pares:
+            return
+        db.execute(
+            delete(estudiantes_cursos).where(
+                tuple_(estudiantes_cursos.c.id_estudiante, estudiantes_cursos.c.id_curso).in_(sorted(pares))
             )
+        )
+        ContadorCursoController.ajustar(db, [(c, estados[e], -1) for e, c in pares])
     
     @staticmethod
-    def obtener_estudiantes_de_curso(db: Session, id_curso: int) -> Curso:
+    def _verificar_existencia(db: Session, id_estudiante: int, id_curso: int) -> tuple:
         """
-        Obtener todos los estudiantes asignados a un curso
+        Verificar por clave primaria que el estudiante y el curso existen,
+        leyendo solo las columnas necesarias (sin cargar relaciones)
+        
+        Returns:
+            Tupla (estudiante, curso) con filas livianas
+            
+        Raises:
+            HTTPException: Si el estudiante o curso no existe
+        """
+        estudiante = db.query(
+            Estudiante.nombres,
+            Estudiante.apellido_paterno,
+            Estudiante.estado_estudiante
+        ).filter(
+            Estudiante.id_estudiante == id_estudiante
+        ).first()
+        
+        if not estudiante:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Estudiante con ID {id_estudiante} no encontrado"
+            )
+        
+        curso = db.query(
+            Curso.nombre_curso,
+            Curso.gestion,
+            Curso.capacidad
+        ).filter(
+            Curso.id_curso == id_curso
+        ).first()
+        
+        if not curso:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Curso con ID {id_curso} no encontrado"
+            )
+        
+        return estudiante, curso
+    
+    @staticmethod
+    def obtener_estudiantes_de_curso(
+        db: Session,
+        id_curso: int,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        orden: str = "apellidos",
+        descendente: bool = False,
+        estado: Optional[str] = None,
+        campos: Optional[List[str]] = None
+    ) -> dict:
+        """
+        Obtener los estudiantes asignados a un curso con una única consulta liviana,
+        ordenada en el servidor y paginada por cursor (keyset).
+        Si el curso no está entre los vigentes se busca en cursos_archivo.
         
         Args:
             db: Sesión de base de datos
             id_curso: ID del curso
+            limit: Cantidad máxima de estudiantes por página (None: todos)
+            cursor: Cursor devuelto por la página anterior
+            orden: 'apellidos' (paterno, materno, nombres) o 'id'
+            descendente: Invertir el orden
+            estado: Filtrar por estado del estudiante (opcional)
+            campos: Columnas a incluir por estudiante (id_estudiante siempre se incluye)
             
         Returns:
-            Curso con lista de estudiantes
+            Diccionario con los datos del curso, la página de estudiantes y el siguiente cursor
             
         Raises:
-            HTTPException: Si el curso no existe
+            HTTPException: Si el curso no existe o los parámetros no son válidos
         """
-        curso = db.query(Curso).filter(Curso.id_curso == id_curso).first()
+        inscripciones = estudiantes_cursos
+        curso = db.query(
+            Curso.id_curso,
+            Curso.nombre_curso,
+            Curso.nivel,
+            Curso.gestion
+        ).filter(Curso.id_curso == id_curso).first()
+        
+        if not curso:
+            inscripciones = estudiantes_cursos_archivo
+            curso = db.query(
+                CursoArchivado.id_curso,
+                CursoArchivado.nombre_curso,
+                CursoArchivado.nivel,
+                CursoArchivado.gestion
+            ).filter(CursoArchivado.id_curso == id_curso).first()
         
         if not curso:
             raise HTTPException(
@@ -156,7 +469,61 @@ class EstudianteCursoController:
                 detail=f"Curso con ID {id_curso} no encontrado"
             )
         
-        return curso
+        if orden not in ORDENES_ROSTER:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Orden inválido. Órdenes válidos: {', '.join(ORDENES_ROSTER)}"
+            )
+        
+        # Copia: la lista del llamador no se modifica al agregar id_estudiante
+        campos = list(campos or CAMPOS_ROSTER)
+        invalidos = [campo for campo in campos if campo not in CAMPOS_ROSTER]
+        if invalidos:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Campos inválidos: {', '.join(invalidos)}. Campos válidos: {', '.join(CAMPOS_ROSTER)}"
+            )
+        if "id_estudiante" not in campos:
+            campos.insert(0, "id_estudiante")
+        
+        claves = [CAMPOS_ROSTER[nombre] for nombre in ORDENES_ROSTER[orden]]
+        columnas = {nombre: CAMPOS_ROSTER[nombre] for nombre in set(campos) | set(ORDENES_ROSTER[orden])}
+        
+        query = (
+            select(*[columna.label(nombre) for nombre, columna in columnas.items()])
+            .select_from(inscripciones)
+            .join(Estudiante.__table__, Estudiante.id_estudiante == inscripciones.c.id_estudiante)
+            .where(inscripciones.c.id_curso == id_curso)
+            .order_by(*[clave.desc() if descendente else clave.asc() for clave in claves])
+        )
+        
+        if estado:
+            query = query.where(Estudiante.estado_estudiante == estado)
+        
+        if cursor:
+            valores = _decodificar_cursor(cursor, len(claves))
+            comparacion = tuple_(*claves) < tuple_(*valores) if descendente else tuple_(*claves) > tuple_(*valores)
+            query = query.where(comparacion)
+        
+        if limit:
+            # Se pide una fila extra para saber si hay página siguiente
+            query = query.limit(limit + 1)
+        
+        filas = db.execute(query).mappings().all()
+        
+        siguiente_cursor = None
+        if limit and len(filas) > limit:
+            filas = filas[:limit]
+            siguiente_cursor = _codificar_cursor([filas[-1][nombre] for nombre in ORDENES_ROSTER[orden]])
+        
+        return {
+            "id_curso": curso.id_curso,
+            "nombre_curso": curso.nombre_curso,
+            "nivel": curso.nivel,
+            "gestion": curso.gestion,
+            "estudiantes": [{campo: fila[campo] for campo in campos} for fila in filas],
+            "siguiente_cursor": siguiente_cursor
+        }
     
     @staticmethod
     def obtener_cursos_de_estudiante(db: Session, id_estudiante: int) -> Estudiante:
@@ -184,3 +551,23 @@ class EstudianteCursoController:
             )
         
         return estudiante
+
+
+def _codificar_cursor(valores: list) -> str:
+    """Codificar los valores de la última fila de una página como cursor opaco"""
+    return base64.urlsafe_b64encode(json.dumps(valores).encode("utf-8")).decode("ascii")
+
+def _decodificar_cursor(cursor: str, cantidad: int) -> list:
+    """Decodificar un cursor generado por _codificar_cursor"""
+    try:
+        valores = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except Exception:
+        valores = None
+    
+    if not isinstance(valores, list) or len(valores) != cantidad:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor de paginación inválido"
+        )
+    
+    return valores
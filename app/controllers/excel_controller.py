@@ -1,15 +1,27 @@
 """
 Controlador para importar y exportar datos de estudiantes desde/hacia Excel
+La lectura de la base de datos ocurre en la petición; la construcción y lectura
+de los libros se ejecuta en el pool de procesos con filas simples (tuplas).
+excel_procesos no importa pandas ni openpyxl al cargarse.
 """
 from sqlalchemy.orm import Session
+from sqlalchemy import insert, update, bindparam, func
 from fastapi import HTTPException, status, UploadFile
-from app.models.estudiante_model import Estudiante
-from typing import List, BinaryIO
-import pandas as pd
+from app.models.estudiante_model import Estudiante, estudiantes_cursos
+from app.models.curso_model import Curso
+from app.models.archivo_model import CursoArchivado, estudiantes_cursos_archivo
+from app.config.executor import ejecutar_en_pool
+from app.config.metricas import medir_excel
+from app.config.consultas import presupuesto_consultas
+from app.controllers import excel_procesos
+from app.config.cache import invalidar_caches
+from app.controllers.cohorte_controller import CohorteController
+from app.controllers.contador_curso_controller import ContadorCursoController
 from io import BytesIO
-from datetime import datetime
-import openpyxl
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from typing import Dict, List, Optional
+
+# Campos que debe traer una fila para crear un estudiante nuevo
+CAMPOS_OBLIGATORIOS = ('nombres', 'apellido_paterno', 'apellido_materno')
 
 class ExcelController:
     """
@@ -27,87 +39,21 @@ class ExcelController:
         Returns:
             BytesIO con el archivo Excel
         """
-        # Obtener todos los estudiantes
-        estudiantes = db.query(Estudiante).all()
-        
-        if not estudiantes:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="No hay estudiantes para exportar"
-            )
-        
-        # Crear lista de diccionarios con los datos
-        datos = []
-        for est in estudiantes:
-            datos.append({
-                'ID': est.id_estudiante,
-                'CI': est.ci,
-                'Nombres': est.nombres,
-                'Apellido Paterno': est.apellido_paterno,
-                'Apellido Materno': est.apellido_materno,
-                'Fecha Nacimiento': est.fecha_nacimiento.strftime('%Y-%m-%d') if est.fecha_nacimiento else '',
-                'Dirección': est.direccion or '',
-                'Estado': est.estado_estudiante,
-                'Nombre Padre': est.nombre_padre or '',
-                'Apellido Paterno Padre': est.apellido_paterno_padre or '',
-                'Apellido Materno Padre': est.apellido_materno_padre or '',
-                'Teléfono Padre': est.telefono_padre or '',
-                'Nombre Madre': est.nombre_madre or '',
-                'Apellido Paterno Madre': est.apellido_paterno_madre or '',
-                'Apellido Materno Madre': est.apellido_materno_madre or '',
-                'Teléfono Madre': est.telefono_madre or ''
-            })
-        
-        # Crear DataFrame
-        df = pd.DataFrame(datos)
-        
-        # Crear archivo Excel en memoria con formato
-        output = BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, index=False, sheet_name='Estudiantes')
+        with medir_excel("exportar") as medicion:
+            # Obtener todos los estudiantes como tuplas (sin objetos ORM ni relaciones)
+            columnas = [getattr(Estudiante, atributo) for _, atributo in excel_procesos.COLUMNAS_ESTUDIANTE]
+            filas = [tuple(fila) for fila in db.query(*columnas).order_by(Estudiante.id_estudiante)]
             
-            # Obtener el workbook y worksheet para aplicar estilos
-            workbook = writer.book
-            worksheet = writer.sheets['Estudiantes']
-            
-            # Estilos para el encabezado
-            header_fill = PatternFill(start_color='27C5DA', end_color='27C5DA', fill_type='solid')
-            header_font = Font(bold=True, color='FFFFFF', size=12)
-            header_alignment = Alignment(horizontal='center', vertical='center')
-            
-            # Aplicar estilos al encabezado
-            for cell in worksheet[1]:
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = header_alignment
-            
-            # Ajustar ancho de columnas
-            for column in worksheet.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                adjusted_width = min(max_length + 2, 50)
-                worksheet.column_dimensions[column_letter].width = adjusted_width
-            
-            # Agregar bordes
-            thin_border = Border(
-                left=Side(style='thin'),
-                right=Side(style='thin'),
-                top=Side(style='thin'),
-                bottom=Side(style='thin')
-            )
+            if not filas:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="No hay estudiantes para exportar"
+                )
             
-            for row in worksheet.iter_rows(min_row=1, max_row=len(datos)+1, min_col=1, max_col=len(df.columns)):
-                for cell in row:
-                    cell.border = thin_border
+            contenido = ejecutar_en_pool(excel_procesos.construir_libro_estudiantes, filas)
+            medicion["filas"] = len(filas)
         
-        output.seek(0)
-        return output
+        return BytesIO(contenido)
     
     @staticmethod
     def exportar_estudiante_por_id(db: Session, id_estudiante: int) -> BytesIO:
@@ -122,7 +68,8 @@ class ExcelController:
             BytesIO con el archivo Excel
         """
         # Obtener el estudiante
-        estudiante = db.query(Estudiante).filter(
+        columnas = [getattr(Estudiante, atributo) for _, atributo in excel_procesos.COLUMNAS_ESTUDIANTE]
+        estudiante = db.query(*columnas).filter(
             Estudiante.id_estudiante == id_estudiante
         ).first()
         
@@ -132,118 +79,44 @@ class ExcelController:
                 detail=f"Estudiante con ID {id_estudiante} no encontrado"
             )
         
-        # Crear diccionario con los datos del estudiante
-        datos = [{
-            'ID': estudiante.id_estudiante,
-            'CI': estudiante.ci,
-            'Nombres': estudiante.nombres,
-            'Apellido Paterno': estudiante.apellido_paterno,
-            'Apellido Materno': estudiante.apellido_materno,
-            'Fecha Nacimiento': estudiante.fecha_nacimiento.strftime('%Y-%m-%d') if estudiante.fecha_nacimiento else '',
-            'Dirección': estudiante.direccion or '',
-            'Estado': estudiante.estado_estudiante,
-            'Nombre Padre': estudiante.nombre_padre or '',
-            'Apellido Paterno Padre': estudiante.apellido_paterno_padre or '',
-            'Apellido Materno Padre': estudiante.apellido_materno_padre or '',
-            'Teléfono Padre': estudiante.telefono_padre or '',
-            'Nombre Madre': estudiante.nombre_madre or '',
-            'Apellido Paterno Madre': estudiante.apellido_paterno_madre or '',
-            'Apellido Materno Madre': estudiante.apellido_materno_madre or '',
-            'Teléfono Madre': estudiante.telefono_madre or ''
-        }]
+        # Obtener sus cursos: los vigentes y los de gestiones archivadas
+        cursos = [
+            tuple(curso)
+            for modelo, inscripciones in ((Curso, estudiantes_cursos), (CursoArchivado, estudiantes_cursos_archivo))
+            for curso in db.query(modelo.id_curso, modelo.nombre_curso, modelo.nivel, modelo.gestion)
+            .join(inscripciones, inscripciones.c.id_curso == modelo.id_curso)
+            .filter(inscripciones.c.id_estudiante == id_estudiante)
+        ]
         
-        # Crear DataFrame
-        df = pd.DataFrame(datos)
+        with medir_excel("exportar_estudiante") as medicion:
+            contenido = ejecutar_en_pool(excel_procesos.construir_libro_estudiante, tuple(estudiante), cursos)
+            medicion["filas"] = 1
         
-        # Crear archivo Excel en memoria con formato
-        output = BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, index=False, sheet_name='Estudiante')
-            
-            # Obtener el workbook y worksheet para aplicar estilos
-            workbook = writer.book
-            worksheet = writer.sheets['Estudiante']
-            
-            # Estilos para el encabezado
-            header_fill = PatternFill(start_color='27C5DA', end_color='27C5DA', fill_type='solid')
-            header_font = Font(bold=True, color='FFFFFF', size=12)
-            header_alignment = Alignment(horizontal='center', vertical='center')
-            
-            # Aplicar estilos al encabezado
-            for cell in worksheet[1]:
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = header_alignment
-            
-            # Ajustar ancho de columnas
-            for column in worksheet.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                adjusted_width = min(max_length + 2, 50)
-                worksheet.column_dimensions[column_letter].width = adjusted_width
-            
-            # Agregar bordes
-            thin_border = Border(
-                left=Side(style='thin'),
-                right=Side(style='thin'),
-                top=Side(style='thin'),
-                bottom=Side(style='thin')
-            )
-            
-            for row in worksheet.iter_rows(min_row=1, max_row=2, min_col=1, max_col=len(df.columns)):
-                for cell in row:
-                    cell.border = thin_border
+        return BytesIO(contenido)
+    
+    @staticmethod
+    def exportar_cohortes(db: Session, gestion_origen: str, gestion_destino: Optional[str] = None) -> BytesIO:
+        """
+        Exportar el reporte de retención de una cohorte a un archivo Excel
+        
+        Args:
+            db: Sesión de base de datos
+            gestion_origen: Gestión de la cohorte
+            gestion_destino: Gestión en la que se mide la retención (por defecto: la siguiente)
             
-            # Agregar información de cursos en una segunda hoja si tiene cursos
-            if estudiante.cursos:
-                cursos_data = []
-                for curso in estudiante.cursos:
-                    cursos_data.append({
-                        'ID Curso': curso.id_curso,
-                        'Nombre Curso': curso.nombre_curso,
-                        'Nivel': curso.nivel,
-                        'Gestión': curso.gestion
-                    })
-                
-                df_cursos = pd.DataFrame(cursos_data)
-                df_cursos.to_excel(writer, index=False, sheet_name='Cursos')
-                
-                worksheet_cursos = writer.sheets['Cursos']
-                
-                # Aplicar estilos al encabezado de cursos
-                for cell in worksheet_cursos[1]:
-                    cell.fill = header_fill
-                    cell.font = header_font
-                    cell.alignment = header_alignment
-                
-                # Ajustar ancho de columnas
-                for column in worksheet_cursos.columns:
-                    max_length = 0
-                    column_letter = column[0].column_letter
-                    for cell in column:
-                        try:
-                            if len(str(cell.value)) > max_length:
-                                max_length = len(str(cell.value))
-                        except:
-                            pass
-                    adjusted_width = min(max_length + 2, 30)
-                    worksheet_cursos.column_dimensions[column_letter].width = adjusted_width
-                
-                # Agregar bordes
-                for row in worksheet_cursos.iter_rows(min_row=1, max_row=len(cursos_data)+1, min_col=1, max_col=len(df_cursos.columns)):
-                    for cell in row:
-                        cell.border = thin_border
+        Returns:
+            BytesIO con el archivo Excel
+        """
+        with medir_excel("exportar_cohortes") as medicion:
+            # El reporte sale de la caché de cohortes si ya se calculó para este par de gestiones
+            reporte = CohorteController.obtener_reporte(db, gestion_origen, gestion_destino)
+            contenido = ejecutar_en_pool(excel_procesos.construir_libro_cohortes, reporte)
+            medicion["filas"] = len(reporte["por_curso"])
         
-        output.seek(0)
-        return output
+        return BytesIO(contenido)
     
     @staticmethod
+    @presupuesto_consultas(5)
     def importar_estudiantes(db: Session, file: UploadFile) -> dict:
         """
         Importar estudiantes desde un archivo Excel
@@ -262,14 +135,17 @@ class ExcelController:
                 detail="El archivo debe ser un Excel (.xlsx o .xls)"
             )
         
+        with medir_excel("importar") as medicion:
+            return ExcelController._importar_filas(db, file, medicion)
+    
+    @staticmethod
+    def _importar_filas(db: Session, file: UploadFile, medicion: dict) -> dict:
+        """Leer el archivo en el pool de procesos y crear o actualizar los estudiantes"""
         try:
-            # Leer el archivo Excel
+            # Leer el archivo Excel en el pool de procesos
             contents = file.file.read()
-            df = pd.read_excel(BytesIO(contents))
-            
-            # Validar columnas requeridas
-            columnas_requeridas = ['CI', 'Nombres', 'Apellido Paterno', 'Apellido Materno']
-            columnas_faltantes = [col for col in columnas_requeridas if col not in df.columns]
+            columnas_faltantes, filas, errores = ejecutar_en_pool(excel_procesos.leer_libro_estudiantes, contents)
+            medicion["filas"] = len(filas)
             
             if columnas_faltantes:
                 raise HTTPException(
@@ -277,58 +153,67 @@ class ExcelController:
                     detail=f"Faltan columnas requeridas: {', '.join(columnas_faltantes)}"
                 )
             
-            # Reemplazar NaN con None
-            df = df.where(pd.notna(df), None)
-            
             estudiantes_creados = 0
             estudiantes_actualizados = 0
-            errores = []
             
-            for index, row in df.iterrows():
-                try:
-                    # Verificar si el estudiante ya existe por CI
-                    estudiante_existente = None
-                    if row.get('CI'):
-                        estudiante_existente = db.query(Estudiante).filter(
-                            Estudiante.ci == str(row['CI'])
-                        ).first()
-                    
-                    # Preparar datos del estudiante
-                    datos_estudiante = {
-                        'ci': str(row['CI']) if row.get('CI') else None,
-                        'nombres': row['Nombres'],
-                        'apellido_paterno': row['Apellido Paterno'],
-                        'apellido_materno': row['Apellido Materno'],
-                        'fecha_nacimiento': pd.to_datetime(row['Fecha Nacimiento']).date() if row.get('Fecha Nacimiento') and pd.notna(row['Fecha Nacimiento']) else None,
-                        'direccion': row.get('Dirección'),
-                        'estado_estudiante': row.get('Estado', 'Activo'),
-                        'nombre_padre': row.get('Nombre Padre'),
-                        'apellido_paterno_padre': row.get('Apellido Paterno Padre'),
-                        'apellido_materno_padre': row.get('Apellido Materno Padre'),
-                        'telefono_padre': row.get('Teléfono Padre'),
-                        'nombre_madre': row.get('Nombre Madre'),
-                        'apellido_paterno_madre': row.get('Apellido Paterno Madre'),
-                        'apellido_materno_madre': row.get('Apellido Materno Madre'),
-                        'telefono_madre': row.get('Teléfono Madre')
-                    }
-                    
-                    if estudiante_existente:
-                        # Actualizar estudiante existente
-                        for campo, valor in datos_estudiante.items():
-                            if valor is not None:
-                                setattr(estudiante_existente, campo, valor)
-                        estudiantes_actualizados += 1
+            # Estudiantes existentes de todos los CIs del archivo, en una sola consulta
+            # (ante CIs repetidos en la base se actualiza el de menor ID)
+            cis = {datos_estudiante['ci'] for _, datos_estudiante in filas if datos_estudiante['ci']}
+            existentes = {
+                fila.ci: fila
+                for fila in db.query(
+                    Estudiante.id_estudiante, Estudiante.ci, Estudiante.estado_estudiante, Estudiante.version
+                ).filter(Estudiante.ci.in_(cis)).order_by(Estudiante.id_estudiante.desc())
+            } if cis else {}
+            
+            # Cambios por estudiante existente y estudiantes nuevos; si un CI se repite en
+            # el archivo, cada fila actualiza lo que dejó la anterior (los vacíos no pisan)
+            cambios: Dict[int, dict] = {}
+            nuevos_por_ci: Dict[str, dict] = {}
+            nuevos_sin_ci: List[dict] = []
+            
+            for numero_fila, datos_estudiante in filas:
+                completos = {campo: valor for campo, valor in datos_estudiante.items() if valor is not None}
+                existente = existentes.get(datos_estudiante['ci'])
+                
+                if existente:
+                    cambios.setdefault(existente.id_estudiante, {}).update(completos)
+                    estudiantes_actualizados += 1
+                elif datos_estudiante['ci'] in nuevos_por_ci:
+                    nuevos_por_ci[datos_estudiante['ci']].update(completos)
+                    estudiantes_actualizados += 1
+                else:
+                    faltantes = [campo for campo in CAMPOS_OBLIGATORIOS if not datos_estudiante.get(campo)]
+                    if faltantes:
+                        errores.append(f"Fila {numero_fila}: faltan {', '.join(faltantes)}")
+                        continue
+                    nuevo = {**datos_estudiante, 'estado_estudiante': datos_estudiante['estado_estudiante'] or 'Activo'}
+                    if datos_estudiante['ci']:
+                        nuevos_por_ci[datos_estudiante['ci']] = nuevo
                     else:
-                        # Crear nuevo estudiante
-                        nuevo_estudiante = Estudiante(**datos_estudiante)
-                        db.add(nuevo_estudiante)
-                        estudiantes_creados += 1
-                    
-                except Exception as e:
-                    errores.append(f"Fila {index + 2}: {str(e)}")
+                        nuevos_sin_ci.append(nuevo)
+                    estudiantes_creados += 1
+            
+            # Un INSERT y un UPDATE para todo el archivo (executemany). El INSERT va contra la
+            # tabla: el del ORM separa las filas según qué columnas vienen vacías
+            nuevos = list(nuevos_por_ci.values()) + nuevos_sin_ci
+            if nuevos:
+                db.execute(insert(Estudiante.__table__), nuevos)
+            if cambios:
+                ExcelController._actualizar_existentes(db, cambios, {fila.id_estudiante: fila for fila in existentes.values()})
+            
+            # Estudiantes existentes cuyo estado cambió: sus cursos recalculan los contadores por estado
+            cambios_estado = {
+                fila.id_estudiante
+                for fila in existentes.values()
+                if cambios.get(fila.id_estudiante, {}).get('estado_estudiante', fila.estado_estudiante) != fila.estado_estudiante
+            }
+            if cambios_estado:
+                ContadorCursoController.recalcular(db, ids_estudiantes=cambios_estado)
             
             # Confirmar cambios
             db.commit()
+            invalidar_caches()
             
             return {
                 "mensaje": "Importación completada",
@@ -339,6 +224,7 @@ class ExcelController:
             }
             
         except HTTPException:
+            db.rollback()
             raise
         except Exception as e:
             db.rollback()
@@ -347,6 +233,47 @@ class ExcelController:
                 detail=f"Error al procesar el archivo Excel: {str(e)}"
             )
     
+    @staticmethod
+    def _actualizar_existentes(db: Session, cambios: Dict[int, dict], existentes: Dict[int, object]) -> None:
+        """
+        Actualizar los estudiantes existentes con una sola sentencia (executemany).
+        Cada fila conserva los campos que no vienen en el archivo (COALESCE) y, como
+        el ORM, exige la versión leída e incrementa la versión.
+
+        Raises:
+            HTTPException: 409 si otro usuario modificó alguno de los estudiantes durante la importación
+        """
+        tabla = Estudiante.__table__
+        campos = sorted({campo for valores in cambios.values() for campo in valores})
+        sentencia = (
+            update(tabla)
+            .where(
+                tabla.c.id_estudiante == bindparam('b_id_estudiante'),
+                tabla.c.version == bindparam('b_version')
+            )
+            .values({
+                **{
+                    campo: func.coalesce(bindparam(f'b_{campo}', type_=tabla.c[campo].type), tabla.c[campo])
+                    for campo in campos
+                },
+                'version': tabla.c.version + 1
+            })
+        )
+        parametros = [
+            {
+                'b_id_estudiante': id_estudiante,
+                'b_version': existentes[id_estudiante].version,
+                **{f'b_{campo}': valores.get(campo) for campo in campos}
+            }
+            for id_estudiante, valores in cambios.items()
+        ]
+        
+        if db.execute(sentencia, parametros).rowcount != len(parametros):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Otro usuario modificó estudiantes del archivo durante la importación. Vuelva a importarlo."
+            )
+    
     @staticmethod
     def descargar_plantilla() -> BytesIO:
         """
@@ -355,101 +282,4 @@ class ExcelController:
         Returns:
             BytesIO con la plantilla Excel
         """
-        # Crear DataFrame con columnas y datos de ejemplo
-        datos_ejemplo = [{
-            'CI': '12345678',
-            'Nombres': 'Juan Carlos',
-            'Apellido Paterno': 'Pérez',
-            'Apellido Materno': 'García',
-            'Fecha Nacimiento': '2010-05-15',
-            'Dirección': 'Av. Principal #123',
-            'Estado': 'Activo',
-            'Nombre Padre': 'Carlos',
-            'Apellido Paterno Padre': 'Pérez',
-            'Apellido Materno Padre': 'López',
-            'Teléfono Padre': '70000001',
-            'Nombre Madre': 'María',
-            'Apellido Paterno Madre': 'García',
-            'Apellido Materno Madre': 'Rojas',
-            'Teléfono Madre': '70000002'
-        }]
-        
-        df = pd.DataFrame(datos_ejemplo)
-        
-        # Crear archivo Excel en memoria con formato
-        output = BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, index=False, sheet_name='Estudiantes')
-            
-            workbook = writer.book
-            worksheet = writer.sheets['Estudiantes']
-            
-            # Estilos para el encabezado
-            header_fill = PatternFill(start_color='3AC0B8', end_color='3AC0B8', fill_type='solid')
-            header_font = Font(bold=True, color='FFFFFF', size=12)
-            header_alignment = Alignment(horizontal='center', vertical='center')
-            
-            # Aplicar estilos al encabezado
-            for cell in worksheet[1]:
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = header_alignment
-            
-            # Ajustar ancho de columnas
-            for column in worksheet.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                adjusted_width = min(max_length + 2, 50)
-                worksheet.column_dimensions[column_letter].width = adjusted_width
-            
-            # Agregar instrucciones en una hoja separada
-            instrucciones = [
-                ['INSTRUCCIONES PARA IMPORTAR ESTUDIANTES'],
-                [''],
-                ['Columnas Requeridas (obligatorias):'],
-                ['- CI: Cédula de Identidad del estudiante'],
-                ['- Nombres: Nombres del estudiante'],
-                ['- Apellido Paterno: Apellido paterno del estudiante'],
-                ['- Apellido Materno: Apellido materno del estudiante'],
-                [''],
-                ['Columnas Opcionales:'],
-                ['- Fecha Nacimiento: Formato YYYY-MM-DD (ej: 2010-05-15)'],
-                ['- Dirección: Dirección del estudiante'],
-                ['- Estado: Activo, Retirado o Abandono (por defecto: Activo)'],
-                ['- Nombre Padre: Nombre del padre'],
-                ['- Apellido Paterno Padre: Apellido paterno del padre'],
-                ['- Apellido Materno Padre: Apellido materno del padre'],
-                ['- Teléfono Padre: Teléfono del padre'],
-                ['- Nombre Madre: Nombre de la madre'],
-                ['- Apellido Paterno Madre: Apellido paterno de la madre'],
-                ['- Apellido Materno Madre: Apellido materno de la madre'],
-                ['- Teléfono Madre: Teléfono de la madre'],
-                [''],
-                ['Notas Importantes:'],
-                ['1. Si el CI ya existe, se actualizará el estudiante'],
-                ['2. Si el CI no existe, se creará un nuevo estudiante'],
-                ['3. La primera fila contiene datos de ejemplo, puede eliminarla'],
-                ['4. No modifique los nombres de las columnas'],
-                ['5. Guarde el archivo como .xlsx antes de importar']
-            ]
-            
-            df_instrucciones = pd.DataFrame(instrucciones)
-            df_instrucciones.to_excel(writer, index=False, header=False, sheet_name='Instrucciones')
-            
-            worksheet_inst = writer.sheets['Instrucciones']
-            
-            # Estilo para el título
-            worksheet_inst['A1'].font = Font(bold=True, size=14, color='0B2E50')
-            worksheet_inst['A1'].fill = PatternFill(start_color='27C5DA', end_color='27C5DA', fill_type='solid')
-            
-            # Ajustar ancho de columna
-            worksheet_inst.column_dimensions['A'].width = 80
-        
-        output.seek(0)
-        return output
+        return BytesIO(ejecutar_en_pool(excel_procesos.construir_plantilla))
@@ -0,0 +1,332 @@
+"""
+Funciones puras para construir y leer libros Excel de estudiantes
+Se ejecutan en el pool de procesos (app.config.executor): reciben y devuelven solo
+tipos simples (tuplas, dicts, bytes) y no acceden a la base de datos
+
+pandas y openpyxl se importan dentro de cada función: el proceso web solo necesita
+las referencias a estas funciones y no carga la pila de Excel
+"""
+from io import BytesIO
+from typing import List, Optional, Tuple
+
+# Columnas del Excel de estudiantes y su atributo en el modelo, en orden
+COLUMNAS_ESTUDIANTE = [
+    ('ID', 'id_estudiante'),
+    ('CI', 'ci'),
+    ('Nombres', 'nombres'),
+    ('Apellido Paterno', 'apellido_paterno'),
+    ('Apellido Materno', 'apellido_materno'),
+    ('Fecha Nacimiento', 'fecha_nacimiento'),
+    ('Dirección', 'direccion'),
+    ('Estado', 'estado_estudiante'),
+    ('Nombre Padre', 'nombre_padre'),
+    ('Apellido Paterno Padre', 'apellido_paterno_padre'),
+    ('Apellido Materno Padre', 'apellido_materno_padre'),
+    ('Teléfono Padre', 'telefono_padre'),
+    ('Nombre Madre', 'nombre_madre'),
+    ('Apellido Paterno Madre', 'apellido_paterno_madre'),
+    ('Apellido Materno Madre', 'apellido_materno_madre'),
+    ('Teléfono Madre', 'telefono_madre')
+]
+
+# Columnas de la hoja de cursos de un estudiante
+COLUMNAS_CURSO = ['ID Curso', 'Nombre Curso', 'Nivel', 'Gestión']
+
+COLUMNAS_REQUERIDAS = ['CI', 'Nombres', 'Apellido Paterno', 'Apellido Materno']
+
+def _formatear_fila(fila: tuple) -> dict:
+    """Convertir una fila (en el orden de COLUMNAS_ESTUDIANTE) al formato de exportación"""
+    datos = {}
+    for (titulo, atributo), valor in zip(COLUMNAS_ESTUDIANTE, fila):
+        if atributo == 'fecha_nacimiento':
+            valor = valor.strftime('%Y-%m-%d') if valor else ''
+        elif atributo not in ('id_estudiante', 'ci', 'estado_estudiante'):
+            valor = valor or ''
+        datos[titulo] = valor
+    return datos
+
+def _aplicar_estilos(worksheet, filas: int, columnas: int, ancho_maximo: int, color: str = '27C5DA', bordes: bool = True) -> None:
+    """Aplicar estilos de encabezado, ancho de columnas y bordes a una hoja"""
+    from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+
+    header_fill = PatternFill(start_color=color, end_color=color, fill_type='solid')
+    header_font = Font(bold=True, color='FFFFFF', size=12)
+    header_alignment = Alignment(horizontal='center', vertical='center')
+
+    # Aplicar estilos al encabezado
+    for cell in worksheet[1]:
+        cell.fill = header_fill
+        cell.font = header_font
+        cell.alignment = header_alignment
+
+    # Ajustar ancho de columnas
+    for column in worksheet.columns:
+        max_length = 0
+        column_letter = column[0].column_letter
+        for cell in column:
+            try:
+                if len(str(cell.value)) > max_length:
+                    max_length = len(str(cell.value))
+            except:
+                pass
+        adjusted_width = min(max_length + 2, ancho_maximo)
+        worksheet.column_dimensions[column_letter].width = adjusted_width
+
+    # Agregar bordes
+    if bordes:
+        thin_border = Border(
+            left=Side(style='thin'),
+            right=Side(style='thin'),
+            top=Side(style='thin'),
+            bottom=Side(style='thin')
+        )
+        for row in worksheet.iter_rows(min_row=1, max_row=filas + 1, min_col=1, max_col=columnas):
+            for cell in row:
+                cell.border = thin_border
+
+def construir_libro_estudiantes(filas: List[tuple]) -> bytes:
+    """
+    Construir el Excel con todos los estudiantes
+
+    Args:
+        filas: Tuplas en el orden de COLUMNAS_ESTUDIANTE
+
+    Returns:
+        Contenido del archivo .xlsx
+    """
+    import pandas as pd
+
+    df = pd.DataFrame([_formatear_fila(fila) for fila in filas], columns=[t for t, _ in COLUMNAS_ESTUDIANTE])
+
+    output = BytesIO()
+    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+        df.to_excel(writer, index=False, sheet_name='Estudiantes')
+        _aplicar_estilos(writer.sheets['Estudiantes'], len(df), len(df.columns), 50)
+
+    return output.getvalue()
+
+def construir_libro_estudiante(fila: tuple, cursos: List[tuple]) -> bytes:
+    """
+    Construir el Excel de un estudiante, con una segunda hoja para sus cursos
+
+    Args:
+        fila: Tupla del estudiante en el orden de COLUMNAS_ESTUDIANTE
+        cursos: Tuplas (id_curso, nombre_curso, nivel, gestion)
+
+    Returns:
+        Contenido del archivo .xlsx
+    """
+    import pandas as pd
+
+    df = pd.DataFrame([_formatear_fila(fila)])
+
+    output = BytesIO()
+    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+        df.to_excel(writer, index=False, sheet_name='Estudiante')
+        _aplicar_estilos(writer.sheets['Estudiante'], 1, len(df.columns), 50)
+
+        # Agregar información de cursos en una segunda hoja si tiene cursos
+        if cursos:
+            df_cursos = pd.DataFrame([list(curso) for curso in cursos], columns=COLUMNAS_CURSO)
+            df_cursos.to_excel(writer, index=False, sheet_name='Cursos')
+            _aplicar_estilos(writer.sheets['Cursos'], len(df_cursos), len(df_cursos.columns), 30)
+
+    return output.getvalue()
+
+# Columnas de las hojas de cohortes: (título, clave en el reporte)
+COLUMNAS_TASAS_COHORTE = [
+    ('Cohorte', 'cohorte'),
+    ('Retenidos', 'retenidos'),
+    ('Inscritos no activos', 'inscritos_no_activos'),
+    ('Abandonos', 'abandonos'),
+    ('Retiros', 'retiros'),
+    ('Sin reinscripción', 'sin_reinscripcion'),
+    ('Tasa retención', 'tasa_retencion'),
+    ('Tasa abandono', 'tasa_abandono'),
+    ('Tasa retiro', 'tasa_retiro')
+]
+
+def construir_libro_cohortes(reporte: dict) -> bytes:
+    """
+    Construir el Excel del reporte de retención entre dos gestiones
+
+    Args:
+        reporte: Diccionario devuelto por CohorteController.obtener_reporte
+
+    Returns:
+        Contenido del archivo .xlsx (hojas Resumen, Por nivel, Por curso y Transiciones)
+    """
+    import pandas as pd
+
+    def tabla(filas: List[dict], claves_previas: List[Tuple[str, str]]) -> 'pd.DataFrame':
+        columnas = claves_previas + COLUMNAS_TASAS_COHORTE
+        return pd.DataFrame(
+            [[fila[clave] for _, clave in columnas] for fila in filas],
+            columns=[titulo for titulo, _ in columnas]
+        )
+
+    hojas = {
+        'Resumen': tabla(
+            [{**reporte['resumen'], 'gestion_origen': reporte['gestion_origen'], 'gestion_destino': reporte['gestion_destino']}],
+            [('Gestión origen', 'gestion_origen'), ('Gestión destino', 'gestion_destino')]
+        ),
+        'Por nivel': tabla(reporte['por_nivel'], [('Nivel', 'nivel')]),
+        'Por curso': tabla(
+            reporte['por_curso'],
+            [('ID Curso', 'id_curso'), ('Nombre Curso', 'nombre_curso'), ('Nivel', 'nivel')]
+        ),
+        'Transiciones': pd.DataFrame(
+            [
+                [t['nivel_origen'], t['nivel_destino'] or 'Sin inscripción', t['estudiantes']]
+                for t in reporte['transiciones']
+            ],
+            columns=['Nivel origen', 'Nivel destino', 'Estudiantes']
+        ),
+    }
+
+    output = BytesIO()
+    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+        for nombre, df in hojas.items():
+            df.to_excel(writer, index=False, sheet_name=nombre)
+            _aplicar_estilos(writer.sheets[nombre], len(df), len(df.columns), 30)
+
+    return output.getvalue()
+
+def construir_plantilla() -> bytes:
+    """
+    Construir la plantilla Excel vacía para importar estudiantes
+
+    Returns:
+        Contenido del archivo .xlsx
+    """
+    import pandas as pd
+    from openpyxl.styles import Font, PatternFill
+
+    # Crear DataFrame con columnas y datos de ejemplo
+    datos_ejemplo = [{
+        'CI': '12345678',
+        'Nombres': 'Juan Carlos',
+        'Apellido Paterno': 'Pérez',
+        'Apellido Materno': 'García',
+        'Fecha Nacimiento': '2010-05-15',
+        'Dirección': 'Av. Principal #123',
+        'Estado': 'Activo',
+        'Nombre Padre': 'Carlos',
+        'Apellido Paterno Padre': 'Pérez',
+        'Apellido Materno Padre': 'López',
+        'Teléfono Padre': '70000001',
+        'Nombre Madre': 'María',
+        'Apellido Paterno Madre': 'García',
+        'Apellido Materno Madre': 'Rojas',
+        'Teléfono Madre': '70000002'
+    }]
+
+    df = pd.DataFrame(datos_ejemplo)
+
+    output = BytesIO()
+    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+        df.to_excel(writer, index=False, sheet_name='Estudiantes')
+        _aplicar_estilos(writer.sheets['Estudiantes'], len(df), len(df.columns), 50, color='3AC0B8', bordes=False)
+
+        # Agregar instrucciones en una hoja separada
+        instrucciones = [
+            ['INSTRUCCIONES PARA IMPORTAR ESTUDIANTES'],
+            [''],
+            ['Columnas Requeridas (obligatorias):'],
+            ['- CI: Cédula de Identidad del estudiante'],
+            ['- Nombres: Nombres del estudiante'],
+            ['- Apellido Paterno: Apellido paterno del estudiante'],
+            ['- Apellido Materno: Apellido materno del estudiante'],
+            [''],
+            ['Columnas Opcionales:'],
+            ['- Fecha Nacimiento: Formato YYYY-MM-DD (ej: 2010-05-15)'],
+            ['- Dirección: Dirección del estudiante'],
+            ['- Estado: Activo, Retirado o Abandono (por defecto: Activo)'],
+            ['- Nombre Padre: Nombre del padre'],
+            ['- Apellido Paterno Padre: Apellido paterno del padre'],
+            ['- Apellido Materno Padre: Apellido materno del padre'],
+            ['- Teléfono Padre: Teléfono del padre'],
+            ['- Nombre Madre: Nombre de la madre'],
+            ['- Apellido Paterno Madre: Apellido paterno de la madre'],
+            ['- Apellido Materno Madre: Apellido materno de la madre'],
+            ['- Teléfono Madre: Teléfono de la madre'],
+            [''],
+            ['Notas Importantes:'],
+            ['1. Si el CI ya existe, se actualizará el estudiante'],
+            ['2. Si el CI no existe, se creará un nuevo estudiante'],
+            ['3. La primera fila contiene datos de ejemplo, puede eliminarla'],
+            ['4. No modifique los nombres de las columnas'],
+            ['5. Guarde el archivo como .xlsx antes de importar']
+        ]
+
+        df_instrucciones = pd.DataFrame(instrucciones)
+        df_instrucciones.to_excel(writer, index=False, header=False, sheet_name='Instrucciones')
+
+        worksheet_inst = writer.sheets['Instrucciones']
+
+        # Estilo para el título
+        worksheet_inst['A1'].font = Font(bold=True, size=14, color='0B2E50')
+        worksheet_inst['A1'].fill = PatternFill(start_color='27C5DA', end_color='27C5DA', fill_type='solid')
+
+        # Ajustar ancho de columna
+        worksheet_inst.column_dimensions['A'].width = 80
+
+    return output.getvalue()
+
+def _normalizar_ci(valor) -> Optional[str]:
+    """CI como texto; Excel guarda los CIs sin formato de texto como números (1234567.0)"""
+    if not valor:
+        return None
+    if isinstance(valor, float) and valor.is_integer():
+        return str(int(valor))
+    return str(valor)
+
+def leer_libro_estudiantes(contenido: bytes) -> Tuple[Optional[List[str]], List[Tuple[int, dict]], List[str]]:
+    """
+    Leer y normalizar las filas de un Excel de estudiantes
+
+    Args:
+        contenido: Bytes del archivo subido
+
+    Returns:
+        Tupla (columnas_faltantes, filas, errores). filas contiene pares
+        (número de fila en el Excel, datos del estudiante listos para el modelo)
+    """
+    import pandas as pd
+
+    df = pd.read_excel(BytesIO(contenido))
+
+    # Validar columnas requeridas
+    columnas_faltantes = [col for col in COLUMNAS_REQUERIDAS if col not in df.columns]
+    if columnas_faltantes:
+        return columnas_faltantes, [], []
+
+    # Reemplazar NaN con None
+    df = df.astype(object).where(pd.notna(df), None)
+
+    filas = []
+    errores = []
+
+    for index, row in df.iterrows():
+        try:
+            filas.append((index + 2, {
+                'ci': _normalizar_ci(row.get('CI')),
+                'nombres': row['Nombres'],
+                'apellido_paterno': row['Apellido Paterno'],
+                'apellido_materno': row['Apellido Materno'],
+                'fecha_nacimiento': pd.to_datetime(row['Fecha Nacimiento']).date() if row.get('Fecha Nacimiento') and pd.notna(row['Fecha Nacimiento']) else None,
+                'direccion': row.get('Dirección'),
+                'estado_estudiante': row.get('Estado', 'Activo'),
+                'nombre_padre': row.get('Nombre Padre'),
+                'apellido_paterno_padre': row.get('Apellido Paterno Padre'),
+                'apellido_materno_padre': row.get('Apellido Materno Padre'),
+                'telefono_padre': row.get('Teléfono Padre'),
+                'nombre_madre': row.get('Nombre Madre'),
+                'apellido_paterno_madre': row.get('Apellido Paterno Madre'),
+                'apellido_materno_madre': row.get('Apellido Materno Madre'),
+                'telefono_madre': row.get('Teléfono Madre')
+            }))
+        except Exception as e:
+            errores.append(f"Fila {index + 2}: {str(e)}")
+
+    return None, filas, errores
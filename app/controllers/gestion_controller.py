@@ -0,0 +1,251 @@
+"""
+Controlador para el catálogo de gestiones
+Las gestiones se registran al crear, copiar o promover cursos, dentro de la misma
+transacción; la gestión actual reemplaza al año del reloj como valor por defecto
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import select, insert, update
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.exc import IntegrityError
+from fastapi import HTTPException, status
+from typing import Iterable, List, Optional
+from app.models.gestion_model import Gestion
+from app.models.curso_model import Curso
+from app.schemas.gestion_schema import GestionCreate, GestionUpdate
+from app.config.cache import invalidar_caches
+
+class GestionController:
+    """
+    Controlador para registrar, listar y marcar gestiones
+    """
+
+    @staticmethod
+    def registrar(db: Session, gestiones: Iterable[str]) -> None:
+        """
+        Agregar al catálogo las gestiones que todavía no están. No confirma la transacción.
+
+        Args:
+            db: Sesión de base de datos
+            gestiones: Gestiones usadas por los cursos escritos
+
+        Raises:
+            HTTPException: Si alguna gestión está archivada (sus cursos no se pueden modificar)
+        """
+        gestiones = set(gestiones)
+        if not gestiones:
+            return
+
+        existentes = {
+            fila.gestion: fila.archivada
+            for fila in db.execute(
+                select(Gestion.gestion, Gestion.archivada).where(Gestion.gestion.in_(gestiones))
+            )
+        }
+        archivadas = sorted(gestion for gestion, archivada in existentes.items() if archivada)
+        if archivadas:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"La gestión {', '.join(archivadas)} está archivada; restáurela antes de modificar sus cursos"
+            )
+        nuevas = sorted(gestiones - set(existentes))
+        if nuevas:
+            GestionController._insertar_si_faltan(db, nuevas)
+
+    @staticmethod
+    def _insertar_si_faltan(db: Session, gestiones: List[str]) -> None:
+        """
+        Insertar gestiones ignorando las que otra transacción registró después del
+        SELECT de registrar (dos peticiones que crean cursos de una gestión nueva a la
+        vez); un INSERT simple fallaría con IntegrityError en la segunda
+        """
+        filas = [{"gestion": gestion} for gestion in gestiones]
+        dialecto = db.get_bind().dialect.name
+        if dialecto == "mysql":
+            sentencia = mysql.insert(Gestion)
+            db.execute(sentencia.on_duplicate_key_update(gestion=sentencia.inserted.gestion), filas)
+        elif dialecto == "sqlite":
+            db.execute(sqlite.insert(Gestion).on_conflict_do_nothing(index_elements=["gestion"]), filas)
+        else:
+            for fila in filas:
+                try:
+                    with db.begin_nested():
+                        db.execute(insert(Gestion), [fila])
+                except IntegrityError:
+                    pass
+
+    @staticmethod
+    def sincronizar(db: Session) -> int:
+        """
+        Registrar las gestiones de los cursos existentes que falten en el catálogo
+        (al migrar una base anterior al catálogo). No confirma la transacción.
+
+        Returns:
+            Cantidad de gestiones agregadas
+        """
+        en_cursos = set(db.execute(select(Curso.gestion).distinct()).scalars())
+        en_catalogo = set(db.execute(select(Gestion.gestion)).scalars())
+        GestionController.registrar(db, en_cursos - en_catalogo)
+        return len(en_cursos - en_catalogo)
+
+    @staticmethod
+    def sincronizar_si_vacio(db: Session) -> bool:
+        """
+        Completar el catálogo si está vacío y ya existen cursos: una base anterior al
+        catálogo que se actualizó sin `python manage.py crear-tablas`. Confirma la transacción.
+
+        Returns:
+            True si se registraron gestiones
+        """
+        if db.execute(select(Gestion.gestion).limit(1)).first() is not None:
+            return False
+        if db.execute(select(Curso.id_curso).limit(1)).first() is None:
+            return False
+        try:
+            agregadas = GestionController.sincronizar(db)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        invalidar_caches()
+        return agregadas > 0
+
+    @staticmethod
+    def obtener_actual(db: Session) -> Optional[str]:
+        """
+        Gestión por defecto de los listados: la marcada como actual o, si ninguna
+        lo está, la mayor del catálogo
+
+        Args:
+            db: Sesión de base de datos
+
+        Returns:
+            Gestión actual, o None si no hay cursos ni gestiones registradas
+        """
+        actual = db.execute(select(Gestion.gestion).where(Gestion.actual.is_(True)).limit(1)).scalar()
+        if actual is None:
+            actual = db.execute(select(Gestion.gestion).order_by(Gestion.gestion.desc()).limit(1)).scalar()
+        if actual is None and GestionController.sincronizar_si_vacio(db):
+            return GestionController.obtener_actual(db)
+        return actual
+
+    @staticmethod
+    def obtener_todas(db: Session) -> List[Gestion]:
+        """
+        Obtener el catálogo ordenado de la gestión más reciente a la más antigua
+
+        Args:
+            db: Sesión de base de datos
+
+        Returns:
+            Lista de gestiones
+        """
+        gestiones = db.query(Gestion).order_by(Gestion.gestion.desc()).all()
+        if not gestiones and GestionController.sincronizar_si_vacio(db):
+            gestiones = db.query(Gestion).order_by(Gestion.gestion.desc()).all()
+        return gestiones
+
+    @staticmethod
+    def obtener_por_id(db: Session, gestion: str) -> Gestion:
+        """
+        Obtener una gestión del catálogo por clave primaria
+
+        Raises:
+            HTTPException: Si la gestión no está en el catálogo
+        """
+        registro = db.get(Gestion, gestion)
+        if not registro:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Gestión {gestion} no encontrada"
+            )
+        return registro
+
+    @staticmethod
+    def crear(db: Session, datos: GestionCreate) -> Gestion:
+        """
+        Registrar una gestión antes de crear sus cursos (por ejemplo, para marcarla como actual)
+
+        Args:
+            db: Sesión de base de datos
+            datos: Gestión y si pasa a ser la actual
+
+        Returns:
+            Gestión creada
+
+        Raises:
+            HTTPException: Si la gestión ya está en el catálogo
+        """
+        if db.get(Gestion, datos.gestion):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"La gestión {datos.gestion} ya existe"
+            )
+
+        try:
+            if datos.actual:
+                db.execute(update(Gestion).where(Gestion.actual.is_(True)).values(actual=False))
+            registro = Gestion(gestion=datos.gestion, actual=datos.actual)
+            db.add(registro)
+            db.commit()
+            invalidar_caches()
+            db.refresh(registro)
+            return registro
+        except Exception as e:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error al crear gestión: {str(e)}"
+            )
+
+    @staticmethod
+    def actualizar(db: Session, gestion: str, datos: GestionUpdate) -> Gestion:
+        """
+        Marcar una gestión como actual o como cerrada
+
+        Args:
+            db: Sesión de base de datos
+            gestion: Gestión a actualizar
+            datos: Campos a cambiar
+
+        Returns:
+            Gestión actualizada
+
+        Raises:
+            HTTPException: Si la gestión no existe (404), si quedaría actual y cerrada a la vez
+                o si está archivada (400)
+        """
+        registro = GestionController.obtener_por_id(db, gestion)
+        cambios = {
+            campo: valor for campo, valor in datos.model_dump(exclude_unset=True).items()
+            if valor is not None and getattr(registro, campo) != valor
+        }
+        if not cambios:
+            return registro
+
+        if registro.archivada:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"La gestión {gestion} está archivada; restáurela antes de cambiarla"
+            )
+
+        if cambios.get('actual', registro.actual) and cambios.get('cerrada', registro.cerrada):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="La gestión actual no puede estar cerrada"
+            )
+
+        try:
+            if cambios.get('actual'):
+                db.execute(update(Gestion).where(Gestion.actual.is_(True)).values(actual=False))
+            for campo, valor in cambios.items():
+                setattr(registro, campo, valor)
+            db.commit()
+            invalidar_caches()
+            db.refresh(registro)
+            return registro
+        except Exception as e:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error al actualizar gestión: {str(e)}"
+            )
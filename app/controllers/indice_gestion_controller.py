@@ -0,0 +1,122 @@
+"""
+Controlador para mantener el índice de inscripciones por gestión (estudiantes_gestiones)
+Cada escritura sobre estudiantes_cursos debe sincronizarlo dentro de su misma transacción.
+El índice también cubre las gestiones archivadas (estudiantes_cursos_archivo).
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import delete, insert, select, func, union
+from typing import Iterable, Optional
+from app.config.database import SessionLocal
+from app.models.estudiante_model import estudiantes_cursos
+from app.models.estudiante_gestion_model import estudiantes_gestiones
+from app.models.curso_model import Curso
+from app.models.archivo_model import CursoArchivado, estudiantes_cursos_archivo
+
+# Pares (estudiante, gestión) de las inscripciones archivadas
+_origen_archivo = (
+    select(estudiantes_cursos_archivo.c.id_estudiante, CursoArchivado.gestion)
+    .join(CursoArchivado, CursoArchivado.id_curso == estudiantes_cursos_archivo.c.id_curso)
+)
+
+class IndiceGestionController:
+    """
+    Controlador para sincronizar el índice (id_estudiante, gestion).
+    Ningún método confirma la transacción: lo hace quien realiza la escritura.
+    """
+
+    @staticmethod
+    def sincronizar_estudiantes(
+        db: Session,
+        ids_estudiantes: Iterable[int],
+        gestiones: Optional[Iterable[str]] = None
+    ) -> None:
+        """
+        Recalcular el índice de un conjunto de estudiantes
+
+        Args:
+            db: Sesión de base de datos
+            ids_estudiantes: IDs de los estudiantes afectados
+            gestiones: Limitar el recálculo a estas gestiones vigentes (opcional; sin ellas
+                se recalculan todas, incluidas las archivadas)
+        """
+        ids = list(set(ids_estudiantes))
+        if not ids:
+            return
+
+        borrar = delete(estudiantes_gestiones).where(estudiantes_gestiones.c.id_estudiante.in_(ids))
+        origen = (
+            select(estudiantes_cursos.c.id_estudiante, Curso.gestion)
+            .join(Curso, Curso.id_curso == estudiantes_cursos.c.id_curso)
+            .where(estudiantes_cursos.c.id_estudiante.in_(ids))
+        )
+
+        if gestiones is not None:
+            gestiones = list(set(gestiones))
+            borrar = borrar.where(estudiantes_gestiones.c.gestion.in_(gestiones))
+            origen = origen.where(Curso.gestion.in_(gestiones)).distinct()
+        else:
+            # UNION (no ALL) ya descarta los pares repetidos
+            origen = union(origen, _origen_archivo.where(estudiantes_cursos_archivo.c.id_estudiante.in_(ids)))
+
+        db.execute(borrar)
+        db.execute(insert(estudiantes_gestiones).from_select(['id_estudiante', 'gestion'], origen))
+
+    @staticmethod
+    def sincronizar_gestion(db: Session, gestion: str) -> None:
+        """
+        Recalcular el índice completo de una gestión
+
+        Args:
+            db: Sesión de base de datos
+            gestion: Gestión a recalcular
+        """
+        db.execute(delete(estudiantes_gestiones).where(estudiantes_gestiones.c.gestion == gestion))
+        db.execute(
+            insert(estudiantes_gestiones).from_select(
+                ['id_estudiante', 'gestion'],
+                select(estudiantes_cursos.c.id_estudiante, Curso.gestion)
+                .join(Curso, Curso.id_curso == estudiantes_cursos.c.id_curso)
+                .where(Curso.gestion == gestion)
+                .distinct()
+            )
+        )
+
+    @staticmethod
+    def reconstruir(db: Session) -> None:
+        """
+        Reconstruir el índice completo a partir de estudiantes_cursos y estudiantes_cursos_archivo
+
+        Args:
+            db: Sesión de base de datos
+        """
+        db.execute(delete(estudiantes_gestiones))
+        db.execute(
+            insert(estudiantes_gestiones).from_select(
+                ['id_estudiante', 'gestion'],
+                select(estudiantes_cursos.c.id_estudiante, Curso.gestion)
+                .join(Curso, Curso.id_curso == estudiantes_cursos.c.id_curso)
+                .distinct()
+            )
+        )
+        db.execute(
+            insert(estudiantes_gestiones).from_select(['id_estudiante', 'gestion'], _origen_archivo.distinct())
+        )
+
+    @staticmethod
+    def reconstruir_si_vacio() -> None:
+        """
+        Poblar el índice al iniciar si la tabla es nueva y ya existen inscripciones
+        """
+        db = SessionLocal()
+        try:
+            indice_vacio = db.execute(select(func.count()).select_from(estudiantes_gestiones)).scalar() == 0
+            hay_inscripciones = db.execute(select(estudiantes_cursos.c.id_curso).limit(1)).first() is not None
+
+            if indice_vacio and hay_inscripciones:
+                IndiceGestionController.reconstruir(db)
+                db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
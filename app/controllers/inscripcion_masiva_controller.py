@@ -2,11 +2,20 @@
 Controlador para inscripción masiva de estudiantes
 """
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import text, select, insert, func
 from fastapi import HTTPException, status
 from typing import List
 from app.models.curso_model import Curso
-from app.models.estudiante_model import Estudiante
+from app.models.gestion_model import Gestion
+from app.models.archivo_model import CursoArchivado
+from app.models.estudiante_model import Estudiante, estudiantes_cursos
+from app.controllers.indice_gestion_controller import IndiceGestionController
+from app.controllers.contador_curso_controller import ContadorCursoController
+from app.controllers.lista_espera_controller import ListaEsperaController
+from app.controllers.archivo_controller import ArchivoController
+from app.controllers.gestion_controller import GestionController
+from app.config.consultas import presupuesto_consultas
+from app.config.cache import invalidar_caches
 
 class InscripcionMasivaController:
     """
@@ -17,17 +26,18 @@ class InscripcionMasivaController:
     def obtener_gestiones_disponibles(db: Session) -> List[dict]:
         """
         Obtener lista de gestiones disponibles ordenadas descendentemente
+        (desde el catálogo de gestiones, sin recorrer los cursos)
         
         Args:
             db: Sesión de base de datos
             
         Returns:
-            Lista de gestiones únicas
+            Lista de gestiones con la marca de gestión actual
         """
-        sql = text("SELECT DISTINCT gestion FROM cursos ORDER BY gestion DESC")
-        result = db.execute(sql)
-        
-        gestiones = [{"gestion": row[0]} for row in result]
+        consulta = select(Gestion.gestion, Gestion.actual).order_by(Gestion.gestion.desc())
+        gestiones = [{"gestion": row.gestion, "actual": row.actual} for row in db.execute(consulta)]
+        if not gestiones and GestionController.sincronizar_si_vacio(db):
+            gestiones = [{"gestion": row.gestion, "actual": row.actual} for row in db.execute(consulta)]
         
         if not gestiones:
             raise HTTPException(
@@ -40,7 +50,7 @@ class InscripcionMasivaController:
     @staticmethod
     def obtener_cursos_por_gestion(db: Session, gestion: str) -> List[dict]:
         """
-        Obtener cursos de una gestión específica
+        Obtener cursos de una gestión específica (vigente o archivada)
         
         Args:
             db: Sesión de base de datos
@@ -49,15 +59,16 @@ class InscripcionMasivaController:
         Returns:
             Lista de cursos con id, nombre y nivel
         """
+        modelo = CursoArchivado if ArchivoController.esta_archivada(db, gestion) else Curso
         cursos = db.query(
-            Curso.id_curso,
-            Curso.nombre_curso,
-            Curso.nivel
+            modelo.id_curso,
+            modelo.nombre_curso,
+            modelo.nivel
         ).filter(
-            Curso.gestion == gestion
+            modelo.gestion == gestion
         ).order_by(
-            Curso.nivel,
-            Curso.nombre_curso
+            modelo.nivel,
+            modelo.nombre_curso
         ).all()
         
         if not cursos:
@@ -93,8 +104,12 @@ class InscripcionMasivaController:
         Returns:
             Lista de estudiantes con información de inscripción
         """
-        # Verificar que el curso origen existe
-        curso_origen = db.query(Curso).filter(Curso.id_curso == id_curso_origen).first()
+        # Verificar que el curso origen existe (puede ser de una gestión archivada)
+        tabla_inscripciones = "estudiantes_cursos"
+        curso_origen = db.query(Curso.nombre_curso).filter(Curso.id_curso == id_curso_origen).first()
+        if not curso_origen:
+            tabla_inscripciones = "estudiantes_cursos_archivo"
+            curso_origen = db.query(CursoArchivado.nombre_curso).filter(CursoArchivado.id_curso == id_curso_origen).first()
         if not curso_origen:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -102,7 +117,7 @@ class InscripcionMasivaController:
             )
         
         # Query SQL para obtener estudiantes con estado de inscripción
-        sql = text("""
+        sql = text(f"""
             SELECT 
                 e.id_estudiante,
                 e.ci,
@@ -111,13 +126,12 @@ class InscripcionMasivaController:
                 e.apellido_materno,
                 (EXISTS (
                     SELECT 1
-                    FROM estudiantes_cursos ec_new
-                    JOIN cursos c_new ON ec_new.id_curso = c_new.id_curso
-                    WHERE c_new.gestion = :gestion_destino
-                    AND ec_new.id_estudiante = e.id_estudiante
+                    FROM estudiantes_gestiones eg
+                    WHERE eg.id_estudiante = e.id_estudiante
+                    AND eg.gestion = :gestion_destino
                 )) AS ya_inscrito
             FROM estudiantes e
-            JOIN estudiantes_cursos ec_source ON e.id_estudiante = ec_source.id_estudiante
+            JOIN {tabla_inscripciones} ec_source ON e.id_estudiante = ec_source.id_estudiante
             WHERE ec_source.id_curso = :id_curso_origen
             AND e.estado_estudiante = 'Activo'
             ORDER BY e.apellido_paterno, e.apellido_materno, e.nombres
@@ -152,13 +166,17 @@ class InscripcionMasivaController:
         return estudiantes
     
     @staticmethod
+    @presupuesto_consultas(13)
     def inscribir_estudiantes_masivamente(
         db: Session,
         id_curso_destino: int,
         ids_estudiantes: List[int]
     ) -> dict:
         """
-        Inscribir múltiples estudiantes a un curso
+        Inscribir múltiples estudiantes a un curso.
+        Los lugares se ocupan con un UPDATE condicional sobre el contador del curso;
+        si la capacidad no alcanza, se inscribe en el orden recibido y el resto
+        pasa a la lista de espera.
         
         Args:
             db: Sesión de base de datos
@@ -168,60 +186,67 @@ class InscripcionMasivaController:
         Returns:
             Diccionario con información de la operación
         """
-        # Verificar que el curso destino existe
-        curso_destino = db.query(Curso).filter(Curso.id_curso == id_curso_destino).first()
+        # Verificar que el curso destino existe (sin cargar sus estudiantes)
+        curso_destino = db.query(Curso.nombre_curso, Curso.gestion).filter(Curso.id_curso == id_curso_destino).first()
         if not curso_destino:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Curso destino con ID {id_curso_destino} no encontrado"
             )
         
+        ids_estudiantes = list(dict.fromkeys(ids_estudiantes))
+        
         # Verificar que todos los estudiantes existen y están activos
-        estudiantes = db.query(Estudiante).filter(
+        activos = db.query(func.count(Estudiante.id_estudiante)).filter(
             Estudiante.id_estudiante.in_(ids_estudiantes),
             Estudiante.estado_estudiante == 'Activo'
-        ).all()
+        ).scalar()
         
-        if len(estudiantes) != len(ids_estudiantes):
+        if activos != len(ids_estudiantes):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Algunos estudiantes no existen o no están activos"
             )
         
         try:
-            estudiantes_inscritos = 0
-            estudiantes_ya_inscritos = 0
+            # Estudiantes que ya están inscritos, en una sola consulta
+            ya_inscritos = set(db.execute(
+                select(estudiantes_cursos.c.id_estudiante).where(
+                    estudiantes_cursos.c.id_curso == id_curso_destino,
+                    estudiantes_cursos.c.id_estudiante.in_(ids_estudiantes)
+                )
+            ).scalars())
+            pendientes = [id_estudiante for id_estudiante in ids_estudiantes if id_estudiante not in ya_inscritos]
+            
+            # Todos los pendientes están activos (se verificó arriba)
+            lugares = ContadorCursoController.reservar(db, id_curso_destino, 'Activo', len(pendientes))
+            inscribir = pendientes[:lugares]
+            en_espera = pendientes[lugares:]
             
-            for id_estudiante in ids_estudiantes:
-                # Verificar si ya está inscrito
-                ya_inscrito = db.execute(
-                    text("""
-                        SELECT 1 FROM estudiantes_cursos 
-                        WHERE id_estudiante = :id_estudiante 
-                        AND id_curso = :id_curso
-                    """),
-                    {"id_estudiante": id_estudiante, "id_curso": id_curso_destino}
-                ).first()
-                
-                if ya_inscrito:
-                    estudiantes_ya_inscritos += 1
-                else:
-                    # Inscribir estudiante
-                    db.execute(
-                        text("""
-                            INSERT INTO estudiantes_cursos (id_estudiante, id_curso)
-                            VALUES (:id_estudiante, :id_curso)
-                        """),
-                        {"id_estudiante": id_estudiante, "id_curso": id_curso_destino}
-                    )
-                    estudiantes_inscritos += 1
+            if inscribir:
+                db.execute(
+                    insert(estudiantes_cursos),
+                    [{"id_estudiante": id_estudiante, "id_curso": id_curso_destino} for id_estudiante in inscribir]
+                )
+                ListaEsperaController.quitar_inscritos(db, id_curso_destino, inscribir)
+                # Mantener el índice de inscripciones por gestión
+                IndiceGestionController.sincronizar_estudiantes(db, inscribir, [curso_destino.gestion])
+            if en_espera:
+                ListaEsperaController.agregar(db, id_curso_destino, en_espera)
             
             db.commit()
+            invalidar_caches()
+            
+            mensaje = f"Inscripción masiva completada en {curso_destino.nombre_curso}"
+            if en_espera:
+                mensaje += f": curso lleno, {len(en_espera)} estudiantes quedaron en la lista de espera"
             
             return {
-                "mensaje": f"Inscripción masiva completada en {curso_destino.nombre_curso}",
-                "estudiantes_inscritos": estudiantes_inscritos,
-                "estudiantes_ya_inscritos": estudiantes_ya_inscritos,
+                "mensaje": mensaje,
+                "estudiantes_inscritos": len(inscribir),
+                "estudiantes_ya_inscritos": len(ya_inscritos),
+                "estudiantes_en_lista_espera": len(en_espera),
+                "ids_en_lista_espera": en_espera,
                 "total_procesados": len(ids_estudiantes)
             }
             
@@ -0,0 +1,239 @@
+"""
+Controlador para la lista de espera de los cursos con capacidad
+Los estudiantes que no entran en un curso lleno quedan en orden de llegada
+y se inscriben cuando se liberan lugares
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import insert, delete, select, exists, and_, func
+from fastapi import HTTPException, status
+from typing import Iterable, List
+from app.models.estudiante_model import Estudiante, estudiantes_cursos
+from app.models.curso_model import Curso
+from app.models.lista_espera_model import lista_espera
+from app.controllers.indice_gestion_controller import IndiceGestionController
+from app.controllers.contador_curso_controller import ContadorCursoController
+from app.config.cache import invalidar_caches
+
+class ListaEsperaController:
+    """
+    Controlador para agregar, listar, quitar y promover estudiantes en espera
+    """
+
+    @staticmethod
+    def agregar(db: Session, id_curso: int, ids_estudiantes: Iterable[int]) -> List[int]:
+        """
+        Agregar estudiantes al final de la lista de espera de un curso.
+        Los que ya estaban en la lista conservan su lugar. No confirma la transacción.
+
+        Args:
+            db: Sesión de base de datos
+            id_curso: ID del curso
+            ids_estudiantes: IDs en el orden en que pidieron el lugar
+
+        Returns:
+            IDs agregados (sin los que ya estaban en espera)
+        """
+        ids = list(dict.fromkeys(ids_estudiantes))
+        if not ids:
+            return []
+
+        en_espera = set(db.execute(
+            select(lista_espera.c.id_estudiante).where(
+                lista_espera.c.id_curso == id_curso,
+                lista_espera.c.id_estudiante.in_(ids)
+            )
+        ).scalars())
+        nuevos = [id_estudiante for id_estudiante in ids if id_estudiante not in en_espera]
+
+        if nuevos:
+            db.execute(
+                insert(lista_espera),
+                [{"id_curso": id_curso, "id_estudiante": id_estudiante} for id_estudiante in nuevos]
+            )
+        return nuevos
+
+    @staticmethod
+    def posicion(db: Session, id_curso: int, id_estudiante: int) -> int:
+        """
+        Posición (desde 1) de un estudiante en la lista de espera de un curso
+
+        Returns:
+            Posición, o 0 si no está en la lista
+        """
+        propio = select(lista_espera.c.id_espera).where(
+            lista_espera.c.id_curso == id_curso,
+            lista_espera.c.id_estudiante == id_estudiante
+        ).scalar_subquery()
+        return db.execute(
+            select(func.count()).select_from(lista_espera).where(
+                lista_espera.c.id_curso == id_curso,
+                lista_espera.c.id_espera <= propio
+            )
+        ).scalar()
+
+    @staticmethod
+    def quitar_inscritos(db: Session, id_curso: int, ids_estudiantes: Iterable[int]) -> None:
+        """
+        Quitar de la lista de espera a estudiantes que ya quedaron inscritos en el curso.
+        No confirma la transacción.
+        """
+        ids = list(set(ids_estudiantes))
+        if ids:
+            db.execute(
+                delete(lista_espera).where(
+                    lista_espera.c.id_curso == id_curso,
+                    lista_espera.c.id_estudiante.in_(ids)
+                )
+            )
+
+    @staticmethod
+    def obtener(db: Session, id_curso: int) -> dict:
+        """
+        Obtener la lista de espera de un curso en orden de llegada
+
+        Args:
+            db: Sesión de base de datos
+            id_curso: ID del curso
+
+        Returns:
+            Diccionario con la ocupación del curso y los estudiantes en espera
+
+        Raises:
+            HTTPException: Si el curso no existe
+        """
+        curso = ListaEsperaController._obtener_curso(db, id_curso)
+
+        filas = db.execute(
+            select(
+                lista_espera.c.id_estudiante,
+                Estudiante.nombres,
+                Estudiante.apellido_paterno,
+                Estudiante.apellido_materno,
+                Estudiante.estado_estudiante,
+                lista_espera.c.fecha_solicitud
+            )
+            .join(Estudiante, Estudiante.id_estudiante == lista_espera.c.id_estudiante)
+            .where(lista_espera.c.id_curso == id_curso)
+            .order_by(lista_espera.c.id_espera)
+        ).all()
+
+        return {
+            "id_curso": id_curso,
+            "nombre_curso": curso.nombre_curso,
+            "capacidad": curso.capacidad,
+            "cantidad_estudiantes": curso.cantidad_estudiantes,
+            "lugares_libres": None if curso.capacidad is None else max(curso.capacidad - curso.cantidad_estudiantes, 0),
+            "estudiantes": [
+                {"posicion": posicion, **fila._asdict()}
+                for posicion, fila in enumerate(filas, start=1)
+            ]
+        }
+
+    @staticmethod
+    def promover(db: Session, id_curso: int) -> dict:
+        """
+        Inscribir estudiantes de la lista de espera, en orden de llegada, hasta llenar los lugares libres.
+        Solo se promueven estudiantes activos; los demás quedan en la lista.
+
+        Args:
+            db: Sesión de base de datos
+            id_curso: ID del curso
+
+        Returns:
+            Diccionario con los estudiantes inscritos y los que siguen en espera
+
+        Raises:
+            HTTPException: Si el curso no existe
+        """
+        curso = ListaEsperaController._obtener_curso(db, id_curso)
+
+        ya_inscrito = exists().where(and_(
+            estudiantes_cursos.c.id_estudiante == lista_espera.c.id_estudiante,
+            estudiantes_cursos.c.id_curso == id_curso
+        ))
+        candidatos = list(db.execute(
+            select(lista_espera.c.id_estudiante)
+            .join(Estudiante, Estudiante.id_estudiante == lista_espera.c.id_estudiante)
+            .where(
+                lista_espera.c.id_curso == id_curso,
+                Estudiante.estado_estudiante == 'Activo',
+                ~ya_inscrito
+            )
+            .order_by(lista_espera.c.id_espera)
+        ).scalars())
+
+        try:
+            lugares = ContadorCursoController.reservar(db, id_curso, 'Activo', len(candidatos))
+            inscritos = candidatos[:lugares]
+
+            if inscritos:
+                db.execute(
+                    insert(estudiantes_cursos),
+                    [{"id_estudiante": id_estudiante, "id_curso": id_curso} for id_estudiante in inscritos]
+                )
+                ListaEsperaController.quitar_inscritos(db, id_curso, inscritos)
+                IndiceGestionController.sincronizar_estudiantes(db, inscritos, [curso.gestion])
+
+            en_espera = db.execute(
+                select(func.count()).select_from(lista_espera).where(lista_espera.c.id_curso == id_curso)
+            ).scalar()
+            db.commit()
+            if inscritos:
+                invalidar_caches()
+        except Exception as e:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error al promover la lista de espera: {str(e)}"
+            )
+
+        return {
+            "mensaje": f"{len(inscritos)} estudiantes inscritos desde la lista de espera de {curso.nombre_curso}",
+            "id_curso": id_curso,
+            "inscritos": inscritos,
+            "en_espera": en_espera
+        }
+
+    @staticmethod
+    def quitar(db: Session, id_curso: int, id_estudiante: int) -> dict:
+        """
+        Quitar a un estudiante de la lista de espera de un curso
+
+        Raises:
+            HTTPException: Si el estudiante no está en la lista de espera del curso
+        """
+        result = db.execute(
+            delete(lista_espera).where(
+                lista_espera.c.id_curso == id_curso,
+                lista_espera.c.id_estudiante == id_estudiante
+            )
+        )
+        if result.rowcount == 0:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="El estudiante no está en la lista de espera de este curso"
+            )
+        db.commit()
+        return {
+            "mensaje": "Estudiante quitado de la lista de espera",
+            "id_estudiante": id_estudiante,
+            "id_curso": id_curso
+        }
+
+    @staticmethod
+    def _obtener_curso(db: Session, id_curso: int):
+        """Leer las columnas de ocupación del curso por clave primaria"""
+        curso = db.query(
+            Curso.nombre_curso,
+            Curso.gestion,
+            Curso.capacidad,
+            Curso.cantidad_estudiantes
+        ).filter(Curso.id_curso == id_curso).first()
+
+        if not curso:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Curso con ID {id_curso} no encontrado"
+            )
+        return curso
@@ -0,0 +1,488 @@
+"""
+Controlador para la promoción de una gestión completa a la siguiente
+Copia los cursos y re-inscribe a los estudiantes activos en una sola transacción.
+El estado de cada trabajo vive en la tabla trabajos_promocion, así cualquier worker
+responde la consulta de avance.
+"""
+import os
+import re
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+from sqlalchemy import text, delete, insert, update
+from fastapi import HTTPException, status
+from typing import Dict, List, Optional, Tuple
+from app.config.database import SessionLocal
+from app.models.curso_model import Curso
+from app.models.estudiante_model import estudiantes_cursos
+from app.models.trabajo_promocion_model import TrabajoPromocion
+from app.controllers.indice_gestion_controller import IndiceGestionController
+from app.controllers.contador_curso_controller import ContadorCursoController
+from app.controllers.lista_espera_controller import ListaEsperaController
+from app.controllers.gestion_controller import GestionController
+from app.controllers.archivo_controller import ArchivoController
+from app.schemas.promocion_schema import PromocionGestionRequest
+from app.config.cache import invalidar_caches
+
+# Orden de los niveles para el mapeo por orden
+ORDEN_NIVELES = {'inicial': 0, 'primaria': 1, 'secundaria': 2}
+
+# Horas que se conservan los trabajos terminados (completados o con error)
+PROMOCION_RETENCION_HORAS = float(os.getenv("PROMOCION_RETENCION_HORAS", "24"))
+
+# Minutos sin cambios tras los que un trabajo pendiente o en proceso se da por perdido
+# (su worker se reinició a mitad de camino; la transacción no llegó a confirmarse)
+PROMOCION_ABANDONO_MINUTOS = float(os.getenv("PROMOCION_ABANDONO_MINUTOS", "60"))
+
+ESTADOS_ACTIVOS = ('pendiente', 'en_proceso')
+
+# "2do B" -> grado "2do", paralelo "B"; un nombre sin paralelo es un grado de un solo curso
+PATRON_PARALELO = re.compile(r"^(?P<grado>.+?)\s+(?P<paralelo>[A-Z]{1,2})$")
+
+# Número con el que empieza el grado ("1ro", "2da Sección"): orden de los grados dentro del nivel
+PATRON_NUMERO_GRADO = re.compile(r"^(\d+)")
+
+class PromocionController:
+    """
+    Controlador para la promoción de estudiantes entre gestiones
+    """
+
+    @staticmethod
+    def iniciar_promocion(db: Session, datos: PromocionGestionRequest) -> dict:
+        """
+        Validar la solicitud y registrar un nuevo trabajo de promoción
+
+        Args:
+            db: Sesión de base de datos
+            datos: Gestiones y mapeo de cursos
+
+        Returns:
+            Estado inicial del trabajo
+
+        Raises:
+            HTTPException: Si la solicitud no es válida
+        """
+        if datos.gestion_origen == datos.gestion_destino:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="La gestión de origen y la de destino deben ser diferentes"
+            )
+
+        archivadas = ArchivoController.archivadas(db, [datos.gestion_origen, datos.gestion_destino])
+        if archivadas:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"La gestión {', '.join(sorted(archivadas))} está archivada; restáurela antes de promover"
+            )
+
+        cursos_origen = db.query(Curso.id_curso, Curso.nombre_curso, Curso.nivel).filter(
+            Curso.gestion == datos.gestion_origen
+        ).all()
+        ids_origen = {curso.id_curso for curso in cursos_origen}
+
+        if not ids_origen:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"No se encontraron cursos en la gestión {datos.gestion_origen}"
+            )
+
+        if datos.modo_mapeo == 'explicito':
+            if not datos.mapeo:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="El modo 'explicito' requiere el campo 'mapeo'"
+                )
+            ajenos = sorted({m.id_curso_origen for m in datos.mapeo} - ids_origen)
+            if ajenos:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Los cursos {ajenos} no pertenecen a la gestión {datos.gestion_origen}"
+                )
+        elif datos.modo_mapeo == 'orden_nivel':
+            # Rechazar ahora (y no en segundo plano) las gestiones cuyos grados no se pueden ordenar
+            _resolver_objetivos(cursos_origen, datos)
+
+        try:
+            PromocionController.depurar_trabajos(db)
+            trabajo = TrabajoPromocion(
+                id_trabajo=uuid.uuid4().hex,
+                estado="pendiente",
+                gestion_origen=datos.gestion_origen,
+                gestion_destino=datos.gestion_destino,
+                mensaje="En cola",
+                cursos_sin_destino=[]
+            )
+            db.add(trabajo)
+            db.commit()
+            db.refresh(trabajo)
+            return _como_dict(trabajo)
+        except Exception as e:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error al registrar el trabajo de promoción: {str(e)}"
+            )
+
+    @staticmethod
+    def obtener_trabajo(db: Session, id_trabajo: str) -> dict:
+        """
+        Obtener el estado de un trabajo de promoción (desde cualquier worker)
+
+        Args:
+            db: Sesión de base de datos
+            id_trabajo: ID del trabajo
+
+        Returns:
+            Estado actual del trabajo
+
+        Raises:
+            HTTPException: Si el trabajo no existe o ya fue depurado
+        """
+        trabajo = db.get(TrabajoPromocion, id_trabajo)
+        if not trabajo:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Trabajo de promoción {id_trabajo} no encontrado"
+            )
+
+        if trabajo.estado in ESTADOS_ACTIVOS and trabajo.fecha_actualizacion < _limite_abandono():
+            _marcar_abandonado(trabajo)
+            db.commit()
+        return _como_dict(trabajo)
+
+    @staticmethod
+    def depurar_trabajos(db: Session) -> int:
+        """
+        Borrar los trabajos terminados hace más de PROMOCION_RETENCION_HORAS y marcar
+        con error los que quedaron huérfanos. No confirma la transacción.
+
+        Args:
+            db: Sesión de base de datos
+
+        Returns:
+            Cantidad de trabajos borrados
+        """
+        db.execute(
+            update(TrabajoPromocion)
+            .where(
+                TrabajoPromocion.estado.in_(ESTADOS_ACTIVOS),
+                TrabajoPromocion.fecha_actualizacion < _limite_abandono()
+            )
+            .values(**_campos_abandono())
+        )
+        return db.execute(
+            delete(TrabajoPromocion).where(
+                TrabajoPromocion.estado.notin_(ESTADOS_ACTIVOS),
+                TrabajoPromocion.fecha_actualizacion < datetime.now() - timedelta(hours=PROMOCION_RETENCION_HORAS)
+            )
+        ).rowcount
+
+    @staticmethod
+    def ejecutar_promocion(id_trabajo: str, datos: PromocionGestionRequest) -> None:
+        """
+        Ejecutar la promoción en segundo plano con su propia sesión.
+        Todo se confirma en una única transacción: si algo falla no queda nada a medias.
+        Cada curso destino respeta su capacidad (ContadorCursoController.reservar): quien
+        no entra queda en su lista de espera y se cuenta en estudiantes_en_lista_espera.
+        El avance se publica en trabajos_promocion con transacciones cortas aparte.
+
+        Args:
+            id_trabajo: ID del trabajo registrado con iniciar_promocion
+            datos: Gestiones y mapeo de cursos
+        """
+        db = SessionLocal()
+        # SQLite admite un solo escritor: mientras la promoción tiene su transacción
+        # abierta, el avance intermedio no se puede publicar desde otra conexión
+        publicar_avance = db.get_bind().dialect.name != "sqlite"
+        avance = {}
+
+        def registrar_avance(**campos) -> None:
+            avance.update(campos)
+            if publicar_avance:
+                _actualizar_trabajo(id_trabajo, **avance)
+
+        try:
+            _actualizar_trabajo(id_trabajo, estado="en_proceso", mensaje="Creando cursos en la gestión destino")
+
+            cursos_origen = db.query(Curso.id_curso, Curso.nombre_curso, Curso.nivel).filter(
+                Curso.gestion == datos.gestion_origen
+            ).all()
+
+            # Curso destino (nombre, nivel) que corresponde a cada curso origen
+            objetivos = _resolver_objetivos(cursos_origen, datos)
+
+            cursos_creados = _crear_cursos_destino(db, datos, set(objetivos.values()))
+
+            destino_por_clave = {
+                (fila.nombre_curso, fila.nivel): fila.id_curso
+                for fila in db.query(Curso.id_curso, Curso.nombre_curso, Curso.nivel).filter(
+                    Curso.gestion == datos.gestion_destino
+                )
+            }
+
+            pares: List[Tuple[int, int]] = [
+                (id_origen, destino_por_clave[clave])
+                for id_origen, clave in objetivos.items()
+            ]
+            sin_destino = sorted(c.id_curso for c in cursos_origen if c.id_curso not in objetivos)
+
+            registrar_avance(
+                pasos_totales=len(pares) + 1,
+                pasos_completados=1,
+                cursos_creados=cursos_creados,
+                cursos_sin_destino=sin_destino,
+                mensaje="Inscribiendo estudiantes activos"
+            )
+
+            # Estudiantes activos de cada curso origen que aún no están en su destino,
+            # en el orden de la lista del curso (el mismo en que pasan a la lista de espera)
+            sql_candidatos = text("""
+                SELECT ec.id_estudiante
+                FROM estudiantes_cursos ec
+                JOIN estudiantes e ON e.id_estudiante = ec.id_estudiante
+                WHERE ec.id_curso = :id_curso_origen
+                AND e.estado_estudiante = 'Activo'
+                AND NOT EXISTS (
+                    SELECT 1 FROM estudiantes_cursos ya
+                    WHERE ya.id_estudiante = ec.id_estudiante
+                    AND ya.id_curso = :id_curso_destino
+                )
+                ORDER BY e.apellido_paterno, e.apellido_materno, e.nombres, e.id_estudiante
+            """)
+
+            inscritos = 0
+            en_espera = 0
+            for paso, (id_origen, id_destino) in enumerate(pares, start=2):
+                candidatos = db.execute(
+                    sql_candidatos,
+                    {"id_curso_origen": id_origen, "id_curso_destino": id_destino}
+                ).scalars().all()
+                if candidatos:
+                    # Varios cursos origen pueden ir al mismo destino, que además puede
+                    # tener inscritos: solo entran los lugares libres y el resto espera
+                    lugares = ContadorCursoController.reservar(db, id_destino, "Activo", len(candidatos))
+                    if lugares:
+                        db.execute(
+                            insert(estudiantes_cursos),
+                            [{"id_estudiante": e, "id_curso": id_destino} for e in candidatos[:lugares]]
+                        )
+                        ListaEsperaController.quitar_inscritos(db, id_destino, candidatos[:lugares])
+                    en_espera += len(ListaEsperaController.agregar(db, id_destino, candidatos[lugares:]))
+                    inscritos += lugares
+                registrar_avance(
+                    pasos_completados=paso,
+                    estudiantes_inscritos=inscritos,
+                    estudiantes_en_lista_espera=en_espera
+                )
+
+            IndiceGestionController.sincronizar_gestion(db, datos.gestion_destino)
+            ContadorCursoController.recalcular(db, gestion=datos.gestion_destino)
+            db.commit()
+            invalidar_caches()
+
+            mensaje = f"Promoción completada de {datos.gestion_origen} a {datos.gestion_destino}"
+            if en_espera:
+                mensaje += f" ({en_espera} estudiantes en lista de espera por falta de lugares)"
+            avance.update(estado="completado", mensaje=mensaje)
+            _actualizar_trabajo(id_trabajo, **avance)
+        except Exception as e:
+            db.rollback()
+            avance.update(
+                estado="error",
+                mensaje="La promoción falló y no se aplicó ningún cambio",
+                cursos_creados=0,
+                estudiantes_inscritos=0,
+                estudiantes_en_lista_espera=0,
+                error=str(e.detail) if isinstance(e, HTTPException) else str(e)
+            )
+            _actualizar_trabajo(id_trabajo, **avance)
+        finally:
+            db.close()
+
+def _actualizar_trabajo(id_trabajo: str, **campos) -> None:
+    """
+    Actualizar los campos de un trabajo y recalcular su porcentaje de avance,
+    en una transacción propia (independiente de la de la promoción)
+    """
+    db = SessionLocal()
+    try:
+        trabajo = db.get(TrabajoPromocion, id_trabajo)
+        for campo, valor in campos.items():
+            setattr(trabajo, campo, valor)
+        if trabajo.estado == "completado":
+            trabajo.porcentaje = 100.0
+        elif trabajo.pasos_totales:
+            trabajo.porcentaje = round(100.0 * trabajo.pasos_completados / trabajo.pasos_totales, 1)
+        trabajo.fecha_actualizacion = datetime.now()
+        db.commit()
+    finally:
+        db.close()
+
+def _limite_abandono() -> datetime:
+    """Fecha de último cambio antes de la cual un trabajo activo se considera huérfano"""
+    return datetime.now() - timedelta(minutes=PROMOCION_ABANDONO_MINUTOS)
+
+def _campos_abandono() -> dict:
+    """Campos de un trabajo cuyo worker se detuvo antes de confirmar la promoción"""
+    return {
+        "estado": "error",
+        "mensaje": "La promoción falló y no se aplicó ningún cambio",
+        "cursos_creados": 0,
+        "estudiantes_inscritos": 0,
+        "estudiantes_en_lista_espera": 0,
+        "error": "El worker que ejecutaba la promoción se detuvo antes de terminarla",
+        "fecha_actualizacion": datetime.now()
+    }
+
+def _marcar_abandonado(trabajo: TrabajoPromocion) -> None:
+    """Marcar con error un trabajo huérfano"""
+    for campo, valor in _campos_abandono().items():
+        setattr(trabajo, campo, valor)
+
+def _como_dict(trabajo: TrabajoPromocion) -> dict:
+    """Campos del trabajo expuestos por la API"""
+    return {
+        "id_trabajo": trabajo.id_trabajo,
+        "estado": trabajo.estado,
+        "gestion_origen": trabajo.gestion_origen,
+        "gestion_destino": trabajo.gestion_destino,
+        "pasos_totales": trabajo.pasos_totales,
+        "pasos_completados": trabajo.pasos_completados,
+        "porcentaje": trabajo.porcentaje,
+        "mensaje": trabajo.mensaje,
+        "cursos_creados": trabajo.cursos_creados,
+        "estudiantes_inscritos": trabajo.estudiantes_inscritos,
+        "estudiantes_en_lista_espera": trabajo.estudiantes_en_lista_espera,
+        "cursos_sin_destino": list(trabajo.cursos_sin_destino or []),
+        "error": trabajo.error
+    }
+
+def _resolver_objetivos(cursos_origen: list, datos: PromocionGestionRequest) -> Dict[int, Tuple[str, str]]:
+    """
+    Calcular el curso destino (nombre, nivel) de cada curso origen según el modo de mapeo.
+    Los cursos origen sin destino (ej: último curso de secundaria) no aparecen en el resultado.
+    """
+    if datos.modo_mapeo == 'explicito':
+        return {
+            m.id_curso_origen: (m.nombre_curso_destino, m.nivel_destino)
+            for m in datos.mapeo
+        }
+
+    if datos.modo_mapeo == 'mismo_curso':
+        return {c.id_curso: (c.nombre_curso, c.nivel) for c in cursos_origen}
+
+    # orden_nivel: cada curso pasa al mismo paralelo del grado que está 'salto' grados más adelante
+    grados = _ordenar_grados(cursos_origen)
+    posicion = {grado: indice for indice, grado in enumerate(grados)}
+    paralelos: Dict[Tuple[str, str], Dict[str, str]] = {}
+    for curso in cursos_origen:
+        grado, paralelo = _grado_y_paralelo(curso.nombre_curso)
+        paralelos.setdefault((curso.nivel, grado), {})[paralelo] = curso.nombre_curso
+
+    objetivos = {}
+    sin_paralelo = []
+    for curso in cursos_origen:
+        grado, paralelo = _grado_y_paralelo(curso.nombre_curso)
+        indice = posicion[(curso.nivel, grado)] + datos.salto
+        if indice >= len(grados):
+            continue
+        nivel_destino, grado_destino = grados[indice]
+        nombre_destino = paralelos[(nivel_destino, grado_destino)].get(paralelo)
+        if nombre_destino is None:
+            sin_paralelo.append(f"{curso.nombre_curso} ({curso.nivel}) -> {grado_destino} ({nivel_destino})")
+        else:
+            objetivos[curso.id_curso] = (nombre_destino, nivel_destino)
+
+    if sin_paralelo:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=(
+                "Los grados no tienen los mismos paralelos; el grado destino no tiene el paralelo de: "
+                f"{', '.join(sorted(sin_paralelo))}. Use modo_mapeo 'explicito' para estos cursos."
+            )
+        )
+    return objetivos
+
+def _grado_y_paralelo(nombre_curso: str) -> Tuple[str, str]:
+    """Separar el nombre de un curso en grado y paralelo ("2do B" -> ("2do", "B"))"""
+    coincidencia = PATRON_PARALELO.match(nombre_curso.strip())
+    if coincidencia:
+        return coincidencia.group("grado"), coincidencia.group("paralelo")
+    return nombre_curso.strip(), ""
+
+def _ordenar_grados(cursos_origen: list) -> List[Tuple[str, str]]:
+    """
+    Grados (nivel, grado) de la gestión en orden de avance: por nivel y, dentro del
+    nivel, por el número con el que empieza el grado ("1ro", "2do", ...).
+
+    Raises:
+        HTTPException: Si algún nivel tiene grados sin número o con el número repetido
+    """
+    por_nivel: Dict[str, set] = {}
+    for curso in cursos_origen:
+        por_nivel.setdefault(curso.nivel, set()).add(_grado_y_paralelo(curso.nombre_curso)[0])
+
+    grados = []
+    for nivel in sorted(por_nivel, key=lambda n: ORDEN_NIVELES[n]):
+        numeros = {grado: _numero_grado(grado) for grado in por_nivel[nivel]}
+        valores = [numero for numero in numeros.values() if numero is not None]
+        if len(numeros) > 1 and (len(valores) < len(numeros) or len(set(valores)) < len(valores)):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=(
+                    f"No se puede deducir el orden de los grados de {nivel} ({', '.join(sorted(numeros))}): "
+                    "cada grado debe empezar con un número distinto (1ro, 2do, ...). Use modo_mapeo 'explicito'."
+                )
+            )
+        grados.extend((nivel, grado) for grado in sorted(numeros, key=lambda g: numeros[g] or 0))
+    return grados
+
+def _numero_grado(grado: str) -> Optional[int]:
+    """Número con el que empieza el grado, o None si no empieza con un número"""
+    coincidencia = PATRON_NUMERO_GRADO.match(grado)
+    return int(coincidencia.group(1)) if coincidencia else None
+
+def _crear_cursos_destino(db: Session, datos: PromocionGestionRequest, requeridos: set) -> int:
+    """
+    Crear en la gestión destino los cursos que aún no existen.
+    Si la gestión destino está vacía se copia la estructura completa de la gestión origen.
+
+    Returns:
+        Cantidad de cursos creados
+    """
+    creados = 0
+    GestionController.registrar(db, [datos.gestion_destino])
+    existentes = db.query(Curso.id_curso).filter(Curso.gestion == datos.gestion_destino).count()
+
+    if existentes == 0:
+        result = db.execute(
+            text("""
+                INSERT INTO cursos (nombre_curso, nivel, gestion, capacidad)
+                SELECT nombre_curso, nivel, :gestion_destino, capacidad
+                FROM cursos
+                WHERE gestion = :gestion_origen
+            """),
+            {"gestion_origen": datos.gestion_origen, "gestion_destino": datos.gestion_destino}
+        )
+        creados += max(result.rowcount, 0)
+
+    presentes = {
+        (fila.nombre_curso, fila.nivel)
+        for fila in db.query(Curso.nombre_curso, Curso.nivel).filter(Curso.gestion == datos.gestion_destino)
+    }
+    faltantes = sorted(requeridos - presentes)
+
+    if faltantes:
+        db.execute(
+            text("""
+                INSERT INTO cursos (nombre_curso, nivel, gestion)
+                VALUES (:nombre_curso, :nivel, :gestion)
+            """),
+            [
+                {"nombre_curso": nombre, "nivel": nivel, "gestion": datos.gestion_destino}
+                for nombre, nivel in faltantes
+            ]
+        )
+        creados += len(faltantes)
+
+    return creados
@@ -2,13 +2,23 @@
 Aplicación principal FastAPI
 Configura la aplicación, middlewares y rutas
 """
-from fastapi import FastAPI
+from fastapi import FastAPI, Response, status
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from app.views import estudiante_view, curso_view, estudiante_curso_view, inscripcion_masiva_view, excel_view
-from app.config.database import engine, Base
+from app.views import estudiante_view, curso_view, estudiante_curso_view, inscripcion_masiva_view, excel_view, promocion_view, estadistica_view, cohorte_view, gestion_view
+from app.config.executor import cerrar_pool
+from app.middlewares.admision_middleware import AdmisionMiddleware
+from app.middlewares.perfilado_middleware import PerfiladoMiddleware
+from app.config.perfilado import PERFILADO_HABILITADO
+from app.middlewares.tiempos_middleware import TiemposMiddleware, registrar_eventos_sql
+from app.config import database
+from app.config.consultas import instrumentar_engine
+from app.config.consultas_lentas import registrar_consultas_lentas, esperar_pendientes
+from app.config.metricas import exportar_metricas, TIPO_CONTENIDO
+from app.config.salud import estado_preparacion, estado_vida
 
-# Crear tablas en la base de datos (si no existen)
-Base.metadata.create_all(bind=engine)
+# Las tablas se crean con el comando explícito: python manage.py crear-tablas
+# (no se ejecuta DDL al importar la app, para que cada worker arranque rápido)
 
 # Crear instancia de FastAPI
 app = FastAPI(
@@ -19,6 +29,9 @@ app = FastAPI(
     redoc_url="/redoc"
 )
 
+# Limitar la concurrencia de los endpoints pesados (Excel, lotes, promoción)
+app.add_middleware(AdmisionMiddleware)
+
 # Configurar CORS para permitir peticiones desde frontend
 app.add_middleware(
     CORSMiddleware,
@@ -26,14 +39,35 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Permitir todos los métodos HTTP
     allow_headers=["*"],  # Permitir todos los headers
+    expose_headers=["Server-Timing", "ETag"]
 )
 
+# Medir SQL, controlador y serialización de cada petición (header Server-Timing y log)
+registrar_eventos_sql(database.engine)
+instrumentar_engine(database.engine)
+registrar_consultas_lentas(database.engine)
+app.add_middleware(TiemposMiddleware)
+
+# Perfilado bajo demanda (header X-Perfilar o ?perfilar= con PERFILADO_TOKEN)
+if PERFILADO_HABILITADO:
+    app.add_middleware(PerfiladoMiddleware)
+
 # Incluir routers
 app.include_router(estudiante_view.router)
 app.include_router(curso_view.router)
 app.include_router(estudiante_curso_view.router)
 app.include_router(inscripcion_masiva_view.router)
 app.include_router(excel_view.router)
+app.include_router(promocion_view.router)
+app.include_router(estadistica_view.router)
+app.include_router(cohorte_view.router)
+app.include_router(gestion_view.router)
+
+# Cerrar el pool de procesos de Excel al apagar
+@app.on_event("shutdown")
+def apagar_pool_excel():
+    cerrar_pool()
+    esperar_pendientes()
 
 # Ruta raíz
 @app.get("/", tags=["Root"])
@@ -55,6 +89,36 @@ def health_check():
     """
     return {"status": "ok", "mensaje": "API funcionando correctamente"}
 
+# Liveness: el proceso responde (no consulta dependencias)
+@app.get("/health/live", tags=["Health"])
+def health_live():
+    """
+    Endpoint de vida para el orquestador: si no responde, reiniciar el worker
+    """
+    return estado_vida()
+
+# Readiness: el worker puede atender tráfico
+@app.get("/health/ready", tags=["Health"])
+def health_ready():
+    """
+    Endpoint de preparación para el balanceador: verifica la latencia de la base de
+    datos, la saturación del pool de conexiones, la cola de Excel y que las cachés
+    respondan (app/config/cache.py registra su verificación).
+    Responde 503 si alguna verificación falla. El resultado se cachea unos segundos.
+    """
+    resultado = estado_preparacion()
+    codigo = status.HTTP_200_OK if resultado["listo"] else status.HTTP_503_SERVICE_UNAVAILABLE
+    return JSONResponse(status_code=codigo, content=resultado)
+
+# Métricas para Prometheus
+@app.get("/metrics", tags=["Health"], include_in_schema=False)
+def metricas():
+    """
+    Métricas en formato de exposición de Prometheus: latencia y códigos por ruta,
+    pool de conexiones, consultas por petición, cachés, Excel y memoria del proceso
+    """
+    return Response(content=exportar_metricas(), media_type=TIPO_CONTENIDO)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
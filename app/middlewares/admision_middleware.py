@@ -0,0 +1,145 @@
+"""
+Middleware de control de admisión para los endpoints pesados
+Limita cuántas peticiones de cada clase de ruta se ejecutan a la vez, con una
+cola de espera acotada, y descarta carga cuando el pool de la base de datos se satura
+"""
+import os
+import asyncio
+from typing import Dict, Optional
+from fastapi import status
+from fastapi.responses import JSONResponse
+from app.config.database import espera_checkout_reciente
+
+# Segundos máximos que una petición espera turno antes de recibir 503
+ADMISION_ESPERA_MAXIMA = float(os.getenv("ADMISION_ESPERA_MAXIMA", "10"))
+
+# Espera promedio del pool de conexiones (segundos) a partir de la cual se descarta carga pesada
+ADMISION_UMBRAL_ESPERA_POOL = float(os.getenv("ADMISION_UMBRAL_ESPERA_POOL", "0.5"))
+
+# Valor del header Retry-After en las respuestas 429/503
+ADMISION_RETRY_AFTER = os.getenv("ADMISION_RETRY_AFTER", "5")
+
+class LimiteConcurrencia:
+    """
+    Semáforo con cola de espera acotada para una clase de rutas
+    """
+    def __init__(self, nombre: str, maximo: int, cola: int):
+        self.nombre = nombre
+        self.maximo = maximo
+        self.cola = cola
+        self.activos = 0
+        self.esperando = 0
+        self._semaforo = asyncio.Semaphore(maximo)
+
+    def cola_llena(self) -> bool:
+        return self.activos >= self.maximo and self.esperando >= self.cola
+
+    async def adquirir(self, timeout: float) -> bool:
+        """
+        Esperar un lugar hasta `timeout` segundos.
+        Si se deja de esperar (timeout o petición cancelada) justo cuando el semáforo
+        concedía el lugar, el lugar se devuelve: con asyncio.wait_for quedaba tomado
+        sin que nadie lo liberara.
+        """
+        self.esperando += 1
+        tarea = asyncio.ensure_future(self._semaforo.acquire())
+        abandonada = True
+        try:
+            await asyncio.wait({tarea}, timeout=timeout)
+            abandonada = not tarea.done()
+        finally:
+            self.esperando -= 1
+            if abandonada:
+                tarea.cancel()
+                tarea.add_done_callback(self._devolver_si_adquirido)
+        if abandonada:
+            return False
+        self.activos += 1
+        return True
+
+    def _devolver_si_adquirido(self, tarea: asyncio.Future) -> None:
+        """Liberar el lugar de una espera abandonada si el semáforo llegó a concederlo"""
+        if not tarea.cancelled():
+            self._semaforo.release()
+
+    def liberar(self) -> None:
+        self.activos -= 1
+        self._semaforo.release()
+
+def _limite_desde_env(nombre: str, maximo: int, cola: int) -> LimiteConcurrencia:
+    """Crear un límite leyendo ADMISION_<NOMBRE>_MAX y ADMISION_<NOMBRE>_COLA"""
+    clave = nombre.upper()
+    return LimiteConcurrencia(
+        nombre,
+        int(os.getenv(f"ADMISION_{clave}_MAX", str(maximo))),
+        int(os.getenv(f"ADMISION_{clave}_COLA", str(cola)))
+    )
+
+# Clases de rutas limitadas: (límite, métodos, prefijos de ruta)
+CLASES_RUTA = [
+    (_limite_desde_env("excel_exportar", 2, 4), {"GET"}, ("/api/excel/exportar-", "/api/excel/plantilla-")),
+    (_limite_desde_env("excel_importar", 2, 2), {"POST"}, ("/api/excel/importar-",)),
+    (_limite_desde_env("lote", 4, 8), {"POST"}, ("/api/asignaciones/lote", "/api/inscripcion-masiva/inscribir", "/api/promocion")),
+]
+
+def clasificar(metodo: str, ruta: str) -> Optional[LimiteConcurrencia]:
+    """Obtener el límite que corresponde a una petición, o None si no está limitada"""
+    for limite, metodos, prefijos in CLASES_RUTA:
+        if metodo in metodos and ruta.startswith(prefijos):
+            return limite
+    return None
+
+def estado_admision() -> Dict[str, dict]:
+    """Peticiones activas y en espera por clase de ruta"""
+    return {
+        limite.nombre: {"activos": limite.activos, "esperando": limite.esperando, "maximo": limite.maximo, "cola": limite.cola}
+        for limite, _, _ in CLASES_RUTA
+    }
+
+class AdmisionMiddleware:
+    """
+    Middleware ASGI que aplica los límites de concurrencia de CLASES_RUTA.
+    Responde 429 si la cola de la clase está llena y 503 si la espera supera
+    ADMISION_ESPERA_MAXIMA o si el pool de conexiones está saturado.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        limite = clasificar(scope["method"], scope["path"])
+        if limite is None:
+            await self.app(scope, receive, send)
+            return
+
+        if espera_checkout_reciente() > ADMISION_UMBRAL_ESPERA_POOL:
+            await self._rechazar(scope, receive, send, status.HTTP_503_SERVICE_UNAVAILABLE,
+                                 "La base de datos está saturada. Intente nuevamente en unos segundos.")
+            return
+
+        if limite.cola_llena():
+            await self._rechazar(scope, receive, send, status.HTTP_429_TOO_MANY_REQUESTS,
+                                 "Demasiadas peticiones de este tipo en curso. Intente nuevamente en unos segundos.")
+            return
+
+        if not await limite.adquirir(ADMISION_ESPERA_MAXIMA):
+            await self._rechazar(scope, receive, send, status.HTTP_503_SERVICE_UNAVAILABLE,
+                                 "El servidor está ocupado. Intente nuevamente en unos segundos.")
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limite.liberar()
+
+    @staticmethod
+    async def _rechazar(scope, receive, send, codigo: int, detalle: str) -> None:
+        respuesta = JSONResponse(
+            status_code=codigo,
+            content={"detail": detalle},
+            headers={"Retry-After": ADMISION_RETRY_AFTER}
+        )
+        await respuesta(scope, receive, send)
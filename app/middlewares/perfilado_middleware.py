@@ -0,0 +1,68 @@
+"""
+Middleware de perfilado bajo demanda
+Perfila una petición cuando PERFILADO_HABILITADO=1 y la petición trae el token
+de PERFILADO_TOKEN en el header X-Perfilar o en el parámetro ?perfilar=.
+La respuesta no cambia; el header X-Perfil indica dónde quedó guardado el perfil.
+"""
+import os
+import re
+import hmac
+import datetime
+import logging
+from urllib.parse import parse_qs
+from app.config.perfilado import PERFILADO_TOKEN, PERFILADO_DIRECTORIO, Perfil
+
+logger = logging.getLogger("app.perfilado")
+
+def _token_recibido(scope) -> str:
+    for nombre, valor in scope.get("headers", []):
+        if nombre == b"x-perfilar":
+            return valor.decode("latin-1")
+    parametros = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    return parametros.get("perfilar", [""])[0]
+
+def _solicita_perfil(scope) -> bool:
+    token = _token_recibido(scope)
+    return bool(PERFILADO_TOKEN) and bool(token) and hmac.compare_digest(token, PERFILADO_TOKEN)
+
+class PerfiladoMiddleware:
+    """
+    Middleware ASGI que perfila las peticiones que lo solicitan con el token.
+    Solo se perfila una petición a la vez por proceso; si hay otra en curso,
+    la petición se atiende normalmente con X-Perfil: ocupado.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _solicita_perfil(scope):
+            await self.app(scope, receive, send)
+            return
+
+        ruta = re.sub(r"[^A-Za-z0-9]+", "_", scope["path"]).strip("_") or "raiz"
+        nombre = f"{datetime.datetime.now():%Y%m%d_%H%M%S}_{scope['method']}_{ruta}_{os.getpid()}"
+        perfil = Perfil.intentar_iniciar(nombre)
+        encabezado = os.path.join(PERFILADO_DIRECTORIO, nombre) if perfil else "ocupado"
+        codigo = {"status": None}
+
+        async def send_con_perfil(mensaje):
+            if mensaje["type"] == "http.response.start":
+                codigo["status"] = mensaje["status"]
+                encabezados = list(mensaje.get("headers", []))
+                encabezados.append((b"x-perfil", encabezado.encode("latin-1")))
+                mensaje = {**mensaje, "headers": encabezados}
+            await send(mensaje)
+
+        if perfil is None:
+            await self.app(scope, receive, send_con_perfil)
+            return
+
+        try:
+            await self.app(scope, receive, send_con_perfil)
+        finally:
+            perfil.detener()
+            try:
+                base = perfil.guardar({"metodo": scope["method"], "ruta": scope["path"], "status": codigo["status"]})
+                logger.warning(f"Perfil guardado en {base}.folded y {base}.json")
+            except OSError as e:
+                logger.error(f"No se pudo guardar el perfil {nombre}: {e}")
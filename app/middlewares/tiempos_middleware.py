@@ -0,0 +1,205 @@
+"""
+Middleware de tiempos por petición
+Mide el tiempo en SQL (eventos del engine), en el controlador (ORM y lógica), en
+validación/serialización y el total, y los emite en el header Server-Timing y
+como una línea de log JSON por petición
+"""
+import os
+import json
+import asyncio
+import time
+import logging
+import threading
+import functools
+import contextvars
+from typing import Callable, Optional
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.config.metricas import registrar_peticion
+from app.config.consultas import CONSULTAS_MODO, presupuesto_consultas
+from app.config.perfilado import perfil_actual
+
+# Emitir una línea de log por petición (LOG_TIEMPOS=0 la desactiva; Server-Timing se envía igual)
+LOG_TIEMPOS = os.getenv("LOG_TIEMPOS", "1") == "1"
+
+logger = logging.getLogger("app.tiempos")
+if not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+class MetricasPeticion:
+    """
+    Acumulador de tiempos de una petición. Se comparte por referencia entre el
+    event loop y el hilo del threadpool donde corre el controlador.
+    """
+    __slots__ = ("consultas", "db", "controlador", "handler", "inicio")
+
+    def __init__(self):
+        self.consultas = 0
+        self.db = 0.0
+        self.controlador = 0.0
+        self.handler = 0.0
+        self.inicio = time.perf_counter()
+
+_metricas_actuales: contextvars.ContextVar[Optional[MetricasPeticion]] = contextvars.ContextVar(
+    "metricas_peticion", default=None
+)
+
+def metricas_actuales() -> Optional[MetricasPeticion]:
+    """Métricas de la petición en curso (None fuera de una petición)"""
+    return _metricas_actuales.get()
+
+def registrar_eventos_sql(engine: Engine) -> None:
+    """Registrar en el engine los eventos que cuentan y cronometran cada consulta"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _antes(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("inicio_consulta", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _despues(conn, cursor, statement, parameters, context, executemany):
+        inicio = conn.info["inicio_consulta"].pop()
+        metricas = _metricas_actuales.get()
+        if metricas is not None:
+            metricas.consultas += 1
+            metricas.db += time.perf_counter() - inicio
+
+def _cronometrar_endpoint(endpoint: Callable) -> Callable:
+    """Envolver un endpoint para medir el tiempo del controlador (ORM, lógica y SQL)"""
+    # include_router vuelve a crear cada ruta con el endpoint ya envuelto
+    if getattr(endpoint, "_cronometrado", False):
+        return endpoint
+
+    if asyncio.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def envoltura_async(*args, **kwargs):
+            _registrar_hilo_perfilado()
+            inicio = time.perf_counter()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                _sumar_controlador(time.perf_counter() - inicio)
+                _registrar_hilo_perfilado(activo=False)
+        envoltura_async._cronometrado = True
+        return envoltura_async
+
+    @functools.wraps(endpoint)
+    def envoltura(*args, **kwargs):
+        _registrar_hilo_perfilado()
+        inicio = time.perf_counter()
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            _sumar_controlador(time.perf_counter() - inicio)
+            _registrar_hilo_perfilado(activo=False)
+    envoltura._cronometrado = True
+    return envoltura
+
+def _registrar_hilo_perfilado(activo: bool = True) -> None:
+    """Si la petición se está perfilando, muestrear el hilo mientras ejecuta el endpoint"""
+    perfil = perfil_actual()
+    if perfil is not None:
+        if activo:
+            perfil.hilos.add(threading.get_ident())
+        else:
+            perfil.hilos.discard(threading.get_ident())
+
+def _sumar_controlador(duracion: float) -> None:
+    metricas = _metricas_actuales.get()
+    if metricas is not None:
+        metricas.controlador += duracion
+
+class RutaCronometrada(APIRoute):
+    """
+    Ruta de FastAPI que mide por separado el endpoint y el manejo completo
+    (validación de entrada, dependencias y serialización de la respuesta)
+    """
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        super().__init__(path, _cronometrar_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def handler_cronometrado(request):
+            inicio = time.perf_counter()
+            try:
+                return await handler(request)
+            finally:
+                metricas = _metricas_actuales.get()
+                if metricas is not None:
+                    metricas.handler += time.perf_counter() - inicio
+
+        return handler_cronometrado
+
+def server_timing(metricas: MetricasPeticion, total: float) -> str:
+    """Construir el valor del header Server-Timing"""
+    orm = max(metricas.controlador - metricas.db, 0.0)
+    serializacion = max(metricas.handler - metricas.controlador, 0.0)
+    return ", ".join([
+        f'db;dur={metricas.db * 1000:.1f};desc="SQL ({metricas.consultas} consultas)"',
+        f'orm;dur={orm * 1000:.1f};desc="ORM y controlador"',
+        f'serializacion;dur={serializacion * 1000:.1f};desc="Validacion y JSON"',
+        f'total;dur={total * 1000:.1f}',
+    ])
+
+class TiemposMiddleware:
+    """
+    Middleware ASGI que crea las métricas de cada petición y agrega Server-Timing
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metricas = MetricasPeticion()
+        token = _metricas_actuales.set(metricas)
+        respondida = False
+
+        async def send_con_tiempos(mensaje):
+            nonlocal respondida
+            if mensaje["type"] == "http.response.start":
+                respondida = True
+                total = time.perf_counter() - metricas.inicio
+                encabezados = list(mensaje.get("headers", []))
+                encabezados.append((b"server-timing", server_timing(metricas, total).encode("ascii")))
+                mensaje = {**mensaje, "headers": encabezados}
+                self._registrar(scope, mensaje["status"], total, metricas)
+            await send(mensaje)
+
+        try:
+            if CONSULTAS_MODO == "off":
+                await self.app(scope, receive, send_con_tiempos)
+            else:
+                # En desarrollo, advertir de consultas N+1 en cualquier endpoint
+                with presupuesto_consultas(None, modo="advertir", nombre=f"{scope['method']} {scope['path']}"):
+                    await self.app(scope, receive, send_con_tiempos)
+        finally:
+            if not respondida:
+                # Excepción no controlada: la respuesta 500 la envía un middleware exterior
+                self._registrar(scope, 500, time.perf_counter() - metricas.inicio, metricas)
+            _metricas_actuales.reset(token)
+
+    @staticmethod
+    def _registrar(scope, codigo: int, total: float, metricas: MetricasPeticion) -> None:
+        # Plantilla de la ruta (la agrega el router al scope) para no crear una serie por URL
+        ruta = getattr(scope.get("route"), "path", None) or "sin_ruta"
+        registrar_peticion(scope["method"], ruta, codigo, total, metricas.consultas)
+        if LOG_TIEMPOS:
+            logger.info(json.dumps({
+                "evento": "peticion",
+                "metodo": scope["method"],
+                "ruta": scope["path"],
+                "status": codigo,
+                "total_ms": round(total * 1000, 2),
+                "db_ms": round(metricas.db * 1000, 2),
+                "consultas": metricas.consultas,
+                "orm_ms": round(max(metricas.controlador - metricas.db, 0.0) * 1000, 2),
+                "serializacion_ms": round(max(metricas.handler - metricas.controlador, 0.0) * 1000, 2),
+            }))
@@ -0,0 +1,48 @@
+"""
+Modelos SQLAlchemy para las tablas de archivo (cursos_archivo y estudiantes_cursos_archivo)
+Cursos e inscripciones de las gestiones cerradas que se sacaron de las tablas de uso
+diario; conservan sus IDs y solo se leen
+"""
+from sqlalchemy import Column, Integer, String, Enum, ForeignKey, Table, Index
+from sqlalchemy.orm import relationship, backref
+from app.config.database import Base
+
+# Inscripciones de los cursos archivados
+estudiantes_cursos_archivo = Table(
+    'estudiantes_cursos_archivo',
+    Base.metadata,
+    Column('id_estudiante', Integer, ForeignKey('estudiantes.id_estudiante', ondelete='CASCADE'), primary_key=True),
+    Column('id_curso', Integer, ForeignKey('cursos_archivo.id_curso', ondelete='CASCADE'), primary_key=True),
+    Index('ix_estudiantes_cursos_archivo_curso', 'id_curso', 'id_estudiante')
+)
+
+class CursoArchivado(Base):
+    """
+    Modelo de la tabla cursos_archivo: mismas columnas que cursos, con los
+    contadores tal como estaban al archivar
+    """
+    __tablename__ = "cursos_archivo"
+
+    # Mismo ID que tenía en cursos (no es autoincremental)
+    id_curso = Column(Integer, primary_key=True, autoincrement=False)
+    nombre_curso = Column(String(50), nullable=False)
+    nivel = Column(Enum('inicial', 'primaria', 'secundaria', name='nivel_enum'), nullable=False)
+    gestion = Column(String(20), nullable=False, index=True)
+    capacidad = Column(Integer, nullable=True)
+    cantidad_estudiantes = Column(Integer, nullable=False, default=0, server_default='0')
+    cantidad_activos = Column(Integer, nullable=False, default=0, server_default='0')
+    cantidad_abandonos = Column(Integer, nullable=False, default=0, server_default='0')
+    cantidad_retirados = Column(Integer, nullable=False, default=0, server_default='0')
+    version = Column(Integer, nullable=False, default=1, server_default='1')
+
+    # Solo lectura; Estudiante.cursos_archivados es la relación inversa
+    estudiantes = relationship(
+        "Estudiante",
+        secondary=estudiantes_cursos_archivo,
+        backref=backref("cursos_archivados", lazy="select", viewonly=True),
+        lazy="joined",
+        viewonly=True
+    )
+
+    def __repr__(self):
+        return f"<CursoArchivado(id={self.id_curso}, nombre={self.nombre_curso}, gestion={self.gestion})>"
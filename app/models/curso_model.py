@@ -13,11 +13,28 @@ class Curso(Base):
     """
     __tablename__ = "cursos"
     
+    # En SQLite, no reutilizar los IDs de cursos borrados o archivados (sin esto toma
+    # max(id) + 1 y un curso nuevo ocuparía el ID de uno archivado, ver ArchivoController)
+    __table_args__ = {"sqlite_autoincrement": True}
+    
     # Campos de la tabla
     id_curso = Column(Integer, primary_key=True, index=True, autoincrement=True)
     nombre_curso = Column(String(50), nullable=False)
     nivel = Column(Enum('inicial', 'primaria', 'secundaria', name='nivel_enum'), nullable=False)
-    gestion = Column(String(20), nullable=False)
+    gestion = Column(String(20), nullable=False, index=True)
+    
+    # Cupo máximo de estudiantes; NULL es sin límite
+    capacidad = Column(Integer, nullable=True)
+    
+    # Contadores desnormalizados de estudiantes_cursos, mantenidos por cada escritura
+    # sobre las inscripciones y los cambios de estado (ver ContadorCursoController)
+    cantidad_estudiantes = Column(Integer, nullable=False, default=0, server_default='0')
+    cantidad_activos = Column(Integer, nullable=False, default=0, server_default='0')
+    cantidad_abandonos = Column(Integer, nullable=False, default=0, server_default='0')
+    cantidad_retirados = Column(Integer, nullable=False, default=0, server_default='0')
+    
+    # Versión de la fila para control de concurrencia optimista
+    version = Column(Integer, nullable=False, default=1, server_default='1')
     
     # Relación con estudiantes (muchos a muchos)
     estudiantes = relationship(
@@ -27,5 +44,8 @@ class Curso(Base):
         lazy="joined"
     )
     
+    # UPDATE ... WHERE version = :version; si otro usuario ya modificó la fila falla con StaleDataError
+    __mapper_args__ = {"version_id_col": version}
+    
     def __repr__(self):
         return f"<Curso(id={self.id_curso}, nombre={self.nombre_curso}, nivel={self.nivel})>"
@@ -0,0 +1,16 @@
+"""
+Modelo SQLAlchemy para la tabla estudiantes_gestiones
+Índice desnormalizado (id_estudiante, gestion) de las inscripciones, mantenido
+por cada escritura sobre estudiantes_cursos
+"""
+from sqlalchemy import Column, Integer, String, ForeignKey, Table, Index
+from app.config.database import Base
+
+# Un registro por cada gestión en la que el estudiante tiene al menos un curso
+estudiantes_gestiones = Table(
+    'estudiantes_gestiones',
+    Base.metadata,
+    Column('id_estudiante', Integer, ForeignKey('estudiantes.id_estudiante', ondelete='CASCADE'), primary_key=True),
+    Column('gestion', String(20), primary_key=True),
+    Index('ix_estudiantes_gestiones_gestion', 'gestion')
+)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, Table, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Date, Table, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 from app.config.database import Base
 
@@ -7,11 +7,17 @@ estudiantes_cursos = Table(
     'estudiantes_cursos',
     Base.metadata,
     Column('id_estudiante', Integer, ForeignKey('estudiantes.id_estudiante'), primary_key=True),
-    Column('id_curso', Integer, ForeignKey('cursos.id_curso'), primary_key=True)
+    Column('id_curso', Integer, ForeignKey('cursos.id_curso'), primary_key=True),
+    # La clave primaria empieza por id_estudiante; este índice sirve las listas por curso
+    Index('ix_estudiantes_cursos_curso', 'id_curso', 'id_estudiante')
 )
 
 class Estudiante(Base):
     __tablename__ = "estudiantes"
+    __table_args__ = (
+        # Orden alfabético estable para la paginación por cursor de las listas de curso
+        Index('ix_estudiantes_apellidos', 'apellido_paterno', 'apellido_materno', 'nombres', 'id_estudiante'),
+    )
     
     # Campos de la tabla
     id_estudiante = Column(Integer, primary_key=True, index=True, autoincrement=True)
@@ -35,6 +41,9 @@ class Estudiante(Base):
     apellido_materno_madre = Column(String(50), nullable=True)
     telefono_madre = Column(String(20), nullable=True)
     
+    # Versión de la fila para control de concurrencia optimista
+    version = Column(Integer, nullable=False, default=1, server_default='1')
+    
     # Relación con cursos (muchos a muchos)
     cursos = relationship(
         "Curso",
@@ -43,5 +52,8 @@ class Estudiante(Base):
         lazy="joined"
     )
     
+    # UPDATE ... WHERE version = :version; si otro usuario ya modificó la fila falla con StaleDataError
+    __mapper_args__ = {"version_id_col": version}
+    
     def __repr__(self):
         return f"<Estudiante(id={self.id_estudiante}, nombres={self.nombres})>"
@@ -0,0 +1,15 @@
+"""
+Modelo SQLAlchemy para la tabla generacion_cache
+Contador que cada escritura incrementa: los workers lo comparan con el de sus
+entradas en caché para descartar las que calcularon antes de una escritura en otro worker
+"""
+from sqlalchemy import Column, Integer, BigInteger, Table
+from app.config.database import Base
+
+# Una sola fila (id = 1); si falta, la primera invalidación la crea
+generacion_cache = Table(
+    'generacion_cache',
+    Base.metadata,
+    Column('id', Integer, primary_key=True, autoincrement=False),
+    Column('generacion', BigInteger, nullable=False, default=0)
+)
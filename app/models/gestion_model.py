@@ -0,0 +1,31 @@
+"""
+Modelo SQLAlchemy para la tabla gestiones
+Catálogo de gestiones (años académicos) con la gestión actual, mantenido al
+crear, copiar o promover cursos
+"""
+from datetime import datetime
+from sqlalchemy import Column, String, Boolean, DateTime
+from app.config.database import Base
+
+class Gestion(Base):
+    """
+    Modelo de la tabla gestiones en la base de datos
+    """
+    __tablename__ = "gestiones"
+
+    # Mismo valor que cursos.gestion
+    gestion = Column(String(20), primary_key=True)
+
+    # Gestión por defecto de los listados; a lo sumo una está marcada
+    actual = Column(Boolean, nullable=False, default=False, server_default='0', index=True)
+
+    # Gestión terminada; la gestión actual no puede estar cerrada
+    cerrada = Column(Boolean, nullable=False, default=False, server_default='0')
+
+    # Sus cursos e inscripciones están en las tablas de archivo (ver ArchivoController)
+    archivada = Column(Boolean, nullable=False, default=False, server_default='0')
+
+    fecha_creacion = Column(DateTime, nullable=False, default=datetime.now)
+
+    def __repr__(self):
+        return f"<Gestion(gestion={self.gestion}, actual={self.actual}, cerrada={self.cerrada}, archivada={self.archivada})>"
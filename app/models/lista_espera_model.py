@@ -0,0 +1,18 @@
+"""
+Modelo SQLAlchemy para la tabla lista_espera
+Estudiantes que pidieron inscribirse en un curso que ya había llenado su capacidad
+"""
+from datetime import datetime
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Table, UniqueConstraint
+from app.config.database import Base
+
+# El orden de llegada es id_espera (autoincremental); un estudiante figura una vez por curso
+lista_espera = Table(
+    'lista_espera',
+    Base.metadata,
+    Column('id_espera', Integer, primary_key=True, autoincrement=True),
+    Column('id_curso', Integer, ForeignKey('cursos.id_curso', ondelete='CASCADE'), nullable=False),
+    Column('id_estudiante', Integer, ForeignKey('estudiantes.id_estudiante', ondelete='CASCADE'), nullable=False),
+    Column('fecha_solicitud', DateTime, nullable=False, default=datetime.now),
+    UniqueConstraint('id_curso', 'id_estudiante', name='uq_lista_espera_curso_estudiante')
+)
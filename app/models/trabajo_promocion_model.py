@@ -0,0 +1,37 @@
+"""
+Modelo SQLAlchemy para la tabla trabajos_promocion
+Estado y avance de los trabajos de promoción de gestión, compartidos por todos los
+workers: cualquiera puede responder GET /api/promocion/{id_trabajo}
+"""
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Float, Text, DateTime, JSON
+from app.config.database import Base
+
+class TrabajoPromocion(Base):
+    """
+    Modelo de la tabla trabajos_promocion en la base de datos
+    """
+    __tablename__ = "trabajos_promocion"
+
+    id_trabajo = Column(String(32), primary_key=True)
+    estado = Column(String(20), nullable=False, default='pendiente', index=True)
+    gestion_origen = Column(String(20), nullable=False)
+    gestion_destino = Column(String(20), nullable=False)
+    pasos_totales = Column(Integer, nullable=False, default=0)
+    pasos_completados = Column(Integer, nullable=False, default=0)
+    porcentaje = Column(Float, nullable=False, default=0.0)
+    mensaje = Column(String(200), nullable=True)
+    cursos_creados = Column(Integer, nullable=False, default=0)
+    estudiantes_inscritos = Column(Integer, nullable=False, default=0)
+    # Estudiantes que no entraron en su curso destino por capacidad
+    estudiantes_en_lista_espera = Column(Integer, nullable=False, default=0)
+    cursos_sin_destino = Column(JSON, nullable=False, default=list)
+    error = Column(Text, nullable=True)
+    fecha_creacion = Column(DateTime, nullable=False, default=datetime.now)
+
+    # Último cambio de estado o avance; sirve para depurar trabajos terminados y
+    # detectar los que quedaron huérfanos cuando su worker se reinició
+    fecha_actualizacion = Column(DateTime, nullable=False, default=datetime.now, index=True)
+
+    def __repr__(self):
+        return f"<TrabajoPromocion(id={self.id_trabajo}, estado={self.estado}, porcentaje={self.porcentaje})>"
@@ -0,0 +1,71 @@
+"""
+Esquemas Pydantic para los reportes de retención por cohortes
+"""
+from datetime import datetime
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+class TasasCohorte(BaseModel):
+    """
+    Resultado de una cohorte (estudiantes inscritos en la gestión origen) en la gestión destino
+    """
+    cohorte: int = Field(..., description="Estudiantes inscritos en la gestión origen")
+    retenidos: int = Field(..., description="Inscritos en la gestión destino y con estado Activo")
+    inscritos_no_activos: int = Field(..., description="Inscritos en la gestión destino con estado Abandono o Retirado")
+    abandonos: int = Field(..., description="Sin inscripción en la gestión destino y con estado Abandono")
+    retiros: int = Field(..., description="Sin inscripción en la gestión destino y con estado Retirado")
+    sin_reinscripcion: int = Field(..., description="Activos que todavía no se inscribieron en la gestión destino")
+    tasa_retencion: float
+    tasa_abandono: float
+    tasa_retiro: float
+
+class CohorteNivel(TasasCohorte):
+    """
+    Resultado de la cohorte de un nivel
+    """
+    nivel: str
+
+class CohorteCurso(TasasCohorte):
+    """
+    Resultado de la cohorte de un curso de la gestión origen
+    """
+    id_curso: int
+    nombre_curso: str
+    nivel: str
+
+class TransicionNivel(BaseModel):
+    """
+    Estudiantes que pasaron de un nivel en la gestión origen a un nivel en la destino
+    """
+    nivel_origen: str
+    nivel_destino: Optional[str] = Field(None, description="None: sin inscripción en la gestión destino")
+    estudiantes: int
+
+class CohorteResponse(BaseModel):
+    """
+    Esquema de respuesta del reporte de retención entre dos gestiones
+    """
+    gestion_origen: str
+    gestion_destino: str
+    generado: datetime
+    resumen: TasasCohorte
+    por_nivel: List[CohorteNivel] = []
+    por_curso: List[CohorteCurso] = []
+    transiciones: List[TransicionNivel] = []
+
+class FilaMatrizCohortes(BaseModel):
+    """
+    Una cohorte de la matriz: cuántos de sus estudiantes siguen inscritos k gestiones después
+    """
+    gestion: str
+    estudiantes: int
+    inscritos: List[Optional[int]] = Field(..., description="Inscritos en gestion + k (None: gestión todavía sin datos)")
+    tasas: List[Optional[float]]
+
+class MatrizCohortesResponse(BaseModel):
+    """
+    Esquema de respuesta de la matriz de retención de todas las gestiones
+    """
+    generado: datetime
+    desplazamientos: List[int] = Field(..., description="Valores de k de cada columna")
+    filas: List[FilaMatrizCohortes] = []
@@ -12,6 +12,7 @@ class CursoBase(BaseModel):
     nombre_curso: str = Field(..., min_length=1, max_length=50, description="Nombre del curso")
     nivel: Literal['inicial', 'primaria', 'secundaria'] = Field(..., description="Nivel educativo")
     gestion: str = Field(..., min_length=1, max_length=20, description="Gestión o año académico")
+    capacidad: Optional[int] = Field(None, ge=1, description="Cupo máximo de estudiantes (nulo: sin límite)")
     
     @validator('nombre_curso', 'gestion')
     def validar_no_vacio(cls, v):
@@ -42,6 +43,7 @@ class CursoUpdate(BaseModel):
     nombre_curso: Optional[str] = Field(None, min_length=1, max_length=50)
     nivel: Optional[Literal['inicial', 'primaria', 'secundaria']] = None
     gestion: Optional[str] = Field(None, min_length=1, max_length=20)
+    capacidad: Optional[int] = Field(None, ge=1, description="Enviar null para quitar el límite")
     
     @validator('nombre_curso', 'gestion')
     def validar_no_vacio(cls, v):
@@ -55,6 +57,11 @@ class CursoResponse(CursoBase):
     Esquema de respuesta que incluye el ID del curso
     """
     id_curso: int = Field(..., description="ID único del curso")
+    version: int = Field(..., description="Versión del registro (se envía en If-Match al actualizar)")
+    cantidad_estudiantes: int = Field(0, description="Estudiantes inscritos en el curso")
+    cantidad_activos: int = Field(0, description="Inscritos con estado Activo")
+    cantidad_abandonos: int = Field(0, description="Inscritos con estado Abandono")
+    cantidad_retirados: int = Field(0, description="Inscritos con estado Retirado")
     
     class Config:
         from_attributes = True  # Permite crear desde objetos ORM
@@ -0,0 +1,64 @@
+"""
+Esquemas Pydantic para las estadísticas agregadas
+"""
+from datetime import datetime
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+class ConteoPorEstado(BaseModel):
+    """
+    Cantidad de estudiantes por estado
+    """
+    Activo: int = 0
+    Abandono: int = 0
+    Retirado: int = 0
+
+class EstadisticaEstudiantes(BaseModel):
+    """
+    Totales de la tabla de estudiantes
+    """
+    total: int = Field(..., description="Cantidad de estudiantes registrados")
+    por_estado: ConteoPorEstado
+
+class EstadisticaGestion(BaseModel):
+    """
+    Totales de una gestión
+    """
+    gestion: str
+    cursos: int = Field(..., description="Cursos de la gestión")
+    inscripciones: int = Field(..., description="Pares estudiante-curso de la gestión")
+    estudiantes: int = Field(..., description="Estudiantes distintos inscritos en la gestión")
+    por_estado: ConteoPorEstado
+
+class EstadisticaNivel(BaseModel):
+    """
+    Totales de un nivel dentro de una gestión
+    """
+    gestion: str
+    nivel: str
+    cursos: int
+    inscripciones: int
+    estudiantes: int = Field(..., description="Estudiantes distintos inscritos en el nivel")
+    por_estado: ConteoPorEstado
+
+class EstadisticaCurso(BaseModel):
+    """
+    Totales de un curso
+    """
+    id_curso: int
+    nombre_curso: str
+    nivel: str
+    gestion: str
+    estudiantes: int
+    por_estado: ConteoPorEstado
+
+class EstadisticasResponse(BaseModel):
+    """
+    Esquema de respuesta de las estadísticas agregadas
+    """
+    gestion: Optional[str] = Field(None, description="Gestión filtrada (None: todas)")
+    generado: datetime = Field(..., description="Momento en que se calcularon (pueden venir de la caché)")
+    estudiantes: EstadisticaEstudiantes
+    por_gestion: List[EstadisticaGestion] = []
+    por_nivel: List[EstadisticaNivel] = []
+    por_curso: Optional[List[EstadisticaCurso]] = Field(None, description="Solo cuando se filtra por gestión")
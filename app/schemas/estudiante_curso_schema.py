@@ -2,8 +2,8 @@
 Esquemas Pydantic para la relación estudiantes-cursos
 """
 from pydantic import BaseModel, Field
-from typing import List, Optional
-from datetime import date
+from typing import Any, Dict, List, Optional, Literal
+from datetime import date, datetime
 
 # Schemas simplificados para evitar referencias circulares
 
@@ -58,6 +58,11 @@ class CursoConEstudiantes(BaseModel):
     nombre_curso: str
     nivel: str
     gestion: str
+    capacidad: Optional[int] = None
+    cantidad_estudiantes: int = 0
+    cantidad_activos: int = 0
+    cantidad_abandonos: int = 0
+    cantidad_retirados: int = 0
     estudiantes: List[EstudianteSimple] = []
     
     class Config:
@@ -73,6 +78,8 @@ class AsignacionResponse(BaseModel):
     mensaje: str
     id_estudiante: int
     id_curso: int
+    en_lista_espera: bool = Field(False, description="True si el curso estaba lleno y el estudiante quedó en espera")
+    posicion_lista_espera: Optional[int] = None
 
 
 class EstudianteConCursosGestion(BaseModel):
@@ -97,3 +104,69 @@ class EstudianteConCursosGestion(BaseModel):
     
     class Config:
         from_attributes = True
+
+
+class MoverEstudianteCurso(BaseModel):
+    """Schema para mover un estudiante de un curso a otro"""
+    id_estudiante: int = Field(..., description="ID del estudiante")
+    id_curso_origen: int = Field(..., description="ID del curso actual")
+    id_curso_destino: int = Field(..., description="ID del nuevo curso")
+
+class AsignacionLoteRequest(BaseModel):
+    """Schema para aplicar muchas asignaciones en una sola transacción"""
+    asignar: List[AsignarEstudianteCurso] = Field(default_factory=list, max_length=5000, description="Pares a asignar")
+    desasignar: List[AsignarEstudianteCurso] = Field(default_factory=list, max_length=5000, description="Pares a desasignar")
+    mover: List[MoverEstudianteCurso] = Field(default_factory=list, max_length=5000, description="Estudiantes a mover de curso")
+
+class ResultadoOperacionLote(BaseModel):
+    """Schema con el resultado de una operación del lote"""
+    operacion: Literal['asignar', 'desasignar', 'mover']
+    id_estudiante: int
+    id_curso: int
+    id_curso_destino: Optional[int] = None
+    resultado: Literal[
+        'aplicado', 'ya_asignado', 'no_asignado', 'lista_espera', 'sin_cupo',
+        'estudiante_no_encontrado', 'curso_no_encontrado'
+    ]
+
+class AsignacionLoteResponse(BaseModel):
+    """Schema de respuesta para asignaciones en lote"""
+    mensaje: str
+    aplicadas: int
+    omitidas: int
+    resultados: List[ResultadoOperacionLote] = []
+
+class CursoRosterResponse(BaseModel):
+    """Schema de una página de la lista de estudiantes de un curso"""
+    id_curso: int
+    nombre_curso: str
+    nivel: str
+    gestion: str
+    estudiantes: List[Dict[str, Any]] = Field(default_factory=list, description="Estudiantes con las columnas solicitadas")
+    siguiente_cursor: Optional[str] = Field(None, description="Cursor para pedir la página siguiente; nulo si no hay más")
+
+class EstudianteEnEspera(BaseModel):
+    """Schema de un estudiante en la lista de espera de un curso"""
+    posicion: int
+    id_estudiante: int
+    nombres: str
+    apellido_paterno: str
+    apellido_materno: str
+    estado_estudiante: str
+    fecha_solicitud: datetime
+
+class ListaEsperaResponse(BaseModel):
+    """Schema de la lista de espera de un curso, en orden de llegada"""
+    id_curso: int
+    nombre_curso: str
+    capacidad: Optional[int] = None
+    cantidad_estudiantes: int
+    lugares_libres: Optional[int] = Field(None, description="Nulo si el curso no tiene capacidad")
+    estudiantes: List[EstudianteEnEspera] = []
+
+class PromocionListaEsperaResponse(BaseModel):
+    """Schema de respuesta al inscribir estudiantes desde la lista de espera"""
+    mensaje: str
+    id_curso: int
+    inscritos: List[int] = Field(default_factory=list, description="IDs inscritos, en orden de llegada")
+    en_espera: int = Field(..., description="Estudiantes que siguen en la lista")
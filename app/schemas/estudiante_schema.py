@@ -59,9 +59,11 @@ class CambiarEstadoResponse(BaseModel):
     id_estudiante: int
     estado_anterior: str
     estado_nuevo: str
+    version: int
 
 class EstudianteResponse(EstudianteBase):
     id_estudiante: int = Field(..., description="ID único del estudiante")
+    version: int = Field(..., description="Versión del registro (se envía en If-Match al actualizar)")
     
     class Config:
         from_attributes = True  # Permite crear desde objetos ORM
@@ -0,0 +1,50 @@
+"""
+Esquemas Pydantic para el catálogo de gestiones
+"""
+from pydantic import BaseModel, Field, validator
+from typing import Optional
+from datetime import datetime
+
+class GestionCreate(BaseModel):
+    """
+    Esquema para registrar una gestión antes de crear sus cursos
+    """
+    gestion: str = Field(..., min_length=1, max_length=20, description="Gestión o año académico")
+    actual: bool = Field(False, description="Marcarla como gestión actual")
+
+    @validator('gestion')
+    def validar_no_vacio(cls, v):
+        """Validar que la gestión no esté vacía"""
+        if not v.strip():
+            raise ValueError('La gestión no puede estar vacía')
+        return v.strip()
+
+class GestionUpdate(BaseModel):
+    """
+    Esquema para actualizar una gestión
+    Todos los campos son opcionales
+    """
+    actual: Optional[bool] = Field(None, description="true: pasa a ser la gestión actual (la anterior deja de serlo)")
+    cerrada: Optional[bool] = Field(None, description="Marcar la gestión como terminada")
+
+class ArchivoGestionResponse(BaseModel):
+    """
+    Esquema de respuesta al archivar o restaurar una gestión
+    """
+    mensaje: str = Field(..., description="Mensaje de confirmación")
+    gestion: str = Field(..., description="Gestión movida")
+    cursos: int = Field(..., description="Cursos movidos")
+    inscripciones: int = Field(..., description="Inscripciones movidas")
+
+class GestionCatalogoResponse(BaseModel):
+    """
+    Esquema de respuesta de una gestión del catálogo
+    """
+    gestion: str = Field(..., description="Gestión o año académico")
+    actual: bool = Field(..., description="Si es la gestión por defecto de los listados")
+    cerrada: bool = Field(..., description="Si la gestión está terminada")
+    archivada: bool = Field(..., description="Si sus cursos e inscripciones están en las tablas de archivo")
+    fecha_creacion: datetime = Field(..., description="Fecha en que se registró la gestión")
+
+    class Config:
+        from_attributes = True
@@ -9,6 +9,7 @@ class GestionResponse(BaseModel):
     Esquema para respuesta de gestiones disponibles
     """
     gestion: str = Field(..., description="Año de gestión")
+    actual: bool = Field(False, description="Si es la gestión actual")
     
     class Config:
         from_attributes = True
@@ -52,4 +53,6 @@ class InscripcionMasivaResponse(BaseModel):
     mensaje: str = Field(..., description="Mensaje de confirmación")
     estudiantes_inscritos: int = Field(..., description="Cantidad de estudiantes inscritos exitosamente")
     estudiantes_ya_inscritos: int = Field(..., description="Cantidad de estudiantes que ya estaban inscritos")
+    estudiantes_en_lista_espera: int = Field(0, description="Cantidad de estudiantes que no entraron por capacidad y quedaron en espera")
+    ids_en_lista_espera: List[int] = Field(default_factory=list, description="IDs de los estudiantes que quedaron en espera")
     total_procesados: int = Field(..., description="Total de estudiantes procesados")
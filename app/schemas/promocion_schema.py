@@ -0,0 +1,58 @@
+"""
+Esquemas Pydantic para la promoción de estudiantes entre gestiones
+"""
+from pydantic import BaseModel, Field, validator
+from typing import List, Optional, Literal
+
+class MapeoCursoPromocion(BaseModel):
+    """
+    Esquema para indicar a qué curso de la gestión destino pasan los estudiantes de un curso origen
+    """
+    id_curso_origen: int = Field(..., description="ID del curso en la gestión origen")
+    nombre_curso_destino: str = Field(..., min_length=1, max_length=50, description="Nombre del curso en la gestión destino")
+    nivel_destino: Literal['inicial', 'primaria', 'secundaria'] = Field(..., description="Nivel del curso en la gestión destino")
+
+    @validator('nombre_curso_destino')
+    def validar_no_vacio(cls, v):
+        """Validar que el nombre del curso no esté vacío"""
+        if v and not v.strip():
+            raise ValueError('El campo no puede estar vacío')
+        return v.strip()
+
+class PromocionGestionRequest(BaseModel):
+    """
+    Esquema para promover una gestión completa a la siguiente
+    """
+    gestion_origen: str = Field(..., min_length=1, max_length=20, description="Gestión de origen (ej: 2025)")
+    gestion_destino: str = Field(..., min_length=1, max_length=20, description="Gestión de destino (ej: 2026)")
+    modo_mapeo: Literal['explicito', 'mismo_curso', 'orden_nivel'] = Field(
+        default='orden_nivel',
+        description="explicito: usa 'mapeo'; mismo_curso: mismo nombre y nivel; orden_nivel: mismo paralelo del grado siguiente (grados ordenados por nivel y por el número con que empiezan: 1ro, 2do, ...)"
+    )
+    salto: int = Field(default=1, ge=1, description="Grados a avanzar en modo orden_nivel (1: al grado siguiente)")
+    mapeo: Optional[List[MapeoCursoPromocion]] = Field(None, description="Mapeo explícito de cursos (solo modo explicito)")
+
+    @validator('gestion_origen', 'gestion_destino')
+    def validar_gestion(cls, v):
+        """Validar que las gestiones no estén vacías"""
+        if v and not v.strip():
+            raise ValueError('La gestión no puede estar vacía')
+        return v.strip()
+
+class TrabajoPromocionResponse(BaseModel):
+    """
+    Esquema de respuesta con el estado de un trabajo de promoción
+    """
+    id_trabajo: str = Field(..., description="ID del trabajo de promoción")
+    estado: Literal['pendiente', 'en_proceso', 'completado', 'error'] = Field(..., description="Estado del trabajo")
+    gestion_origen: str = Field(..., description="Gestión de origen")
+    gestion_destino: str = Field(..., description="Gestión de destino")
+    pasos_totales: int = Field(0, description="Cantidad total de pasos del trabajo")
+    pasos_completados: int = Field(0, description="Cantidad de pasos completados")
+    porcentaje: float = Field(0, description="Porcentaje de avance")
+    mensaje: Optional[str] = Field(None, description="Descripción del paso actual o del resultado")
+    cursos_creados: int = Field(0, description="Cursos creados en la gestión destino")
+    estudiantes_inscritos: int = Field(0, description="Estudiantes inscritos en la gestión destino")
+    estudiantes_en_lista_espera: int = Field(0, description="Estudiantes que quedaron en la lista de espera de un curso destino lleno")
+    cursos_sin_destino: List[int] = Field(default_factory=list, description="IDs de cursos origen sin curso destino (ej: último curso)")
+    error: Optional[str] = Field(None, description="Detalle del error si el trabajo falló")
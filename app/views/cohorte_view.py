@@ -0,0 +1,55 @@
+"""
+Vista (Router) para los endpoints de retención por cohortes
+"""
+from fastapi import APIRouter, Depends, status, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+from app.config.database import get_db
+from app.middlewares.tiempos_middleware import RutaCronometrada
+from app.controllers.cohorte_controller import CohorteController
+from app.schemas.cohorte_schema import CohorteResponse, MatrizCohortesResponse
+
+# Crear router con prefijo y etiquetas
+router = APIRouter(
+    prefix="/api/cohortes",
+    tags=["Cohortes"],
+    route_class=RutaCronometrada
+)
+
+# /matriz se declara antes de /{gestion_origen} para que no se tome como una gestión
+@router.get(
+    "/matriz",
+    response_model=MatrizCohortesResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Matriz de retención de todas las gestiones",
+    description="Para cada gestión, cuántos de sus estudiantes siguen inscritos 0, 1, ..., maximo gestiones después. El resultado se guarda en caché."
+)
+def obtener_matriz(
+    maximo: int = Query(6, ge=1, le=20, description="Cantidad de gestiones posteriores a medir"),
+    db: Session = Depends(get_db)
+):
+    """
+    Endpoint para la matriz de cohortes (triángulo de retención)
+    """
+    return CohorteController.obtener_matriz(db, maximo)
+
+@router.get(
+    "/{gestion_origen}",
+    response_model=CohorteResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Reporte de retención de una cohorte",
+    description="Estudiantes de la gestión que siguen Activo e inscritos en la siguiente (o en gestion_destino), abandonos, retiros y tasas por nivel y por curso. El resultado se guarda en caché por par de gestiones y se invalida con cada inscripción o cambio de estado."
+)
+def obtener_reporte(
+    gestion_origen: str,
+    gestion_destino: Optional[str] = Query(None, description="Gestión en la que se mide la retención (por defecto: la siguiente)"),
+    db: Session = Depends(get_db)
+):
+    """
+    Endpoint para el reporte anual de retención:
+
+    - **resumen**: totales y tasas de toda la cohorte
+    - **por_nivel** y **por_curso**: lo mismo según el curso de la gestión origen
+    - **transiciones**: estudiantes por nivel origen y nivel destino
+    """
+    return CohorteController.obtener_reporte(db, gestion_origen, gestion_destino)
@@ -2,12 +2,14 @@
 Vista (Router) para los endpoints de cursos
 Define las rutas HTTP y conecta con el controlador
 """
-from fastapi import APIRouter, Depends, status, Query
+from fastapi import APIRouter, Depends, status, Query, Header, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from datetime import datetime
 from app.config.database import get_db
+from app.middlewares.tiempos_middleware import RutaCronometrada
 from app.controllers.curso_controller import CursoController
+from app.controllers.gestion_controller import GestionController
+from app.views.etag import etag, version_desde_if_match
 from app.schemas.curso_schema import (
     CursoCreate,
     CursoUpdate,
@@ -20,7 +22,8 @@ from app.schemas.estudiante_curso_schema import CursoConEstudiantes
 # Crear router con prefijo y etiquetas
 router = APIRouter(
     prefix="/api/cursos",
-    tags=["Cursos"]
+    tags=["Cursos"],
+    route_class=RutaCronometrada
 )
 
 @router.get(
@@ -28,62 +31,68 @@ router = APIRouter(
     response_model=List[CursoConEstudiantes],
     status_code=status.HTTP_200_OK,
     summary="Listar todos los cursos con sus estudiantes",
-    description="Obtiene una lista de todos los cursos registrados con sus estudiantes asignados. Por defecto filtra por el año actual. Usa gestion='all' para ver todos los años."
+    description="Obtiene una lista de todos los cursos registrados con sus estudiantes asignados. Por defecto filtra por la gestión actual. Usa gestion='all' para ver todas las gestiones."
 )
 def listar_cursos(
     skip: int = Query(0, ge=0, description="Número de registros a saltar"),
     limit: int = Query(100, ge=1, le=1000, description="Número máximo de registros"),
     nivel: Optional[str] = Query(None, description="Filtrar por nivel (inicial, primaria, secundaria)"),
-    gestion: Optional[str] = Query(None, description="Filtrar por gestión. Por defecto: año actual. Usa 'all' para ver todos"),
+    gestion: Optional[str] = Query(None, description="Filtrar por gestión. Por defecto: gestión actual. Usa 'all' para ver todas"),
+    estudiantes: bool = Query(True, description="false: no incluir la lista de estudiantes (los contadores cantidad_* siempre se incluyen)"),
     db: Session = Depends(get_db)
 ):
     """
     Endpoint para listar todos los cursos con sus estudiantes y filtros opcionales.
-    Por defecto filtra por el año actual. Para ver todos los años, usa gestion='all'
+    Por defecto filtra por la gestión actual. Para ver todas las gestiones, usa gestion='all'
     """
-    # Si no se especifica gestión, usar el año actual
+    # Si no se especifica gestión, usar la gestión actual del catálogo
     if gestion is None:
-        gestion = str(datetime.now().year)
+        gestion = GestionController.obtener_actual(db)
     # Si se especifica 'all', no filtrar por gestión
     elif gestion.lower() == 'all':
         gestion = None
     
-    return CursoController.obtener_todos(db, skip=skip, limit=limit, nivel=nivel, gestion=gestion)
+    return CursoController.obtener_todos(
+        db, skip=skip, limit=limit, nivel=nivel, gestion=gestion, incluir_estudiantes=estudiantes
+    )
 
 @router.get(
     "/por-gestion-nivel",
     response_model=List[CursoConEstudiantes],
     status_code=status.HTTP_200_OK,
     summary="Listar cursos por gestión y nivel",
-    description="Endpoint específico para obtener cursos filtrados por gestión y opcionalmente por nivel. Por defecto usa el año actual."
+    description="Endpoint específico para obtener cursos filtrados por gestión y opcionalmente por nivel. Por defecto usa la gestión actual."
 )
 def listar_cursos_por_gestion_nivel(
-    gestion: Optional[str] = Query(None, description="Gestión a filtrar. Por defecto: año actual"),
+    gestion: Optional[str] = Query(None, description="Gestión a filtrar. Por defecto: gestión actual"),
     nivel: Optional[str] = Query(None, description="Filtrar por nivel (inicial, primaria, secundaria)"),
     skip: int = Query(0, ge=0, description="Número de registros a saltar"),
     limit: int = Query(100, ge=1, le=1000, description="Número máximo de registros"),
+    estudiantes: bool = Query(True, description="false: no incluir la lista de estudiantes (los contadores cantidad_* siempre se incluyen)"),
     db: Session = Depends(get_db)
 ):
     """
     Endpoint para listar cursos filtrados por gestión y nivel.
-    Por defecto filtra por el año actual.
+    Por defecto filtra por la gestión actual.
     
     Ejemplos:
-    - /api/cursos/por-gestion-nivel → Cursos del año actual
+    - /api/cursos/por-gestion-nivel → Cursos de la gestión actual
     - /api/cursos/por-gestion-nivel?gestion=2025 → Cursos de 2025
     - /api/cursos/por-gestion-nivel?gestion=2025&nivel=primaria → Cursos de primaria 2025
-    - /api/cursos/por-gestion-nivel?nivel=secundaria → Cursos de secundaria del año actual
+    - /api/cursos/por-gestion-nivel?nivel=secundaria → Cursos de secundaria de la gestión actual
+    - /api/cursos/por-gestion-nivel?estudiantes=false → Solo cursos y ocupación, sin listas de estudiantes
     """
-    # Si no se especifica gestión, usar el año actual
+    # Si no se especifica gestión, usar la gestión actual del catálogo
     if gestion is None:
-        gestion = str(datetime.now().year)
+        gestion = GestionController.obtener_actual(db)
     
     return CursoController.obtener_todos(
         db, 
         skip=skip, 
         limit=limit, 
         nivel=nivel, 
-        gestion=gestion
+        gestion=gestion,
+        incluir_estudiantes=estudiantes
     )
 
 @router.get(
@@ -91,16 +100,20 @@ def listar_cursos_por_gestion_nivel(
     response_model=CursoConEstudiantes,
     status_code=status.HTTP_200_OK,
     summary="Obtener curso por ID con sus estudiantes",
-    description="Obtiene la información detallada de un curso específico incluyendo los estudiantes asignados"
+    description="Obtiene la información detallada de un curso específico incluyendo los estudiantes asignados. También encuentra los cursos de gestiones archivadas."
 )
 def obtener_curso(
     id_curso: int,
+    response: Response,
     db: Session = Depends(get_db)
 ):
     """
-    Endpoint para obtener un curso por su ID con sus estudiantes
+    Endpoint para obtener un curso por su ID con sus estudiantes.
+    El header ETag contiene la versión del registro.
     """
-    return CursoController.obtener_por_id(db, id_curso)
+    curso = CursoController.obtener_por_id(db, id_curso, incluir_archivados=True)
+    response.headers["ETag"] = etag(curso.version)
+    return curso
 
 @router.post(
     "/",
@@ -123,17 +136,26 @@ def crear_curso(
     response_model=CursoResponse,
     status_code=status.HTTP_200_OK,
     summary="Actualizar curso",
-    description="Actualiza la información de un curso existente"
+    description="Actualiza la información de un curso existente. Si se envía If-Match con el ETag obtenido, responde 409 cuando otro usuario ya lo modificó."
 )
 def actualizar_curso(
     id_curso: int,
     curso: CursoUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None, description="ETag obtenido al leer el curso"),
     db: Session = Depends(get_db)
 ):
     """
     Endpoint para actualizar un curso existente
     """
-    return CursoController.actualizar(db, id_curso, curso)
+    actualizado = CursoController.actualizar(
+        db,
+        id_curso,
+        curso,
+        version_esperada=version_desde_if_match(if_match)
+    )
+    response.headers["ETag"] = etag(actualizado.version)
+    return actualizado
 
 @router.delete(
     "/{id_curso}",
@@ -0,0 +1,36 @@
+"""
+Vista (Router) para los endpoints de estadísticas
+"""
+from fastapi import APIRouter, Depends, status, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+from app.config.database import get_db
+from app.middlewares.tiempos_middleware import RutaCronometrada
+from app.controllers.estadistica_controller import EstadisticaController
+from app.schemas.estadistica_schema import EstadisticasResponse
+
+# Crear router con prefijo y etiquetas
+router = APIRouter(
+    prefix="/api/estadisticas",
+    tags=["Estadísticas"],
+    route_class=RutaCronometrada
+)
+
+@router.get(
+    "/",
+    response_model=EstadisticasResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Obtener estadísticas agregadas",
+    description="Cantidad de estudiantes por estado y conteos de cursos, inscripciones y estudiantes por gestión, nivel y curso. El resultado se guarda en caché y se invalida con cada inscripción o cambio de estado."
+)
+def obtener_estadisticas(
+    gestion: Optional[str] = Query(None, description="Limitar a una gestión (incluye el detalle por curso)"),
+    db: Session = Depends(get_db)
+):
+    """
+    Endpoint para el tablero: reemplaza descargar las listas completas y contarlas en el cliente.
+
+    - Sin `gestion`: totales, conteos por gestión y por nivel de todas las gestiones
+    - Con `gestion`: los mismos conteos de esa gestión más el detalle por curso
+    """
+    return EstadisticaController.obtener_estadisticas(db, gestion)
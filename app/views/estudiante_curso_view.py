@@ -2,21 +2,29 @@
 Vista (Router) para los endpoints de asignación estudiantes-cursos
 Define las rutas HTTP para gestionar las relaciones
 """
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, status, Query, Response
 from sqlalchemy.orm import Session
+from typing import Optional, Literal
 from app.config.database import get_db
+from app.middlewares.tiempos_middleware import RutaCronometrada
 from app.controllers.estudiante_curso_controller import EstudianteCursoController
+from app.controllers.lista_espera_controller import ListaEsperaController
 from app.schemas.estudiante_curso_schema import (
     AsignarEstudianteCurso,
     AsignacionResponse,
-    CursoConEstudiantes,
-    EstudianteConCursos
+    AsignacionLoteRequest,
+    AsignacionLoteResponse,
+    CursoRosterResponse,
+    EstudianteConCursos,
+    ListaEsperaResponse,
+    PromocionListaEsperaResponse
 )
 
 # Crear router con prefijo y etiquetas
 router = APIRouter(
     prefix="/api/asignaciones",
-    tags=["Asignaciones Estudiante-Curso"]
+    tags=["Asignaciones Estudiante-Curso"],
+    route_class=RutaCronometrada
 )
 
 @router.post(
@@ -24,20 +32,24 @@ router = APIRouter(
     response_model=AsignacionResponse,
     status_code=status.HTTP_201_CREATED,
     summary="Asignar estudiante a curso",
-    description="Asigna un estudiante a un curso específico"
+    description="Asigna un estudiante a un curso específico. Si el curso llenó su capacidad, el estudiante queda en la lista de espera y se responde 202."
 )
 def asignar_estudiante_a_curso(
     asignacion: AsignarEstudianteCurso,
+    response: Response,
     db: Session = Depends(get_db)
 ):
     """
     Endpoint para asignar un estudiante a un curso
     """
-    return EstudianteCursoController.asignar_estudiante_a_curso(
+    resultado = EstudianteCursoController.asignar_estudiante_a_curso(
         db, 
         asignacion.id_estudiante, 
         asignacion.id_curso
     )
+    if resultado.get("en_lista_espera"):
+        response.status_code = status.HTTP_202_ACCEPTED
+    return resultado
 
 @router.delete(
     "/",
@@ -59,21 +71,122 @@ def desasignar_estudiante_de_curso(
         asignacion.id_curso
     )
 
+@router.post(
+    "/lote",
+    response_model=AsignacionLoteResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Aplicar asignaciones en lote",
+    description="Asigna, desasigna y mueve estudiantes entre cursos en una sola transacción, con el resultado de cada operación"
+)
+def procesar_lote_asignaciones(
+    lote: AsignacionLoteRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Endpoint para aplicar muchas asignaciones en una sola petición.
+    
+    Ejemplo de uso:
+    ```json
+    {
+        "asignar": [{"id_estudiante": 1, "id_curso": 10}],
+        "desasignar": [{"id_estudiante": 2, "id_curso": 10}],
+        "mover": [{"id_estudiante": 3, "id_curso_origen": 10, "id_curso_destino": 11}]
+    }
+    ```
+    
+    Nota: Las operaciones que no aplican (IDs inexistentes, pares ya asignados
+    o no asignados) se informan en 'resultados' sin detener el lote. Si el curso
+    destino está lleno, la asignación queda en 'lista_espera' y el cambio de
+    curso en 'sin_cupo' (el estudiante sigue en el curso de origen). Si otra
+    petición asigna alguno de los pares al mismo tiempo responde 409 y no aplica nada.
+    """
+    return EstudianteCursoController.procesar_lote(db, lote)
+
 @router.get(
     "/curso/{id_curso}",
-    response_model=CursoConEstudiantes,
+    response_model=CursoRosterResponse,
     status_code=status.HTTP_200_OK,
     summary="Obtener estudiantes de un curso",
-    description="Obtiene todos los estudiantes asignados a un curso específico"
+    description="Obtiene los estudiantes asignados a un curso, ordenados en el servidor, con paginación por cursor, filtro por estado y selección de columnas"
 )
 def obtener_estudiantes_de_curso(
     id_curso: int,
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Estudiantes por página. Por defecto: todos"),
+    cursor: Optional[str] = Query(None, description="Valor de 'siguiente_cursor' de la página anterior"),
+    orden: str = Query("apellidos", description="Orden: apellidos o id"),
+    descendente: bool = Query(False, description="Invertir el orden"),
+    estado: Optional[Literal['Activo', 'Abandono', 'Retirado']] = Query(None, description="Filtrar por estado del estudiante"),
+    campos: Optional[str] = Query(None, description="Columnas separadas por coma (ej: nombres,apellido_paterno)"),
+    db: Session = Depends(get_db)
+):
+    """
+    Endpoint para obtener los estudiantes de un curso.
+    
+    Ejemplos:
+    - /api/asignaciones/curso/5 → Todos los estudiantes ordenados por apellidos
+    - /api/asignaciones/curso/5?limit=25 → Primera página de 25
+    - /api/asignaciones/curso/5?limit=25&cursor=... → Página siguiente
+    - /api/asignaciones/curso/5?estado=Activo&campos=nombres,apellido_paterno
+    """
+    return EstudianteCursoController.obtener_estudiantes_de_curso(
+        db,
+        id_curso,
+        limit=limit,
+        cursor=cursor,
+        orden=orden,
+        descendente=descendente,
+        estado=estado,
+        campos=[campo.strip() for campo in campos.split(",") if campo.strip()] if campos else None
+    )
+
+@router.get(
+    "/curso/{id_curso}/lista-espera",
+    response_model=ListaEsperaResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Obtener la lista de espera de un curso",
+    description="Estudiantes que no entraron por capacidad, en orden de llegada, con la ocupación actual del curso"
+)
+def obtener_lista_espera(
+    id_curso: int,
+    db: Session = Depends(get_db)
+):
+    """
+    Endpoint para ver la lista de espera de un curso
+    """
+    return ListaEsperaController.obtener(db, id_curso)
+
+@router.post(
+    "/curso/{id_curso}/lista-espera/promover",
+    response_model=PromocionListaEsperaResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Inscribir desde la lista de espera",
+    description="Inscribe estudiantes activos de la lista de espera, en orden de llegada, hasta llenar los lugares libres del curso"
+)
+def promover_lista_espera(
+    id_curso: int,
+    db: Session = Depends(get_db)
+):
+    """
+    Endpoint para ocupar los lugares que se liberaron (desasignaciones o aumento de capacidad)
+    """
+    return ListaEsperaController.promover(db, id_curso)
+
+@router.delete(
+    "/curso/{id_curso}/lista-espera/{id_estudiante}",
+    response_model=AsignacionResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Quitar de la lista de espera",
+    description="Quita a un estudiante de la lista de espera de un curso"
+)
+def quitar_de_lista_espera(
+    id_curso: int,
+    id_estudiante: int,
     db: Session = Depends(get_db)
 ):
     """
-    Endpoint para obtener todos los estudiantes de un curso
+    Endpoint para quitar a un estudiante de la lista de espera
     """
-    return EstudianteCursoController.obtener_estudiantes_de_curso(db, id_curso)
+    return ListaEsperaController.quitar(db, id_curso, id_estudiante)
 
 @router.get(
     "/estudiante/{id_estudiante}",
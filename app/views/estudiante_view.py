@@ -2,11 +2,14 @@
 Vista (Router) para los endpoints de estudiantes
 Define las rutas HTTP y conecta con el controlador
 """
-from fastapi import APIRouter, Depends, status, Query
+from fastapi import APIRouter, Depends, status, Query, Header, Response
 from sqlalchemy.orm import Session
 from typing import List
 from app.config.database import get_db
+from app.middlewares.tiempos_middleware import RutaCronometrada
 from app.controllers.estudiante_controller import EstudianteController
+from app.controllers.gestion_controller import GestionController
+from app.views.etag import etag, version_desde_if_match
 from app.schemas.estudiante_schema import (
     EstudianteCreate,
     EstudianteUpdate,
@@ -16,12 +19,12 @@ from app.schemas.estudiante_schema import (
 )
 from app.schemas.estudiante_curso_schema import EstudianteConCursos, EstudianteConCursosGestion
 from typing import Optional
-from datetime import datetime
 
 # Crear router con prefijo y etiquetas
 router = APIRouter(
     prefix="/api/estudiantes",
-    tags=["Estudiantes"]
+    tags=["Estudiantes"],
+    route_class=RutaCronometrada
 )
 
 @router.get(
@@ -45,10 +48,10 @@ def listar_estudiantes(
     "/por-gestion",
     status_code=status.HTTP_200_OK,
     summary="Listar estudiantes por gestión",
-    description="Obtiene estudiantes filtrados por gestión (año académico), mostrando SOLO los cursos de esa gestión. Por defecto usa el año actual."
+    description="Obtiene estudiantes filtrados por gestión (año académico), mostrando SOLO los cursos de esa gestión. Por defecto usa la gestión actual."
 )
 def listar_estudiantes_por_gestion(
-    gestion: Optional[str] = Query(None, description="Gestión a filtrar. Por defecto: año actual"),
+    gestion: Optional[str] = Query(None, description="Gestión a filtrar. Por defecto: gestión actual"),
     nivel: Optional[str] = Query(None, description="Filtrar por nivel (inicial, primaria, secundaria)"),
     id_curso: Optional[int] = Query(None, description="Filtrar por ID de curso específico"),
     skip: int = Query(0, ge=0, description="Número de registros a saltar"),
@@ -57,12 +60,12 @@ def listar_estudiantes_por_gestion(
 ):
     """
     Endpoint para listar estudiantes filtrados por gestión.
-    Por defecto filtra por el año actual.
+    Por defecto filtra por la gestión actual.
     Los cursos mostrados corresponden SOLO a la gestión especificada.
     """
-    # Si no se especifica gestión, usar el año actual
+    # Si no se especifica gestión, usar la gestión actual del catálogo
     if gestion is None:
-        gestion = str(datetime.now().year)
+        gestion = GestionController.obtener_actual(db)
     
     return EstudianteController.obtener_por_gestion(
         db, 
@@ -82,12 +85,16 @@ def listar_estudiantes_por_gestion(
 )
 def obtener_estudiante(
     id_estudiante: int,
+    response: Response,
     db: Session = Depends(get_db)
 ):
     """
-    Endpoint para obtener un estudiante por su ID con sus cursos
+    Endpoint para obtener un estudiante por su ID con sus cursos.
+    El header ETag contiene la versión del registro.
     """
-    return EstudianteController.obtener_por_id(db, id_estudiante)
+    estudiante = EstudianteController.obtener_por_id(db, id_estudiante)
+    response.headers["ETag"] = etag(estudiante.version)
+    return estudiante
 
 @router.post(
     "/",
@@ -110,17 +117,26 @@ def crear_estudiante(
     response_model=EstudianteResponse,
     status_code=status.HTTP_200_OK,
     summary="Actualizar estudiante",
-    description="Actualiza la información de un estudiante existente"
+    description="Actualiza la información de un estudiante existente. Si se envía If-Match con el ETag obtenido, responde 409 cuando otro usuario ya lo modificó."
 )
 def actualizar_estudiante(
     id_estudiante: int,
     estudiante: EstudianteUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None, description="ETag obtenido al leer el estudiante"),
     db: Session = Depends(get_db)
 ):
     """
     Endpoint para actualizar un estudiante existente
     """
-    return EstudianteController.actualizar(db, id_estudiante, estudiante)
+    actualizado = EstudianteController.actualizar(
+        db,
+        id_estudiante,
+        estudiante,
+        version_esperada=version_desde_if_match(if_match)
+    )
+    response.headers["ETag"] = etag(actualizado.version)
+    return actualizado
 
 @router.delete(
     "/{id_estudiante}",
@@ -147,17 +163,22 @@ def eliminar_estudiante(
 def cambiar_estado_estudiante(
     id_estudiante: int,
     estado_data: CambiarEstadoEstudiante,
+    response: Response,
+    if_match: Optional[str] = Header(None, description="ETag obtenido al leer el estudiante"),
     db: Session = Depends(get_db)
 ):
     """
     Endpoint para cambiar el estado de un estudiante.
     Estados válidos: Activo, Abandono, Retirado
     """
-    return EstudianteController.cambiar_estado(
+    resultado = EstudianteController.cambiar_estado(
         db, 
         id_estudiante, 
-        estado_data.estado_estudiante
+        estado_data.estado_estudiante,
+        version_esperada=version_desde_if_match(if_match)
     )
+    response.headers["ETag"] = etag(resultado["version"])
+    return resultado
 
 @router.get(
     "/por-estado/{estado}",
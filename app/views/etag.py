@@ -0,0 +1,34 @@
+"""
+Utilidades para exponer la versión de los registros como ETag / If-Match
+"""
+from typing import Optional
+from fastapi import HTTPException, status
+
+def etag(version: int) -> str:
+    """Construir el valor del header ETag a partir de la versión del registro"""
+    return f'"{version}"'
+
+def version_desde_if_match(if_match: Optional[str]) -> Optional[int]:
+    """
+    Obtener la versión esperada desde el header If-Match
+
+    Returns:
+        Versión esperada, o None si no se envió el header o es '*'
+
+    Raises:
+        HTTPException: Si el header no tiene el formato de un ETag de la API
+    """
+    if if_match is None or if_match.strip() == "*":
+        return None
+
+    valor = if_match.strip()
+    if valor.startswith("W/"):
+        valor = valor[2:]
+
+    try:
+        return int(valor.strip('"'))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Header If-Match inválido"
+        )
@@ -1,17 +1,20 @@
 """
 Vista (Router) para los endpoints de importación/exportación Excel
 """
-from fastapi import APIRouter, Depends, UploadFile, File
+from fastapi import APIRouter, Depends, UploadFile, File, Query
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from app.config.database import get_db
+from app.middlewares.tiempos_middleware import RutaCronometrada
 from app.controllers.excel_controller import ExcelController
 from datetime import datetime
+from typing import Optional
 
 # Crear router
 router = APIRouter(
     prefix="/api/excel",
-    tags=["Excel - Importar/Exportar"]
+    tags=["Excel - Importar/Exportar"],
+    route_class=RutaCronometrada
 )
 
 @router.get(
@@ -59,6 +62,29 @@ def exportar_estudiante_por_id(
         headers={"Content-Disposition": f"attachment; filename={filename}"}
     )
 
+@router.get(
+    "/exportar-cohortes/{gestion_origen}",
+    summary="Exportar el reporte de retención de una cohorte a Excel",
+    description="Descarga el reporte de retención de los estudiantes de una gestión en la siguiente (o en gestion_destino), con hojas de resumen, por nivel, por curso y transiciones"
+)
+def exportar_cohortes(
+    gestion_origen: str,
+    gestion_destino: Optional[str] = Query(None, description="Gestión en la que se mide la retención (por defecto: la siguiente)"),
+    db: Session = Depends(get_db)
+):
+    """
+    Endpoint para exportar el reporte de /api/cohortes/{gestion_origen} a un archivo Excel
+    """
+    excel_file = ExcelController.exportar_cohortes(db, gestion_origen, gestion_destino)
+    
+    filename = f"cohortes_{gestion_origen}_{gestion_destino or 'siguiente'}.xlsx"
+    
+    return StreamingResponse(
+        excel_file,
+        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
 @router.post(
     "/importar-estudiantes",
     summary="Importar estudiantes desde Excel",
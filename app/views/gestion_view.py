@@ -0,0 +1,119 @@
+"""
+Vista (Router) para los endpoints del catálogo de gestiones
+"""
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.orm import Session
+from typing import List
+from app.config.database import get_db
+from app.middlewares.tiempos_middleware import RutaCronometrada
+from app.controllers.gestion_controller import GestionController
+from app.controllers.archivo_controller import ArchivoController
+from app.schemas.gestion_schema import GestionCreate, GestionUpdate, GestionCatalogoResponse, ArchivoGestionResponse
+
+# Crear router con prefijo y etiquetas
+router = APIRouter(
+    prefix="/api/gestiones",
+    tags=["Gestiones"],
+    route_class=RutaCronometrada
+)
+
+@router.get(
+    "/",
+    response_model=List[GestionCatalogoResponse],
+    status_code=status.HTTP_200_OK,
+    summary="Listar gestiones",
+    description="Catálogo de gestiones ordenado de la más reciente a la más antigua, con la gestión actual marcada"
+)
+def listar_gestiones(
+    db: Session = Depends(get_db)
+):
+    """
+    Endpoint para listar el catálogo de gestiones
+    """
+    return GestionController.obtener_todas(db)
+
+@router.get(
+    "/actual",
+    status_code=status.HTTP_200_OK,
+    summary="Obtener la gestión actual",
+    description="Gestión que usan por defecto los listados de cursos y estudiantes: la marcada como actual o, si no hay ninguna, la más reciente"
+)
+def obtener_gestion_actual(
+    db: Session = Depends(get_db)
+):
+    """
+    Endpoint para obtener la gestión actual (null si no hay gestiones)
+    """
+    return {"gestion": GestionController.obtener_actual(db)}
+
+@router.post(
+    "/",
+    response_model=GestionCatalogoResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Registrar gestión",
+    description="Registra una gestión antes de crear sus cursos. Las gestiones de los cursos creados o copiados se registran solas."
+)
+def crear_gestion(
+    gestion: GestionCreate,
+    db: Session = Depends(get_db)
+):
+    """
+    Endpoint para registrar una gestión
+    """
+    return GestionController.crear(db, gestion)
+
+@router.put(
+    "/{gestion}",
+    response_model=GestionCatalogoResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Actualizar gestión",
+    description="Marca la gestión como actual (la anterior deja de serlo) o como cerrada. La gestión actual no puede estar cerrada."
+)
+def actualizar_gestion(
+    gestion: str,
+    datos: GestionUpdate,
+    db: Session = Depends(get_db)
+):
+    """
+    Endpoint para cambiar la gestión actual o cerrar una gestión.
+
+    Ejemplo de uso:
+    ```json
+    {
+        "actual": true
+    }
+    ```
+    """
+    return GestionController.actualizar(db, gestion, datos)
+
+@router.post(
+    "/{gestion}/archivar",
+    response_model=ArchivoGestionResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Archivar gestión",
+    description="Mueve los cursos de una gestión cerrada (que no sea la actual) y sus inscripciones a las tablas de archivo. Sus cursos siguen visibles en los listados, reportes y exportaciones, pero ya no se modifican."
+)
+def archivar_gestion(
+    gestion: str,
+    db: Session = Depends(get_db)
+):
+    """
+    Endpoint para archivar una gestión cerrada
+    """
+    return ArchivoController.archivar(db, gestion)
+
+@router.post(
+    "/{gestion}/restaurar",
+    response_model=ArchivoGestionResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Restaurar gestión archivada",
+    description="Devuelve los cursos e inscripciones de una gestión archivada a las tablas vigentes y recalcula sus contadores"
+)
+def restaurar_gestion(
+    gestion: str,
+    db: Session = Depends(get_db)
+):
+    """
+    Endpoint para restaurar una gestión archivada
+    """
+    return ArchivoController.restaurar(db, gestion)
@@ -5,6 +5,7 @@ from fastapi import APIRouter, Depends, status, Query, Path
 from sqlalchemy.orm import Session
 from typing import List
 from app.config.database import get_db
+from app.middlewares.tiempos_middleware import RutaCronometrada
 from app.controllers.inscripcion_masiva_controller import InscripcionMasivaController
 from app.schemas.inscripcion_masiva_schema import (
     GestionResponse,
@@ -17,7 +18,8 @@ from app.schemas.inscripcion_masiva_schema import (
 # Crear router con prefijo y etiquetas
 router = APIRouter(
     prefix="/api/inscripcion-masiva",
-    tags=["Inscripción Masiva"]
+    tags=["Inscripción Masiva"],
+    route_class=RutaCronometrada
 )
 
 @router.get(
@@ -81,7 +83,7 @@ def obtener_estudiantes_para_inscripcion(
     response_model=InscripcionMasivaResponse,
     status_code=status.HTTP_201_CREATED,
     summary="Inscribir múltiples estudiantes a un curso",
-    description="Inscribe una lista de estudiantes a un curso destino. Omite estudiantes ya inscritos."
+    description="Inscribe una lista de estudiantes a un curso destino. Omite estudiantes ya inscritos. Si el curso tiene capacidad y no alcanza, los que no entran (en el orden recibido) quedan en la lista de espera."
 )
 def inscribir_estudiantes_masivamente(
     request: InscripcionMasivaRequest,
@@ -99,6 +101,7 @@ def inscribir_estudiantes_masivamente(
     ```
     
     Nota: Si un estudiante ya está inscrito en el curso, se omite sin generar error.
+    Los que no entran por capacidad se informan en 'ids_en_lista_espera'.
     """
     return InscripcionMasivaController.inscribir_estudiantes_masivamente(
         db,
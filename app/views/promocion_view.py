@@ -0,0 +1,63 @@
+"""
+Vista (Router) para los endpoints de promoción de gestión
+"""
+from fastapi import APIRouter, BackgroundTasks, Depends, status, Path
+from sqlalchemy.orm import Session
+from app.config.database import get_db
+from app.middlewares.tiempos_middleware import RutaCronometrada
+from app.controllers.promocion_controller import PromocionController
+from app.schemas.promocion_schema import PromocionGestionRequest, TrabajoPromocionResponse
+
+# Crear router con prefijo y etiquetas
+router = APIRouter(
+    prefix="/api/promocion",
+    tags=["Promoción de Gestión"],
+    route_class=RutaCronometrada
+)
+
+@router.post(
+    "/",
+    response_model=TrabajoPromocionResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Promover una gestión completa",
+    description="Crea los cursos de la gestión destino e inscribe a todos los estudiantes activos en segundo plano. Todo o nada."
+)
+def promover_gestion(
+    request: PromocionGestionRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
+):
+    """
+    Endpoint para iniciar la promoción de una gestión a la siguiente.
+
+    Ejemplo de uso:
+    ```json
+    {
+        "gestion_origen": "2025",
+        "gestion_destino": "2026",
+        "modo_mapeo": "orden_nivel",
+        "salto": 1
+    }
+    ```
+
+    Retorna el trabajo creado; consulte su avance con GET /api/promocion/{id_trabajo}.
+    """
+    trabajo = PromocionController.iniciar_promocion(db, request)
+    background_tasks.add_task(PromocionController.ejecutar_promocion, trabajo["id_trabajo"], request)
+    return trabajo
+
+@router.get(
+    "/{id_trabajo}",
+    response_model=TrabajoPromocionResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Consultar avance de una promoción",
+    description="Obtiene el estado y el porcentaje de avance de un trabajo de promoción. Los trabajos terminados se conservan PROMOCION_RETENCION_HORAS."
+)
+def obtener_trabajo_promocion(
+    id_trabajo: str = Path(..., description="ID del trabajo de promoción"),
+    db: Session = Depends(get_db)
+):
+    """
+    Endpoint para consultar el estado de un trabajo de promoción
+    """
+    return PromocionController.obtener_trabajo(db, id_trabajo)
@@ -0,0 +1,172 @@
+"""
+Benchmark del archivo de gestiones: latencia de las consultas de la gestión actual
+a medida que crece el historial
+Para cada tamaño de historial genera una base sintética con el mismo volumen por
+gestión (datos_sinteticos), mide las consultas de la gestión actual con todo el
+historial en las tablas vigentes, archiva las gestiones cerradas (todas menos las
+dos últimas) y vuelve a medir. Con el archivo, la latencia de la gestión actual
+debería quedar plana aunque el historial crezca.
+
+Termina con código 1 si, con el archivo, alguna consulta del historial más grande
+supera a la del más chico en más de --tolerancia (y de --piso-ms).
+
+Uso:
+    python -m benchmarks.bench_archivo
+    python -m benchmarks.bench_archivo --historias 2,5,10,20,40 --por-gestion 5000
+    python -m benchmarks.bench_archivo --directorio /tmp/archivo --repeticiones 50
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List
+from sqlalchemy import create_engine, text, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from app.config.database import Base
+from app.models.curso_model import Curso
+from app.models.gestion_model import Gestion
+from app.controllers.archivo_controller import ArchivoController
+from app.controllers.curso_controller import CursoController
+from app.controllers.estudiante_controller import EstudianteController
+from app.controllers.estadistica_controller import EstadisticaController
+from app.controllers.inscripcion_masiva_controller import InscripcionMasivaController
+from benchmarks.datos_sinteticos import GRADOS, generar
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ULTIMA_GESTION = 2026
+ACTUAL = str(ULTIMA_GESTION)
+ANTERIOR = str(ULTIMA_GESTION - 1)
+
+SQL_INSCRIPCIONES_ACTUAL = text("""
+    SELECT COUNT(*)
+    FROM estudiantes_cursos ec
+    JOIN cursos c ON c.id_curso = ec.id_curso
+    WHERE c.gestion = :gestion
+""")
+
+# Consultas de la gestión actual: (nombre, función(db, ctx))
+CASOS: List[tuple] = [
+    ("CursoController.obtener_todos (gestión actual)",
+     lambda db, ctx: CursoController.obtener_todos(db, gestion=ACTUAL)),
+    ("EstudianteController.obtener_por_gestion",
+     lambda db, ctx: EstudianteController.obtener_por_gestion(db, gestion=ACTUAL)),
+    ("EstadisticaController.calcular (gestión actual)",
+     lambda db, ctx: EstadisticaController.calcular(db, ACTUAL)),
+    ("obtener_estudiantes_para_inscripcion",
+     lambda db, ctx: InscripcionMasivaController.obtener_estudiantes_para_inscripcion(db, ctx["id_curso_anterior"], ACTUAL)),
+    ("SQL: inscripciones de la gestión actual",
+     lambda db, ctx: db.execute(SQL_INSCRIPCIONES_ACTUAL, {"gestion": ACTUAL}).scalar()),
+]
+
+def preparar(ruta: str, gestiones: int, por_gestion: int, cursos_por_gestion: int) -> Engine:
+    """
+    Crear una base nueva con `gestiones` años de historia. Cada estudiante cursa
+    len(GRADOS) gestiones, así que se generan los estudiantes necesarios para que
+    cada gestión tenga unas `por_gestion` inscripciones sin importar el historial.
+    """
+    if os.path.exists(ruta):
+        os.remove(ruta)
+    engine = create_engine(f"sqlite:///{ruta}")
+    Base.metadata.create_all(bind=engine)
+    estudiantes = round(por_gestion * (gestiones + len(GRADOS) - 1) / len(GRADOS))
+    generar(engine, estudiantes=estudiantes, cursos=cursos_por_gestion * gestiones,
+            gestiones=gestiones, ultima_gestion=ULTIMA_GESTION)
+
+    # La última gestión es la actual; todas las anteriores menos una quedan cerradas
+    with engine.begin() as conexion:
+        conexion.execute(update(Gestion).where(Gestion.gestion == ACTUAL).values(actual=True))
+        conexion.execute(
+            update(Gestion).where(Gestion.gestion.notin_([ACTUAL, ANTERIOR])).values(cerrada=True)
+        )
+    return engine
+
+def medir(engine: Engine, funcion: Callable, ctx: dict, repeticiones: int) -> float:
+    """Mediana en ms; cada repetición con una sesión nueva (sin identity map previo)"""
+    tiempos = []
+    for _ in range(repeticiones):
+        with Session(bind=engine) as db:
+            inicio = time.perf_counter()
+            funcion(db, ctx)
+            tiempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tiempos)
+
+def medir_todo(engine: Engine, ctx: dict, repeticiones: int) -> Dict[str, float]:
+    return {nombre: medir(engine, funcion, ctx, repeticiones) for nombre, funcion in CASOS}
+
+def archivar_cerradas(engine: Engine) -> float:
+    """Archivar todas las gestiones cerradas; devuelve los segundos que tomó"""
+    inicio = time.perf_counter()
+    with Session(bind=engine) as db:
+        cerradas = db.execute(
+            text("SELECT gestion FROM gestiones WHERE cerrada = 1 AND archivada = 0 ORDER BY gestion")
+        ).scalars().all()
+        for gestion in cerradas:
+            ArchivoController.archivar(db, gestion)
+    return time.perf_counter() - inicio
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--historias", default="2,5,10,20", help="Gestiones de historia de cada base, separadas por coma")
+    parser.add_argument("--por-gestion", type=int, default=3000, help="Inscripciones aproximadas por gestión")
+    parser.add_argument("--cursos-por-gestion", type=int, default=70, help="Cursos por gestión")
+    parser.add_argument("--repeticiones", type=int, default=15)
+    parser.add_argument("--directorio", default=os.path.join(RAIZ, "benchmarks", "datos"),
+                        help="Dónde crear las bases archivo_<gestiones>.db (se recrean en cada ejecución)")
+    parser.add_argument("--tolerancia", type=float, default=0.5,
+                        help="Crecimiento relativo máximo, con archivo, del historial más chico al más grande")
+    parser.add_argument("--piso-ms", type=float, default=2.0, help="Diferencias menores a esto no cuentan")
+    args = parser.parse_args()
+
+    historias = sorted(int(valor) for valor in args.historias.split(","))
+    if historias[0] < 2:
+        parser.error("cada historial necesita al menos 2 gestiones (la actual y la anterior quedan vigentes)")
+    os.makedirs(args.directorio, exist_ok=True)
+
+    resultados = {}
+    for gestiones in historias:
+        engine = preparar(os.path.join(args.directorio, f"archivo_{gestiones}.db"),
+                          gestiones, args.por_gestion, args.cursos_por_gestion)
+        with Session(bind=engine) as db:
+            ctx = {"id_curso_anterior": db.query(Curso.id_curso).filter(Curso.gestion == ANTERIOR).first()[0]}
+            filas_antes = ArchivoController.contar(db)
+
+        sin_archivo = medir_todo(engine, ctx, args.repeticiones)
+        segundos = archivar_cerradas(engine)
+        con_archivo = medir_todo(engine, ctx, args.repeticiones)
+        with Session(bind=engine) as db:
+            filas_despues = ArchivoController.contar(db)
+        engine.dispose()
+
+        resultados[gestiones] = {"sin": sin_archivo, "con": con_archivo}
+        print(f"\n{gestiones} gestiones: {filas_antes['inscripciones']} inscripciones vigentes -> "
+              f"{filas_despues['inscripciones']} tras archivar {filas_despues['inscripciones_archivadas']} "
+              f"({segundos:.2f}s)")
+        print(f"{'Consulta':<52}{'sin archivo ms':>16}{'con archivo ms':>16}")
+        for nombre, _ in CASOS:
+            print(f"{nombre:<52}{sin_archivo[nombre]:>16.2f}{con_archivo[nombre]:>16.2f}")
+
+    menor, mayor = historias[0], historias[-1]
+    print(f"\nCrecimiento de {menor} a {mayor} gestiones")
+    print(f"{'Consulta':<52}{'sin archivo':>14}{'con archivo':>14}")
+    fallas = []
+    for nombre, _ in CASOS:
+        crecimiento = {
+            variante: resultados[mayor][variante][nombre] / max(resultados[menor][variante][nombre], 1e-6)
+            for variante in ("sin", "con")
+        }
+        print(f"{nombre:<52}{crecimiento['sin']:>13.2f}x{crecimiento['con']:>13.2f}x")
+
+        base, final = resultados[menor]["con"][nombre], resultados[mayor]["con"][nombre]
+        if final > max(base * (1 + args.tolerancia), base + args.piso_ms):
+            fallas.append(f"{nombre}: {base:.2f} -> {final:.2f} ms con archivo")
+
+    for falla in fallas:
+        print(f"FALLA {falla}")
+    if not fallas:
+        print("\nCon el archivo, la latencia de la gestión actual no crece con el historial")
+    sys.exit(1 if fallas else 0)
+
+if __name__ == "__main__":
+    main()
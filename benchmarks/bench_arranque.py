@@ -0,0 +1,95 @@
+"""
+Benchmark de arranque de un worker: tiempo de importación de app.main y memoria (RSS)
+Cada medición se hace en un proceso nuevo, como un worker recién creado.
+No abre conexiones a la base de datos: la app no ejecuta DDL al importarse.
+
+Uso:
+    python -m benchmarks.bench_arranque
+    python -m benchmarks.bench_arranque --repeticiones 10 --guardar benchmarks/resultados/arranque.json
+    python -m benchmarks.bench_arranque --comparar benchmarks/resultados/arranque.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Código que ejecuta cada proceso hijo; imprime una línea JSON con las métricas
+SCRIPT_HIJO = r"""
+import json, sys, time
+inicio = time.perf_counter()
+import app.main
+duracion = time.perf_counter() - inicio
+
+rss_kb = 0
+try:
+    with open("/proc/self/status") as f:
+        for linea in f:
+            if linea.startswith("VmRSS:"):
+                rss_kb = int(linea.split()[1])
+except OSError:
+    import resource
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+print(json.dumps({
+    "importacion_ms": duracion * 1000,
+    "rss_mb": rss_kb / 1024,
+    "pandas_cargado": "pandas" in sys.modules,
+    "openpyxl_cargado": "openpyxl" in sys.modules,
+}))
+"""
+
+def medir_una_vez() -> dict:
+    """Importar app.main en un proceso nuevo y devolver sus métricas"""
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    salida = subprocess.run(
+        [sys.executable, "-c", SCRIPT_HIJO],
+        cwd=raiz,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return json.loads(salida.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--guardar", help="Guardar el resultado como línea base (JSON)")
+    parser.add_argument("--comparar", help="Comparar contra una línea base guardada (JSON)")
+    parser.add_argument("--tolerancia", type=float, default=0.2, help="Regresión permitida (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    mediciones = [medir_una_vez() for _ in range(args.repeticiones)]
+    resultado = {
+        "importacion_ms": statistics.median(m["importacion_ms"] for m in mediciones),
+        "rss_mb": statistics.median(m["rss_mb"] for m in mediciones),
+        "pandas_cargado": any(m["pandas_cargado"] for m in mediciones),
+        "openpyxl_cargado": any(m["openpyxl_cargado"] for m in mediciones),
+    }
+
+    print(f"Importación de app.main (mediana de {args.repeticiones}): {resultado['importacion_ms']:.0f} ms")
+    print(f"RSS por worker tras importar: {resultado['rss_mb']:.1f} MB")
+    print(f"pandas cargado: {resultado['pandas_cargado']} | openpyxl cargado: {resultado['openpyxl_cargado']}")
+
+    if args.guardar:
+        os.makedirs(os.path.dirname(os.path.abspath(args.guardar)), exist_ok=True)
+        with open(args.guardar, "w") as f:
+            json.dump(resultado, f, indent=2)
+        print(f"Línea base guardada en {args.guardar}")
+
+    if args.comparar:
+        with open(args.comparar) as f:
+            base = json.load(f)
+        regresiones = [
+            clave for clave in ("importacion_ms", "rss_mb")
+            if resultado[clave] > base[clave] * (1 + args.tolerancia)
+        ]
+        if resultado["pandas_cargado"] and not base["pandas_cargado"]:
+            regresiones.append("pandas_cargado")
+        for clave in regresiones:
+            print(f"REGRESIÓN {clave}: {base[clave]} -> {resultado[clave]}")
+        sys.exit(1 if regresiones else 0)
+
+if __name__ == "__main__":
+    main()
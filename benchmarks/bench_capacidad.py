@@ -0,0 +1,247 @@
+"""
+Prueba de estrés de la capacidad de los cursos con inscripciones concurrentes
+Simula a varias secretarias inscribiendo en el mismo curso al abrir las inscripciones:
+cada hilo tiene su propia sesión y llama a los controladores (asignación individual
+o inscripción masiva en lotes), todos a la vez. Al terminar verifica que no haya
+sobrecupo, que el contador del curso coincida con estudiantes_cursos y que cada
+estudiante esté inscrito o en la lista de espera (nunca en ambos).
+
+Con --comparar-conteo repite la prueba con la estrategia anterior a los contadores
+(SELECT ... FOR UPDATE del curso + COUNT(*) de estudiantes_cursos + INSERT) para
+comparar el throughput.
+
+Cada corrida crea su curso y sus estudiantes en una gestión propia ("estres-<hora>");
+la base no se borra. Con SQLite (por defecto, benchmarks/datos/capacidad.db) hay un
+solo escritor a la vez y las transacciones empiezan con BEGIN IMMEDIATE; la
+concurrencia real se mide contra MySQL con --url.
+
+Uso:
+    python -m benchmarks.bench_capacidad
+    python -m benchmarks.bench_capacidad --modo masiva --lote 20 --solicitudes 2000 --capacidad 1500
+    python -m benchmarks.bench_capacidad --url mysql+pymysql://root:@localhost/bienestar_bench --secretarias 32 --comparar-conteo
+
+Termina con código 1 si alguna verificación falla.
+"""
+import argparse
+import os
+import queue
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Callable, List
+from fastapi import HTTPException
+from sqlalchemy import create_engine, event, func, insert, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+from app.config.database import Base
+from app.models.estudiante_model import Estudiante, estudiantes_cursos
+from app.models.curso_model import Curso
+from app.models.lista_espera_model import lista_espera
+import app.models.estudiante_gestion_model  # noqa: F401
+from app.controllers.estudiante_curso_controller import EstudianteCursoController
+from app.controllers.inscripcion_masiva_controller import InscripcionMasivaController
+from app.controllers.contador_curso_controller import ContadorCursoController
+from app.controllers.indice_gestion_controller import IndiceGestionController
+from benchmarks.bench_carga import percentil
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+URL_POR_DEFECTO = f"sqlite:///{os.path.join(RAIZ, 'benchmarks', 'datos', 'capacidad.db')}"
+
+def crear_engine(url: str, conexiones: int) -> Engine:
+    """Engine con un pool del tamaño de la cantidad de secretarias"""
+    if not url.startswith("sqlite"):
+        return create_engine(url, pool_size=conexiones, max_overflow=0)
+
+    if url.startswith("sqlite:///"):
+        os.makedirs(os.path.dirname(url[len("sqlite:///"):]) or ".", exist_ok=True)
+    engine = create_engine(url, connect_args={"check_same_thread": False, "timeout": 60},
+                           pool_size=conexiones, max_overflow=0)
+
+    # SQLite no pasa de lector a escritor si otra conexión ya escribe (database is locked):
+    # cada transacción toma el lock de escritura al empezar
+    @event.listens_for(engine, "connect")
+    def _al_conectar(conexion_dbapi, registro):
+        conexion_dbapi.isolation_level = None
+        conexion_dbapi.execute("PRAGMA journal_mode=WAL")
+
+    @event.listens_for(engine, "begin")
+    def _al_iniciar(conexion):
+        conexion.exec_driver_sql("BEGIN IMMEDIATE")
+
+    return engine
+
+def preparar_corrida(engine: Engine, solicitudes: int, capacidad: int, etiqueta: str) -> tuple:
+    """Crear el curso con capacidad y los estudiantes activos que pedirán lugar"""
+    gestion = f"estres-{int(time.time())}"[:20]
+    with engine.begin() as conexion:
+        id_curso = conexion.execute(
+            insert(Curso.__table__).values(nombre_curso=f"Estrés {etiqueta}"[:50], nivel="primaria",
+                                            gestion=gestion, capacidad=capacidad)
+        ).inserted_primary_key[0]
+        conexion.execute(insert(Estudiante.__table__), [
+            {"nombres": f"Solicitante {i}", "apellido_paterno": etiqueta[:50], "apellido_materno": gestion,
+             "estado_estudiante": "Activo"}
+            for i in range(solicitudes)
+        ])
+        ids = list(conexion.execute(
+            select(Estudiante.id_estudiante)
+            .where(Estudiante.apellido_paterno == etiqueta[:50], Estudiante.apellido_materno == gestion)
+            .order_by(Estudiante.id_estudiante)
+        ).scalars())
+    return id_curso, ids
+
+def asignar_con_conteo(db: Session, id_estudiante: int, id_curso: int) -> str:
+    """Estrategia anterior: bloquear el curso, contar sus inscritos y decidir"""
+    curso = db.execute(
+        select(Curso.capacidad, Curso.gestion).where(Curso.id_curso == id_curso).with_for_update()
+    ).first()
+    inscritos = db.execute(
+        select(func.count()).select_from(estudiantes_cursos).where(estudiantes_cursos.c.id_curso == id_curso)
+    ).scalar()
+    if curso.capacidad is not None and inscritos >= curso.capacidad:
+        db.execute(insert(lista_espera).values(id_curso=id_curso, id_estudiante=id_estudiante))
+        db.commit()
+        return "espera"
+    db.execute(insert(estudiantes_cursos).values(id_estudiante=id_estudiante, id_curso=id_curso))
+    IndiceGestionController.sincronizar_estudiantes(db, [id_estudiante], [curso.gestion])
+    ContadorCursoController.ajustar(db, [(id_curso, "Activo", 1)])
+    db.commit()
+    return "inscrito"
+
+def _individual(db: Session, lote: List[int], id_curso: int) -> Counter:
+    resultado = EstudianteCursoController.asignar_estudiante_a_curso(db, lote[0], id_curso)
+    return Counter({"espera" if resultado.get("en_lista_espera") else "inscrito": 1})
+
+def _masiva(db: Session, lote: List[int], id_curso: int) -> Counter:
+    resultado = InscripcionMasivaController.inscribir_estudiantes_masivamente(db, id_curso, lote)
+    return Counter({"inscrito": resultado["estudiantes_inscritos"], "espera": resultado["estudiantes_en_lista_espera"]})
+
+def _conteo(db: Session, lote: List[int], id_curso: int) -> Counter:
+    return Counter({asignar_con_conteo(db, lote[0], id_curso): 1})
+
+ESTRATEGIAS = {"individual": _individual, "masiva": _masiva, "conteo": _conteo}
+
+def secretaria(fabrica: sessionmaker, tareas: queue.Queue, funcion: Callable, id_curso: int,
+               barrera: threading.Barrier, latencias: List[float], resultados: Counter, lock: threading.Lock) -> None:
+    """Tomar solicitudes de la cola hasta vaciarla; todas las secretarias arrancan juntas"""
+    barrera.wait()
+    while True:
+        try:
+            lote = tareas.get_nowait()
+        except queue.Empty:
+            return
+        db = fabrica()
+        inicio = time.perf_counter()
+        try:
+            salida = funcion(db, lote, id_curso)
+        except HTTPException as e:
+            salida = Counter({f"http_{e.status_code}": len(lote)})
+        except Exception as e:
+            db.rollback()
+            salida = Counter({type(e).__name__: len(lote)})
+        finally:
+            db.close()
+        with lock:
+            latencias.append((time.perf_counter() - inicio) * 1000)
+            resultados.update(salida)
+
+def verificar(engine: Engine, id_curso: int, ids: List[int], capacidad: int, resultados: Counter) -> List[str]:
+    """Invariantes del curso tras la corrida"""
+    with engine.connect() as conexion:
+        inscritos = set(conexion.execute(
+            select(estudiantes_cursos.c.id_estudiante).where(estudiantes_cursos.c.id_curso == id_curso)
+        ).scalars())
+        en_espera = set(conexion.execute(
+            select(lista_espera.c.id_estudiante).where(lista_espera.c.id_curso == id_curso)
+        ).scalars())
+        contador = conexion.execute(select(Curso.cantidad_estudiantes).where(Curso.id_curso == id_curso)).scalar()
+
+    fallas = []
+    errores = sum(n for clave, n in resultados.items() if clave not in ("inscrito", "espera"))
+    if len(inscritos) > capacidad:
+        fallas.append(f"sobrecupo: {len(inscritos)} inscritos con capacidad {capacidad}")
+    if contador != len(inscritos):
+        fallas.append(f"contador {contador} != {len(inscritos)} filas en estudiantes_cursos")
+    if inscritos & en_espera:
+        fallas.append(f"{len(inscritos & en_espera)} estudiantes inscritos y en espera a la vez")
+    if not errores and len(inscritos) != min(capacidad, len(ids)):
+        fallas.append(f"quedaron lugares libres: {len(inscritos)} inscritos de {min(capacidad, len(ids))} posibles")
+    if len(inscritos) + len(en_espera) + errores != len(ids):
+        fallas.append(f"{len(ids) - len(inscritos) - len(en_espera) - errores} solicitudes sin resultado")
+    if resultados["inscrito"] != len(inscritos):
+        fallas.append(f"los controladores informaron {resultados['inscrito']} inscritos y hay {len(inscritos)}")
+    return fallas
+
+def correr(engine: Engine, estrategia: str, args) -> dict:
+    """Una corrida completa: preparar, inscribir en paralelo y verificar"""
+    id_curso, ids = preparar_corrida(engine, args.solicitudes, args.capacidad, estrategia)
+    tamano = args.lote if estrategia == "masiva" else 1
+    tareas = queue.Queue()
+    for i in range(0, len(ids), tamano):
+        tareas.put(ids[i:i + tamano])
+
+    fabrica = sessionmaker(bind=engine)
+    barrera = threading.Barrier(args.secretarias)
+    latencias: List[float] = []
+    resultados: Counter = Counter()
+    lock = threading.Lock()
+    hilos = [
+        threading.Thread(target=secretaria, args=(fabrica, tareas, ESTRATEGIAS[estrategia], id_curso,
+                                                  barrera, latencias, resultados, lock))
+        for _ in range(args.secretarias)
+    ]
+    inicio = time.perf_counter()
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    segundos = time.perf_counter() - inicio
+
+    return {
+        "estrategia": estrategia,
+        "segundos": segundos,
+        "solicitudes_s": len(ids) / segundos,
+        "p50_ms": percentil(latencias, 50),
+        "p95_ms": percentil(latencias, 95),
+        "p99_ms": percentil(latencias, 99),
+        "resultados": dict(resultados),
+        "fallas": verificar(engine, id_curso, ids, args.capacidad, resultados),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=URL_POR_DEFECTO, help="Base de datos (se crean las tablas que falten)")
+    parser.add_argument("--secretarias", type=int, default=16, help="Hilos inscribiendo a la vez")
+    parser.add_argument("--solicitudes", type=int, default=600, help="Estudiantes que piden lugar en el curso")
+    parser.add_argument("--capacidad", type=int, default=400, help="Capacidad del curso")
+    parser.add_argument("--modo", choices=["individual", "masiva"], default="individual",
+                        help="asignar_estudiante_a_curso o inscribir_estudiantes_masivamente")
+    parser.add_argument("--lote", type=int, default=10, help="Estudiantes por inscripción masiva")
+    parser.add_argument("--comparar-conteo", action="store_true",
+                        help="Repetir con SELECT ... FOR UPDATE + COUNT(*) (solo asignación individual)")
+    args = parser.parse_args()
+
+    engine = crear_engine(args.url, args.secretarias)
+    Base.metadata.create_all(bind=engine)
+
+    estrategias = [args.modo] + (["conteo"] if args.comparar_conteo else [])
+    print(f"{args.secretarias} secretarias, {args.solicitudes} solicitudes, capacidad {args.capacidad} ({engine.dialect.name})")
+    print(f"\n{'Estrategia':<12}{'solic./s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}  resultados")
+
+    fallas = []
+    for estrategia in estrategias:
+        r = correr(engine, estrategia, args)
+        resultados = ", ".join(f"{clave} {n}" for clave, n in sorted(r["resultados"].items()))
+        print(f"{estrategia:<12}{r['solicitudes_s']:>10.1f}{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['p99_ms']:>9.1f}  {resultados}")
+        fallas += [f"{estrategia}: {falla}" for falla in r["fallas"]]
+
+    engine.dispose()
+    for falla in fallas:
+        print(f"FALLA {falla}")
+    if not fallas:
+        print("\nSin sobrecupo; contadores, inscripciones y lista de espera consistentes")
+    sys.exit(1 if fallas else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+"""
+Prueba de carga HTTP con objetivos de latencia (SLO)
+Levanta la aplicación con uvicorn sobre una copia de la base sintética
+(benchmarks.datos_sinteticos) y la somete a tráfico mixto desde varios clientes
+concurrentes: mayormente listados, detalles y listas de curso, algunas
+asignaciones y, de vez en cuando, exportaciones e importaciones Excel.
+
+Reporta throughput y p50/p95/p99 por endpoint y compara contra los objetivos de
+benchmarks/slo_carga.json. Termina con código 1 si alguno no se cumple.
+
+Uso:
+    python -m benchmarks.bench_carga
+    python -m benchmarks.bench_carga --duracion 120 --concurrencia 32 --workers 2
+    python -m benchmarks.bench_carga --servidor http://localhost:8000 --url "mysql+pymysql://root:@localhost/bench"
+    python -m benchmarks.bench_carga --guardar benchmarks/resultados/carga.json
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from collections import defaultdict, deque
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+from sqlalchemy import create_engine, select, text
+from benchmarks.datos_sinteticos import GRADOS, preparar
+from app.models.estudiante_model import Estudiante
+from app.controllers import excel_procesos
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SLO_POR_DEFECTO = os.path.join(RAIZ, "benchmarks", "slo_carga.json")
+DIRECTORIO_DATOS = os.path.join(RAIZ, "benchmarks", "datos")
+# Salida del servidor (incluye el log de tiempos de cada petición)
+LOG_SERVIDOR = os.path.join(DIRECTORIO_DATOS, "carga_servidor.log")
+GESTIONES = 10
+
+Peticion = Tuple[str, str, Optional[bytes], Dict[str, str]]
+
+class Escenario:
+    """Datos de la base sembrada con los que se arman las peticiones"""
+    def __init__(self, url: str):
+        engine = create_engine(url)
+        with engine.connect() as conexion:
+            self.max_estudiante = conexion.execute(text("SELECT MAX(id_estudiante) FROM estudiantes")).scalar()
+            self.gestion = conexion.execute(text("SELECT MAX(gestion) FROM cursos")).scalar()
+            self.cursos_actuales = [fila[0] for fila in conexion.execute(
+                text("SELECT id_curso FROM cursos WHERE gestion = :gestion"), {"gestion": self.gestion}
+            )]
+            self.max_curso = conexion.execute(text("SELECT MAX(id_curso) FROM cursos")).scalar()
+            columnas = [Estudiante.__table__.c[a] for _, a in excel_procesos.COLUMNAS_ESTUDIANTE]
+            filas = [tuple(f) for f in conexion.execute(select(*columnas).order_by(Estudiante.id_estudiante).limit(50))]
+        engine.dispose()
+        # Importación de 50 estudiantes existentes (actualiza por CI, no crea filas nuevas)
+        self.libro_importacion = excel_procesos.construir_libro_estudiantes(filas)
+        # Asignaciones hechas por la prueba; las desasignaciones las deshacen
+        self.asignados: deque = deque(maxlen=10000)
+
+    def estudiante(self) -> int:
+        return random.randint(1, self.max_estudiante)
+
+    def curso(self) -> int:
+        return random.randint(1, self.max_curso)
+
+def _json(cuerpo: dict) -> Tuple[bytes, Dict[str, str]]:
+    return json.dumps(cuerpo).encode(), {"Content-Type": "application/json"}
+
+def _multipart(nombre_archivo: str, contenido: bytes) -> Tuple[bytes, Dict[str, str]]:
+    limite = uuid.uuid4().hex
+    cuerpo = (
+        f"--{limite}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="{nombre_archivo}"\r\n'
+        "Content-Type: application/vnd.openxmlformats-officedocument.spreadsheetml.sheet\r\n\r\n"
+    ).encode() + contenido + f"\r\n--{limite}--\r\n".encode()
+    return cuerpo, {"Content-Type": f"multipart/form-data; boundary={limite}"}
+
+def _asignar(e: Escenario) -> Peticion:
+    par = {"id_estudiante": e.estudiante(), "id_curso": random.choice(e.cursos_actuales)}
+    e.asignados.append(par)
+    return ("POST", "/api/asignaciones/", *_json(par))
+
+def _desasignar(e: Escenario) -> Peticion:
+    try:
+        par = e.asignados.popleft()
+    except IndexError:
+        par = {"id_estudiante": e.estudiante(), "id_curso": random.choice(e.cursos_actuales)}
+    return ("DELETE", "/api/asignaciones/", *_json(par))
+
+def _importar(e: Escenario) -> Peticion:
+    return ("POST", "/api/excel/importar-estudiantes", *_multipart("estudiantes.xlsx", e.libro_importacion))
+
+# (nombre del endpoint, peso en la mezcla, códigos esperados, petición)
+MEZCLA: List[Tuple[str, float, Tuple[int, ...], Callable[[Escenario], Peticion]]] = [
+    ("GET /api/estudiantes/", 14, (200,),
+     lambda e: ("GET", f"/api/estudiantes/?skip={random.randint(0, e.max_estudiante - 50)}&limit=50", None, {})),
+    ("GET /api/estudiantes/{id}", 20, (200,),
+     lambda e: ("GET", f"/api/estudiantes/{e.estudiante()}", None, {})),
+    ("GET /api/cursos/", 6, (200,),
+     lambda e: ("GET", f"/api/cursos/?gestion={e.gestion}&limit=10&skip={random.randint(0, 50)}", None, {})),
+    ("GET /api/cursos/{id}", 10, (200,),
+     lambda e: ("GET", f"/api/cursos/{e.curso()}", None, {})),
+    ("GET /api/asignaciones/curso/{id}", 20, (200,),
+     lambda e: ("GET", f"/api/asignaciones/curso/{e.curso()}?limit=50", None, {})),
+    ("GET /api/asignaciones/estudiante/{id}", 8, (200,),
+     lambda e: ("GET", f"/api/asignaciones/estudiante/{e.estudiante()}", None, {})),
+    ("GET /api/inscripcion-masiva/gestiones", 3, (200,),
+     lambda e: ("GET", "/api/inscripcion-masiva/gestiones", None, {})),
+    ("POST /api/asignaciones/", 8, (201, 400), _asignar),
+    ("DELETE /api/asignaciones/", 6, (200, 400), _desasignar),
+    ("GET /api/excel/exportar-estudiante/{id}", 2, (200,),
+     lambda e: ("GET", f"/api/excel/exportar-estudiante/{e.estudiante()}", None, {})),
+    ("GET /api/excel/exportar-estudiantes", 0.05, (200,),
+     lambda e: ("GET", "/api/excel/exportar-estudiantes", None, {})),
+    ("POST /api/excel/importar-estudiantes", 0.3, (200,), _importar),
+]
+
+class Resultados:
+    """Latencias y errores por endpoint, compartidos entre los clientes"""
+    def __init__(self):
+        self.latencias: Dict[str, List[float]] = defaultdict(list)
+        self.errores: Dict[str, int] = defaultdict(int)
+        self.codigos: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        self._lock = threading.Lock()
+
+    def registrar(self, endpoint: str, duracion_ms: float, codigo: int, correcto: bool) -> None:
+        with self._lock:
+            self.latencias[endpoint].append(duracion_ms)
+            self.codigos[endpoint][codigo] += 1
+            if not correcto:
+                self.errores[endpoint] += 1
+
+def _conexion(servidor: str) -> http.client.HTTPConnection:
+    partes = urlsplit(servidor)
+    return http.client.HTTPConnection(partes.hostname, partes.port or 80, timeout=300)
+
+def cliente(servidor: str, escenario: Escenario, fin_calentamiento: float, fin: float, resultados: Resultados) -> None:
+    """Cliente de ciclo cerrado: envía la siguiente petición al recibir la respuesta anterior"""
+    nombres = [m[0] for m in MEZCLA]
+    pesos = [m[1] for m in MEZCLA]
+    esperados = {m[0]: m[2] for m in MEZCLA}
+    armadores = {m[0]: m[3] for m in MEZCLA}
+    conexion = _conexion(servidor)
+    while time.monotonic() < fin:
+        endpoint = random.choices(nombres, pesos)[0]
+        metodo, ruta, cuerpo, encabezados = armadores[endpoint](escenario)
+        inicio = time.perf_counter()
+        try:
+            conexion.request(metodo, ruta, body=cuerpo, headers=encabezados)
+            respuesta = conexion.getresponse()
+            respuesta.read()
+            codigo = respuesta.status
+        except (OSError, http.client.HTTPException):
+            conexion.close()
+            conexion = _conexion(servidor)
+            codigo = 0
+        duracion = (time.perf_counter() - inicio) * 1000
+        if time.monotonic() >= fin_calentamiento:
+            resultados.registrar(endpoint, duracion, codigo, codigo in esperados[endpoint])
+    conexion.close()
+
+def percentil(valores: List[float], p: float) -> float:
+    """Percentil por rango más cercano"""
+    ordenados = sorted(valores)
+    indice = max(0, min(len(ordenados) - 1, round(p / 100 * len(ordenados)) - 1))
+    return ordenados[indice]
+
+def resumir(resultados: Resultados, segundos: float) -> dict:
+    endpoints = {}
+    for endpoint, latencias in sorted(resultados.latencias.items()):
+        endpoints[endpoint] = {
+            "peticiones": len(latencias),
+            "rps": round(len(latencias) / segundos, 2),
+            "p50_ms": round(percentil(latencias, 50), 1),
+            "p95_ms": round(percentil(latencias, 95), 1),
+            "p99_ms": round(percentil(latencias, 99), 1),
+            "errores": resultados.errores[endpoint],
+            "codigos": {str(c): n for c, n in sorted(resultados.codigos[endpoint].items())},
+        }
+    total = sum(e["peticiones"] for e in endpoints.values())
+    errores = sum(e["errores"] for e in endpoints.values())
+    return {
+        "segundos": round(segundos, 1),
+        "peticiones": total,
+        "rps": round(total / segundos, 2),
+        "tasa_errores": round(errores / total, 4) if total else 0,
+        "endpoints": endpoints,
+    }
+
+def imprimir(resumen: dict) -> None:
+    print(f"\n{'Endpoint':<44}{'pet.':>7}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errores':>9}")
+    for endpoint, r in resumen["endpoints"].items():
+        print(f"{endpoint:<44}{r['peticiones']:>7}{r['rps']:>9.1f}{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['p99_ms']:>10.1f}{r['errores']:>9}")
+    print(f"\nTotal: {resumen['peticiones']} peticiones en {resumen['segundos']} s, "
+          f"{resumen['rps']} req/s, errores {resumen['tasa_errores']:.2%}")
+
+def verificar_slo(resumen: dict, slo: dict) -> List[str]:
+    """Objetivos no cumplidos: latencia por endpoint, throughput mínimo y tasa de errores"""
+    fallas = []
+    if resumen["rps"] < slo.get("rps_minimo", 0):
+        fallas.append(f"throughput {resumen['rps']} req/s < {slo['rps_minimo']}")
+    if resumen["tasa_errores"] > slo.get("tasa_errores_maxima", 1):
+        fallas.append(f"tasa de errores {resumen['tasa_errores']:.2%} > {slo['tasa_errores_maxima']:.2%}")
+    for endpoint, objetivos in slo.get("endpoints", {}).items():
+        medido = resumen["endpoints"].get(endpoint)
+        if medido is None:
+            continue
+        for clave in ("p50_ms", "p95_ms", "p99_ms"):
+            # Con pocas muestras los percentiles altos no son representativos
+            if clave in objetivos and medido["peticiones"] >= slo.get("muestras_minimas", 20) and medido[clave] > objetivos[clave]:
+                fallas.append(f"{endpoint} {clave} {medido[clave]} > {objetivos[clave]}")
+    return fallas
+
+def _puerto_libre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def iniciar_servidor(url: str, workers: int) -> Tuple[subprocess.Popen, str]:
+    """Levantar uvicorn contra la base indicada y esperar a que esté listo"""
+    puerto = _puerto_libre()
+    entorno = {**os.environ, "DATABASE_URL": url}
+    os.makedirs(DIRECTORIO_DATOS, exist_ok=True)
+    log = open(LOG_SERVIDOR, "w")
+    proceso = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(puerto),
+         "--workers", str(workers), "--log-level", "warning", "--no-access-log"],
+        cwd=RAIZ,
+        env=entorno,
+        stdout=log,
+        stderr=subprocess.STDOUT,
+    )
+    log.close()
+    servidor = f"http://127.0.0.1:{puerto}"
+    limite = time.monotonic() + 60
+    while time.monotonic() < limite:
+        if proceso.poll() is not None:
+            raise RuntimeError(f"El servidor terminó al iniciar (código {proceso.returncode}); ver {LOG_SERVIDOR}")
+        try:
+            conexion = _conexion(servidor)
+            conexion.request("GET", "/health/ready")
+            if conexion.getresponse().status == 200:
+                return proceso, servidor
+        except OSError:
+            pass
+        time.sleep(0.5)
+    proceso.terminate()
+    raise RuntimeError("El servidor no estuvo listo en 60 s")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--estudiantes", type=int, default=10000, help="Tamaño de la base sintética")
+    parser.add_argument("--url", help="Base de datos ya sembrada (por defecto: copia de la base sintética SQLite)")
+    parser.add_argument("--servidor", help="Usar un servidor ya levantado (ej: http://localhost:8000)")
+    parser.add_argument("--workers", type=int, default=1, help="Workers de uvicorn")
+    parser.add_argument("--concurrencia", type=int, default=8, help="Clientes simultáneos")
+    parser.add_argument("--duracion", type=float, default=60, help="Segundos de medición")
+    parser.add_argument("--calentamiento", type=float, default=5, help="Segundos iniciales que no se miden")
+    parser.add_argument("--slo", default=SLO_POR_DEFECTO, help="Archivo JSON con los objetivos")
+    parser.add_argument("--guardar", help="Guardar el resumen (JSON)")
+    parser.add_argument("--semilla", type=int, default=42)
+    args = parser.parse_args()
+    random.seed(args.semilla)
+
+    copia = None
+    url = args.url
+    if url is None:
+        # La prueba escribe (asignaciones, importaciones): se trabaja sobre una copia
+        original = os.path.join(DIRECTORIO_DATOS, f"escuela_{args.estudiantes}.db")
+        cursos = max(len(GRADOS) * GESTIONES, round(args.estudiantes * 0.03))
+        preparar(f"sqlite:///{original}", args.estudiantes, cursos, GESTIONES).dispose()
+        copia = os.path.join(DIRECTORIO_DATOS, f"carga_{os.getpid()}.db")
+        shutil.copyfile(original, copia)
+        url = f"sqlite:///{copia}"
+
+    escenario = Escenario(url)
+    proceso = None
+    try:
+        servidor = args.servidor
+        if servidor is None:
+            proceso, servidor = iniciar_servidor(url, args.workers)
+        print(f"Carga contra {servidor}: {args.concurrencia} clientes, {args.duracion:g} s (+{args.calentamiento:g} s de calentamiento)")
+
+        resultados = Resultados()
+        inicio = time.monotonic()
+        fin_calentamiento = inicio + args.calentamiento
+        fin = fin_calentamiento + args.duracion
+        clientes = [
+            threading.Thread(target=cliente, args=(servidor, escenario, fin_calentamiento, fin, resultados))
+            for _ in range(args.concurrencia)
+        ]
+        for hilo in clientes:
+            hilo.start()
+        for hilo in clientes:
+            hilo.join()
+        # Las peticiones lentas que terminan después del fin también cuentan
+        segundos = time.monotonic() - fin_calentamiento
+    finally:
+        if proceso is not None:
+            proceso.terminate()
+            proceso.wait(timeout=90)
+        if copia:
+            os.remove(copia)
+
+    resumen = resumir(resultados, segundos)
+    imprimir(resumen)
+
+    if args.guardar:
+        os.makedirs(os.path.dirname(os.path.abspath(args.guardar)), exist_ok=True)
+        with open(args.guardar, "w") as f:
+            json.dump(resumen, f, indent=2, ensure_ascii=False)
+        print(f"Resumen guardado en {args.guardar}")
+
+    with open(args.slo) as f:
+        slo = json.load(f)
+    fallas = verificar_slo(resumen, slo)
+    for falla in fallas:
+        print(f"SLO NO CUMPLIDO {falla}")
+    if not fallas:
+        print("SLO cumplidos")
+    sys.exit(1 if fallas else 0)
+
+if __name__ == "__main__":
+    main()
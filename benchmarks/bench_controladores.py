@@ -0,0 +1,252 @@
+"""
+Benchmark de los métodos de los controladores sobre datos sintéticos de varios tamaños
+Cada método se ejecuta contra una base generada con benchmarks.datos_sinteticos
+(se crea la primera vez y se reutiliza). Las escrituras corren dentro de una
+transacción que se descarta al terminar, así cada repetición ve los mismos datos.
+Reporta la mediana de tiempo y las consultas SQL de cada método.
+
+Uso:
+    python -m benchmarks.bench_controladores
+    python -m benchmarks.bench_controladores --tamanos 1000,10000 --solo Inscripcion
+    python -m benchmarks.bench_controladores --guardar benchmarks/resultados/controladores.json
+    python -m benchmarks.bench_controladores --comparar benchmarks/resultados/controladores.json
+    python -m benchmarks.bench_controladores --url "mysql+pymysql://root:@localhost/bench_{tamano}"
+"""
+import os
+
+# Las tareas Excel se miden en el mismo proceso (sin el pool de procesos)
+os.environ.setdefault("EXCEL_WORKERS", "0")
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from io import BytesIO
+from typing import Callable, Dict, List, Tuple
+from fastapi import HTTPException, UploadFile
+from sqlalchemy import event, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from benchmarks.datos_sinteticos import GRADOS, preparar
+from app.config.consultas import contar_consultas, instrumentar_engine
+from app.models.estudiante_model import Estudiante
+from app.controllers import excel_procesos
+from app.controllers.estudiante_controller import EstudianteController
+from app.controllers.curso_controller import CursoController
+from app.controllers.estudiante_curso_controller import EstudianteCursoController
+from app.controllers.inscripcion_masiva_controller import InscripcionMasivaController
+from app.controllers.excel_controller import ExcelController
+from app.schemas.estudiante_schema import EstudianteCreate, EstudianteUpdate
+from app.schemas.curso_schema import CursoCreate, CursoUpdate
+from app.schemas.estudiante_curso_schema import AsignacionLoteRequest
+
+GESTIONES = 10
+ULTIMA_GESTION = 2026
+
+def habilitar_savepoints_sqlite(engine: Engine) -> None:
+    """pysqlite maneja las transacciones por su cuenta y rompe SAVEPOINT; se delega en SQLAlchemy"""
+    @event.listens_for(engine, "connect")
+    def _al_conectar(conexion_dbapi, registro):
+        conexion_dbapi.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _al_iniciar(conexion):
+        conexion.exec_driver_sql("BEGIN")
+
+def contexto(engine: Engine) -> dict:
+    """Ids de ejemplo para los casos: gestión anterior (origen) y gestión en curso (destino)"""
+    origen, destino = str(ULTIMA_GESTION - 1), str(ULTIMA_GESTION)
+    with engine.connect() as conexion:
+        id_curso_origen = conexion.execute(text("""
+            SELECT c.id_curso FROM cursos c JOIN estudiantes_cursos ec ON ec.id_curso = c.id_curso
+            WHERE c.gestion = :gestion GROUP BY c.id_curso ORDER BY COUNT(*) DESC, c.id_curso LIMIT 1
+        """), {"gestion": origen}).scalar()
+        id_curso_destino = conexion.execute(
+            text("SELECT MIN(id_curso) FROM cursos WHERE gestion = :gestion"), {"gestion": destino}
+        ).scalar()
+        inscritos = [fila[0] for fila in conexion.execute(text("""
+            SELECT e.id_estudiante FROM estudiantes e
+            JOIN estudiantes_cursos ec ON ec.id_estudiante = e.id_estudiante
+            WHERE ec.id_curso = :id_curso AND e.estado_estudiante = 'Activo'
+            AND NOT EXISTS (
+                SELECT 1 FROM estudiantes_cursos ec2
+                WHERE ec2.id_estudiante = e.id_estudiante AND ec2.id_curso = :id_destino
+            )
+            ORDER BY e.id_estudiante
+        """), {"id_curso": id_curso_origen, "id_destino": id_curso_destino})]
+        columnas = [Estudiante.__table__.c[a] for _, a in excel_procesos.COLUMNAS_ESTUDIANTE]
+        filas_excel = [
+            tuple(fila) for fila in conexion.execute(select(*columnas).order_by(Estudiante.id_estudiante).limit(500))
+        ]
+
+    # Libro de importación: la mitad actualiza estudiantes existentes y la otra mitad crea nuevos
+    filas_importacion = [
+        fila if posicion % 2 else (fila[0], f"N{9000000 + posicion}", *fila[2:])
+        for posicion, fila in enumerate(filas_excel)
+    ]
+    return {
+        "origen": origen,
+        "destino": destino,
+        "id_curso_origen": id_curso_origen,
+        "id_curso_destino": id_curso_destino,
+        "id_estudiante": inscritos[0],
+        "inscritos": inscritos,
+        "libro_importacion": excel_procesos.construir_libro_estudiantes(filas_importacion),
+    }
+
+def _lote(ctx: dict) -> AsignacionLoteRequest:
+    ids = ctx["inscritos"][:30]
+    return AsignacionLoteRequest(
+        asignar=[{"id_estudiante": e, "id_curso": ctx["id_curso_destino"]} for e in ids[:10]],
+        desasignar=[{"id_estudiante": e, "id_curso": ctx["id_curso_origen"]} for e in ids[10:20]],
+        mover=[{"id_estudiante": e, "id_curso_origen": ctx["id_curso_origen"], "id_curso_destino": ctx["id_curso_destino"]} for e in ids[20:30]],
+    )
+
+# (nombre, función(db, ctx), pesada). Las pesadas se repiten menos veces
+CASOS: List[Tuple[str, Callable[[Session, dict], object], bool]] = [
+    ("EstudianteController.obtener_todos", lambda db, ctx: EstudianteController.obtener_todos(db, 0, 100), False),
+    ("EstudianteController.obtener_por_id", lambda db, ctx: EstudianteController.obtener_por_id(db, ctx["id_estudiante"]), False),
+    ("EstudianteController.crear", lambda db, ctx: EstudianteController.crear(db, EstudianteCreate(
+        ci="99999999", nombres="Bench", apellido_paterno="Prueba", apellido_materno="Sintética")), False),
+    ("EstudianteController.actualizar", lambda db, ctx: EstudianteController.actualizar(
+        db, ctx["id_estudiante"], EstudianteUpdate(direccion="Calle Benchmark #1")), False),
+    ("EstudianteController.cambiar_estado", lambda db, ctx: EstudianteController.cambiar_estado(db, ctx["id_estudiante"], "Retirado"), False),
+    ("EstudianteController.eliminar", lambda db, ctx: EstudianteController.eliminar(db, ctx["id_estudiante"]), False),
+    ("EstudianteController.obtener_por_gestion", lambda db, ctx: EstudianteController.obtener_por_gestion(db, ctx["origen"]), False),
+    ("EstudianteController.obtener_por_estado", lambda db, ctx: EstudianteController.obtener_por_estado(db, "Retirado"), False),
+    ("CursoController.obtener_todos", lambda db, ctx: CursoController.obtener_todos(db, 0, 100, gestion=ctx["origen"]), False),
+    ("CursoController.obtener_todos sin estudiantes", lambda db, ctx: CursoController.obtener_todos(
+        db, 0, 100, gestion=ctx["origen"], incluir_estudiantes=False), False),
+    ("CursoController.obtener_por_id", lambda db, ctx: CursoController.obtener_por_id(db, ctx["id_curso_origen"]), False),
+    ("CursoController.crear", lambda db, ctx: CursoController.crear(db, CursoCreate(
+        nombre_curso="Bench A", nivel="primaria", gestion=ctx["destino"])), False),
+    ("CursoController.actualizar", lambda db, ctx: CursoController.actualizar(
+        db, ctx["id_curso_origen"], CursoUpdate(nombre_curso="Bench Z")), False),
+    ("CursoController.eliminar", lambda db, ctx: CursoController.eliminar(db, ctx["id_curso_origen"]), False),
+    ("CursoController.copiar_cursos_gestion", lambda db, ctx: CursoController.copiar_cursos_gestion(db, ctx["destino"], "2099"), False),
+    ("EstudianteCursoController.asignar_estudiante_a_curso", lambda db, ctx: EstudianteCursoController.asignar_estudiante_a_curso(
+        db, ctx["id_estudiante"], ctx["id_curso_destino"]), False),
+    ("EstudianteCursoController.desasignar_estudiante_de_curso", lambda db, ctx: EstudianteCursoController.desasignar_estudiante_de_curso(
+        db, ctx["id_estudiante"], ctx["id_curso_origen"]), False),
+    ("EstudianteCursoController.procesar_lote", lambda db, ctx: EstudianteCursoController.procesar_lote(db, _lote(ctx)), False),
+    ("EstudianteCursoController.obtener_estudiantes_de_curso", lambda db, ctx: EstudianteCursoController.obtener_estudiantes_de_curso(
+        db, ctx["id_curso_origen"]), False),
+    ("EstudianteCursoController.obtener_cursos_de_estudiante", lambda db, ctx: EstudianteCursoController.obtener_cursos_de_estudiante(
+        db, ctx["id_estudiante"]), False),
+    ("InscripcionMasivaController.obtener_gestiones_disponibles", lambda db, ctx: InscripcionMasivaController.obtener_gestiones_disponibles(db), False),
+    ("InscripcionMasivaController.obtener_cursos_por_gestion", lambda db, ctx: InscripcionMasivaController.obtener_cursos_por_gestion(
+        db, ctx["origen"]), False),
+    ("InscripcionMasivaController.obtener_estudiantes_para_inscripcion", lambda db, ctx: InscripcionMasivaController.obtener_estudiantes_para_inscripcion(
+        db, ctx["id_curso_origen"], ctx["destino"]), False),
+    ("InscripcionMasivaController.inscribir_estudiantes_masivamente", lambda db, ctx: InscripcionMasivaController.inscribir_estudiantes_masivamente(
+        db, ctx["id_curso_destino"], ctx["inscritos"]), False),
+    ("ExcelController.exportar_estudiantes", lambda db, ctx: ExcelController.exportar_estudiantes(db), True),
+    ("ExcelController.exportar_estudiante_por_id", lambda db, ctx: ExcelController.exportar_estudiante_por_id(db, ctx["id_estudiante"]), False),
+    ("ExcelController.importar_estudiantes", lambda db, ctx: ExcelController.importar_estudiantes(
+        db, UploadFile(file=BytesIO(ctx["libro_importacion"]), filename="estudiantes.xlsx")), True),
+    ("ExcelController.descargar_plantilla", lambda db, ctx: ExcelController.descargar_plantilla(), False),
+]
+
+def medir_caso(engine: Engine, funcion: Callable, ctx: dict, repeticiones: int) -> dict:
+    """Ejecutar un caso varias veces, cada una en una transacción descartada"""
+    tiempos = []
+    consultas = 0
+    error = None
+    for _ in range(repeticiones):
+        conexion = engine.connect()
+        transaccion = conexion.begin()
+        db = Session(bind=conexion, join_transaction_mode="create_savepoint")
+        try:
+            with contar_consultas() as contador:
+                inicio = time.perf_counter()
+                funcion(db, ctx)
+                tiempos.append((time.perf_counter() - inicio) * 1000)
+            consultas = contador.total
+        except HTTPException as e:
+            error = f"HTTP {e.status_code}: {e.detail}"
+            break
+        finally:
+            db.close()
+            transaccion.rollback()
+            conexion.close()
+    if error:
+        return {"error": error}
+    return {"mediana_ms": round(statistics.median(tiempos), 2), "minimo_ms": round(min(tiempos), 2), "consultas": consultas}
+
+def ejecutar_tamano(url: str, estudiantes: int, repeticiones: int, solo: str) -> Dict[str, dict]:
+    cursos = max(len(GRADOS) * GESTIONES, round(estudiantes * 0.03))
+    engine = preparar(url, estudiantes, cursos, GESTIONES)
+    if engine.dialect.name == "sqlite":
+        habilitar_savepoints_sqlite(engine)
+    instrumentar_engine(engine)
+    ctx = contexto(engine)
+
+    resultados = {}
+    for nombre, funcion, pesada in CASOS:
+        if solo and solo.lower() not in nombre.lower():
+            continue
+        veces = max(1, repeticiones // 5) if pesada else repeticiones
+        resultados[nombre] = medir_caso(engine, funcion, ctx, veces)
+    engine.dispose()
+    return resultados
+
+def imprimir(estudiantes: int, resultados: Dict[str, dict]) -> None:
+    print(f"\n== {estudiantes} estudiantes ==")
+    print(f"{'Método':<64}{'mediana ms':>12}{'mínimo ms':>12}{'consultas':>11}")
+    for nombre, r in resultados.items():
+        if "error" in r:
+            print(f"{nombre:<64}  {r['error']}")
+        else:
+            print(f"{nombre:<64}{r['mediana_ms']:>12.2f}{r['minimo_ms']:>12.2f}{r['consultas']:>11}")
+
+def comparar(resultado: dict, base: dict, tolerancia: float, piso_ms: float) -> List[str]:
+    """Regresiones de tiempo (sobre la tolerancia y el piso de ruido) o de cantidad de consultas"""
+    regresiones = []
+    for tamano, casos in resultado["tamanos"].items():
+        for nombre, actual in casos.items():
+            anterior = base.get("tamanos", {}).get(tamano, {}).get(nombre)
+            if not anterior or "error" in anterior or "error" in actual:
+                continue
+            limite = max(anterior["mediana_ms"] * (1 + tolerancia), anterior["mediana_ms"] + piso_ms)
+            if actual["mediana_ms"] > limite:
+                regresiones.append(f"{tamano} {nombre}: {anterior['mediana_ms']} -> {actual['mediana_ms']} ms")
+            if actual["consultas"] > anterior["consultas"]:
+                regresiones.append(f"{tamano} {nombre}: {anterior['consultas']} -> {actual['consultas']} consultas")
+    return regresiones
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tamanos", default="1000,10000,100000", help="Cantidades de estudiantes, separadas por coma")
+    parser.add_argument("--url", default="sqlite:///benchmarks/datos/escuela_{tamano}.db",
+                        help="URL por tamaño; {tamano} se reemplaza por la cantidad de estudiantes")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--solo", default="", help="Medir solo los métodos que contengan este texto")
+    parser.add_argument("--guardar", help="Guardar el resultado como línea base (JSON)")
+    parser.add_argument("--comparar", help="Comparar contra una línea base guardada (JSON)")
+    parser.add_argument("--tolerancia", type=float, default=0.25, help="Regresión permitida (0.25 = 25%%)")
+    parser.add_argument("--piso-ms", type=float, default=2.0, help="Diferencias menores se consideran ruido")
+    args = parser.parse_args()
+
+    resultado = {"tamanos": {}}
+    for estudiantes in [int(t) for t in args.tamanos.split(",")]:
+        casos = ejecutar_tamano(args.url.format(tamano=estudiantes), estudiantes, args.repeticiones, args.solo)
+        resultado["tamanos"][str(estudiantes)] = casos
+        imprimir(estudiantes, casos)
+
+    if args.guardar:
+        os.makedirs(os.path.dirname(os.path.abspath(args.guardar)), exist_ok=True)
+        with open(args.guardar, "w") as f:
+            json.dump(resultado, f, indent=2, ensure_ascii=False)
+        print(f"\nLínea base guardada en {args.guardar}")
+
+    if args.comparar:
+        with open(args.comparar) as f:
+            base = json.load(f)
+        regresiones = comparar(resultado, base, args.tolerancia, args.piso_ms)
+        for regresion in regresiones:
+            print(f"REGRESIÓN {regresion}")
+        sys.exit(1 if regresiones else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+"""
+Benchmark de escalabilidad de ExcelController: tiempo y memoria con 1k, 10k y 100k filas
+Para cada tamaño se usa la base sintética del mismo tamaño (benchmarks.datos_sinteticos)
+y un libro de importación con datos sucios: celdas vacías (NaN), fechas inválidas,
+CIs duplicados dentro del archivo y CIs numéricos. La importación corre dentro de una
+transacción que se descarta, así la base no cambia entre ejecuciones.
+
+Cada operación se mide en un proceso nuevo (el pico de RSS es por proceso):
+    tiempo_s        duración de la operación
+    rss_base_mb     RSS antes de la operación (intérprete, pandas, datos de entrada)
+    rss_pico_mb     pico de RSS durante la operación (en Linux; en otros sistemas, del proceso)
+    tracemalloc_mb  pico de memoria Python según tracemalloc (en otra ejecución, porque
+                    tracemalloc hace más lenta la operación)
+
+Uso:
+    python -m benchmarks.bench_excel
+    python -m benchmarks.bench_excel --tamanos 1000,10000 --operaciones importar,exportar
+    python -m benchmarks.bench_excel --guardar benchmarks/resultados/excel.json
+    python -m benchmarks.bench_excel --comparar benchmarks/resultados/excel.json
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from io import BytesIO
+from typing import Dict, List
+from sqlalchemy import text
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DIRECTORIO_DATOS = os.path.join(RAIZ, "benchmarks", "datos")
+GESTIONES = 10
+
+OPERACIONES = ["importar", "exportar", "exportar_por_id", "plantilla"]
+
+# Proporción de cada tipo de dato sucio en el libro de importación
+PROPORCION_CI_EXISTENTE = 0.5
+PROPORCION_CI_DUPLICADO = 0.02
+PROPORCION_CI_VACIO = 0.03
+PROPORCION_CI_NUMERICO = 0.3
+PROPORCION_FECHA_INVALIDA = 0.03
+PROPORCION_CELDA_VACIA = 0.1
+FECHAS_INVALIDAS = ["31/02/2010", "sin dato", "2010-13-45", "ayer", "15-may"]
+
+def url_base(tamano: int) -> str:
+    return f"sqlite:///{os.path.join(DIRECTORIO_DATOS, f'escuela_{tamano}.db')}"
+
+def ruta_libro(tamano: int) -> str:
+    return os.path.join(DIRECTORIO_DATOS, f"importacion_{tamano}.xlsx")
+
+def generar_libro(engine, filas: int, semilla: int = 42) -> bytes:
+    """
+    Generar un libro de importación con datos sucios
+
+    Args:
+        engine: Base sintética de la que se toman los CIs existentes
+        filas: Cantidad de filas del libro
+        semilla: Semilla del generador aleatorio
+
+    Returns:
+        Contenido del archivo .xlsx
+    """
+    import pandas as pd
+    from benchmarks.datos_sinteticos import generar_estudiante
+    from app.controllers.excel_procesos import COLUMNAS_ESTUDIANTE
+
+    rnd = random.Random(semilla)
+    with engine.connect() as conexion:
+        existentes = [fila[0] for fila in conexion.execute(
+            text("SELECT ci FROM estudiantes WHERE ci IS NOT NULL ORDER BY id_estudiante LIMIT :n"), {"n": filas}
+        )]
+
+    titulos = {atributo: titulo for titulo, atributo in COLUMNAS_ESTUDIANTE}
+    registros = []
+    for posicion in range(filas):
+        datos = generar_estudiante(rnd, posicion + 1, rnd.randint(2005, 2020), rnd.choice(["Activo", "Activo", "Activo", "Retirado"]))
+        azar = rnd.random()
+        if azar < PROPORCION_CI_DUPLICADO and registros:
+            ci = rnd.choice(registros)[titulos["ci"]]
+        elif azar < PROPORCION_CI_DUPLICADO + PROPORCION_CI_VACIO:
+            ci = None
+        elif existentes and rnd.random() < PROPORCION_CI_EXISTENTE:
+            ci = rnd.choice(existentes)
+        else:
+            ci = str(50000000 + posicion)
+        # Excel guarda como número los CIs escritos sin formato de texto
+        if isinstance(ci, str) and ci.isdigit() and rnd.random() < PROPORCION_CI_NUMERICO:
+            ci = int(ci)
+        datos["ci"] = ci
+
+        if rnd.random() < PROPORCION_FECHA_INVALIDA:
+            datos["fecha_nacimiento"] = rnd.choice(FECHAS_INVALIDAS)
+        for atributo in ("fecha_nacimiento", "direccion", "telefono_padre", "nombre_madre", "telefono_madre"):
+            if rnd.random() < PROPORCION_CELDA_VACIA:
+                datos[atributo] = float("nan")
+        registros.append({titulo: datos[atributo] for atributo, titulo in titulos.items() if atributo != "id_estudiante"})
+
+    salida = BytesIO()
+    pd.DataFrame(registros).to_excel(salida, index=False, sheet_name="Estudiantes")
+    return salida.getvalue()
+
+def preparar_tamano(tamano: int) -> None:
+    """Crear (si faltan) la base sintética y el libro de importación de un tamaño"""
+    from benchmarks.datos_sinteticos import GRADOS, preparar
+
+    cursos = max(len(GRADOS) * GESTIONES, round(tamano * 0.03))
+    engine = preparar(url_base(tamano), tamano, cursos, GESTIONES)
+    if not os.path.exists(ruta_libro(tamano)):
+        inicio = time.perf_counter()
+        contenido = generar_libro(engine, tamano)
+        with open(ruta_libro(tamano), "wb") as archivo:
+            archivo.write(contenido)
+        print(f"Libro de importación de {tamano} filas generado en {time.perf_counter() - inicio:.1f}s")
+    engine.dispose()
+
+def _leer_status_mb(campo: str) -> float:
+    """Valor de /proc/self/status en MB (solo Linux; 0 si no existe)"""
+    try:
+        with open("/proc/self/status") as f:
+            for linea in f:
+                if linea.startswith(campo + ":"):
+                    return int(linea.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+def _reiniciar_pico_rss() -> bool:
+    """Reiniciar el pico de RSS del proceso (VmHWM); solo Linux"""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+def _rss_pico_mb() -> float:
+    pico = _leer_status_mb("VmHWM")
+    if pico:
+        return pico
+    import resource
+
+    # ru_maxrss (pico de toda la vida del proceso) está en KB en Linux y en bytes en macOS
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico / 1024 / 1024 if sys.platform == "darwin" else pico / 1024
+
+def medir_en_proceso(operacion: str, tamano: int, con_tracemalloc: bool) -> dict:
+    """Ejecutar una operación en este proceso (llamado desde el proceso hijo)"""
+    os.environ["EXCEL_WORKERS"] = "0"
+    import tracemalloc
+    from fastapi import UploadFile
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+    from app.controllers.excel_controller import ExcelController
+    from benchmarks.bench_controladores import habilitar_savepoints_sqlite
+
+    engine = create_engine(url_base(tamano))
+    habilitar_savepoints_sqlite(engine)
+    with open(ruta_libro(tamano), "rb") as archivo:
+        libro = archivo.read()
+    with engine.connect() as conexion:
+        # Estudiante con más cursos: el caso más pesado de la exportación individual
+        id_estudiante = conexion.execute(text(
+            "SELECT id_estudiante FROM estudiantes_cursos GROUP BY id_estudiante ORDER BY COUNT(*) DESC LIMIT 1"
+        )).scalar()
+
+    # pandas y openpyxl se cargan al primer uso; la base de RSS ya los incluye
+    import pandas, openpyxl  # noqa: F401,E401
+
+    conexion = engine.connect()
+    transaccion = conexion.begin()
+    db = Session(bind=conexion, join_transaction_mode="create_savepoint")
+    resultado = {}
+    # Sin reinicio (macOS, Windows) el pico incluye la preparación de esta función
+    _reiniciar_pico_rss()
+    rss_base = _leer_status_mb("VmRSS") or _rss_pico_mb()
+    if con_tracemalloc:
+        tracemalloc.start()
+    inicio = time.perf_counter()
+    try:
+        if operacion == "importar":
+            respuesta = ExcelController.importar_estudiantes(db, UploadFile(file=BytesIO(libro), filename="estudiantes.xlsx"))
+            resultado = {
+                "creados": respuesta["estudiantes_creados"],
+                "actualizados": respuesta["estudiantes_actualizados"],
+                "errores": len(respuesta["errores"] or []),
+            }
+        elif operacion == "exportar":
+            resultado = {"bytes": len(ExcelController.exportar_estudiantes(db).getvalue())}
+        elif operacion == "exportar_por_id":
+            resultado = {"bytes": len(ExcelController.exportar_estudiante_por_id(db, id_estudiante).getvalue())}
+        elif operacion == "plantilla":
+            resultado = {"bytes": len(ExcelController.descargar_plantilla().getvalue())}
+    except Exception as e:
+        resultado = {"error": str(getattr(e, "detail", e))[:200]}
+    duracion = time.perf_counter() - inicio
+    medicion = {"tiempo_s": round(duracion, 3), "rss_base_mb": round(rss_base, 1), "rss_pico_mb": round(_rss_pico_mb(), 1)}
+    if con_tracemalloc:
+        medicion = {"tracemalloc_mb": round(tracemalloc.get_traced_memory()[1] / 1024 / 1024, 1)}
+        tracemalloc.stop()
+    db.close()
+    transaccion.rollback()
+    conexion.close()
+    return {**medicion, "resultado": resultado}
+
+def medir(operacion: str, tamano: int, con_tracemalloc: bool) -> dict:
+    """Medir una operación en un proceso nuevo"""
+    comando = [sys.executable, "-m", "benchmarks.bench_excel", "--hijo", operacion, "--tamanos", str(tamano)]
+    if con_tracemalloc:
+        comando.append("--tracemalloc")
+    salida = subprocess.run(comando, cwd=RAIZ, capture_output=True, text=True)
+    if salida.returncode != 0:
+        return {"resultado": {"error": salida.stderr.strip().splitlines()[-1] if salida.stderr.strip() else "sin salida"}}
+    return json.loads(salida.stdout.strip().splitlines()[-1])
+
+def imprimir(resultados: Dict[str, Dict[str, dict]]) -> None:
+    print(f"\n{'Filas':>8}  {'Operación':<16}{'tiempo s':>10}{'RSS base MB':>13}{'RSS pico MB':>13}{'tracemalloc MB':>16}  Resultado")
+    for tamano, operaciones in resultados.items():
+        for operacion, r in operaciones.items():
+            tracemalloc_mb = f"{r['tracemalloc_mb']:.1f}" if "tracemalloc_mb" in r else "-"
+            detalle = ", ".join(f"{k}={v}" for k, v in r["resultado"].items())
+            if "tiempo_s" not in r:
+                print(f"{tamano:>8}  {operacion:<16}{'-':>10}{'-':>13}{'-':>13}{tracemalloc_mb:>16}  {detalle}")
+                continue
+            print(f"{tamano:>8}  {operacion:<16}{r['tiempo_s']:>10.2f}{r['rss_base_mb']:>13.1f}"
+                  f"{r['rss_pico_mb']:>13.1f}{tracemalloc_mb:>16}  {detalle}")
+
+def comparar(resultados: dict, base: dict, tolerancia: float) -> List[str]:
+    """Regresiones de tiempo, de memoria por encima de la base y nuevos errores"""
+    regresiones = []
+    for tamano, operaciones in resultados.items():
+        for operacion, actual in operaciones.items():
+            anterior = base.get(tamano, {}).get(operacion)
+            if not anterior:
+                continue
+            if "error" in actual["resultado"] and "error" not in anterior["resultado"]:
+                regresiones.append(f"{tamano} {operacion}: {actual['resultado']['error']}")
+            for clave in ("tiempo_s", "tracemalloc_mb"):
+                if clave in actual and clave in anterior and actual[clave] > anterior[clave] * (1 + tolerancia):
+                    regresiones.append(f"{tamano} {operacion} {clave}: {anterior[clave]} -> {actual[clave]}")
+            # El RSS base (imports) no depende de la operación: se compara lo que crece sobre él
+            if "rss_pico_mb" in actual and "rss_pico_mb" in anterior:
+                crecimiento_actual = actual["rss_pico_mb"] - actual["rss_base_mb"]
+                crecimiento_anterior = anterior["rss_pico_mb"] - anterior["rss_base_mb"]
+                if crecimiento_actual > max(crecimiento_anterior * (1 + tolerancia), crecimiento_anterior + 10):
+                    regresiones.append(f"{tamano} {operacion} RSS sobre la base: "
+                                       f"{crecimiento_anterior:.1f} -> {crecimiento_actual:.1f} MB")
+    return regresiones
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tamanos", default="1000,10000,100000", help="Filas (y estudiantes en la base), separadas por coma")
+    parser.add_argument("--operaciones", default=",".join(OPERACIONES), help=f"Operaciones a medir: {', '.join(OPERACIONES)}")
+    parser.add_argument("--sin-tracemalloc", action="store_true", help="No medir el pico de tracemalloc (la mitad de tiempo)")
+    parser.add_argument("--guardar", help="Guardar el resultado (JSON)")
+    parser.add_argument("--comparar", help="Comparar contra un resultado guardado (JSON)")
+    parser.add_argument("--tolerancia", type=float, default=0.25, help="Regresión permitida (0.25 = 25%%)")
+    parser.add_argument("--hijo", help=argparse.SUPPRESS)
+    parser.add_argument("--tracemalloc", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    tamanos = [int(t) for t in args.tamanos.split(",")]
+
+    if args.hijo:
+        print(json.dumps(medir_en_proceso(args.hijo, tamanos[0], args.tracemalloc)))
+        return
+
+    resultados: Dict[str, Dict[str, dict]] = {}
+    for tamano in tamanos:
+        preparar_tamano(tamano)
+        resultados[str(tamano)] = {}
+        for operacion in args.operaciones.split(","):
+            print(f"Midiendo {operacion} con {tamano} filas...", flush=True)
+            medicion = medir(operacion, tamano, con_tracemalloc=False)
+            if not args.sin_tracemalloc and "error" not in medicion["resultado"]:
+                pico = medir(operacion, tamano, con_tracemalloc=True).get("tracemalloc_mb")
+                if pico is not None:
+                    medicion["tracemalloc_mb"] = pico
+            resultados[str(tamano)][operacion] = medicion
+    imprimir(resultados)
+
+    if args.guardar:
+        os.makedirs(os.path.dirname(os.path.abspath(args.guardar)), exist_ok=True)
+        with open(args.guardar, "w") as f:
+            json.dump(resultados, f, indent=2, ensure_ascii=False)
+        print(f"\nResultado guardado en {args.guardar}")
+
+    if args.comparar:
+        with open(args.comparar) as f:
+            base = json.load(f)
+        regresiones = comparar(resultados, base, args.tolerancia)
+        for regresion in regresiones:
+            print(f"REGRESIÓN {regresion}")
+        sys.exit(1 if regresiones else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Benchmark del flag ya_inscrito de obtener_estudiantes_para_inscripcion
+Compara el EXISTS correlacionado sobre estudiantes_cursos + cursos con la
+búsqueda en el índice estudiantes_gestiones, sobre 10 años de historia sintética
+
+Uso:
+    python -m benchmarks.bench_indice_gestion
+    python -m benchmarks.bench_indice_gestion --estudiantes 20000 --url mysql+pymysql://root:@localhost/bench
+"""
+import argparse
+import random
+import time
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from app.config.database import Base
+from app.models.estudiante_model import Estudiante
+from app.models.curso_model import Curso
+from app.controllers.indice_gestion_controller import IndiceGestionController
+
+SQL_EXISTS_CORRELACIONADO = text("""
+    SELECT e.id_estudiante,
+        (EXISTS (
+            SELECT 1
+            FROM estudiantes_cursos ec_new
+            JOIN cursos c_new ON ec_new.id_curso = c_new.id_curso
+            WHERE c_new.gestion = :gestion_destino
+            AND ec_new.id_estudiante = e.id_estudiante
+        )) AS ya_inscrito
+    FROM estudiantes e
+    JOIN estudiantes_cursos ec_source ON e.id_estudiante = ec_source.id_estudiante
+    WHERE ec_source.id_curso = :id_curso_origen
+    AND e.estado_estudiante = 'Activo'
+""")
+
+SQL_INDICE_GESTION = text("""
+    SELECT e.id_estudiante,
+        (EXISTS (
+            SELECT 1
+            FROM estudiantes_gestiones eg
+            WHERE eg.id_estudiante = e.id_estudiante
+            AND eg.gestion = :gestion_destino
+        )) AS ya_inscrito
+    FROM estudiantes e
+    JOIN estudiantes_cursos ec_source ON e.id_estudiante = ec_source.id_estudiante
+    WHERE ec_source.id_curso = :id_curso_origen
+    AND e.estado_estudiante = 'Activo'
+""")
+
+def generar_historia(db, estudiantes: int, gestiones: int, cursos_por_gestion: int) -> None:
+    """Crear estudiantes, cursos y una inscripción por estudiante y gestión"""
+    rnd = random.Random(42)
+    db.execute(
+        Estudiante.__table__.insert(),
+        [
+            {"nombres": f"Nombre{i}", "apellido_paterno": f"Paterno{i % 500}",
+             "apellido_materno": f"Materno{i % 300}", "estado_estudiante": "Activo"}
+            for i in range(estudiantes)
+        ]
+    )
+    primera = 2026 - gestiones + 1
+    filas_cursos = [
+        {"nombre_curso": f"Curso {n}", "nivel": ("inicial", "primaria", "secundaria")[n % 3], "gestion": str(g)}
+        for g in range(primera, 2027)
+        for n in range(cursos_por_gestion)
+    ]
+    db.execute(Curso.__table__.insert(), filas_cursos)
+    ids_cursos = {}
+    for id_curso, gestion in db.execute(text("SELECT id_curso, gestion FROM cursos")):
+        ids_cursos.setdefault(gestion, []).append(id_curso)
+    ids_estudiantes = [fila[0] for fila in db.execute(text("SELECT id_estudiante FROM estudiantes"))]
+
+    # Cada estudiante cursa un año por gestión (la última gestión queda a medio inscribir)
+    inscripciones = []
+    for gestion, cursos in ids_cursos.items():
+        inscribir = ids_estudiantes if gestion != "2026" else ids_estudiantes[: len(ids_estudiantes) // 2]
+        inscripciones.extend({"id_estudiante": e, "id_curso": rnd.choice(cursos)} for e in inscribir)
+    db.execute(text("INSERT INTO estudiantes_cursos (id_estudiante, id_curso) VALUES (:id_estudiante, :id_curso)"), inscripciones)
+    IndiceGestionController.reconstruir(db)
+    db.commit()
+
+def medir(db, sql, parametros, repeticiones: int) -> float:
+    """Tiempo medio en milisegundos de una consulta"""
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        db.execute(sql, parametros).fetchall()
+    return (time.perf_counter() - inicio) * 1000 / repeticiones
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="sqlite://", help="URL de una base de datos vacía para el benchmark")
+    parser.add_argument("--estudiantes", type=int, default=5000)
+    parser.add_argument("--gestiones", type=int, default=10)
+    parser.add_argument("--cursos-por-gestion", type=int, default=30)
+    parser.add_argument("--repeticiones", type=int, default=50)
+    args = parser.parse_args()
+
+    engine = create_engine(args.url)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+
+    inicio = time.perf_counter()
+    generar_historia(db, args.estudiantes, args.gestiones, args.cursos_por_gestion)
+    print(f"Historia generada en {time.perf_counter() - inicio:.1f}s "
+          f"({args.estudiantes} estudiantes x {args.gestiones} gestiones)")
+
+    id_curso_origen = db.execute(text("SELECT MIN(id_curso) FROM cursos WHERE gestion = '2025'")).scalar()
+    parametros = {"id_curso_origen": id_curso_origen, "gestion_destino": "2026"}
+
+    antiguo = db.execute(SQL_EXISTS_CORRELACIONADO, parametros).fetchall()
+    nuevo = db.execute(SQL_INDICE_GESTION, parametros).fetchall()
+    assert sorted(antiguo) == sorted(nuevo), "El índice no coincide con estudiantes_cursos"
+
+    t_antiguo = medir(db, SQL_EXISTS_CORRELACIONADO, parametros, args.repeticiones)
+    t_nuevo = medir(db, SQL_INDICE_GESTION, parametros, args.repeticiones)
+    print(f"{'Consulta':<32}{'ms/consulta':>12}")
+    print(f"{'EXISTS correlacionado':<32}{t_antiguo:>12.2f}")
+    print(f"{'Índice estudiantes_gestiones':<32}{t_nuevo:>12.2f}")
+    print(f"Aceleración: {t_antiguo / t_nuevo:.1f}x ({len(nuevo)} estudiantes en el curso origen)")
+
+    db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+"""
+Generador de datos sintéticos: una red de unidades educativas con varios años de historia
+Crea estudiantes con datos realistas, cursos por gestión (inicial, primaria y
+secundaria con paralelos) e inscripciones que siguen la trayectoria de cada
+estudiante: avanza un grado por gestión y una parte abandona o se retira.
+La última gestión queda con la inscripción a medias, como al inicio de un año.
+
+Funciona con SQLite o MySQL; la base de datos debe estar vacía (o usar --reiniciar).
+
+Uso:
+    python -m benchmarks.datos_sinteticos
+    python -m benchmarks.datos_sinteticos --estudiantes 10000 --url sqlite:///benchmarks/datos/escuela_10000.db
+    python -m benchmarks.datos_sinteticos --url mysql+pymysql://root:@localhost/bienestar_bench --reiniciar
+"""
+import argparse
+import datetime
+import os
+import random
+import time
+from typing import Dict, List
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+from app.config.database import Base
+from app.models.estudiante_model import Estudiante, estudiantes_cursos
+from app.models.curso_model import Curso
+import app.models.estudiante_gestion_model  # noqa: F401
+import app.models.lista_espera_model  # noqa: F401
+import app.models.gestion_model  # noqa: F401
+import app.models.archivo_model  # noqa: F401
+import app.models.trabajo_promocion_model  # noqa: F401
+from app.controllers.indice_gestion_controller import IndiceGestionController
+from app.controllers.contador_curso_controller import ContadorCursoController
+from app.controllers.gestion_controller import GestionController
+
+NOMBRES = [
+    "Juan", "María", "José", "Ana", "Luis", "Carmen", "Carlos", "Rosa", "Jorge", "Lucía",
+    "Miguel", "Elena", "Pedro", "Sofía", "Diego", "Valeria", "Mateo", "Camila", "Santiago", "Daniela",
+    "Gabriel", "Isabel", "Andrés", "Paola", "Fernando", "Ximena", "Ricardo", "Gabriela", "Javier", "Natalia",
+    "Sebastián", "Mariana", "Alejandro", "Fernanda", "Rodrigo", "Andrea", "Marco", "Carla", "Álvaro", "Micaela",
+]
+SEGUNDOS_NOMBRES = ["", "", "", "Alberto", "Antonio", "Alejandra", "Beatriz", "Carlos", "Esteban", "Fernanda", "Ignacio", "Teresa"]
+APELLIDOS = [
+    "Mamani", "Quispe", "Flores", "Choque", "Condori", "Gutiérrez", "Rodríguez", "Vargas", "López", "Fernández",
+    "Pérez", "García", "Rojas", "Torrez", "Gonzales", "Cruz", "Apaza", "Chávez", "Limachi", "Ticona",
+    "Morales", "Castro", "Ramos", "Ortiz", "Medina", "Aguilar", "Suárez", "Romero", "Herrera", "Salazar",
+    "Vásquez", "Méndez", "Huanca", "Calle", "Nina", "Poma", "Callisaya", "Villca", "Alanoca", "Yujra",
+]
+CALLES = ["Av. 6 de Agosto", "Calle Comercio", "Av. Busch", "Calle Sucre", "Av. Arce", "Calle Potosí", "Av. América", "Calle Jaén"]
+
+# Grados en orden de avance: (nivel, nombre del grado)
+GRADOS = (
+    [("inicial", g) for g in ("1ra Sección", "2da Sección")]
+    + [("primaria", g) for g in ("1ro", "2do", "3ro", "4to", "5to", "6to")]
+    + [("secundaria", g) for g in ("1ro", "2do", "3ro", "4to", "5to", "6to")]
+)
+
+# Probabilidad anual de dejar de estudiar y reparto entre abandono y retiro
+PROBABILIDAD_DESERCION = 0.025
+PROPORCION_ABANDONO = 0.6
+
+# Fracción de estudiantes ya inscritos en la última gestión
+INSCRIPCION_ULTIMA_GESTION = 0.5
+
+TAMANO_LOTE = 10000
+
+def _paralelo(indice: int) -> str:
+    """A, B, ..., Z, AA, AB, ..."""
+    letras = ""
+    indice += 1
+    while indice:
+        indice, resto = divmod(indice - 1, 26)
+        letras = chr(65 + resto) + letras
+    return letras
+
+def _insertar(conexion, tabla, filas: List[dict]) -> None:
+    for inicio in range(0, len(filas), TAMANO_LOTE):
+        conexion.execute(tabla.insert(), filas[inicio:inicio + TAMANO_LOTE])
+
+def generar_estudiante(rnd: random.Random, id_estudiante: int, anio_nacimiento: int, estado: str) -> dict:
+    paterno, materno = rnd.choice(APELLIDOS), rnd.choice(APELLIDOS)
+    segundo = rnd.choice(SEGUNDOS_NOMBRES)
+    tiene_padre = rnd.random() < 0.8
+    tiene_madre = rnd.random() < 0.93
+    return {
+        "id_estudiante": id_estudiante,
+        # Algunos estudiantes de inicial todavía no tienen CI registrado
+        "ci": None if rnd.random() < 0.03 else str(1000000 + id_estudiante * 7 + rnd.randint(0, 6)),
+        "nombres": f"{rnd.choice(NOMBRES)} {segundo}".strip(),
+        "apellido_paterno": paterno,
+        "apellido_materno": materno,
+        "fecha_nacimiento": datetime.date(anio_nacimiento, rnd.randint(1, 12), rnd.randint(1, 28)),
+        "direccion": None if rnd.random() < 0.1 else f"{rnd.choice(CALLES)} #{rnd.randint(1, 2500)}",
+        "estado_estudiante": estado,
+        "nombre_padre": rnd.choice(NOMBRES) if tiene_padre else None,
+        "apellido_paterno_padre": paterno if tiene_padre else None,
+        "apellido_materno_padre": rnd.choice(APELLIDOS) if tiene_padre else None,
+        "telefono_padre": f"7{rnd.randint(1000000, 9999999)}" if tiene_padre else None,
+        "nombre_madre": rnd.choice(NOMBRES) if tiene_madre else None,
+        "apellido_paterno_madre": materno if tiene_madre else None,
+        "apellido_materno_madre": rnd.choice(APELLIDOS) if tiene_madre else None,
+        "telefono_madre": f"6{rnd.randint(1000000, 9999999)}" if tiene_madre else None,
+        "version": 1,
+    }
+
+def generar(
+    engine: Engine,
+    estudiantes: int = 100000,
+    cursos: int = 3000,
+    gestiones: int = 10,
+    ultima_gestion: int = 2026,
+    semilla: int = 42
+) -> Dict[str, int]:
+    """
+    Poblar una base de datos vacía con datos sintéticos
+
+    Args:
+        engine: Engine de la base de datos (las tablas deben existir)
+        estudiantes: Cantidad de estudiantes
+        cursos: Cantidad aproximada de cursos en total (se reparten entre gestiones y grados)
+        gestiones: Cantidad de gestiones (años) de historia
+        ultima_gestion: Año de la gestión en curso
+        semilla: Semilla del generador aleatorio (mismos datos en cada ejecución)
+
+    Returns:
+        Cantidad de filas creadas por tabla
+    """
+    rnd = random.Random(semilla)
+    primera_gestion = ultima_gestion - gestiones + 1
+    paralelos = max(1, round(cursos / gestiones / len(GRADOS)))
+    # Los primeros paralelos (A, B, ...) suelen tener más estudiantes que los últimos
+    pesos_paralelos = [1 / (1 + 0.05 * indice) for indice in range(paralelos)]
+
+    # Cursos: cada grado tiene los mismos paralelos en todas las gestiones
+    filas_cursos = []
+    cursos_por_grado: Dict[tuple, List[int]] = {}
+    for gestion in range(primera_gestion, ultima_gestion + 1):
+        for grado, (nivel, nombre) in enumerate(GRADOS):
+            for paralelo in range(paralelos):
+                id_curso = len(filas_cursos) + 1
+                filas_cursos.append({
+                    "id_curso": id_curso,
+                    "nombre_curso": f"{nombre} {_paralelo(paralelo)}",
+                    "nivel": nivel,
+                    "gestion": str(gestion),
+                    "version": 1,
+                })
+                cursos_por_grado.setdefault((gestion, grado), []).append(id_curso)
+
+    # Estudiantes: la cohorte es el año de ingreso a 1ra Sección. Se reparten de modo
+    # que todas las gestiones tengan todos los grados ocupados.
+    filas_estudiantes = []
+    filas_inscripciones = []
+    for id_estudiante in range(1, estudiantes + 1):
+        cohorte = rnd.randint(primera_gestion - len(GRADOS) + 1, ultima_gestion)
+        estado = "Activo"
+        for gestion in range(max(cohorte, primera_gestion), min(cohorte + len(GRADOS) - 1, ultima_gestion) + 1):
+            if gestion == ultima_gestion and rnd.random() > INSCRIPCION_ULTIMA_GESTION:
+                break
+            filas_inscripciones.append({
+                "id_estudiante": id_estudiante,
+                "id_curso": rnd.choices(cursos_por_grado[(gestion, gestion - cohorte)], pesos_paralelos)[0],
+            })
+            if rnd.random() < PROBABILIDAD_DESERCION:
+                estado = "Abandono" if rnd.random() < PROPORCION_ABANDONO else "Retirado"
+                break
+        filas_estudiantes.append(generar_estudiante(rnd, id_estudiante, cohorte - 4, estado))
+
+    with engine.begin() as conexion:
+        _insertar(conexion, Curso.__table__, filas_cursos)
+        _insertar(conexion, Estudiante.__table__, filas_estudiantes)
+        _insertar(conexion, estudiantes_cursos, filas_inscripciones)
+
+    db = sessionmaker(bind=engine)()
+    try:
+        IndiceGestionController.reconstruir(db)
+        ContadorCursoController.recalcular(db)
+        GestionController.sincronizar(db)
+        db.commit()
+    finally:
+        db.close()
+
+    return {
+        "estudiantes": len(filas_estudiantes),
+        "cursos": len(filas_cursos),
+        "inscripciones": len(filas_inscripciones),
+    }
+
+def preparar(url: str, estudiantes: int, cursos: int, gestiones: int, reiniciar: bool = False, semilla: int = 42) -> Engine:
+    """
+    Crear (o reutilizar) una base de datos sintética
+
+    Si la base de datos ya tiene estudiantes y no se pide reiniciar, se reutiliza tal cual.
+    """
+    if url.startswith("sqlite:///"):
+        directorio = os.path.dirname(url[len("sqlite:///"):])
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+
+    engine = create_engine(url)
+    if reiniciar:
+        Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    with engine.connect() as conexion:
+        existentes = conexion.execute(text("SELECT COUNT(*) FROM estudiantes")).scalar()
+    if existentes:
+        return engine
+
+    inicio = time.perf_counter()
+    filas = generar(engine, estudiantes, cursos, gestiones, semilla=semilla)
+    print(f"Datos generados en {time.perf_counter() - inicio:.1f}s: "
+          f"{filas['estudiantes']} estudiantes, {filas['cursos']} cursos, {filas['inscripciones']} inscripciones")
+    return engine
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="sqlite:///benchmarks/datos/escuela_100000.db")
+    parser.add_argument("--estudiantes", type=int, default=100000)
+    parser.add_argument("--cursos", type=int, default=3000, help="Cursos en total, entre todas las gestiones")
+    parser.add_argument("--gestiones", type=int, default=10)
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--reiniciar", action="store_true", help="Borrar las tablas antes de generar")
+    args = parser.parse_args()
+
+    engine = preparar(args.url, args.estudiantes, args.cursos, args.gestiones, args.reiniciar, args.semilla)
+    with engine.connect() as conexion:
+        for tabla in ("estudiantes", "cursos", "estudiantes_cursos", "estudiantes_gestiones"):
+            print(f"{tabla:<24}{conexion.execute(text(f'SELECT COUNT(*) FROM {tabla}')).scalar():>10}")
+
+if __name__ == "__main__":
+    main()
@@ -28,4 +28,4 @@ echo.
 echo Presiona CTRL+C para detener el servidor
 echo.
 
-python run.py
+python run.py --produccion %*
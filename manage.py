@@ -0,0 +1,164 @@
+"""
+Comandos de administración de la aplicación
+
+Uso:
+    python manage.py crear-tablas        # Crear tablas e índices que falten y poblar el índice y el catálogo de gestiones
+    python manage.py reconstruir-indice  # Recalcular el índice de inscripciones por gestión
+    python manage.py reconciliar-contadores  # Corregir los contadores de estudiantes de los cursos
+    python manage.py archivar-gestion 2019   # Mover una gestión cerrada a las tablas de archivo
+    python manage.py consultas-lentas    # Peores consultas lentas agrupadas por sentencia
+"""
+import json
+import argparse
+
+def crear_tablas(args) -> None:
+    """Crear las tablas que no existan, poblar el índice por gestión si es nuevo y registrar las gestiones que falten"""
+    from app.config.database import engine, Base, SessionLocal
+    from app.controllers.indice_gestion_controller import IndiceGestionController
+    from app.controllers.gestion_controller import GestionController
+    import app.models.estudiante_model  # noqa: F401
+    import app.models.curso_model  # noqa: F401
+    import app.models.estudiante_gestion_model  # noqa: F401
+    import app.models.lista_espera_model  # noqa: F401
+    import app.models.gestion_model  # noqa: F401
+    import app.models.archivo_model  # noqa: F401
+    import app.models.trabajo_promocion_model  # noqa: F401
+    import app.models.generacion_cache_model  # noqa: F401
+
+    Base.metadata.create_all(bind=engine)
+    IndiceGestionController.reconstruir_si_vacio()
+
+    db = SessionLocal()
+    try:
+        agregadas = GestionController.sincronizar(db)
+        db.commit()
+    finally:
+        db.close()
+    if agregadas:
+        print(f"{agregadas} gestiones registradas en el catálogo")
+    print("Tablas verificadas/creadas correctamente")
+
+def reconstruir_indice(args) -> None:
+    """Recalcular completamente la tabla estudiantes_gestiones"""
+    from app.config.database import SessionLocal
+    from app.controllers.indice_gestion_controller import IndiceGestionController
+
+    db = SessionLocal()
+    try:
+        IndiceGestionController.reconstruir(db)
+        db.commit()
+        print("Índice de inscripciones por gestión reconstruido")
+    finally:
+        db.close()
+
+def reconciliar_contadores(args) -> None:
+    """Comparar los contadores de estudiantes de cada curso con estudiantes_cursos y corregirlos"""
+    from app.config.database import SessionLocal
+    from app.controllers.contador_curso_controller import ContadorCursoController
+
+    db = SessionLocal()
+    try:
+        desvios = ContadorCursoController.detectar_desvios(db)
+        for desvio in desvios[:args.limite]:
+            diferencias = ", ".join(
+                f"{columna} {guardado} -> {desvio['reales'][columna]}"
+                for columna, guardado in desvio["guardados"].items()
+                if guardado != desvio["reales"][columna]
+            )
+            print(f"Curso {desvio['id_curso']}: {diferencias}")
+        if len(desvios) > args.limite:
+            print(f"... y {len(desvios) - args.limite} cursos más")
+
+        if not desvios:
+            print("Los contadores de todos los cursos coinciden con las inscripciones")
+        elif args.solo_verificar:
+            print(f"{len(desvios)} cursos con contadores desviados (sin corregir)")
+        else:
+            ContadorCursoController.recalcular(db, ids_cursos=[desvio["id_curso"] for desvio in desvios])
+            db.commit()
+            print(f"{len(desvios)} cursos corregidos")
+    finally:
+        db.close()
+
+def archivar_gestion(args) -> None:
+    """Mover una gestión cerrada a las tablas de archivo (o devolverla con --restaurar)"""
+    from fastapi import HTTPException
+    from app.config.database import SessionLocal
+    from app.controllers.archivo_controller import ArchivoController
+
+    db = SessionLocal()
+    try:
+        if args.restaurar:
+            resultado = ArchivoController.restaurar(db, args.gestion)
+        else:
+            resultado = ArchivoController.archivar(db, args.gestion)
+        print(f"{resultado['mensaje']}: {resultado['cursos']} cursos, {resultado['inscripciones']} inscripciones")
+        filas = ArchivoController.contar(db)
+        print(f"Vigentes: {filas['cursos']} cursos, {filas['inscripciones']} inscripciones | "
+              f"archivo: {filas['cursos_archivados']} cursos, {filas['inscripciones_archivadas']} inscripciones")
+    except HTTPException as e:
+        print(e.detail)
+    finally:
+        db.close()
+
+def consultas_lentas(args) -> None:
+    """Mostrar las consultas lentas registradas, agrupadas por sentencia normalizada"""
+    from app.config.consultas_lentas import CONSULTAS_LENTAS_ARCHIVO, agrupar_peores, leer_registros
+
+    ruta = args.archivo or CONSULTAS_LENTAS_ARCHIVO
+    try:
+        grupos = agrupar_peores(leer_registros(ruta), args.limite, args.orden)
+    except FileNotFoundError:
+        print(f"No hay registros de consultas lentas en {ruta}")
+        return
+
+    if args.json:
+        print(json.dumps(grupos, ensure_ascii=False, indent=2))
+        return
+
+    for posicion, grupo in enumerate(grupos, start=1):
+        print(f"{posicion}. {grupo['veces']} veces | total {grupo['total_ms']:.0f} ms | "
+              f"promedio {grupo['promedio_ms']:.0f} ms | máximo {grupo['maximo_ms']:.0f} ms")
+        print(f"   {grupo['normalizada'][:300]}")
+        for origen, veces in sorted(grupo["origenes"].items(), key=lambda o: o[1], reverse=True):
+            print(f"   desde {origen} ({veces})")
+        for linea in grupo["plan"] or []:
+            print(f"   plan: {linea}")
+        print()
+
+COMANDOS = {
+    "crear-tablas": crear_tablas,
+    "reconstruir-indice": reconstruir_indice,
+    "reconciliar-contadores": reconciliar_contadores,
+    "archivar-gestion": archivar_gestion,
+    "consultas-lentas": consultas_lentas,
+}
+
+# Argumentos adicionales de cada comando
+ARGUMENTOS = {
+    "reconciliar-contadores": [
+        (("--solo-verificar",), {"action": "store_true", "help": "Mostrar los desvíos sin corregirlos"}),
+        (("--limite",), {"type": int, "default": 20, "help": "Cantidad de cursos desviados a mostrar"}),
+    ],
+    "archivar-gestion": [
+        (("gestion",), {"help": "Gestión cerrada a archivar"}),
+        (("--restaurar",), {"action": "store_true", "help": "Devolver la gestión a las tablas vigentes"}),
+    ],
+    "consultas-lentas": [
+        (("--archivo",), {"help": "Archivo JSONL (por defecto CONSULTAS_LENTAS_ARCHIVO)"}),
+        (("--limite",), {"type": int, "default": 10, "help": "Cantidad de sentencias a mostrar"}),
+        (("--orden",), {"choices": ["total", "maximo", "veces"], "default": "total", "help": "Criterio de orden"}),
+        (("--json",), {"action": "store_true", "help": "Salida en JSON"}),
+    ],
+}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Comandos de administración")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+    for nombre, funcion in COMANDOS.items():
+        subparser = subparsers.add_parser(nombre, help=funcion.__doc__)
+        for opciones, parametros in ARGUMENTOS.get(nombre, []):
+            subparser.add_argument(*opciones, **parametros)
+
+    args = parser.parse_args()
+    COMANDOS[args.comando](args)
@@ -1,13 +1,19 @@
 """
 Script para iniciar el servidor FastAPI
+
+Uso:
+    python run.py               # Desarrollo: un proceso con recarga automática
+    python run.py --produccion  # Producción: varios workers (ver app/config/servidor.py)
 """
-import uvicorn
+import argparse
+from app.config.servidor import iniciar_desarrollo, iniciar_produccion
 
 if __name__ == "__main__":
-    uvicorn.run(
-        "app.main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
-        log_level="info"
-    )
+    parser = argparse.ArgumentParser(description="Iniciar el servidor de la API")
+    parser.add_argument("--produccion", action="store_true", help="Iniciar en modo producción")
+    args = parser.parse_args()
+
+    if args.produccion:
+        iniciar_produccion()
+    else:
+        iniciar_desarrollo()
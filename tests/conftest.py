@@ -0,0 +1,47 @@
+"""
+Configuración compartida de las pruebas
+Las pruebas usan una base SQLite temporal (nunca la de .env) y ejecutan las
+tareas de Excel en el mismo proceso. Cada prueba parte de tablas vacías.
+
+Uso:
+    python -m pytest
+"""
+import os
+import tempfile
+
+# Antes de importar la aplicación: database.py crea el engine al importarse
+_DIRECTORIO = tempfile.mkdtemp(prefix="bienestar-pruebas-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_DIRECTORIO, 'pruebas.db')}"
+os.environ["EXCEL_WORKERS"] = "0"
+os.environ["LOG_TIEMPOS"] = "0"
+os.environ["CONSULTAS_LENTAS_UMBRAL_MS"] = "0"
+
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.config.database import Base, SessionLocal, engine
+from app.config.cache import invalidar_caches
+
+@pytest.fixture(autouse=True)
+def tablas():
+    """Tablas vacías para cada prueba"""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    invalidar_caches()
+    yield
+    invalidar_caches()
+
+@pytest.fixture
+def client():
+    """Cliente HTTP de la aplicación"""
+    with TestClient(app) as cliente:
+        yield cliente
+
+@pytest.fixture
+def db():
+    """Sesión de base de datos propia de la prueba"""
+    sesion = SessionLocal()
+    try:
+        yield sesion
+    finally:
+        sesion.close()
@@ -0,0 +1,22 @@
+"""
+Datos de prueba creados por la API
+"""
+
+def crear_estudiante(client, nombres: str, **campos) -> int:
+    """Crear un estudiante por la API y devolver su ID"""
+    datos = {"nombres": nombres, "apellido_paterno": "Pérez", "apellido_materno": "García", **campos}
+    respuesta = client.post("/api/estudiantes/", json=datos)
+    assert respuesta.status_code == 201, respuesta.text
+    return respuesta.json()["id_estudiante"]
+
+def crear_curso(client, nombre_curso: str, nivel: str = "primaria", gestion: str = "2025", **campos) -> int:
+    """Crear un curso por la API y devolver su ID"""
+    datos = {"nombre_curso": nombre_curso, "nivel": nivel, "gestion": gestion, **campos}
+    respuesta = client.post("/api/cursos/", json=datos)
+    assert respuesta.status_code == 201, respuesta.text
+    return respuesta.json()["id_curso"]
+
+def asignar(client, id_estudiante: int, id_curso: int) -> None:
+    """Asignar un estudiante a un curso por la API"""
+    respuesta = client.post("/api/asignaciones/", json={"id_estudiante": id_estudiante, "id_curso": id_curso})
+    assert respuesta.status_code in (200, 201), respuesta.text
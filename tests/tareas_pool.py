@@ -0,0 +1,16 @@
+"""
+Tareas de nivel de módulo para el pool de procesos (deben poder serializarse)
+"""
+import os
+import time
+
+def duplicar(valor: int) -> int:
+    return valor * 2
+
+def dormir(segundos: float) -> float:
+    time.sleep(segundos)
+    return segundos
+
+def terminar_proceso() -> None:
+    """Simula un proceso hijo que muere (ej: sin memoria)"""
+    os._exit(1)
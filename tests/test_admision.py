@@ -0,0 +1,100 @@
+"""
+Pruebas del control de admisión de los endpoints pesados
+"""
+import asyncio
+import pytest
+from app.middlewares import admision_middleware
+from app.middlewares.admision_middleware import LimiteConcurrencia
+
+class SemaforoQueConcede:
+    """Semáforo cuyo acquire concede el lugar aunque se cancele la espera"""
+    def __init__(self):
+        self.liberados = 0
+
+    async def acquire(self) -> bool:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            pass
+        return True
+
+    def release(self) -> None:
+        self.liberados += 1
+
+def _limite_con_semaforo_que_concede() -> LimiteConcurrencia:
+    limite = LimiteConcurrencia("prueba", 1, 1)
+    limite._semaforo = SemaforoQueConcede()
+    return limite
+
+def test_timeout_devuelve_el_lugar_concedido_al_vencer():
+    async def escenario():
+        limite = _limite_con_semaforo_que_concede()
+        assert await limite.adquirir(0.01) is False
+        await asyncio.sleep(0)
+        return limite
+
+    limite = asyncio.run(escenario())
+    assert limite._semaforo.liberados == 1
+    assert (limite.activos, limite.esperando) == (0, 0)
+
+def test_peticion_cancelada_devuelve_el_lugar():
+    async def escenario():
+        limite = _limite_con_semaforo_que_concede()
+        espera = asyncio.ensure_future(limite.adquirir(10))
+        await asyncio.sleep(0.01)
+        espera.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await espera
+        await asyncio.sleep(0)
+        return limite
+
+    limite = asyncio.run(escenario())
+    assert limite._semaforo.liberados == 1
+    assert (limite.activos, limite.esperando) == (0, 0)
+
+def test_lugar_liberado_mientras_se_cancela_la_espera():
+    async def escenario():
+        limite = LimiteConcurrencia("prueba", 1, 1)
+        assert await limite.adquirir(1)
+        espera = asyncio.ensure_future(limite.adquirir(10))
+        await asyncio.sleep(0)
+        # El semáforo concede el lugar y la petición se cancela en la misma vuelta del loop
+        limite.liberar()
+        espera.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await espera
+        return await limite.adquirir(0.1)
+
+    assert asyncio.run(escenario()) is True
+
+def _limitar_lote(monkeypatch, limite: LimiteConcurrencia) -> None:
+    """Reemplazar el límite de las rutas de lote por uno creado en la prueba"""
+    clases = [
+        (limite if prefijos[0] == "/api/asignaciones/lote" else original, metodos, prefijos)
+        for original, metodos, prefijos in admision_middleware.CLASES_RUTA
+    ]
+    monkeypatch.setattr(admision_middleware, "CLASES_RUTA", clases)
+
+def _rechazo(client, codigo: int) -> None:
+    respuesta = client.post("/api/asignaciones/lote", json={})
+    assert respuesta.status_code == codigo
+    assert respuesta.headers["Retry-After"] == admision_middleware.ADMISION_RETRY_AFTER
+
+def test_cola_llena_responde_429(client, monkeypatch):
+    limite = LimiteConcurrencia("lote", 1, 0)
+    limite.activos = 1
+    _limitar_lote(monkeypatch, limite)
+    _rechazo(client, 429)
+
+def test_espera_vencida_responde_503(client, monkeypatch):
+    monkeypatch.setattr(admision_middleware, "ADMISION_ESPERA_MAXIMA", 0.05)
+    _limitar_lote(monkeypatch, LimiteConcurrencia("lote", 0, 1))
+    _rechazo(client, 503)
+
+def test_pool_saturado_responde_503(client, monkeypatch):
+    monkeypatch.setattr(admision_middleware, "espera_checkout_reciente", lambda: 10.0)
+    _rechazo(client, 503)
+
+def test_ruta_no_limitada_no_se_rechaza(client, monkeypatch):
+    monkeypatch.setattr(admision_middleware, "espera_checkout_reciente", lambda: 10.0)
+    assert client.get("/api/cursos/").status_code == 200
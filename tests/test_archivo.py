@@ -0,0 +1,42 @@
+"""
+Pruebas del archivo de gestiones
+"""
+from sqlalchemy import insert
+from app.models.curso_model import Curso
+from app.models.gestion_model import Gestion
+from tests.datos import asignar, crear_curso, crear_estudiante
+
+def _archivar(client, gestion: str) -> None:
+    assert client.put(f"/api/gestiones/{gestion}", json={"cerrada": True}).status_code == 200
+    respuesta = client.post(f"/api/gestiones/{gestion}/archivar")
+    assert respuesta.status_code == 200, respuesta.text
+
+def test_archivar_y_restaurar(client):
+    id_curso = crear_curso(client, "1ro A", gestion="2020")
+    asignar(client, crear_estudiante(client, "Ana"), id_curso)
+    _archivar(client, "2020")
+
+    # Un curso nuevo no toma el ID del curso archivado
+    assert crear_curso(client, "1ro A", gestion="2026") != id_curso
+
+    respuesta = client.post("/api/gestiones/2020/restaurar")
+    assert respuesta.status_code == 200, respuesta.text
+    assert (respuesta.json()["cursos"], respuesta.json()["inscripciones"]) == (1, 1)
+
+def test_restaurar_con_id_ocupado_responde_409(client, db):
+    id_curso = crear_curso(client, "1ro A", gestion="2020")
+    asignar(client, crear_estudiante(client, "Ana"), id_curso)
+    _archivar(client, "2020")
+
+    # Un curso vigente con el mismo ID (ej: una base que reutilizó el ID)
+    db.execute(insert(Curso).values(id_curso=id_curso, nombre_curso="1ro A", nivel="primaria", gestion="2026"))
+    db.commit()
+
+    respuesta = client.post("/api/gestiones/2020/restaurar")
+    assert respuesta.status_code == 409
+    assert str(id_curso) in respuesta.json()["detail"]
+
+    # Nada se movió: la gestión sigue archivada con su curso
+    db.expire_all()
+    assert db.get(Gestion, "2020").archivada is True
+    assert client.post("/api/gestiones/2020/restaurar").status_code == 409
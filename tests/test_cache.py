@@ -0,0 +1,41 @@
+"""
+Pruebas de la invalidación de cachés compartida entre workers
+"""
+from app.config.cache import CacheResultados, incrementar_generacion
+from app.models.estudiante_model import Estudiante
+from tests.datos import asignar, crear_curso, crear_estudiante
+
+def test_escritura_en_otro_worker_invalida_la_entrada():
+    cache = CacheResultados("prueba", segundos=60)
+    assert cache.obtener("clave", lambda: 1) == 1
+    assert cache.obtener("clave", lambda: 2) == 1
+
+    # Otro worker confirmó una escritura: su invalidar_caches() solo llega aquí por la base
+    incrementar_generacion()
+    assert cache.obtener("clave", lambda: 2) == 2
+    assert cache.obtener("clave", lambda: 3) == 2
+
+def test_estadisticas_reflejan_escrituras_de_otro_worker(client, db):
+    crear_estudiante(client, "Ana")
+    assert client.get("/api/estadisticas").json()["estudiantes"]["total"] == 1
+
+    # Escritura que este worker no ve: sin aviso se sigue sirviendo la entrada en caché
+    db.add(Estudiante(nombres="Luis", apellido_paterno="Pérez", apellido_materno="García"))
+    db.commit()
+    assert client.get("/api/estadisticas").json()["estudiantes"]["total"] == 1
+
+    incrementar_generacion()
+    assert client.get("/api/estadisticas").json()["estudiantes"]["total"] == 2
+
+def test_cohortes_reflejan_escrituras_de_otro_worker(client, db):
+    id_estudiante = crear_estudiante(client, "Ana")
+    asignar(client, id_estudiante, crear_curso(client, "1ro A", gestion="2025"))
+    asignar(client, id_estudiante, crear_curso(client, "2do A", gestion="2026"))
+    assert client.get("/api/cohortes/2025").json()["resumen"]["retenidos"] == 1
+
+    # Otro worker registra el abandono; COHORTES_CACHE_SEGUNDOS no llegó a vencer
+    db.get(Estudiante, id_estudiante).estado_estudiante = "Abandono"
+    db.commit()
+    assert client.get("/api/cohortes/2025").json()["resumen"]["retenidos"] == 1
+    incrementar_generacion()
+    assert client.get("/api/cohortes/2025").json()["resumen"]["retenidos"] == 0
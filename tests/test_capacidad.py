@@ -0,0 +1,46 @@
+"""
+Pruebas del cambio de capacidad de un curso
+"""
+import pytest
+from fastapi import HTTPException
+from app.config.database import SessionLocal
+from app.controllers.curso_controller import CursoController
+from app.models.curso_model import Curso
+from app.schemas.curso_schema import CursoUpdate
+from tests.datos import asignar, crear_curso, crear_estudiante
+
+def test_bajar_y_subir_capacidad(client):
+    id_curso = crear_curso(client, "1ro A", capacidad=5)
+    for nombre in ("Ana", "Luis"):
+        asignar(client, crear_estudiante(client, nombre), id_curso)
+
+    respuesta = client.put(f"/api/cursos/{id_curso}", json={"capacidad": 2})
+    assert respuesta.status_code == 200, respuesta.text
+    assert respuesta.json()["capacidad"] == 2
+
+    respuesta = client.put(f"/api/cursos/{id_curso}", json={"capacidad": 1})
+    assert respuesta.status_code == 400
+    assert "2 estudiantes" in respuesta.json()["detail"]
+
+    respuesta = client.put(f"/api/cursos/{id_curso}", json={"capacidad": None})
+    assert respuesta.status_code == 200
+    assert respuesta.json()["capacidad"] is None
+
+def test_capacidad_se_valida_contra_la_cantidad_vigente(client, db):
+    id_curso = crear_curso(client, "1ro A", capacidad=5)
+    asignar(client, crear_estudiante(client, "Ana"), id_curso)
+
+    # La sesión ya leyó el curso con 1 inscrito; después se inscriben 2 más
+    leido = db.get(Curso, id_curso)
+    assert leido.cantidad_estudiantes == 1
+    for nombre in ("Luis", "Rosa"):
+        asignar(client, crear_estudiante(client, nombre), id_curso)
+
+    with pytest.raises(HTTPException) as error:
+        CursoController.actualizar(db, id_curso, CursoUpdate(capacidad=2))
+    assert error.value.status_code == 400
+    assert "3 estudiantes" in error.value.detail
+
+    with SessionLocal() as otra:
+        curso = otra.get(Curso, id_curso)
+        assert (curso.capacidad, curso.cantidad_estudiantes) == (5, 3)
@@ -0,0 +1,79 @@
+"""
+Pruebas de la concurrencia optimista: ETag, If-Match y conflictos de versión
+"""
+import pytest
+from fastapi import HTTPException
+from app.config.database import SessionLocal
+from app.controllers.curso_controller import CursoController
+from app.controllers.estudiante_controller import EstudianteController
+from app.models.curso_model import Curso
+from app.models.estudiante_model import Estudiante
+from app.schemas.curso_schema import CursoUpdate
+from app.schemas.estudiante_schema import EstudianteUpdate
+from tests.datos import crear_curso, crear_estudiante
+
+def test_etag_de_estudiante_sigue_la_version(client):
+    id_estudiante = crear_estudiante(client, "Ana")
+    respuesta = client.get(f"/api/estudiantes/{id_estudiante}")
+    assert respuesta.headers["ETag"] == '"1"'
+
+    respuesta = client.put(f"/api/estudiantes/{id_estudiante}", json={"nombres": "Ana María"},
+                           headers={"If-Match": '"1"'})
+    assert respuesta.status_code == 200, respuesta.text
+    assert respuesta.headers["ETag"] == '"2"'
+
+    respuesta = client.patch(f"/api/estudiantes/{id_estudiante}/estado", json={"estado_estudiante": "Abandono"},
+                             headers={"If-Match": 'W/"2"'})
+    assert respuesta.status_code == 200, respuesta.text
+    assert respuesta.headers["ETag"] == '"3"'
+    assert client.get(f"/api/estudiantes/{id_estudiante}").headers["ETag"] == '"3"'
+
+def test_if_match_viejo_responde_409(client):
+    id_estudiante = crear_estudiante(client, "Ana")
+    id_curso = crear_curso(client, "1ro A")
+    assert client.put(f"/api/estudiantes/{id_estudiante}", json={"nombres": "Ana María"}).status_code == 200
+    assert client.put(f"/api/cursos/{id_curso}", json={"nombre_curso": "1ro B"}).status_code == 200
+
+    # Ambos se leyeron en la versión 1 y otro usuario ya los modificó
+    respuesta = client.put(f"/api/estudiantes/{id_estudiante}", json={"nombres": "Anita"}, headers={"If-Match": '"1"'})
+    assert respuesta.status_code == 409
+    respuesta = client.patch(f"/api/estudiantes/{id_estudiante}/estado", json={"estado_estudiante": "Retirado"},
+                             headers={"If-Match": '"1"'})
+    assert respuesta.status_code == 409
+    respuesta = client.put(f"/api/cursos/{id_curso}", json={"nombre_curso": "1ro C"}, headers={"If-Match": '"1"'})
+    assert respuesta.status_code == 409
+
+    # Nada se escribió; con el ETag vigente sí se aplica
+    estudiante = client.get(f"/api/estudiantes/{id_estudiante}")
+    assert (estudiante.json()["nombres"], estudiante.json()["estado_estudiante"]) == ("Ana María", "Activo")
+    assert client.get(f"/api/cursos/{id_curso}").json()["nombre_curso"] == "1ro B"
+    respuesta = client.put(f"/api/cursos/{id_curso}", json={"nombre_curso": "1ro C"},
+                           headers={"If-Match": client.get(f"/api/cursos/{id_curso}").headers["ETag"]})
+    assert respuesta.status_code == 200
+
+def test_if_match_invalido_responde_400(client):
+    id_estudiante = crear_estudiante(client, "Ana")
+    respuesta = client.put(f"/api/estudiantes/{id_estudiante}", json={"nombres": "Anita"}, headers={"If-Match": "abc"})
+    assert respuesta.status_code == 400
+
+def test_version_cambiada_entre_lectura_y_escritura_responde_409(client, db):
+    id_estudiante = crear_estudiante(client, "Ana")
+    id_curso = crear_curso(client, "1ro A")
+
+    with SessionLocal() as otra:
+        # Las sesiones ya leyeron los registros en la versión 1; otro usuario los modifica después
+        estudiante, curso = db.get(Estudiante, id_estudiante), otra.get(Curso, id_curso)
+        assert (estudiante.version, curso.version) == (1, 1)
+        assert client.put(f"/api/estudiantes/{id_estudiante}", json={"nombres": "Ana María"}).status_code == 200
+        assert client.put(f"/api/cursos/{id_curso}", json={"nombre_curso": "1ro B"}).status_code == 200
+
+        # El UPDATE ... WHERE version = 1 no encuentra la fila (StaleDataError)
+        with pytest.raises(HTTPException) as error:
+            EstudianteController.actualizar(db, id_estudiante, EstudianteUpdate(nombres="Anita"))
+        assert error.value.status_code == 409
+        with pytest.raises(HTTPException) as error:
+            CursoController.actualizar(otra, id_curso, CursoUpdate(nombre_curso="1ro C"))
+        assert error.value.status_code == 409
+
+    assert client.get(f"/api/estudiantes/{id_estudiante}").json()["nombres"] == "Ana María"
+    assert client.get(f"/api/cursos/{id_curso}").json()["nombre_curso"] == "1ro B"
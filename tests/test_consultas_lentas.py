@@ -0,0 +1,46 @@
+"""
+Pruebas del registro de consultas lentas: sin datos personales en el archivo
+"""
+from sqlalchemy import create_engine, text
+from app.config import consultas_lentas
+from app.config.consultas_lentas import enmascarar_parametros, esperar_pendientes, leer_registros, normalizar_sentencia
+
+def test_enmascarar_parametros():
+    assert enmascarar_parametros({"ci": "1234567", "nombres": "Juan", "id_curso": 7, "limite": None}) == {
+        "ci": "<texto:7>", "nombres": "<texto:4>", "id_curso": 7, "limite": None
+    }
+    filas = [("Juan", 1), ("Rosa", 2)]
+    assert enmascarar_parametros(filas, executemany=True) == {"filas": 2, "primera": ["<texto:4>", 1]}
+
+def test_normalizar_quita_los_literales():
+    sentencia = "SELECT * FROM estudiantes WHERE nombres = 'Juan' AND ci IN (?, ?, ?) AND id_estudiante > 10"
+    assert normalizar_sentencia(sentencia) == "SELECT * FROM estudiantes WHERE nombres = ? AND ci IN (?...) AND id_estudiante > ?"
+
+def test_registro_no_guarda_datos_personales(tmp_path, monkeypatch):
+    archivo = tmp_path / "consultas_lentas.jsonl"
+    monkeypatch.setattr(consultas_lentas, "CONSULTAS_LENTAS_UMBRAL_MS", 0.000001)
+    monkeypatch.setattr(consultas_lentas, "CONSULTAS_LENTAS_ARCHIVO", str(archivo))
+    monkeypatch.setattr(consultas_lentas, "_engine_explain", None)
+    monkeypatch.setattr(consultas_lentas, "_ultimo_explain", {})
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'lentas.db'}")
+    consultas_lentas.registrar_consultas_lentas(engine)
+    with engine.begin() as conexion:
+        conexion.execute(text("CREATE TABLE personas (id INTEGER PRIMARY KEY, ci TEXT, nombres TEXT)"))
+        conexion.execute(
+            text("INSERT INTO personas (id, ci, nombres) VALUES (:id, :ci, :nombres)"),
+            [{"id": 1, "ci": "1234567", "nombres": "Juan"}, {"id": 2, "ci": "7654321", "nombres": "Rosa"}]
+        )
+        conexion.execute(text("SELECT id FROM personas WHERE ci = :ci AND id > :id"), {"ci": "1234567", "id": 1})
+    esperar_pendientes()
+    engine.dispose()
+
+    contenido = archivo.read_text(encoding="utf-8")
+    for dato in ("1234567", "7654321", "Juan", "Rosa"):
+        assert dato not in contenido
+
+    # Parámetros del driver (posicionales en SQLite): los IDs se conservan
+    registros = {r["normalizada"].split()[0]: r for r in leer_registros(str(archivo))}
+    assert registros["INSERT"]["parametros"] == {"filas": 2, "primera": [1, "<texto:7>", "<texto:4>"]}
+    assert registros["SELECT"]["parametros"] == ["<texto:7>", 1]
+    assert registros["SELECT"]["plan"]
@@ -0,0 +1,143 @@
+"""
+Contadores de estudiantes por curso: cada camino de escritura los deja iguales
+a los conteos reales de estudiantes_cursos (detectar_desvios vacío)
+"""
+from io import BytesIO
+import pandas as pd
+from app.controllers.contador_curso_controller import ContadorCursoController
+from tests.datos import asignar, crear_curso, crear_estudiante
+
+def _contadores(client, id_curso: int) -> tuple:
+    curso = client.get(f"/api/cursos/{id_curso}").json()
+    return (curso["cantidad_estudiantes"], curso["cantidad_activos"],
+            curso["cantidad_abandonos"], curso["cantidad_retirados"])
+
+def _cambiar_estado(client, id_estudiante: int, estado: str) -> None:
+    respuesta = client.patch(f"/api/estudiantes/{id_estudiante}/estado", json={"estado_estudiante": estado})
+    assert respuesta.status_code == 200, respuesta.text
+
+def test_asignar_y_desasignar(client, db):
+    curso = crear_curso(client, "1ro A")
+    ana, luis, rosa = (crear_estudiante(client, nombre) for nombre in ("Ana", "Luis", "Rosa"))
+    _cambiar_estado(client, rosa, "Retirado")
+    for id_estudiante in (ana, luis, rosa):
+        asignar(client, id_estudiante, curso)
+
+    respuesta = client.request("DELETE", "/api/asignaciones/", json={"id_estudiante": luis, "id_curso": curso})
+    assert respuesta.status_code == 200, respuesta.text
+
+    assert _contadores(client, curso) == (2, 1, 0, 1)
+    assert ContadorCursoController.detectar_desvios(db) == []
+
+def test_lote(client, db):
+    curso_a, curso_b = crear_curso(client, "1ro A"), crear_curso(client, "1ro B")
+    ana, luis, rosa = (crear_estudiante(client, nombre) for nombre in ("Ana", "Luis", "Rosa"))
+    _cambiar_estado(client, luis, "Abandono")
+    asignar(client, ana, curso_a)
+    asignar(client, luis, curso_a)
+
+    respuesta = client.post("/api/asignaciones/lote", json={
+        "asignar": [{"id_estudiante": rosa, "id_curso": curso_b}],
+        "desasignar": [{"id_estudiante": ana, "id_curso": curso_a}],
+        "mover": [{"id_estudiante": luis, "id_curso_origen": curso_a, "id_curso_destino": curso_b}]
+    })
+    assert respuesta.status_code == 200, respuesta.text
+
+    assert _contadores(client, curso_a) == (0, 0, 0, 0)
+    assert _contadores(client, curso_b) == (2, 1, 1, 0)
+    assert ContadorCursoController.detectar_desvios(db) == []
+
+def test_cambio_de_estado(client, db):
+    curso_a, curso_b = crear_curso(client, "1ro A"), crear_curso(client, "Taller", nivel="secundaria")
+    ana = crear_estudiante(client, "Ana")
+    asignar(client, ana, curso_a)
+    asignar(client, ana, curso_b)
+
+    _cambiar_estado(client, ana, "Abandono")
+    _cambiar_estado(client, ana, "Retirado")
+
+    assert _contadores(client, curso_a) == _contadores(client, curso_b) == (1, 0, 0, 1)
+    assert ContadorCursoController.detectar_desvios(db) == []
+
+def test_eliminar_estudiante(client, db):
+    curso = crear_curso(client, "1ro A")
+    ana, luis = crear_estudiante(client, "Ana"), crear_estudiante(client, "Luis")
+    asignar(client, ana, curso)
+    asignar(client, luis, curso)
+
+    assert client.delete(f"/api/estudiantes/{ana}").status_code == 200
+
+    assert _contadores(client, curso) == (1, 1, 0, 0)
+    assert ContadorCursoController.detectar_desvios(db) == []
+
+def test_importacion_excel(client, db):
+    curso = crear_curso(client, "1ro A")
+    ana = crear_estudiante(client, "Ana", ci="1000")
+    luis = crear_estudiante(client, "Luis", ci="1001")
+    asignar(client, ana, curso)
+    asignar(client, luis, curso)
+
+    # La importación cambia el estado de estudiantes inscritos y crea otros
+    filas = [
+        {"CI": "1000", "Nombres": "Ana", "Apellido Paterno": "Pérez", "Apellido Materno": "García", "Estado": "Retirado"},
+        {"CI": "1001", "Nombres": "Luis", "Apellido Paterno": "Pérez", "Apellido Materno": "García", "Estado": "Abandono"},
+        {"CI": "2000", "Nombres": "Rosa", "Apellido Paterno": "Quispe", "Apellido Materno": "Mamani"}
+    ]
+    contenido = BytesIO()
+    pd.DataFrame(filas).to_excel(contenido, index=False)
+    respuesta = client.post(
+        "/api/excel/importar-estudiantes",
+        files={"file": ("estudiantes.xlsx", contenido.getvalue(),
+                        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")}
+    )
+    assert respuesta.status_code == 200, respuesta.text
+
+    assert _contadores(client, curso) == (2, 0, 1, 1)
+    assert ContadorCursoController.detectar_desvios(db) == []
+
+def test_inscripcion_masiva(client, db):
+    curso = crear_curso(client, "2do A", capacidad=2)
+    ids = [crear_estudiante(client, nombre) for nombre in ("Ana", "Luis", "Rosa")]
+    asignar(client, ids[0], curso)
+
+    # Ana ya estaba inscrita, Luis ocupa el último lugar y Rosa queda en espera
+    respuesta = client.post("/api/inscripcion-masiva/inscribir", json={"id_curso_destino": curso, "ids_estudiantes": ids})
+    assert respuesta.status_code == 201, respuesta.text
+    _cambiar_estado(client, ids[1], "Abandono")
+
+    assert _contadores(client, curso) == (2, 1, 1, 0)
+    assert ContadorCursoController.detectar_desvios(db) == []
+
+def test_promocion(client, db):
+    primero = crear_curso(client, "1ro A")
+    crear_curso(client, "2do A")
+    ana, luis = crear_estudiante(client, "Ana"), crear_estudiante(client, "Luis")
+    for id_estudiante in (ana, luis):
+        asignar(client, id_estudiante, primero)
+    _cambiar_estado(client, luis, "Abandono")
+
+    respuesta = client.post("/api/promocion/", json={"gestion_origen": "2025", "gestion_destino": "2026"})
+    assert respuesta.status_code == 202, respuesta.text
+    trabajo = client.get(f"/api/promocion/{respuesta.json()['id_trabajo']}").json()
+    assert trabajo["estado"] == "completado", trabajo
+
+    segundo = client.get("/api/cursos/", params={"gestion": "2026", "nivel": "primaria"}).json()
+    assert {c["nombre_curso"]: c["cantidad_estudiantes"] for c in segundo} == {"1ro A": 0, "2do A": 1}
+    assert _contadores(client, primero) == (2, 1, 1, 0)
+    assert ContadorCursoController.detectar_desvios(db) == []
+
+def test_archivar_y_restaurar(client, db):
+    curso = crear_curso(client, "1ro A", gestion="2020")
+    ana, luis = crear_estudiante(client, "Ana"), crear_estudiante(client, "Luis")
+    asignar(client, ana, curso)
+    asignar(client, luis, curso)
+
+    assert client.put("/api/gestiones/2020", json={"cerrada": True}).status_code == 200
+    assert client.post("/api/gestiones/2020/archivar").status_code == 200
+    # Cambios de estado mientras el curso está archivado (no tiene contadores vigentes)
+    _cambiar_estado(client, luis, "Retirado")
+    assert ContadorCursoController.detectar_desvios(db) == []
+
+    assert client.post("/api/gestiones/2020/restaurar").status_code == 200
+    assert _contadores(client, curso) == (2, 1, 0, 1)
+    assert ContadorCursoController.detectar_desvios(db) == []
@@ -0,0 +1,52 @@
+"""
+Pruebas del pool de procesos de Excel (app/config/executor.py)
+"""
+import time
+import pytest
+from fastapi import HTTPException
+from app.config import executor
+from tests import tareas_pool
+
+@pytest.fixture
+def pool(monkeypatch):
+    """Pool real con un proceso (las demás pruebas ejecutan las tareas en el mismo proceso)"""
+    executor.cerrar_pool()
+    monkeypatch.setattr(executor, "EXCEL_WORKERS", 1)
+    yield
+    executor.cerrar_pool()
+
+def _esperar_cupos_libres(limite: float = 10.0) -> None:
+    fin = time.monotonic() + limite
+    while executor.tareas_en_curso() and time.monotonic() < fin:
+        time.sleep(0.05)
+
+def test_timeout_responde_504_y_conserva_el_cupo(pool, monkeypatch):
+    assert executor.ejecutar_en_pool(tareas_pool.duplicar, 2) == 4
+    monkeypatch.setattr(executor, "EXCEL_TIMEOUT", 0.2)
+
+    with pytest.raises(HTTPException) as error:
+        executor.ejecutar_en_pool(tareas_pool.dormir, 1.0)
+    assert error.value.status_code == 504
+
+    # La tarea vencida sigue ocupando el proceso: su cupo no se devuelve todavía
+    assert executor.tareas_en_curso() == 1
+    _esperar_cupos_libres()
+    assert executor.tareas_en_curso() == 0
+
+def test_proceso_caido_responde_503_y_el_pool_se_recrea(pool):
+    with pytest.raises(HTTPException) as error:
+        executor.ejecutar_en_pool(tareas_pool.terminar_proceso)
+    assert error.value.status_code == 503
+
+    # La siguiente tarea crea un pool nuevo en lugar de fallar con BrokenProcessPool
+    assert executor.ejecutar_en_pool(tareas_pool.duplicar, 21) == 42
+    _esperar_cupos_libres()
+    assert executor.tareas_en_curso() == 0
+
+def test_cola_llena_responde_503(monkeypatch):
+    monkeypatch.setattr(executor, "_cupos", executor.threading.BoundedSemaphore(1))
+    executor._cupos.acquire()
+    with pytest.raises(HTTPException) as error:
+        executor.ejecutar_en_pool(tareas_pool.duplicar, 1)
+    assert error.value.status_code == 503
+    executor._cupos.release()
@@ -0,0 +1,36 @@
+"""
+Pruebas del catálogo de gestiones
+"""
+from sqlalchemy import delete, select
+from app.config.database import SessionLocal
+from app.controllers.gestion_controller import GestionController
+from app.models.gestion_model import Gestion
+from tests.datos import crear_curso
+
+def test_registrar_ignora_gestiones_insertadas_por_otra_transaccion(db):
+    # Otra petición registra la gestión entre el SELECT de registrar y su INSERT
+    with SessionLocal() as otra:
+        otra.add(Gestion(gestion="2030"))
+        otra.commit()
+
+    GestionController._insertar_si_faltan(db, ["2030", "2031"])
+    db.commit()
+    assert db.execute(select(Gestion.gestion).order_by(Gestion.gestion)).scalars().all() == ["2030", "2031"]
+
+def test_catalogo_vacio_se_completa_con_los_cursos(client, db):
+    crear_curso(client, "1ro A", gestion="2024")
+    crear_curso(client, "2do A", gestion="2025")
+
+    # Base actualizada sin `manage.py crear-tablas`: cursos sin catálogo
+    db.execute(delete(Gestion))
+    db.commit()
+
+    respuesta = client.get("/api/gestiones/actual")
+    assert respuesta.status_code == 200
+    assert respuesta.json()["gestion"] == "2025"
+    assert [g["gestion"] for g in client.get("/api/gestiones").json()] == ["2025", "2024"]
+
+def test_catalogo_vacio_sin_cursos(client):
+    respuesta = client.get("/api/gestiones/actual")
+    assert respuesta.status_code == 200
+    assert respuesta.json()["gestion"] is None
@@ -0,0 +1,86 @@
+"""
+Pruebas del índice estudiantes_gestiones: cada escritura sobre estudiantes_cursos
+lo deja igual a las gestiones reales de las inscripciones
+"""
+from sqlalchemy import select
+from app.models.curso_model import Curso
+from app.models.estudiante_model import estudiantes_cursos
+from app.models.estudiante_gestion_model import estudiantes_gestiones
+from tests.datos import asignar, crear_curso, crear_estudiante
+
+def _indice(db) -> set:
+    """Pares (id_estudiante, gestion) del índice, comprobando que coincidan con las inscripciones"""
+    indice = set(db.execute(select(estudiantes_gestiones.c.id_estudiante, estudiantes_gestiones.c.gestion)).all())
+    reales = set(db.execute(
+        select(estudiantes_cursos.c.id_estudiante, Curso.gestion)
+        .join(Curso, Curso.id_curso == estudiantes_cursos.c.id_curso)
+        .distinct()
+    ).all())
+    assert indice == reales
+    return indice
+
+def _desasignar(client, id_estudiante: int, id_curso: int) -> None:
+    respuesta = client.request("DELETE", "/api/asignaciones/", json={"id_estudiante": id_estudiante, "id_curso": id_curso})
+    assert respuesta.status_code == 200, respuesta.text
+
+def test_asignar_y_desasignar(client, db):
+    curso_a, curso_b = crear_curso(client, "1ro A"), crear_curso(client, "Taller", nivel="secundaria")
+    curso_c = crear_curso(client, "2do A", gestion="2026")
+    ana, luis = crear_estudiante(client, "Ana"), crear_estudiante(client, "Luis")
+    asignar(client, ana, curso_a)
+    asignar(client, ana, curso_b)
+    asignar(client, luis, curso_c)
+    assert _indice(db) == {(ana, "2025"), (luis, "2026")}
+
+    # Ana sigue en otro curso de 2025: la gestión se conserva hasta quitar el último
+    _desasignar(client, ana, curso_a)
+    assert _indice(db) == {(ana, "2025"), (luis, "2026")}
+    _desasignar(client, ana, curso_b)
+    assert _indice(db) == {(luis, "2026")}
+
+def test_lote(client, db):
+    curso_a, curso_c = crear_curso(client, "1ro A"), crear_curso(client, "2do A", gestion="2026")
+    ana, luis, rosa = (crear_estudiante(client, nombre) for nombre in ("Ana", "Luis", "Rosa"))
+    asignar(client, luis, curso_c)
+    asignar(client, rosa, curso_a)
+
+    respuesta = client.post("/api/asignaciones/lote", json={
+        "asignar": [{"id_estudiante": ana, "id_curso": curso_c}],
+        "desasignar": [{"id_estudiante": rosa, "id_curso": curso_a}],
+        "mover": [{"id_estudiante": luis, "id_curso_origen": curso_c, "id_curso_destino": curso_a}]
+    })
+    assert respuesta.status_code == 200, respuesta.text
+    assert _indice(db) == {(ana, "2026"), (luis, "2025")}
+
+def test_eliminar_estudiante_y_curso(client, db):
+    curso_a, curso_c = crear_curso(client, "1ro A"), crear_curso(client, "2do A", gestion="2026")
+    ana, luis = crear_estudiante(client, "Ana"), crear_estudiante(client, "Luis")
+    for id_estudiante in (ana, luis):
+        asignar(client, id_estudiante, curso_a)
+    asignar(client, luis, curso_c)
+
+    assert client.delete(f"/api/estudiantes/{ana}").status_code == 200
+    assert _indice(db) == {(luis, "2025"), (luis, "2026")}
+
+    assert client.delete(f"/api/cursos/{curso_c}").status_code == 200
+    assert _indice(db) == {(luis, "2025")}
+
+def test_ya_inscrito_lee_el_indice(client, db):
+    origen = crear_curso(client, "1ro A")
+    destino = crear_curso(client, "2do A", gestion="2026")
+    ana, luis = crear_estudiante(client, "Ana"), crear_estudiante(client, "Luis")
+    for id_estudiante in (ana, luis):
+        asignar(client, id_estudiante, origen)
+    asignar(client, ana, destino)
+
+    def ya_inscritos() -> dict:
+        respuesta = client.get(f"/api/inscripcion-masiva/estudiantes/{origen}", params={"gestion_destino": "2026"})
+        assert respuesta.status_code == 200, respuesta.text
+        return {e["id_estudiante"]: e["ya_inscrito"] for e in respuesta.json()}
+
+    assert ya_inscritos() == {ana: True, luis: False}
+
+    # Al salir del único curso de 2026, Ana deja de figurar como inscrita
+    _desasignar(client, ana, destino)
+    assert ya_inscritos() == {ana: False, luis: False}
+    assert _indice(db) == {(ana, "2025"), (luis, "2025")}
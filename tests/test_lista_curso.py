@@ -0,0 +1,68 @@
+"""
+Pruebas de la lista paginada de estudiantes de un curso (GET /api/asignaciones/curso/{id})
+"""
+import pytest
+from app.controllers.estudiante_curso_controller import EstudianteCursoController
+from tests.datos import asignar, crear_curso, crear_estudiante
+
+def _recorrer(client, id_curso: int, limit: int, **parametros) -> list:
+    """IDs de todas las páginas, siguiendo siguiente_cursor hasta el final"""
+    ids, cursor = [], None
+    while True:
+        pagina = {"limit": limit, **parametros, **({"cursor": cursor} if cursor else {})}
+        respuesta = client.get(f"/api/asignaciones/curso/{id_curso}", params=pagina)
+        assert respuesta.status_code == 200, respuesta.text
+        datos = respuesta.json()
+        assert len(datos["estudiantes"]) <= limit
+        ids += [e["id_estudiante"] for e in datos["estudiantes"]]
+        cursor = datos["siguiente_cursor"]
+        if cursor is None:
+            return ids
+
+def _curso_con_empates(client, gestion: str = "2025") -> tuple:
+    """Curso con 7 estudiantes, varios con apellidos y nombres idénticos"""
+    id_curso = crear_curso(client, "1ro A", gestion=gestion)
+    apellidos = ["Quispe", "Arce", "Quispe", "Quispe", "Mamani", "Arce", "Quispe"]
+    ids = []
+    for apellido in apellidos:
+        ids.append(crear_estudiante(client, "Ana", apellido_paterno=apellido))
+        asignar(client, ids[-1], id_curso)
+    return id_curso, ids
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 7, 10])
+@pytest.mark.parametrize("descendente", [False, True])
+def test_paginas_sin_duplicados_ni_huecos_con_empates(client, limit, descendente):
+    id_curso, _ = _curso_con_empates(client)
+
+    completa = client.get(f"/api/asignaciones/curso/{id_curso}", params={"descendente": descendente}).json()
+    esperados = [e["id_estudiante"] for e in completa["estudiantes"]]
+    assert completa["siguiente_cursor"] is None
+
+    # Mismo orden que sin paginar: sin repetidos y sin saltos entre páginas
+    assert _recorrer(client, id_curso, limit, descendente=descendente) == esperados
+
+def test_orden_por_apellidos_desempata_por_id(client):
+    id_curso, ids = _curso_con_empates(client)
+    arce = [ids[1], ids[5]]
+    quispe = [ids[0], ids[2], ids[3], ids[6]]
+    assert _recorrer(client, id_curso, 2) == arce + [ids[4]] + quispe
+    assert _recorrer(client, id_curso, 3, orden="id") == sorted(ids)
+
+def test_paginas_de_un_curso_archivado(client):
+    id_curso, _ = _curso_con_empates(client, gestion="2020")
+    esperados = _recorrer(client, id_curso, 100)
+
+    assert client.put("/api/gestiones/2020", json={"cerrada": True}).status_code == 200
+    assert client.post("/api/gestiones/2020/archivar").status_code == 200
+
+    assert _recorrer(client, id_curso, 100) == esperados
+    assert _recorrer(client, id_curso, 2) == esperados
+    assert _recorrer(client, id_curso, 3, descendente=True) == esperados[::-1]
+
+def test_no_modifica_los_campos_recibidos(client, db):
+    id_curso, _ = _curso_con_empates(client)
+    campos = ["nombres"]
+
+    pagina = EstudianteCursoController.obtener_estudiantes_de_curso(db, id_curso, limit=2, campos=campos)
+    assert campos == ["nombres"]
+    assert set(pagina["estudiantes"][0]) == {"id_estudiante", "nombres"}
@@ -0,0 +1,108 @@
+"""
+Pruebas de las asignaciones en lote (POST /api/asignaciones/lote)
+"""
+from sqlalchemy import insert
+from app.controllers.contador_curso_controller import ContadorCursoController
+from app.models.estudiante_model import estudiantes_cursos
+from tests.datos import asignar, crear_curso, crear_estudiante
+
+def _lote(client, **operaciones) -> dict:
+    respuesta = client.post("/api/asignaciones/lote", json=operaciones)
+    assert respuesta.status_code == 200, respuesta.text
+    return respuesta.json()
+
+def test_lote_respeta_la_capacidad(client, db):
+    lleno = crear_curso(client, "1ro A", capacidad=1)
+    ids = [crear_estudiante(client, nombre) for nombre in ("Ana", "Luis", "Rosa")]
+
+    respuesta = _lote(client, asignar=[{"id_estudiante": e, "id_curso": lleno} for e in ids])
+    assert [r["resultado"] for r in respuesta["resultados"]] == ["aplicado", "lista_espera", "lista_espera"]
+    assert respuesta["aplicadas"] == 1
+
+    curso = client.get(f"/api/cursos/{lleno}").json()
+    assert curso["cantidad_estudiantes"] == 1
+    espera = client.get(f"/api/asignaciones/curso/{lleno}/lista-espera").json()
+    assert [e["id_estudiante"] for e in espera["estudiantes"]] == ids[1:]
+    assert ContadorCursoController.detectar_desvios(db) == []
+
+def test_lote_mover_a_un_curso_lleno_no_se_aplica(client, db):
+    origen = crear_curso(client, "1ro A")
+    destino = crear_curso(client, "1ro B", capacidad=1)
+    ana, luis = crear_estudiante(client, "Ana"), crear_estudiante(client, "Luis")
+    asignar(client, ana, destino)
+    asignar(client, luis, origen)
+
+    respuesta = _lote(client, mover=[{"id_estudiante": luis, "id_curso_origen": origen, "id_curso_destino": destino}])
+    assert respuesta["resultados"][0]["resultado"] == "sin_cupo"
+    assert client.get(f"/api/cursos/{origen}").json()["cantidad_estudiantes"] == 1
+
+    # Una desasignación del mismo lote libera el lugar para el cambio de curso
+    respuesta = _lote(
+        client,
+        desasignar=[{"id_estudiante": ana, "id_curso": destino}],
+        mover=[{"id_estudiante": luis, "id_curso_origen": origen, "id_curso_destino": destino}]
+    )
+    assert [r["resultado"] for r in respuesta["resultados"]] == ["aplicado", "aplicado"]
+    assert client.get(f"/api/cursos/{origen}").json()["cantidad_estudiantes"] == 0
+    assert client.get(f"/api/cursos/{destino}").json()["cantidad_estudiantes"] == 1
+    assert ContadorCursoController.detectar_desvios(db) == []
+
+def test_lote_informa_el_resultado_de_cada_operacion(client, db):
+    curso_a, curso_b = crear_curso(client, "1ro A"), crear_curso(client, "1ro B")
+    ana, luis, rosa = (crear_estudiante(client, nombre) for nombre in ("Ana", "Luis", "Rosa"))
+    asignar(client, ana, curso_a)
+    asignar(client, luis, curso_a)
+
+    respuesta = _lote(
+        client,
+        asignar=[
+            {"id_estudiante": rosa, "id_curso": curso_a},
+            {"id_estudiante": ana, "id_curso": curso_b},
+            {"id_estudiante": 999, "id_curso": curso_a},
+            {"id_estudiante": rosa, "id_curso": 999}
+        ],
+        desasignar=[
+            {"id_estudiante": luis, "id_curso": curso_a},
+            {"id_estudiante": rosa, "id_curso": curso_b}
+        ],
+        mover=[{"id_estudiante": ana, "id_curso_origen": curso_a, "id_curso_destino": curso_b}]
+    )
+    assert [(r["operacion"], r["resultado"]) for r in respuesta["resultados"]] == [
+        ("desasignar", "aplicado"),
+        ("desasignar", "no_asignado"),
+        ("mover", "aplicado"),
+        ("asignar", "aplicado"),
+        ("asignar", "ya_asignado"),
+        ("asignar", "estudiante_no_encontrado"),
+        ("asignar", "curso_no_encontrado")
+    ]
+    assert (respuesta["aplicadas"], respuesta["omitidas"]) == (3, 4)
+
+    roster = client.get(f"/api/asignaciones/curso/{curso_a}", params={"orden": "id"}).json()
+    assert [e["id_estudiante"] for e in roster["estudiantes"]] == [rosa]
+    roster = client.get(f"/api/asignaciones/curso/{curso_b}", params={"orden": "id"}).json()
+    assert [e["id_estudiante"] for e in roster["estudiantes"]] == [ana]
+    assert ContadorCursoController.detectar_desvios(db) == []
+
+def test_lote_vacio_responde_400(client):
+    respuesta = client.post("/api/asignaciones/lote", json={})
+    assert respuesta.status_code == 400
+
+def test_lote_con_insercion_concurrente_responde_409(client, db, monkeypatch):
+    curso = crear_curso(client, "1ro A")
+    ana = crear_estudiante(client, "Ana")
+    reservar = ContadorCursoController.reservar
+
+    def reservar_con_insercion_concurrente(sesion, id_curso, estado, cantidad):
+        # Otra petición asigna el mismo par entre la lectura del lote y su INSERT
+        sesion.execute(insert(estudiantes_cursos).values(id_estudiante=ana, id_curso=id_curso))
+        return reservar(sesion, id_curso, estado, cantidad)
+
+    monkeypatch.setattr(ContadorCursoController, "reservar", staticmethod(reservar_con_insercion_concurrente))
+    respuesta = client.post("/api/asignaciones/lote", json={"asignar": [{"id_estudiante": ana, "id_curso": curso}]})
+    assert respuesta.status_code == 409
+    monkeypatch.undo()
+
+    # El lote se revirtió completo: ni la inscripción ni el lugar reservado quedaron
+    assert client.get(f"/api/cursos/{curso}").json()["cantidad_estudiantes"] == 0
+    assert ContadorCursoController.detectar_desvios(db) == []
@@ -0,0 +1,44 @@
+"""
+Pruebas del endpoint de métricas Prometheus (GET /metrics)
+"""
+from prometheus_client.parser import text_string_to_metric_families
+from tests.datos import crear_curso
+
+def _muestras(client) -> dict:
+    """Muestras de /metrics: (nombre, etiquetas ordenadas) -> valor"""
+    respuesta = client.get("/metrics")
+    assert respuesta.status_code == 200
+    return {
+        (muestra.name, tuple(sorted(muestra.labels.items()))): muestra.value
+        for familia in text_string_to_metric_families(respuesta.text)
+        for muestra in familia.samples
+    }
+
+def _valor(muestras: dict, nombre: str, **etiquetas) -> float:
+    return muestras.get((nombre, tuple(sorted(etiquetas.items()))), 0.0)
+
+def test_formato_de_exposicion(client):
+    respuesta = client.get("/metrics")
+    assert respuesta.headers["content-type"].startswith("text/plain; version=0.0.4")
+    nombres = {familia.name for familia in text_string_to_metric_families(respuesta.text)}
+    assert {"http_peticiones", "db_pool_tamano", "db_pool_conexiones_en_uso", "proceso_memoria_rss_bytes"} <= nombres
+
+def test_peticiones_por_ruta_y_aciertos_de_cache(client):
+    id_curso = crear_curso(client, "1ro A")
+    antes = _muestras(client)
+    client.get(f"/api/cursos/{id_curso}")
+    client.get("/api/cursos/999")
+    client.get("/api/estadisticas")
+    client.get("/api/estadisticas")
+    despues = _muestras(client)
+
+    def delta(nombre: str, **etiquetas) -> float:
+        return _valor(despues, nombre, **etiquetas) - _valor(antes, nombre, **etiquetas)
+
+    # La ruta se agrupa por su plantilla, no por el ID pedido
+    ruta = "/api/cursos/{id_curso}"
+    assert delta("http_peticiones_total", metodo="GET", ruta=ruta, status="200") == 1
+    assert delta("http_peticiones_total", metodo="GET", ruta=ruta, status="404") == 1
+    assert delta("http_peticion_duracion_segundos_count", metodo="GET", ruta=ruta) == 2
+    assert delta("cache_consultas_total", cache="estadisticas", resultado="fallo") == 1
+    assert delta("cache_consultas_total", cache="estadisticas", resultado="acierto") == 1
@@ -0,0 +1,49 @@
+"""
+Pruebas del perfilado bajo demanda (PerfiladoMiddleware)
+"""
+import os
+import json
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.config import perfilado
+from app.middlewares import perfilado_middleware
+from app.middlewares.perfilado_middleware import PerfiladoMiddleware
+
+@pytest.fixture
+def perfiles(tmp_path, monkeypatch):
+    """Cliente de la aplicación con el perfilado habilitado y el token 'secreto'"""
+    monkeypatch.setattr(perfilado_middleware, "PERFILADO_TOKEN", "secreto")
+    monkeypatch.setattr(perfilado_middleware, "PERFILADO_DIRECTORIO", str(tmp_path))
+    monkeypatch.setattr(perfilado, "PERFILADO_DIRECTORIO", str(tmp_path))
+    with TestClient(PerfiladoMiddleware(app)) as cliente:
+        yield cliente, tmp_path
+
+@pytest.mark.parametrize("token", ["otro", "secret", "secreto2", ""])
+def test_token_incorrecto_no_perfila(perfiles, token):
+    cliente, directorio = perfiles
+    for respuesta in (
+        cliente.get("/api/cursos/", headers={"X-Perfilar": token}),
+        cliente.get("/api/cursos/", params={"perfilar": token})
+    ):
+        assert respuesta.status_code == 200
+        assert "X-Perfil" not in respuesta.headers
+    assert list(directorio.iterdir()) == []
+
+def test_sin_token_configurado_no_perfila(perfiles, monkeypatch):
+    cliente, directorio = perfiles
+    monkeypatch.setattr(perfilado_middleware, "PERFILADO_TOKEN", "")
+    respuesta = cliente.get("/api/cursos/", headers={"X-Perfilar": ""})
+    assert "X-Perfil" not in respuesta.headers
+    assert list(directorio.iterdir()) == []
+
+def test_token_correcto_guarda_el_perfil(perfiles):
+    cliente, directorio = perfiles
+    respuesta = cliente.get("/api/cursos/", headers={"X-Perfilar": "secreto"})
+    assert respuesta.status_code == 200
+    base = respuesta.headers["X-Perfil"]
+    assert os.path.dirname(base) == str(directorio)
+
+    resumen = json.loads(open(base + ".json", encoding="utf-8").read())
+    assert (resumen["metodo"], resumen["ruta"], resumen["status"]) == ("GET", "/api/cursos/", 200)
+    assert os.path.exists(base + ".folded")
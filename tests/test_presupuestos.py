@@ -0,0 +1,104 @@
+"""
+Presupuestos de consultas de los métodos decorados con presupuesto_consultas
+Cada prueba ejecuta el método dentro de un bloque con el presupuesto que declara:
+el bloque falla si el método lo excede o repite una consulta por fila (N+1).
+"""
+import logging
+from io import BytesIO
+import pytest
+from fastapi import UploadFile
+from sqlalchemy import text
+from app.config import consultas
+from app.config.consultas import presupuesto_consultas, PresupuestoConsultasExcedido
+from app.controllers.excel_controller import ExcelController
+from app.controllers.inscripcion_masiva_controller import InscripcionMasivaController
+from app.models.estudiante_model import Estudiante
+from tests.datos import crear_estudiante, crear_curso, asignar
+
+def _libro(filas: list) -> UploadFile:
+    """Archivo Excel de importación con las filas dadas"""
+    import pandas as pd
+
+    contenido = BytesIO()
+    pd.DataFrame(filas).to_excel(contenido, index=False)
+    return UploadFile(file=BytesIO(contenido.getvalue()), filename="estudiantes.xlsx")
+
+def _fila(ci, nombres, **campos) -> dict:
+    return {"CI": ci, "Nombres": nombres, "Apellido Paterno": "Quispe", "Apellido Materno": "Mamani", **campos}
+
+def test_importar_estudiantes_cumple_su_presupuesto(client, db):
+    curso = crear_curso(client, "1ro A")
+    existentes = [crear_estudiante(client, f"Existente {i}", ci=str(1000 + i)) for i in range(10)]
+    for id_estudiante in existentes[:3]:
+        asignar(client, id_estudiante, curso)
+
+    filas = [_fila(str(1000 + i), f"Actualizado {i}") for i in range(10)]
+    filas[0]["Estado"] = "Retirado"
+    filas += [_fila(str(2000 + i), f"Nuevo {i}") for i in range(20)]
+    filas.append(_fila("2000", None, **{"Dirección": "Calle Sucre"}))  # CI repetido en el archivo
+    filas.append(_fila(None, "Sin CI"))
+    filas.append(_fila("3000", None))  # estudiante nuevo sin nombres
+
+    metodo = ExcelController.importar_estudiantes
+    with presupuesto_consultas(metodo.presupuesto_consultas) as contador:
+        resultado = metodo(db, _libro(filas))
+    assert contador.total <= metodo.presupuesto_consultas
+
+    assert resultado["estudiantes_creados"] == 21
+    assert resultado["estudiantes_actualizados"] == 11
+    assert resultado["errores"] == ["Fila 34: faltan nombres"]
+
+    db.expire_all()
+    actualizado = db.get(Estudiante, existentes[0])
+    assert (actualizado.nombres, actualizado.estado_estudiante, actualizado.version) == ("Actualizado 0", "Retirado", 2)
+    assert actualizado.apellido_paterno == "Quispe"
+    repetido = db.query(Estudiante).filter(Estudiante.ci == "2000").one()
+    assert (repetido.nombres, repetido.direccion, repetido.estado_estudiante) == ("Nuevo 0", "Calle Sucre", "Activo")
+
+    # El cambio de estado se refleja en los contadores del curso
+    contadores = db.execute(
+        text("SELECT cantidad_activos, cantidad_retirados FROM cursos WHERE id_curso = :id"), {"id": curso}
+    ).one()
+    assert tuple(contadores) == (2, 1)
+
+def test_importar_estudiantes_no_depende_de_la_cantidad_de_filas(client, db):
+    metodo = ExcelController.importar_estudiantes
+    totales = []
+    for desde, cantidad in ((100, 5), (200, 60)):
+        for i in range(cantidad // 2):
+            crear_estudiante(client, f"E{desde + i}", ci=str(desde + i))
+        with presupuesto_consultas(metodo.presupuesto_consultas) as contador:
+            metodo(db, _libro([_fila(str(desde + i), f"N{i}", Estado="Abandono") for i in range(cantidad)]))
+        totales.append(contador.total)
+    assert totales[0] == totales[1]
+
+def test_inscripcion_masiva_cumple_su_presupuesto(client, db):
+    curso = crear_curso(client, "2do A", capacidad=8)
+    ids = [crear_estudiante(client, f"Estudiante {i}") for i in range(12)]
+    asignar(client, ids[0], curso)
+
+    metodo = InscripcionMasivaController.inscribir_estudiantes_masivamente
+    with presupuesto_consultas(metodo.presupuesto_consultas):
+        resultado = metodo(db, curso, ids)
+
+    assert resultado["estudiantes_ya_inscritos"] == 1
+    assert resultado["estudiantes_inscritos"] == 7
+    assert resultado["estudiantes_en_lista_espera"] == 4
+
+def test_bloque_detecta_n_mas_1(db):
+    with pytest.raises(PresupuestoConsultasExcedido, match="N\\+1"):
+        with presupuesto_consultas(None):
+            for id_estudiante in range(10):
+                db.get(Estudiante, id_estudiante)
+
+def test_metodo_decorado_solo_advierte(db, monkeypatch, caplog):
+    # El método ya confirmó su transacción cuando se controla el presupuesto: no debe fallar
+    monkeypatch.setattr(consultas, "CONSULTAS_MODO", "advertir")
+
+    @presupuesto_consultas(0)
+    def contar(sesion):
+        return sesion.execute(text("SELECT COUNT(*) FROM estudiantes")).scalar()
+
+    with caplog.at_level(logging.WARNING, logger="app.consultas"):
+        assert contar(db) == 0
+    assert "presupuesto: 0" in caplog.text
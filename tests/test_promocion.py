@@ -0,0 +1,154 @@
+"""
+Pruebas de la promoción de gestión en segundo plano
+"""
+from datetime import datetime, timedelta
+from app.config.database import SessionLocal
+from app.controllers.contador_curso_controller import ContadorCursoController
+from app.controllers.promocion_controller import PromocionController
+from app.models.trabajo_promocion_model import TrabajoPromocion
+from tests.datos import crear_estudiante, crear_curso, asignar
+
+def _promover(client, **campos) -> dict:
+    datos = {"gestion_origen": "2025", "gestion_destino": "2026", **campos}
+    respuesta = client.post("/api/promocion/", json=datos)
+    assert respuesta.status_code == 202, respuesta.text
+    return respuesta.json()
+
+def test_estado_del_trabajo_se_lee_de_la_base(client):
+    primero = crear_curso(client, "1ro A")
+    crear_curso(client, "2do A")
+    for nombre in ("Ana", "Luis"):
+        asignar(client, crear_estudiante(client, nombre), primero)
+
+    trabajo = _promover(client)
+    assert trabajo["estado"] == "pendiente"
+
+    respuesta = client.get(f"/api/promocion/{trabajo['id_trabajo']}")
+    assert respuesta.status_code == 200
+    estado = respuesta.json()
+    assert estado["estado"] == "completado"
+    assert estado["porcentaje"] == 100.0
+    assert estado["estudiantes_inscritos"] == 2
+    assert estado["cursos_creados"] == 2
+
+    # Otro worker no comparte memoria con el que ejecutó el trabajo: solo la base
+    otra_sesion = SessionLocal()
+    try:
+        assert PromocionController.obtener_trabajo(otra_sesion, trabajo["id_trabajo"]) == estado
+    finally:
+        otra_sesion.close()
+
+def test_promocion_respeta_la_capacidad_del_destino(client, db):
+    # Dos paralelos pasan al mismo curso destino, que ya tiene un inscrito y 3 lugares
+    cursos = {nombre: crear_curso(client, nombre) for nombre in ("1ro A", "1ro B")}
+    destino = crear_curso(client, "2do A", gestion="2026", capacidad=3)
+    asignar(client, crear_estudiante(client, "Previo"), destino)
+    estudiantes = []
+    for nombre, apellido in (("Ana", "Arce"), ("Luis", "Baca"), ("Rosa", "Cruz"), ("Juan", "Díaz")):
+        estudiantes.append(crear_estudiante(client, nombre, apellido_paterno=apellido))
+        asignar(client, estudiantes[-1], cursos["1ro A" if len(estudiantes) % 2 else "1ro B"])
+
+    mapeo = [
+        {"id_curso_origen": id_curso, "nombre_curso_destino": "2do A", "nivel_destino": "primaria"}
+        for id_curso in cursos.values()
+    ]
+    trabajo = _promover(client, modo_mapeo="explicito", mapeo=mapeo)
+    estado = client.get(f"/api/promocion/{trabajo['id_trabajo']}").json()
+    assert estado["estado"] == "completado", estado
+    assert (estado["estudiantes_inscritos"], estado["estudiantes_en_lista_espera"]) == (2, 2)
+    assert "lista de espera" in estado["mensaje"]
+
+    assert client.get(f"/api/cursos/{destino}").json()["cantidad_estudiantes"] == 3
+    # Los lugares se ocupan curso por curso: 1ro A entra completo y 1ro B queda en espera
+    espera = client.get(f"/api/asignaciones/curso/{destino}/lista-espera").json()
+    assert [e["id_estudiante"] for e in espera["estudiantes"]] == [estudiantes[1], estudiantes[3]]
+    assert ContadorCursoController.detectar_desvios(db) == []
+
+def test_trabajo_inexistente(client):
+    respuesta = client.get("/api/promocion/no-existe")
+    assert respuesta.status_code == 404
+
+def test_depura_terminados_y_marca_huerfanos(client, db):
+    crear_curso(client, "1ro A")
+    viejo = datetime.now() - timedelta(days=3)
+    db.add_all([
+        TrabajoPromocion(id_trabajo="terminado", estado="completado", gestion_origen="2023", gestion_destino="2024",
+                         cursos_sin_destino=[], fecha_creacion=viejo, fecha_actualizacion=viejo),
+        TrabajoPromocion(id_trabajo="huerfano", estado="en_proceso", gestion_origen="2024", gestion_destino="2025",
+                         cursos_sin_destino=[], fecha_creacion=viejo, fecha_actualizacion=viejo),
+    ])
+    db.commit()
+
+    # Un trabajo colgado se informa como fallido al consultarlo
+    estado = client.get("/api/promocion/huerfano").json()
+    assert estado["estado"] == "error"
+    assert "se detuvo" in estado["error"]
+
+    # Registrar un trabajo nuevo depura los terminados hace más de la retención
+    _promover(client)
+    assert client.get("/api/promocion/terminado").status_code == 404
+    assert client.get("/api/promocion/huerfano").status_code == 200
+
+def _destinos(client, gestion: str = "2026") -> dict:
+    """Nombre del curso de cada estudiante en la gestión dada"""
+    cursos = client.get("/api/cursos/", params={"gestion": gestion}).json()
+    return {
+        estudiante["id_estudiante"]: curso["nombre_curso"]
+        for curso in cursos
+        for estudiante in curso.get("estudiantes", [])
+    }
+
+def test_orden_nivel_con_paralelos_desiguales(client):
+    # 1ro tiene dos paralelos y 2do y 3ro tres: avanzar posiciones en la lista ordenada
+    # por nombre (salto = paralelos) mandaba a los de 2do C a 3ro B
+    nombres = ("1ro A", "1ro B", "2do A", "2do B", "2do C", "3ro A", "3ro B", "3ro C")
+    cursos = {nombre: crear_curso(client, nombre) for nombre in nombres}
+    estudiantes = {}
+    for nombre in ("1ro B", "2do A", "2do C", "3ro A"):
+        estudiantes[nombre] = crear_estudiante(client, nombre)
+        asignar(client, estudiantes[nombre], cursos[nombre])
+
+    trabajo = _promover(client)
+    assert client.get(f"/api/promocion/{trabajo['id_trabajo']}").json()["estado"] == "completado"
+
+    destinos = _destinos(client)
+    assert destinos[estudiantes["1ro B"]] == "2do B"
+    assert destinos[estudiantes["2do A"]] == "3ro A"
+    assert destinos[estudiantes["2do C"]] == "3ro C"
+    assert estudiantes["3ro A"] not in destinos
+
+def test_orden_nivel_cruza_de_primaria_a_secundaria(client):
+    sexto = crear_curso(client, "6to A", nivel="primaria")
+    crear_curso(client, "5to A", nivel="primaria")
+    crear_curso(client, "1ro A", nivel="secundaria")
+    id_estudiante = crear_estudiante(client, "Ana")
+    asignar(client, id_estudiante, sexto)
+
+    _promover(client)
+    assert _destinos(client)[id_estudiante] == "1ro A"
+
+def test_orden_nivel_orden_numerico_de_grados(client):
+    # Alfabéticamente "10mo" queda antes que "9no"
+    noveno = crear_curso(client, "9no A", nivel="secundaria")
+    crear_curso(client, "10mo A", nivel="secundaria")
+    id_estudiante = crear_estudiante(client, "Ana")
+    asignar(client, id_estudiante, noveno)
+
+    _promover(client)
+    assert _destinos(client)[id_estudiante] == "10mo A"
+
+def test_orden_nivel_rechaza_paralelo_sin_destino(client):
+    for nombre in ("1ro A", "1ro B", "1ro C", "2do A", "2do B"):
+        crear_curso(client, nombre)
+
+    respuesta = client.post("/api/promocion/", json={"gestion_origen": "2025", "gestion_destino": "2026"})
+    assert respuesta.status_code == 400
+    assert "1ro C" in respuesta.json()["detail"]
+
+def test_orden_nivel_rechaza_grados_sin_numero(client):
+    for nombre in ("Prekinder A", "Kinder A"):
+        crear_curso(client, nombre, nivel="inicial")
+
+    respuesta = client.post("/api/promocion/", json={"gestion_origen": "2025", "gestion_destino": "2026"})
+    assert respuesta.status_code == 400
+    assert "explicito" in respuesta.json()["detail"]
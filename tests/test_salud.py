@@ -0,0 +1,27 @@
+"""
+Pruebas de los endpoints de vida y preparación
+"""
+from app.config import salud
+from app.config import cache as modulo_cache
+from app.config.cache import CacheResultados
+
+def test_preparacion_incluye_las_caches(client):
+    salud.estado_preparacion(forzar=True)
+    respuesta = client.get("/health/ready")
+    assert respuesta.status_code == 200
+    verificaciones = respuesta.json()["verificaciones"]
+    assert set(verificaciones) == {"base_de_datos", "pool_conexiones", "excel", "caches"}
+    assert verificaciones["caches"]["estado"] == "ok"
+    assert "estadisticas" in verificaciones["caches"]["entradas"]
+
+def test_cache_bloqueada_saca_al_worker_de_servicio(monkeypatch):
+    cache = CacheResultados("prueba_bloqueada", segundos=60)
+    monkeypatch.setitem(modulo_cache._caches, "prueba_bloqueada", cache)
+    cache._lock.acquire()
+    try:
+        resultado = salud.estado_preparacion(forzar=True)
+    finally:
+        cache._lock.release()
+    assert resultado["listo"] is False
+    assert resultado["verificaciones"]["caches"]["bloqueadas"] == ["prueba_bloqueada"]
+    assert salud.estado_preparacion(forzar=True)["verificaciones"]["caches"]["estado"] == "ok"
@@ -0,0 +1,34 @@
+"""
+Pruebas del header Server-Timing de cada respuesta
+"""
+import re
+from tests.datos import crear_curso
+
+def _server_timing(respuesta) -> dict:
+    """Métricas del header: nombre -> (duración en ms, descripción)"""
+    metricas = {}
+    for parte in respuesta.headers["Server-Timing"].split(","):
+        nombre, *atributos = [campo.strip() for campo in parte.split(";")]
+        valores = dict(atributo.split("=", 1) for atributo in atributos)
+        metricas[nombre] = (float(valores["dur"]), valores.get("desc", "").strip('"'))
+    return metricas
+
+def test_server_timing_desglosa_la_peticion(client):
+    id_curso = crear_curso(client, "1ro A")
+    metricas = _server_timing(client.get(f"/api/cursos/{id_curso}"))
+
+    assert list(metricas) == ["db", "orm", "serializacion", "total"]
+    assert all(duracion >= 0 for duracion, _ in metricas.values())
+    partes = sum(metricas[nombre][0] for nombre in ("db", "orm", "serializacion"))
+    assert partes <= metricas["total"][0] + 0.3  # cada valor está redondeado a 0.1 ms
+
+    consultas = int(re.fullmatch(r"SQL \((\d+) consultas\)", metricas["db"][1]).group(1))
+    assert consultas >= 1
+
+def test_server_timing_en_errores_y_sin_base(client):
+    respuesta = client.get("/api/cursos/999")
+    assert respuesta.status_code == 404
+    assert "total" in _server_timing(respuesta)
+
+    metricas = _server_timing(client.get("/health/live"))
+    assert metricas["db"][1] == "SQL (0 consultas)"